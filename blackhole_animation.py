@@ -31,33 +31,37 @@ M_SUN = 1.98847e30  # Sonnenmasse [kg]
 M_BH = 4.154e6 * M_SUN  # Sagittarius A*: 4.154 Millionen Sonnenmassen
 r_s = 2 * G * M_BH / (C**2)  # Schwarzschild-Radius [m]
 
-print("="*80)
-print("SAGITTARIUS A* - SEGMENTED SPACETIME ANIMATION")
-print("="*80)
-print(f"Galaktisches Zentrum (Supermassives Schwarzes Loch)")
-print(f"Masse: M = {M_BH/M_SUN:.3e} M_sun = 4.154 Millionen Sonnenmassen")
-print(f"Schwarzschild-Radius: r_s = {r_s:.2f} m = {r_s/1e6:.2f} Millionen km")
-print(f"Photonen-Sphaere: r_ph = 1.5 r_s = {1.5*r_s/1e6:.2f} Millionen km")
-print(f"Phi-Grenze: r_phi = {PHI:.3f} r_s = {PHI*r_s/1e6:.2f} Millionen km")
-print(f"ISCO: r_isco = 3 r_s = {3*r_s/1e6:.2f} Millionen km")
-print(f"Entfernung zur Erde: ~26,000 Lichtjahre")
-print("="*80)
+def print_header():
+    print("="*80)
+    print("SAGITTARIUS A* - SEGMENTED SPACETIME ANIMATION")
+    print("="*80)
+    print(f"Galaktisches Zentrum (Supermassives Schwarzes Loch)")
+    print(f"Masse: M = {M_BH/M_SUN:.3e} M_sun = 4.154 Millionen Sonnenmassen")
+    print(f"Schwarzschild-Radius: r_s = {r_s:.2f} m = {r_s/1e6:.2f} Millionen km")
+    print(f"Photonen-Sphaere: r_ph = 1.5 r_s = {1.5*r_s/1e6:.2f} Millionen km")
+    print(f"Phi-Grenze: r_phi = {PHI:.3f} r_s = {PHI*r_s/1e6:.2f} Millionen km")
+    print(f"ISCO: r_isco = 3 r_s = {3*r_s/1e6:.2f} Millionen km")
+    print(f"Entfernung zur Erde: ~26,000 Lichtjahre")
+    print("="*80)
 
 # ============================================================================
 # Segmented Spacetime Funktionen
 # ============================================================================
 
+def _out(a):
+    """0-d Ergebnis als Skalar, sonst Array"""
+    return a[()] if np.ndim(a) == 0 else a
+
 def gravitational_redshift(r, M=M_BH):
     """
     Gravitational Redshift in Segmented Spacetime
     z_grav = 1/√(1 - r_s/r) - 1
+    (r darf Skalar oder Array sein; innerhalb des Horizonts NaN)
     """
     r_s = 2 * G * M / (C**2)
-    x = r / r_s
-    if x > 1.0:
-        return 1.0 / np.sqrt(1 - 1.0/x) - 1.0
-    else:
-        return np.nan  # Inside horizon
+    x = np.asarray(r, dtype=float) / r_s
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _out(np.where(x > 1.0, 1.0 / np.sqrt(1 - 1.0/x) - 1.0, np.nan))
 
 def phi_correction(r, M=M_BH):
     """
@@ -70,18 +74,16 @@ def phi_correction(r, M=M_BH):
     ALPHA = 2.7177e4
     B = 1.96
     deltaM_pct = (A * np.exp(-ALPHA * r_s_local) + B)
-    return 1.0 + deltaM_pct / 100.0
+    return _out(np.full(np.shape(r), 1.0 + deltaM_pct / 100.0))
 
 def time_dilation(r, M=M_BH):
     """
     Zeitdilatation: τ = 1/√(1 - r_s/r)
     """
     r_s = 2 * G * M / (C**2)
-    x = r / r_s
-    if x > 1.0:
-        return 1.0 / np.sqrt(1 - 1.0/x)
-    else:
-        return np.inf
+    x = np.asarray(r, dtype=float) / r_s
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _out(np.where(x > 1.0, 1.0 / np.sqrt(1 - 1.0/x), np.inf))
 
 def segment_density(r, M=M_BH):
     """
@@ -89,30 +91,27 @@ def segment_density(r, M=M_BH):
     Basiert auf φ-Spirale Geometrie
     """
     r_s = 2 * G * M / (C**2)
-    if r > 0:
-        return PHI * (r_s / r)**2
-    else:
-        return np.inf
+    r = np.asarray(r, dtype=float)
+    with np.errstate(divide='ignore'):
+        return _out(np.where(r > 0, PHI * (r_s / r)**2, np.inf))
 
 def orbital_velocity(r, M=M_BH):
     """
     Keplersche Orbitalgeschwindigkeit
     v_orb = √(GM/r)
     """
-    if r > 0:
-        return np.sqrt(G * M / r)
-    else:
-        return 0
+    r = np.asarray(r, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _out(np.where(r > 0, np.sqrt(G * M / r), 0.0))
 
 def escape_velocity(r, M=M_BH):
     """
     Fluchtgeschwindigkeit
     v_esc = √(2GM/r)
     """
-    if r > 0:
-        return np.sqrt(2 * G * M / r)
-    else:
-        return 0
+    r = np.asarray(r, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _out(np.where(r > 0, np.sqrt(2 * G * M / r), 0.0))
 
 # ============================================================================
 # Visualisierung Setup
@@ -131,222 +130,222 @@ r_grid = np.linspace(1.0, 8.0, 50)  # Von Horizont bis 8 r_s
 # ============================================================================
 # Figur Setup (2 Zeilen, 3 Spalten - Werte-Panel rechts über 2 Zeilen)
 # ============================================================================
-fig = plt.figure(figsize=(24, 12), facecolor='#000')
-gs = fig.add_gridspec(2, 3, hspace=0.3, wspace=0.4, left=0.05, right=0.98, top=0.95, bottom=0.05,
-                     width_ratios=[1, 1, 1.2])
-
-# Farbschema
-BH_COLOR = '#000'
-HORIZON_COLOR = '#FF0000'
-PHOTON_COLOR = '#FFD700'
-ISCO_COLOR = '#00FF00'
-PHI_COLOR = '#FF00FF'
-GRID_COLOR = '#00FFFF'
-
-# ============================================================================
-# Plot 1: Schwarzschild-Geometrie (2D Draufsicht)
-# ============================================================================
-ax1 = fig.add_subplot(gs[0, 0], facecolor='#000')
-ax1.set_xlim(-8, 8)
-ax1.set_ylim(-8, 8)
-ax1.set_aspect('equal')
-ax1.set_title('Schwarzschild-Geometrie (Draufsicht)', fontsize=13, color='white', fontweight='bold')
-ax1.set_xlabel('x / r_s', fontsize=11, color='white')
-ax1.set_ylabel('y / r_s', fontsize=11, color='white')
-ax1.tick_params(colors='white')
-for spine in ax1.spines.values():
-    spine.set_color('white')
-
-# Schwarzes Loch (Event Horizon)
-horizon = Circle((0, 0), r_s_norm, facecolor=BH_COLOR, edgecolor=HORIZON_COLOR, 
-                linewidth=3, label='Event Horizon (r_s)', zorder=10)
-ax1.add_patch(horizon)
-
-# Photonen-Sphäre
-photon_sphere = Circle((0, 0), r_photon, fill=False, edgecolor=PHOTON_COLOR, 
-                       linewidth=2, linestyle='--', label='Photonen-Sphäre (1.5 r_s)', zorder=5)
-ax1.add_patch(photon_sphere)
-
-# ISCO
-isco_circle = Circle((0, 0), r_isco, fill=False, edgecolor=ISCO_COLOR, 
-                     linewidth=2, linestyle='--', label='ISCO (3 r_s)', zorder=5)
-ax1.add_patch(isco_circle)
-
-# φ-Grenze (FUNDAMENTAL!)
-phi_circle = Circle((0, 0), r_phi, fill=False, edgecolor=PHI_COLOR, 
-                    linewidth=2, linestyle=':', label=f'φ-Grenze ({PHI:.3f} r_s)', zorder=5)
-ax1.add_patch(phi_circle)
-
-# Raumzeit-Gitter (wird animiert)
-grid_lines = []
-for r in [2, 3, 4, 5, 6, 7]:
-    circle, = ax1.plot([], [], color=GRID_COLOR, linewidth=0.5, alpha=0.3)
-    grid_lines.append(circle)
-
-# Test-Partikel (wird animiert)
-particle, = ax1.plot([], [], 'wo', markersize=8, label='Test-Partikel', zorder=15)
-
-ax1.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
-ax1.grid(True, alpha=0.1, color='white')
-
-# ============================================================================
-# Plot 2: Zeit-Dilatation & Redshift
-# ============================================================================
-ax2 = fig.add_subplot(gs[0, 1], facecolor='#0a0a1e')
-ax2.set_xlim(1, 8)
-ax2.set_ylim(0, 10)
-ax2.set_title('Zeitdilatation & Gravitational Redshift', fontsize=13, color='white', fontweight='bold')
-ax2.set_xlabel('r / r_s', fontsize=11, color='white')
-ax2.set_ylabel('Faktor', fontsize=11, color='white')
-ax2.tick_params(colors='white')
-for spine in ax2.spines.values():
-    spine.set_color('white')
-
-r_plot = np.linspace(1.01, 8, 200)
-tau_plot = [time_dilation(r*r_s, M_BH) for r in r_plot]
-z_plot = [gravitational_redshift(r*r_s, M_BH) for r in r_plot]
-
-ax2.plot(r_plot, tau_plot, color='#00FF00', linewidth=2, label='τ (Zeitdilatation)', zorder=5)
-ax2.plot(r_plot, [1+z for z in z_plot], color='#FFD700', linewidth=2, label='1+z_grav', zorder=5)
-
-# φ-Grenze markieren
-ax2.axvline(r_phi, color=PHI_COLOR, linewidth=2, linestyle=':', alpha=0.7, label=f'φ-Grenze')
-ax2.axvline(r_photon, color=PHOTON_COLOR, linewidth=1, linestyle='--', alpha=0.5)
-ax2.axvline(r_isco, color=ISCO_COLOR, linewidth=1, linestyle='--', alpha=0.5)
-
-# Animierter Marker
-current_pos_marker, = ax2.plot([], [], 'ro', markersize=10, zorder=20)
-
-ax2.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
-ax2.grid(True, alpha=0.2, color='white')
-
-# ============================================================================
-# Plot 3: Mathematische Werte (Live) - RECHTS über beide Zeilen
-# ============================================================================
-ax_values = fig.add_subplot(gs[:, 2], facecolor='#0a0a1e')
-ax_values.set_xlim(0, 1)
-ax_values.set_ylim(0, 1)
-ax_values.axis('off')
-ax_values.set_title('Mathematische Werte (Live) - Sagittarius A*', fontsize=14, color='white', fontweight='bold', pad=20)
-
-# Linke Spalte
-values_text_left = ax_values.text(0.05, 0.95, '', fontsize=11, color='white', 
-                                  verticalalignment='top', family='monospace',
-                                  bbox=dict(boxstyle='round', facecolor='#1a1a2e', 
-                                          edgecolor='#00FFFF', alpha=0.8, linewidth=2))
-
-# Rechte Spalte
-values_text_right = ax_values.text(0.52, 0.95, '', fontsize=11, color='white', 
-                                   verticalalignment='top', family='monospace',
-                                   bbox=dict(boxstyle='round', facecolor='#1a1a2e', 
-                                           edgecolor='#FF00FF', alpha=0.8, linewidth=2))
-
-# ============================================================================
-# Plot 4: Segment-Dichte (φ-basiert)
-# ============================================================================
-ax3 = fig.add_subplot(gs[1, 0], facecolor='#0a0a1e')
-ax3.set_xlim(1, 8)
-ax3.set_ylim(0, 5)
-ax3.set_title('Segment-Dichte N(r) ~ φ·(r_s/r)²', fontsize=13, color='white', fontweight='bold')
-ax3.set_xlabel('r / r_s', fontsize=11, color='white')
-ax3.set_ylabel('N(r) / N(r_s)', fontsize=11, color='white')
-ax3.tick_params(colors='white')
-for spine in ax3.spines.values():
-    spine.set_color('white')
-
-N_plot = [segment_density(r*r_s, M_BH) / segment_density(r_s, M_BH) for r in r_plot]
-ax3.plot(r_plot, N_plot, color='#FF00FF', linewidth=2, label='N(r) (φ-Spirale)', zorder=5)
-
-# φ-Potenzen markieren
-ax3.axvline(r_phi, color=PHI_COLOR, linewidth=2, linestyle=':', alpha=0.7, label=f'φ¹ = {PHI:.3f}')
-ax3.axvline(PHI**2, color=PHI_COLOR, linewidth=1, linestyle=':', alpha=0.5, label=f'φ² = {PHI**2:.3f}')
-
-# Animierter Marker
-segment_marker, = ax3.plot([], [], 'ro', markersize=10, zorder=20)
-
-ax3.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
-ax3.grid(True, alpha=0.2, color='white')
+def build_figure(figsize=(24, 12)):
+    """
+    Baut die komplette Figur (statische Kurven, Legenden, Panels) und gibt
+    (fig, artists) zurück; artists enthält alle animierten Elemente.
+    """
+    fig = plt.figure(figsize=figsize, facecolor='#000')
+    gs = fig.add_gridspec(2, 3, hspace=0.3, wspace=0.4, left=0.05, right=0.98, top=0.95, bottom=0.05,
+                         width_ratios=[1, 1, 1.2])
+
+    # Farbschema
+    BH_COLOR = '#000'
+    HORIZON_COLOR = '#FF0000'
+    PHOTON_COLOR = '#FFD700'
+    ISCO_COLOR = '#00FF00'
+    PHI_COLOR = '#FF00FF'
+    GRID_COLOR = '#00FFFF'
+
+    # ============================================================================
+    # Plot 1: Schwarzschild-Geometrie (2D Draufsicht)
+    # ============================================================================
+    ax1 = fig.add_subplot(gs[0, 0], facecolor='#000')
+    ax1.set_xlim(-8, 8)
+    ax1.set_ylim(-8, 8)
+    ax1.set_aspect('equal')
+    ax1.set_title('Schwarzschild-Geometrie (Draufsicht)', fontsize=13, color='white', fontweight='bold')
+    ax1.set_xlabel('x / r_s', fontsize=11, color='white')
+    ax1.set_ylabel('y / r_s', fontsize=11, color='white')
+    ax1.tick_params(colors='white')
+    for spine in ax1.spines.values():
+        spine.set_color('white')
+
+    # Schwarzes Loch (Event Horizon)
+    horizon = Circle((0, 0), r_s_norm, facecolor=BH_COLOR, edgecolor=HORIZON_COLOR, 
+                    linewidth=3, label='Event Horizon (r_s)', zorder=10)
+    ax1.add_patch(horizon)
+
+    # Photonen-Sphäre
+    photon_sphere = Circle((0, 0), r_photon, fill=False, edgecolor=PHOTON_COLOR, 
+                           linewidth=2, linestyle='--', label='Photonen-Sphäre (1.5 r_s)', zorder=5)
+    ax1.add_patch(photon_sphere)
+
+    # ISCO
+    isco_circle = Circle((0, 0), r_isco, fill=False, edgecolor=ISCO_COLOR, 
+                         linewidth=2, linestyle='--', label='ISCO (3 r_s)', zorder=5)
+    ax1.add_patch(isco_circle)
+
+    # φ-Grenze (FUNDAMENTAL!)
+    phi_circle = Circle((0, 0), r_phi, fill=False, edgecolor=PHI_COLOR, 
+                        linewidth=2, linestyle=':', label=f'φ-Grenze ({PHI:.3f} r_s)', zorder=5)
+    ax1.add_patch(phi_circle)
+
+    # Raumzeit-Gitter (wird animiert)
+    grid_lines = []
+    for r in [2, 3, 4, 5, 6, 7]:
+        circle, = ax1.plot([], [], color=GRID_COLOR, linewidth=0.5, alpha=0.3)
+        grid_lines.append(circle)
+
+    # Test-Partikel (wird animiert)
+    particle, = ax1.plot([], [], 'wo', markersize=8, label='Test-Partikel', zorder=15)
+
+    ax1.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
+    ax1.grid(True, alpha=0.1, color='white')
+
+    # ============================================================================
+    # Plot 2: Zeit-Dilatation & Redshift
+    # ============================================================================
+    ax2 = fig.add_subplot(gs[0, 1], facecolor='#0a0a1e')
+    ax2.set_xlim(1, 8)
+    ax2.set_ylim(0, 10)
+    ax2.set_title('Zeitdilatation & Gravitational Redshift', fontsize=13, color='white', fontweight='bold')
+    ax2.set_xlabel('r / r_s', fontsize=11, color='white')
+    ax2.set_ylabel('Faktor', fontsize=11, color='white')
+    ax2.tick_params(colors='white')
+    for spine in ax2.spines.values():
+        spine.set_color('white')
+
+    r_plot = np.linspace(1.01, 8, 200)
+    tau_plot = time_dilation(r_plot*r_s, M_BH)
+    z_plot = gravitational_redshift(r_plot*r_s, M_BH)
+
+    ax2.plot(r_plot, tau_plot, color='#00FF00', linewidth=2, label='τ (Zeitdilatation)', zorder=5)
+    ax2.plot(r_plot, 1 + z_plot, color='#FFD700', linewidth=2, label='1+z_grav', zorder=5)
+
+    # φ-Grenze markieren
+    ax2.axvline(r_phi, color=PHI_COLOR, linewidth=2, linestyle=':', alpha=0.7, label=f'φ-Grenze')
+    ax2.axvline(r_photon, color=PHOTON_COLOR, linewidth=1, linestyle='--', alpha=0.5)
+    ax2.axvline(r_isco, color=ISCO_COLOR, linewidth=1, linestyle='--', alpha=0.5)
+
+    # Animierter Marker
+    current_pos_marker, = ax2.plot([], [], 'ro', markersize=10, zorder=20)
+
+    ax2.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
+    ax2.grid(True, alpha=0.2, color='white')
+
+    # ============================================================================
+    # Plot 3: Mathematische Werte (Live) - RECHTS über beide Zeilen
+    # ============================================================================
+    ax_values = fig.add_subplot(gs[:, 2], facecolor='#0a0a1e')
+    ax_values.set_xlim(0, 1)
+    ax_values.set_ylim(0, 1)
+    ax_values.axis('off')
+    ax_values.set_title('Mathematische Werte (Live) - Sagittarius A*', fontsize=14, color='white', fontweight='bold', pad=20)
+
+    # Linke Spalte
+    values_text_left = ax_values.text(0.05, 0.95, '', fontsize=11, color='white', 
+                                      verticalalignment='top', family='monospace',
+                                      bbox=dict(boxstyle='round', facecolor='#1a1a2e', 
+                                              edgecolor='#00FFFF', alpha=0.8, linewidth=2))
+
+    # Rechte Spalte
+    values_text_right = ax_values.text(0.52, 0.95, '', fontsize=11, color='white', 
+                                       verticalalignment='top', family='monospace',
+                                       bbox=dict(boxstyle='round', facecolor='#1a1a2e', 
+                                               edgecolor='#FF00FF', alpha=0.8, linewidth=2))
+
+    # ============================================================================
+    # Plot 4: Segment-Dichte (φ-basiert)
+    # ============================================================================
+    ax3 = fig.add_subplot(gs[1, 0], facecolor='#0a0a1e')
+    ax3.set_xlim(1, 8)
+    ax3.set_ylim(0, 5)
+    ax3.set_title('Segment-Dichte N(r) ~ φ·(r_s/r)²', fontsize=13, color='white', fontweight='bold')
+    ax3.set_xlabel('r / r_s', fontsize=11, color='white')
+    ax3.set_ylabel('N(r) / N(r_s)', fontsize=11, color='white')
+    ax3.tick_params(colors='white')
+    for spine in ax3.spines.values():
+        spine.set_color('white')
+
+    N_plot = segment_density(r_plot*r_s, M_BH) / segment_density(r_s, M_BH)
+    ax3.plot(r_plot, N_plot, color='#FF00FF', linewidth=2, label='N(r) (φ-Spirale)', zorder=5)
+
+    # φ-Potenzen markieren
+    ax3.axvline(r_phi, color=PHI_COLOR, linewidth=2, linestyle=':', alpha=0.7, label=f'φ¹ = {PHI:.3f}')
+    ax3.axvline(PHI**2, color=PHI_COLOR, linewidth=1, linestyle=':', alpha=0.5, label=f'φ² = {PHI**2:.3f}')
+
+    # Animierter Marker
+    segment_marker, = ax3.plot([], [], 'ro', markersize=10, zorder=20)
+
+    ax3.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
+    ax3.grid(True, alpha=0.2, color='white')
+
+    # ============================================================================
+    # Plot 5: Geschwindigkeiten
+    # ============================================================================
+    ax4 = fig.add_subplot(gs[1, 1], facecolor='#0a0a1e')
+    ax4.set_xlim(1, 8)
+    ax4.set_ylim(0, 1)
+    ax4.set_title('Orbital- & Fluchtgeschwindigkeit', fontsize=13, color='white', fontweight='bold')
+    ax4.set_xlabel('r / r_s', fontsize=11, color='white')
+    ax4.set_ylabel('v / c', fontsize=11, color='white')
+    ax4.tick_params(colors='white')
+    for spine in ax4.spines.values():
+        spine.set_color('white')
+
+    v_orb_plot = orbital_velocity(r_plot*r_s, M_BH) / C
+    v_esc_plot = escape_velocity(r_plot*r_s, M_BH) / C
+
+    ax4.plot(r_plot, v_orb_plot, color='#00FF00', linewidth=2, label='v_orb (Kepler)', zorder=5)
+    ax4.plot(r_plot, v_esc_plot, color='#FF0000', linewidth=2, label='v_esc (Flucht)', zorder=5)
+    ax4.axhline(1.0, color='white', linewidth=1, linestyle='--', alpha=0.5, label='c')
+
+    # ISCO markieren
+    ax4.axvline(r_isco, color=ISCO_COLOR, linewidth=2, linestyle='--', alpha=0.7, label='ISCO')
+
+    # Animierter Marker
+    velocity_marker, = ax4.plot([], [], 'ro', markersize=10, zorder=20)
+
+    ax4.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
+    ax4.grid(True, alpha=0.2, color='white')
+
+    # Info ist jetzt im Werte-Panel integriert
+
+    artists = dict(particle=particle, grid_lines=grid_lines,
+                   current_pos_marker=current_pos_marker, segment_marker=segment_marker,
+                   velocity_marker=velocity_marker, values_text_left=values_text_left,
+                   values_text_right=values_text_right)
+    return fig, artists
 
 # ============================================================================
-# Plot 5: Geschwindigkeiten
+# Frame-Zustand (vorberechnet, vektorisiert)
 # ============================================================================
-ax4 = fig.add_subplot(gs[1, 1], facecolor='#0a0a1e')
-ax4.set_xlim(1, 8)
-ax4.set_ylim(0, 1)
-ax4.set_title('Orbital- & Fluchtgeschwindigkeit', fontsize=13, color='white', fontweight='bold')
-ax4.set_xlabel('r / r_s', fontsize=11, color='white')
-ax4.set_ylabel('v / c', fontsize=11, color='white')
-ax4.tick_params(colors='white')
-for spine in ax4.spines.values():
-    spine.set_color('white')
-
-v_orb_plot = [orbital_velocity(r*r_s, M_BH) / C for r in r_plot]
-v_esc_plot = [escape_velocity(r*r_s, M_BH) / C for r in r_plot]
-
-ax4.plot(r_plot, v_orb_plot, color='#00FF00', linewidth=2, label='v_orb (Kepler)', zorder=5)
-ax4.plot(r_plot, v_esc_plot, color='#FF0000', linewidth=2, label='v_esc (Flucht)', zorder=5)
-ax4.axhline(1.0, color='white', linewidth=1, linestyle='--', alpha=0.5, label='c')
-
-# ISCO markieren
-ax4.axvline(r_isco, color=ISCO_COLOR, linewidth=2, linestyle='--', alpha=0.7, label='ISCO')
-
-# Animierter Marker
-velocity_marker, = ax4.plot([], [], 'ro', markersize=10, zorder=20)
-
-ax4.legend(loc='upper right', fontsize=9, facecolor='black', edgecolor='white', labelcolor='white')
-ax4.grid(True, alpha=0.2, color='white')
 
-# Info ist jetzt im Werte-Panel integriert
+DT = 0.05  # Zeitschritt pro Frame
 
-# ============================================================================
-# Animation-Funktion
-# ============================================================================
-
-def animate(frame):
+def precompute_frames(n_frames):
     """
-    Animiert ein Test-Partikel das um das Schwarze Loch kreist
+    Berechnet den kompletten Zustand aller Frames als Arrays (einmal, vektorisiert).
+    Test-Partikel auf elliptischem Orbit, r variiert zwischen 2.5 und 6 r_s.
     """
-    t = frame * 0.05  # Zeitschritt
-    
-    # Partikel-Orbit (elliptisch, r variiert zwischen 2 und 6 r_s)
+    t = np.arange(n_frames) * DT
     r_min = 2.5
     r_max = 6.0
     r_current = r_min + (r_max - r_min) * (0.5 + 0.5 * np.sin(t))
-    
     # Winkel (schneller näher am Schwarzen Loch)
     omega = 2.0 / r_current**1.5  # Kepler's 3rd law approximation
     theta_current = omega * t * 10
-    
-    # Kartesische Koordinaten
-    x = r_current * np.cos(theta_current)
-    y = r_current * np.sin(theta_current)
-    
-    # Update Partikel-Position
-    particle.set_data([x], [y])
-    
-    # Update Gitter (visualisiert Raumzeit-Krümmung)
-    for i, line in enumerate(grid_lines):
-        r_line = 2 + i
-        # Gitter "pulsiert" näher am Schwarzen Loch
-        pulse_factor = 1.0 + 0.1 * np.sin(t * 3 - r_line)
-        x_circle = r_line * pulse_factor * np.cos(theta)
-        y_circle = r_line * pulse_factor * np.sin(theta)
-        line.set_data(x_circle, y_circle)
-    
-    # Update Marker in anderen Plots
-    current_pos_marker.set_data([r_current], [time_dilation(r_current*r_s, M_BH)])
-    segment_marker.set_data([r_current], [segment_density(r_current*r_s, M_BH) / segment_density(r_s, M_BH)])
-    velocity_marker.set_data([r_current], [orbital_velocity(r_current*r_s, M_BH) / C])
-    
-    # Update mathematische Werte (Live) - ZWEISPALTIG
     r_actual = r_current * r_s  # Tatsächlicher Radius [m]
-    z_grav = gravitational_redshift(r_actual, M_BH)
-    tau = time_dilation(r_actual, M_BH)
-    N_rel = segment_density(r_actual, M_BH) / segment_density(r_s, M_BH)
-    v_orb = orbital_velocity(r_actual, M_BH)
-    v_esc = escape_velocity(r_actual, M_BH)
-    phi_corr = phi_correction(r_actual, M_BH)
-    
+    r_lines = 2 + np.arange(6)
+    N_rs = segment_density(r_s, M_BH)
+    return dict(
+        n=n_frames, t=t, r_current=r_current, r_actual=r_actual,
+        x=r_current * np.cos(theta_current), y=r_current * np.sin(theta_current),
+        # Gitter "pulsiert" näher am Schwarzen Loch
+        pulse=1.0 + 0.1 * np.sin(t[:, None] * 3 - r_lines[None, :]), r_lines=r_lines,
+        tau=time_dilation(r_actual, M_BH), z_grav=gravitational_redshift(r_actual, M_BH),
+        N_rel=segment_density(r_actual, M_BH) / N_rs,
+        v_orb=orbital_velocity(r_actual, M_BH), v_esc=escape_velocity(r_actual, M_BH),
+        phi_corr=phi_correction(r_actual, M_BH),
+    )
+
+def frame_texts(state, i):
+    """Werte-Panel (zweispaltig) für Frame i"""
+    r_current = state['r_current'][i]; r_actual = state['r_actual'][i]
+    tau = state['tau'][i]; z_grav = state['z_grav'][i]; N_rel = state['N_rel'][i]
+    v_orb = state['v_orb'][i]; v_esc = state['v_esc'][i]; phi_corr = state['phi_corr'][i]
+
     # LINKE SPALTE: Sgr A* Info, Position, Zeitdilatation, Redshift
     values_left = (
         f"SAGITTARIUS A*\n"
@@ -403,37 +402,196 @@ def animate(frame):
         f"  r_φ = {PHI:.3f} × r_s\n"
         f"      = {PHI*r_s/1e9:.2f} Mio km\n"
     )
+    return values_left, values_right
+
+# ============================================================================
+# Animation-Funktion
+# ============================================================================
+
+def draw_frame(artists, state, i):
+    """
+    Setzt alle animierten Elemente auf Frame i (nur Array-Lookups)
+    """
+    r_current = state['r_current'][i]
     
-    values_text_left.set_text(values_left)
-    values_text_right.set_text(values_right)
+    # Update Partikel-Position
+    artists['particle'].set_data([state['x'][i]], [state['y'][i]])
+    
+    # Update Gitter (visualisiert Raumzeit-Krümmung)
+    for line, r_line, pulse_factor in zip(artists['grid_lines'], state['r_lines'], state['pulse'][i]):
+        line.set_data(r_line * pulse_factor * _COS_THETA, r_line * pulse_factor * _SIN_THETA)
+    
+    # Update Marker in anderen Plots
+    artists['current_pos_marker'].set_data([r_current], [state['tau'][i]])
+    artists['segment_marker'].set_data([r_current], [state['N_rel'][i]])
+    artists['velocity_marker'].set_data([r_current], [state['v_orb'][i] / C])
     
-    return [particle] + grid_lines + [current_pos_marker, segment_marker, velocity_marker, 
-            values_text_left, values_text_right]
+    # Update mathematische Werte (Live) - ZWEISPALTIG
+    values_left, values_right = frame_texts(state, i)
+    artists['values_text_left'].set_text(values_left)
+    artists['values_text_right'].set_text(values_right)
+    
+    return ([artists['particle']] + artists['grid_lines'] +
+            [artists['current_pos_marker'], artists['segment_marker'], artists['velocity_marker'],
+             artists['values_text_left'], artists['values_text_right']])
+
+_COS_THETA = np.cos(theta)
+_SIN_THETA = np.sin(theta)
+
+# ============================================================================
+# Paralleler Renderer (Worker-Prozesse -> Bildpuffer -> Encoder)
+# ============================================================================
+
+_WORKER = {}
+
+def _init_worker(n_frames, figsize, dpi, palette):
+    import matplotlib
+    matplotlib.use('Agg')
+    fig, artists = build_figure(figsize)
+    fig.set_dpi(dpi)
+    _WORKER.update(fig=fig, artists=artists, state=precompute_frames(n_frames), palette=palette)
+
+def _render_frame(i):
+    """Rendert Frame i in einen RGBA-Puffer (bzw. Palette-Bild für GIF)"""
+    w = _WORKER
+    draw_frame(w['artists'], w['state'], i)
+    canvas = w['fig'].canvas
+    canvas.draw()
+    rgba = np.asarray(canvas.buffer_rgba())
+    if w['palette']:
+        from PIL import Image
+        # Quantisierung (teuerster GIF-Schritt) läuft hier parallel
+        return Image.fromarray(rgba[..., :3]).quantize(colors=256)
+    return rgba.tobytes(), rgba.shape
+
+def _iter_frames(n_frames, figsize, dpi, workers, palette):
+    """Frames in Reihenfolge; mit workers > 1 aus einem Prozess-Pool"""
+    init = (n_frames, figsize, dpi, palette)
+    if workers <= 1:
+        _init_worker(*init)
+        for i in range(n_frames):
+            yield _render_frame(i)
+        return
+    import multiprocessing as mp
+    chunk = max(1, min(8, n_frames // (4 * workers)))
+    with mp.Pool(workers, initializer=_init_worker, initargs=init) as pool:
+        yield from pool.imap(_render_frame, range(n_frames), chunksize=chunk)
+
+def encode_gif(frames, path, fps):
+    """
+    Reicht die Palettenbilder als Iterator an Pillow weiter (keine Frame-Liste).
+    Pillow puffert die (auf das Differenzrechteck beschnittenen) GIF-Frames
+    trotzdem bis zum Schluss - für lange Animationen ein Videoformat nehmen.
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        raise SystemExit("[ERROR] keine Frames zum Schreiben")
+    first.save(path, save_all=True, append_images=frames,
+               duration=int(round(1000 / fps)), loop=0)
+
+def encode_ffmpeg(frames, path, fps):
+    """Streamt die Rohbilder per Pipe an ffmpeg (konstanter Speicherbedarf)"""
+    import shutil, subprocess
+    exe = shutil.which('ffmpeg')
+    if exe is None:
+        raise SystemExit("[ERROR] ffmpeg nicht gefunden - für Videoformate nötig (oder .gif verwenden)")
+    proc = None
+    for buf, shape in frames:
+        if proc is None:
+            h, w = shape[:2]
+            cmd = [exe, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                   '-s', f'{w}x{h}', '-r', str(fps), '-i', '-',
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', str(path)]
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        proc.stdin.write(buf)
+    if proc is not None:
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise SystemExit(f"[ERROR] ffmpeg fehlgeschlagen (exit {proc.returncode})")
+
+def render_parallel(output, n_frames, fps, dpi, figsize, workers):
+    is_gif = str(output).lower().endswith('.gif')
+    frames = _iter_frames(n_frames, figsize, dpi, workers, palette=is_gif)
+    if is_gif:
+        encode_gif(frames, output, fps)
+    else:
+        encode_ffmpeg(frames, output, fps)
+
+def render_serial(output, n_frames, fps, dpi, figsize):
+    """Bisheriger Weg: FuncAnimation + PillowWriter in einem Prozess"""
+    fig, artists = build_figure(figsize)
+    state = precompute_frames(n_frames)
+    anim = FuncAnimation(fig, lambda i: draw_frame(artists, state, i),
+                         frames=n_frames, interval=1000 / fps, blit=True)
+    anim.save(output, writer=PillowWriter(fps=fps), dpi=dpi)
+    plt.close(fig)
 
 # ============================================================================
-# Animation erstellen
+# CLI
 # ============================================================================
-print("\nErstelle Animation...")
-anim = FuncAnimation(fig, animate, frames=200, interval=50, blit=True)
-
-# Als GIF speichern
-output_gif = "d:\\blackhole_segmented_spacetime.gif"
-writer = PillowWriter(fps=20)
-anim.save(output_gif, writer=writer, dpi=120)
-print(f"Animation gespeichert: {output_gif}")
-
-# Als PNG speichern (Schlüsselbild)
-fig.savefig("d:\\blackhole_segmented_spacetime.png", dpi=300, facecolor='#000', bbox_inches='tight')
-print(f"Statisches Bild gespeichert: d:\\blackhole_segmented_spacetime.png")
-
-print("\n" + "="*80)
-print("PHYSIKALISCHE INTERPRETATION:")
-print("-" * 80)
-print(f"- Phi-Grenze bei r = {PHI:.3f} r_s ist fundamental (Goldener Schnitt!)")
-print(f"- Photonen-Sphaere bei r = 1.5 r_s (instabile Licht-Orbits)")
-print(f"- ISCO bei r = 3 r_s (innermost stable circular orbit)")
-print(f"- Segment-Dichte N(r) ~ Phi*(r_s/r)^2 aus Phi-Spirale")
-print(f"- Zeitdilatation tau -> unendlich am Event Horizon")
-print("="*80)
-
-plt.show()
+
+def _positive_int(text):
+    import argparse
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"muss >= 1 sein (war {value})")
+    return value
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Sagittarius A* - Segmented Spacetime Animation")
+    ap.add_argument("--frames", type=_positive_int, default=200,
+                    help="Anzahl Frames >= 1 (je %.2f Zeiteinheiten)" % DT)
+    ap.add_argument("--fps", type=_positive_int, default=20)
+    ap.add_argument("--dpi", type=int, default=120, help="Auflösung der Animation")
+    ap.add_argument("--figsize", type=str, default="24x12", help="Figurgröße in Zoll, BxH")
+    ap.add_argument("--output", default="blackhole_segmented_spacetime.gif",
+                    help=".gif (Pillow) oder Videoformat wie .mp4/.webm (ffmpeg)")
+    ap.add_argument("--still", default=None, help="Statisches Bild (Default: <output>.png)")
+    ap.add_argument("--still-dpi", type=int, default=300)
+    ap.add_argument("--renderer", choices=["parallel", "serial"], default="parallel")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--show", action="store_true", help="Figur am Ende interaktiv anzeigen")
+    args = ap.parse_args(argv)
+
+    if not args.show:
+        import matplotlib
+        matplotlib.use('Agg')
+    figsize = tuple(float(v) for v in args.figsize.lower().split('x'))
+    output = args.output
+    still = args.still or os.path.splitext(output)[0] + '.png'
+    for path in (output, still):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    print_header()
+    print(f"\nErstelle Animation... ({args.frames} Frames, dpi={args.dpi}, "
+          f"renderer={args.renderer}, workers={args.workers})")
+    if args.renderer == "parallel":
+        render_parallel(output, args.frames, args.fps, args.dpi, figsize, args.workers)
+    else:
+        render_serial(output, args.frames, args.fps, args.dpi, figsize)
+    print(f"Animation gespeichert: {output}")
+
+    # Als PNG speichern (Schlüsselbild = letzter Frame)
+    fig, artists = build_figure(figsize)
+    draw_frame(artists, precompute_frames(args.frames), args.frames - 1)
+    fig.savefig(still, dpi=args.still_dpi, facecolor='#000', bbox_inches='tight')
+    print(f"Statisches Bild gespeichert: {still}")
+
+    print("\n" + "="*80)
+    print("PHYSIKALISCHE INTERPRETATION:")
+    print("-" * 80)
+    print(f"- Phi-Grenze bei r = {PHI:.3f} r_s ist fundamental (Goldener Schnitt!)")
+    print(f"- Photonen-Sphaere bei r = 1.5 r_s (instabile Licht-Orbits)")
+    print(f"- ISCO bei r = 3 r_s (innermost stable circular orbit)")
+    print(f"- Segment-Dichte N(r) ~ Phi*(r_s/r)^2 aus Phi-Spirale")
+    print(f"- Zeitdilatation tau -> unendlich am Event Horizon")
+    print("="*80)
+
+    if args.show:
+        plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -15,13 +15,16 @@ ALL tests use φ-based geometry:
 - φ-derived Δ(M) = A*exp(-α*r_s) + B corrections
 - Tests validate: radius (physics) dominates, NOT data source/completeness
 
-Uses segspace_all_in_one_extended.py (with φ-based corrections) for each subset.
+Same model and sign test as segspace_all_in_one_extended.py eval-redshift
+(with φ-based corrections), evaluated in-process via tools.stratified_paired:
+one residual computation, every stratum is an aggregation on top.
 """
 import pandas as pd
-import subprocess
 import json
 from pathlib import Path
 
+from tools.stratified_paired import compute_residuals, paired_stats, rows_mask
+
 print("="*80)
 print("COMPREHENSIVE STRATIFICATION ANALYSIS - 3 DIMENSIONS")
 print("="*80)
@@ -52,54 +55,32 @@ print(f"Complete data: {df['complete'].sum()} ({df['complete'].sum()/len(df)*100
 print(f"NED-origin: {df['is_ned'].sum()} ({df['is_ned'].sum()/len(df)*100:.1f}%)")
 print()
 
-def run_paired_test(subset_df, label, outdir='agent_out_strat'):
-    """Run paired test on a subset"""
+# Model residuals for all rows, computed once; strata are aggregations on top
+residuals = compute_residuals(df, mode='hybrid')
+
+def run_paired_test(subset_df, label, n_boot=2000):
+    """Run paired test on a subset (in-process, no eval-redshift subprocess)"""
     if len(subset_df) == 0:
         return None
     
-    # Save subset to temp file
-    temp_file = Path('temp_stratified_subset.csv')
-    subset_df.to_csv(temp_file, index=False)
+    stats_data = paired_stats(residuals, rows_mask(residuals, subset_df.index), n_boot=n_boot)
     
-    # Run paired test
-    cmd = [
-        'python', 'segspace_all_in_one_extended.py',
-        '--outdir', outdir,
-        'eval-redshift',
-        '--csv', str(temp_file),
-        '--paired-stats',
-        '--mode', 'hybrid'
-    ]
+    n_pairs = stats_data['N_pairs']
+    n_seg_better = stats_data['N_Seg_better']
+    share = stats_data['share_Seg_better']
+    p_value = stats_data['binom_two_sided_p']
     
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, 
-                              encoding='utf-8', errors='replace', timeout=60)
-        
-        # Read results
-        result_file = Path(f'{outdir}/reports/redshift_paired_stats.json')
-        if result_file.exists():
-            with open(result_file) as f:
-                stats_data = json.load(f)
-            
-            n_pairs = stats_data.get('N_pairs', 0)
-            n_seg_better = stats_data.get('N_Seg_better', 0)
-            share = stats_data.get('share_Seg_better', 0)
-            p_value = stats_data.get('binom_two_sided_p', 1.0)
-            
-            temp_file.unlink(missing_ok=True)
-            
-            return {
-                'label': label,
-                'n': n_pairs,
-                'seg_wins': n_seg_better,
-                'win_pct': share * 100,
-                'p_value': p_value,
-                'significant': p_value < 0.05
-            }
-    except Exception as e:
-        print(f"  ERROR in {label}: {e}")
-        temp_file.unlink(missing_ok=True)
-        return None
+    result = {
+        'label': label,
+        'n': n_pairs,
+        'seg_wins': n_seg_better,
+        'win_pct': share * 100,
+        'p_value': p_value,
+        'significant': p_value < 0.05
+    }
+    if n_boot > 0:
+        result['win_pct_ci'] = [stats_data['share_ci_lo'] * 100, stats_data['share_ci_hi'] * 100]
+    return result
 
 # ==============================================================================
 # DIMENSION 1: BY RADIUS
@@ -13,18 +13,96 @@ TODO: Implement baseline model predictions
 © 2025 Carmen Wrede, Lino Casu
 Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
 """
+import hashlib
+import math
+from collections import OrderedDict
 import numpy as np
-from typing import Dict, List
-from tools.metrics import rmse, mae, aic, bic, cliffs_delta, log_likelihood_gaussian
+from typing import Dict, List, Optional, Tuple
+from tools.metrics import effect_sizes
 from tools.io_utils import safe_write_csv, register_artifact
 
 
+# Default parameter count per model (α, β, η)
+DEFAULT_PARAM_COUNT = 3
+
+
+def stack_predictions(
+    models: Dict[str, np.ndarray],
+    n_points: Optional[int] = None
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Stack model predictions into one (models × points) array
+    
+    Args:
+        models: Dict of {model_name: y_pred}; scalar or 0-d predictions
+            broadcast over all points
+        n_points: Number of observed points (default: longest prediction)
+    
+    Returns:
+        tuple: (model names in input order, float array of shape (m, n))
+    """
+    names = list(models.keys())
+    if not names:
+        return names, np.empty((0, 0))
+    preds = [np.asarray(models[name], dtype=float).ravel() for name in names]
+    if n_points is None:
+        n_points = max(p.size for p in preds)
+    return names, np.vstack([np.broadcast_to(p, (n_points,)) for p in preds])
+
+
+def score_models(
+    y_obs: np.ndarray,
+    predictions: np.ndarray,
+    param_counts=DEFAULT_PARAM_COUNT
+) -> Dict[str, np.ndarray]:
+    """
+    Fit metrics and information criteria for all models at once
+    
+    Args:
+        y_obs: Observed values, shape (n,)
+        predictions: Stacked predictions, shape (m, n)
+        param_counts: Parameters per model (scalar or shape (m,))
+    
+    Returns:
+        dict: Arrays of shape (m,) for "rmse", "mae", "log_likelihood",
+              "aic", "bic", plus the residual matrix under "residuals"
+    
+    Note:
+        Row-wise single reductions over the residual matrix; the values
+        match rmse, mae, log_likelihood_gaussian (σ estimated from the
+        residuals, ddof=1), aic and bic applied to each model.
+    """
+    y_obs = np.asarray(y_obs, dtype=float).ravel()
+    P = np.atleast_2d(np.asarray(predictions, dtype=float))
+    m, n = P.shape
+    k = np.broadcast_to(np.asarray(param_counts, dtype=float), (m,))
+    
+    R = y_obs[None, :] - P
+    sq = np.sum(R ** 2, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.std(R, axis=1, ddof=1)
+        ll = (-n / 2 * np.log(2 * np.pi)
+              - n / 2 * np.log(sigma ** 2)
+              - sq / (2 * sigma ** 2))
+    ll = np.where(sigma <= 0, -np.inf, ll)  # σ = 0: -inf; undefined σ (n < 2): NaN
+    
+    return {
+        "rmse": np.sqrt(sq / n),
+        "mae": np.mean(np.abs(R), axis=1),
+        "log_likelihood": ll,
+        "aic": 2 * k - 2 * ll,
+        "bic": (math.log(n) * k - 2 * ll) if n > 0 else np.full(m, np.nan),
+        "residuals": R,
+    }
+
+
 def compare_models(
     y_obs: np.ndarray,
     models: Dict[str, np.ndarray],
     metrics: List[str] = None,
     out_csv: str = "reports/compare/model_scores.csv",
-    manifest_path: str = None
+    manifest_path: str = None,
+    param_counts: Dict[str, int] = None
 ) -> Dict:
     """
     Compare multiple models using information criteria and fit metrics
@@ -37,6 +115,8 @@ def compare_models(
             Options: "rmse", "mae", "aic", "bic", "waic", "cliffs"
         out_csv: Output CSV path
         manifest_path: Optional manifest path
+        param_counts: Optional {model_name: k} for AIC/BIC
+            (models not listed use k=3)
     
     Returns:
         dict: Comparison results
@@ -51,50 +131,33 @@ def compare_models(
             },
             metrics=["rmse", "aic", "bic"]
         )
+    
+    Note:
+        All predictions are stacked into one (models × points) array and
+        scored with score_models; pairwise effect sizes come from
+        tools.metrics.effect_sizes on the sorted absolute residuals.
     """
     if metrics is None:
         metrics = ["rmse", "mae", "aic", "bic"]
     
-    n = len(y_obs)
-    results = {}
+    names, P = stack_predictions(models, np.size(y_obs))
+    param_counts = param_counts or {}
+    k = [param_counts.get(name, DEFAULT_PARAM_COUNT) for name in names]
+    scores = score_models(y_obs, P, k) if names else {}
     
-    for model_name, y_pred in models.items():
-        model_results = {}
-        
-        # Fit metrics
-        if "rmse" in metrics:
-            model_results["rmse"] = rmse(y_obs, y_pred)
-        
-        if "mae" in metrics:
-            model_results["mae"] = mae(y_obs, y_pred)
-        
-        # Information criteria (requires log-likelihood)
-        if "aic" in metrics or "bic" in metrics:
-            # Assume Gaussian errors
-            ll = log_likelihood_gaussian(y_obs, y_pred)
-            
-            # Assume k=3 parameters (α, β, η) for all models
-            # TODO: Adjust based on actual model complexity
-            k = 3
-            
-            if "aic" in metrics:
-                model_results["aic"] = aic(ll, k)
-            
-            if "bic" in metrics:
-                model_results["bic"] = bic(ll, k, n)
-        
-        results[model_name] = model_results
+    results = {}
+    for i, model_name in enumerate(names):
+        results[model_name] = {
+            metric: float(scores[metric][i])
+            for metric in ("rmse", "mae", "aic", "bic") if metric in metrics
+        }
     
     # Effect sizes (pairwise comparisons)
     if "cliffs" in metrics and len(models) >= 2:
-        model_names = list(models.keys())
-        for i in range(len(model_names)):
-            for j in range(i+1, len(model_names)):
-                name1, name2 = model_names[i], model_names[j]
-                residuals1 = y_obs - models[name1]
-                residuals2 = y_obs - models[name2]
-                delta = cliffs_delta(np.abs(residuals1), np.abs(residuals2))
-                results[f"{name1}_vs_{name2}_delta"] = delta
+        abs_residuals = dict(zip(names, np.abs(scores["residuals"])))
+        pairs = effect_sizes(abs_residuals, measures=("cliffs_delta",))
+        for (name1, name2), values in pairs.items():
+            results[f"{name1}_vs_{name2}_delta"] = values["cliffs_delta"]
     
     # Write CSV
     header = ["model"] + metrics
@@ -185,6 +248,59 @@ def predict_baseline_gr_alpha0(T: np.ndarray, n: np.ndarray, v0: float) -> np.nd
     return v_pred
 
 
+# Baseline predictions keyed by (T, n, v0) content hash, least recently used dropped first
+BASELINE_CACHE_SIZE = 64
+_BASELINE_CACHE: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+
+
+def _input_key(T: np.ndarray, n: np.ndarray, v0: float) -> str:
+    h = hashlib.sha256()
+    for arr in (T, n):
+        arr = np.ascontiguousarray(arr)
+        h.update(f"{arr.dtype.str}{arr.shape}".encode())
+        h.update(arr.tobytes())
+    h.update(repr(float(v0)).encode())
+    return h.hexdigest()
+
+
+def baseline_predictions(T: np.ndarray, n: np.ndarray, v0: float) -> Dict[str, np.ndarray]:
+    """
+    Shock, PDR and GR(α=0) predictions, cached by input hash
+    
+    Args:
+        T, n: Temperature and density
+        v0: Initial velocity
+    
+    Returns:
+        dict: {"Shock": ..., "PDR": ..., "GR_alpha0": ...} (read-only arrays)
+    
+    Note:
+        Repeated calls with identical T, n, v0 (e.g. many SSZ variants of
+        the same object) reuse the cached arrays. At most
+        BASELINE_CACHE_SIZE inputs are kept (LRU).
+    """
+    key = _input_key(T, n, v0)
+    if key in _BASELINE_CACHE:
+        _BASELINE_CACHE.move_to_end(key)
+    else:
+        baselines = {
+            "Shock": predict_baseline_shock(T, n, v0),
+            "PDR": predict_baseline_pdr(T, n, v0),
+            "GR_alpha0": predict_baseline_gr_alpha0(T, n, v0)
+        }
+        for arr in baselines.values():
+            arr.setflags(write=False)
+        _BASELINE_CACHE[key] = baselines
+        while len(_BASELINE_CACHE) > BASELINE_CACHE_SIZE:
+            _BASELINE_CACHE.popitem(last=False)
+    return _BASELINE_CACHE[key]
+
+
+def clear_baseline_cache() -> None:
+    """Drop all cached baseline predictions"""
+    _BASELINE_CACHE.clear()
+
+
 def run_full_comparison(
     T: np.ndarray,
     n: np.ndarray,
@@ -193,7 +309,8 @@ def run_full_comparison(
     v_ssz: np.ndarray,
     metrics: List[str] = None,
     out_csv: str = "reports/compare/model_scores.csv",
-    manifest_path: str = None
+    manifest_path: str = None,
+    param_counts: Dict[str, int] = None
 ) -> Dict:
     """
     Run full model comparison: SSZ vs. Shock vs. PDR vs. GR(α=0)
@@ -206,6 +323,7 @@ def run_full_comparison(
         metrics: Metrics to compute
         out_csv: Output CSV path
         manifest_path: Optional manifest path
+        param_counts: Optional {model_name: k} for AIC/BIC
     
     Returns:
         dict: Comparison results
@@ -217,13 +335,9 @@ def run_full_comparison(
             metrics=["rmse", "aic", "bic"]
         )
     """
-    # Generate baseline predictions
+    # Generate baseline predictions (cached per input)
     # TODO: Replace with actual physics
-    models = {
-        "SSZ": v_ssz,
-        "Shock": predict_baseline_shock(T, n, v0),
-        "PDR": predict_baseline_pdr(T, n, v0),
-        "GR_alpha0": predict_baseline_gr_alpha0(T, n, v0)
-    }
+    models = {"SSZ": v_ssz}
+    models.update(baseline_predictions(T, n, v0))
     
-    return compare_models(v_obs, models, metrics, out_csv, manifest_path)
+    return compare_models(v_obs, models, metrics, out_csv, manifest_path, param_counts)
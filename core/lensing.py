@@ -3,19 +3,202 @@
 """
 Gravitational Lensing Proxy for SSZ Suite
 
-Compute effective deflection angle from γ-field.
-Provides independent test of SSZ predictions.
+Compute convergence, lensing potential, deflection and shear from the
+γ-field. Provides independent test of SSZ predictions.
 
-TODO: Implement actual lensing calculation
-- Current: Placeholder
-- Needed: Map γ → deflection angle
+- Radial profiles: axisymmetric fast path (cumulative enclosed convergence)
+- 2-D maps: zero-padded FFT convolution with the isolated-lens Green's
+  functions (no periodic images), one output component at a time
 
 © 2025 Carmen Wrede, Lino Casu
 Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
 """
 import numpy as np
-from typing import Dict
-from tools.io_utils import safe_write_csv, register_artifact
+import scipy.fft as sfft
+from typing import Dict, Iterable, Optional
+from tools.io_utils import safe_write_table
+
+
+ARCSEC_PER_RAD = 180.0 / np.pi * 3600.0
+
+# Mean of ln(r) over a unit pixel centred on the origin (ψ kernel at r=0)
+_LOG_R_PIXEL_MEAN = -0.5 * np.log(2.0) - 1.5 + np.pi / 4.0
+
+GRID_FIELDS = ("psi", "alpha1", "alpha2", "gamma1", "gamma2")
+
+
+def gamma_to_kappa(gamma: np.ndarray, kappa_scale: float = 1.0) -> np.ndarray:
+    """
+    Convergence κ from the segment field strength γ
+    
+    Args:
+        gamma: Segment field strength (γ), any shape
+        kappa_scale: Convergence scale parameter
+    
+    Returns:
+        np.ndarray: κ = kappa_scale × γ²
+    """
+    return kappa_scale * np.asarray(gamma, dtype=float) ** 2
+
+
+def radial_lensing(kappa: np.ndarray, radius: np.ndarray) -> Dict:
+    """
+    Lensing quantities of an axisymmetric convergence profile
+    
+    Args:
+        kappa: Convergence κ(R) at increasing radii
+        radius: Radii R > 0 (angle or length; outputs share the unit)
+    
+    Returns:
+        dict:
+            - kappa_mean: Mean convergence inside R, κ̄ = 2/R² ∫ κ R' dR'
+            - alpha: Deflection α = R κ̄ (radial, pointing outward)
+            - gamma_t: Tangential shear γ_t = κ̄ - κ
+            - psi: Lensing potential ψ = ∫ α dR' (ψ → 0 at R → 0)
+    
+    Note:
+        Cumulative trapezoid integration, O(n). κ is taken constant
+        inside the first radius.
+    """
+    kappa = np.asarray(kappa, dtype=float)
+    radius = np.asarray(radius, dtype=float)
+    
+    # m(R) = ∫_0^R κ R' dR'
+    integrand = kappa * radius
+    m = np.empty_like(radius)
+    m[0] = 0.5 * kappa[0] * radius[0] ** 2
+    m[1:] = m[0] + np.cumsum(0.5 * (integrand[1:] + integrand[:-1]) * np.diff(radius))
+    
+    kappa_mean = 2.0 * m / radius ** 2
+    alpha = radius * kappa_mean
+    
+    psi = np.empty_like(radius)
+    psi[0] = 0.5 * kappa[0] * radius[0] ** 2
+    psi[1:] = psi[0] + np.cumsum(0.5 * (alpha[1:] + alpha[:-1]) * np.diff(radius))
+    
+    return {
+        "kappa_mean": kappa_mean,
+        "alpha": alpha,
+        "gamma_t": kappa_mean - kappa,
+        "psi": psi
+    }
+
+
+def _padded_offsets(size: int, pixel_scale: float) -> np.ndarray:
+    """Kernel offsets on a wrapped padded axis (0, 1, ..., -1) in pixel_scale units"""
+    d = np.arange(size)
+    d[d > size // 2] -= size
+    return d * pixel_scale
+
+
+def _green_kernel(field: str, dx: np.ndarray, dy: np.ndarray, pixel_scale: float,
+                  dtype) -> np.ndarray:
+    """Isolated-lens Green's function of a field, times pixel area, on the padded grid"""
+    X = dx[None, :].astype(dtype)
+    Y = dy[:, None].astype(dtype)
+    r2 = X ** 2 + Y ** 2
+    r2[0, 0] = 1.0
+    area = dtype(pixel_scale ** 2 / np.pi)
+    if field == "psi":
+        K = 0.5 * np.log(r2)
+        K[0, 0] = np.log(pixel_scale) + _LOG_R_PIXEL_MEAN
+    elif field == "alpha1":
+        K = X / r2
+    elif field == "alpha2":
+        K = Y / r2
+    elif field == "gamma1":
+        K = (Y ** 2 - X ** 2) / r2 ** 2
+    elif field == "gamma2":
+        K = -2.0 * X * Y / r2 ** 2
+    else:
+        raise ValueError(f"Unknown lensing field: {field}")
+    if field != "psi":
+        K[0, 0] = 0.0  # pixel average vanishes by symmetry
+    K *= area
+    return K
+
+
+def lensing_maps(
+    kappa: np.ndarray,
+    pixel_scale: float = 1.0,
+    fields: Iterable[str] = GRID_FIELDS,
+    pad: int = 2,
+    dtype=np.float64,
+    workers: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Lensing potential, deflection and shear maps of a gridded convergence
+    
+    Args:
+        kappa: Convergence map κ[iy, ix] (x along axis 1)
+        pixel_scale: Pixel size (angle or length; α and ψ share the unit)
+        fields: Subset of "psi", "alpha1", "alpha2", "gamma1", "gamma2"
+        pad: Padding factor (≥ 2 gives the exact isolated-lens solution)
+        dtype: np.float64 or np.float32 (half memory, faster FFTs)
+        workers: FFT worker threads (default: all cores)
+    
+    Returns:
+        dict: {field: map of kappa.shape}
+    
+    Physics:
+        ∇²ψ = 2κ with the isolated Green's functions
+            ψ = (1/π) ∫ κ(x') ln|x - x'| d²x'
+            α = (1/π) ∫ κ(x') (x - x')/|x - x'|² d²x'
+            γ = (1/π) ∫ κ(x') D(x - x') d²x',  D = -1/(x̄)² (complex notation)
+        evaluated as FFT convolutions on a zero-padded grid.
+    
+    Note:
+        κ̂ is computed once; each field then needs one kernel FFT and one
+        inverse FFT, and only one padded spectrum per field is alive at a
+        time, so memory stays at a few padded maps for any field count.
+    """
+    kappa = np.asarray(kappa, dtype=dtype)
+    ny, nx = kappa.shape
+    if pad < 2:
+        raise ValueError("pad must be >= 2 for the isolated-lens solution")
+    workers = -1 if workers is None else workers
+    Py = sfft.next_fast_len(pad * ny, real=True)
+    Px = sfft.next_fast_len(pad * nx, real=True)
+    dy = _padded_offsets(Py, pixel_scale)
+    dx = _padded_offsets(Px, pixel_scale)
+    
+    kappa_hat = sfft.rfft2(kappa, s=(Py, Px), workers=workers)
+    
+    maps = {}
+    for field in fields:
+        K_hat = sfft.rfft2(_green_kernel(field, dx, dy, pixel_scale, dtype), workers=workers)
+        K_hat *= kappa_hat
+        maps[field] = sfft.irfft2(K_hat, s=(Py, Px), workers=workers)[:ny, :nx].copy()
+        del K_hat
+    return maps
+
+
+def compute_lensing_grid(
+    gamma: np.ndarray,
+    pixel_scale: float = 1.0,
+    kappa_scale: float = 1.0,
+    fields: Iterable[str] = GRID_FIELDS,
+    pad: int = 2,
+    dtype=np.float64
+) -> Dict[str, np.ndarray]:
+    """
+    Gridded lensing engine: γ-field map → κ, ψ, α, shear
+    
+    Args:
+        gamma: Segment field strength map γ[iy, ix]
+        pixel_scale: Pixel size (angle or length)
+        kappa_scale: Convergence scale parameter
+        fields: Output fields (see lensing_maps)
+        pad: Padding factor
+        dtype: Working precision
+    
+    Returns:
+        dict: {"kappa": κ, field: map, ...}
+    """
+    kappa = gamma_to_kappa(gamma, kappa_scale).astype(dtype, copy=False)
+    maps = {"kappa": kappa}
+    maps.update(lensing_maps(kappa, pixel_scale, fields=fields, pad=pad, dtype=dtype))
+    return maps
 
 
 def compute_deflection_angle(
@@ -23,89 +206,86 @@ def compute_deflection_angle(
     radius: np.ndarray,
     kappa_scale: float = 1.0,
     out_csv: str = "reports/lensing/deflection_map.csv",
-    manifest_path: str = None
+    manifest_path: str = None,
+    distance_pc: float = None
 ) -> Dict:
     """
     Compute effective gravitational deflection angle from γ-field
     
     Args:
-        gamma: Segment field strength (γ)
+        gamma: Segment field strength (γ) at increasing radii
         radius: Radial positions [pc]
         kappa_scale: Convergence scale parameter
         out_csv: Output CSV path
         manifest_path: Optional manifest path
+        distance_pc: Lens distance [pc] for the angular deflection
     
     Returns:
         dict: Lensing predictions
             - kappa: Convergence κ
-            - alpha: Deflection angle [arcsec]
-    
-    TODO - IMPLEMENT:
-        1. Map γ → effective mass density
-        2. Compute convergence κ = Σ / Σ_crit
-        3. Calculate deflection angle:
-           α = (4GM/c²) × (b/r)
-           where b = impact parameter
-        4. Account for segment field contribution
+            - kappa_mean: Mean convergence inside R
+            - alpha_pc: Deflection R κ̄ in the lens plane [pc]
+            - alpha_arcsec: Deflection angle [arcsec] (NaN without distance_pc)
     
     Physics:
         - γ-field acts as effective gravitational potential
-        - κ > 0 everywhere (positive mass)
+        - κ = kappa_scale × γ² > 0 everywhere (positive mass)
+        - Axisymmetric profile: α(R) = R κ̄(R), angle α / D_lens
         - Observable via weak lensing
-    
-    Note:
-        STUB - returns dummy deflection!
     """
-    n_points = len(gamma)
-    
-    # TODO: REPLACE THIS PLACEHOLDER!
-    # Map γ → lensing observables
-    
-    # Dummy convergence (placeholder formula)
-    kappa = kappa_scale * gamma ** 2
-    
-    # Dummy deflection angle (placeholder)
-    # Typical scale: ~0.1 arcsec for galaxy-scale lensing
-    alpha_arcsec = 0.1 * kappa / (1 + (radius / 0.5) ** 2)
-    
-    # Write CSV
-    header = ["radius_pc", "gamma", "kappa", "alpha_arcsec"]
-    rows = []
-    for i in range(n_points):
-        rows.append([radius[i], gamma[i], kappa[i], alpha_arcsec[i]])
+    radius = np.asarray(radius, dtype=float)
+    kappa = gamma_to_kappa(gamma, kappa_scale)
+    radial = radial_lensing(kappa, radius)
     
-    safe_write_csv(out_csv, header, rows)
+    alpha_pc = radial["alpha"]
+    if distance_pc:
+        alpha_arcsec = alpha_pc / distance_pc * ARCSEC_PER_RAD
+    else:
+        alpha_arcsec = np.full_like(alpha_pc, np.nan)
     
-    # Register in manifest
-    if manifest_path:
-        register_artifact(manifest_path, "lensing_map", out_csv, format="csv")
+    # Write table (format from suffix) and register in manifest
+    safe_write_table(out_csv, {
+        "radius_pc": radius,
+        "gamma": np.asarray(gamma, dtype=float),
+        "kappa": kappa,
+        "alpha_arcsec": alpha_arcsec
+    }, manifest_path=manifest_path, role="lensing_map")
     
     return {
         "kappa": kappa,
+        "kappa_mean": radial["kappa_mean"],
+        "alpha_pc": alpha_pc,
         "alpha_arcsec": alpha_arcsec
     }
 
 
 def compute_shear(
     gamma: np.ndarray,
-    radius: np.ndarray
+    radius: np.ndarray,
+    kappa_scale: float = 1.0
 ) -> Dict:
     """
     Compute shear components from γ-field
     
     Args:
-        gamma: Segment field strength (γ)
+        gamma: Segment field strength (γ) at increasing radii
         radius: Radial positions [pc]
+        kappa_scale: Convergence scale parameter
     
     Returns:
-        dict: Shear components {gamma1, gamma2}
+        dict: Shear components {gamma1, gamma2, gamma_t} along the +x axis
     
-    TODO - IMPLEMENT:
+    Physics:
         Shear from derivatives of potential:
         γ_1 = (∂²φ/∂x² - ∂²φ/∂y²) / 2
         γ_2 = ∂²φ/(∂x∂y)
-    
-    Note:
-        STUB - not implemented!
+        For an axisymmetric profile γ_t = κ̄ - κ, and on the +x axis
+        γ_1 = -γ_t, γ_2 = 0 (use compute_lensing_grid for 2-D maps).
     """
-    raise NotImplementedError("Shear calculation not implemented")
+    kappa = gamma_to_kappa(gamma, kappa_scale)
+    gamma_t = radial_lensing(kappa, radius)["gamma_t"]
+    return {
+        "gamma1": -gamma_t,
+        "gamma2": np.zeros_like(gamma_t),
+        "gamma_t": gamma_t
+    }
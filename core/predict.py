@@ -5,16 +5,241 @@ Observable Predictions for SSZ Suite
 
 Predict line ratios and radio spectral index from γ-field.
 
-TODO: Implement actual excitation physics
-- Current: Placeholder
-- Needed: Map γ → T_ex → line ratios
+- γ → excitation temperature T_ex = T_ref × γ^(1/β) (q_k ≈ (T_k/T_{k-1})^β)
+- LTE, optically thin line intensities from tabulated partition functions
+  and upper-level populations on a T_ex grid (built once, cached on disk)
+- Free-free spectral index broadcast over a frequency grid
 
 © 2025 Carmen Wrede, Lino Casu
 Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
 """
+import hashlib
+import json
 import numpy as np
-from typing import Dict, List
-from tools.io_utils import safe_write_csv, register_artifact
+from pathlib import Path
+from typing import Dict, List, Tuple
+from tools.io_utils import safe_write_table
+
+
+# Physical constants (SI)
+H_PLANCK = 6.62607015e-34
+K_BOLTZMANN = 1.380649e-23
+C_LIGHT = 2.99792458e8
+H_OVER_K_GHZ = H_PLANCK * 1e9 / K_BOLTZMANN   # K per GHz
+
+# Molecular / atomic data (LAMDA): rotational constants [GHz]
+CO_B_GHZ = 57.6359683
+NH3_B_GHZ = 298.117
+NH3_C_GHZ = 186.726
+NH3_INVERSION_GHZ = 23.7   # typical inversion splitting, for levels without a listed line
+
+# Transitions: species, ν [GHz], A_ul [s⁻¹], upper level (J, K)
+TRANSITIONS = {
+    "co10":   ("co",  115.2712018, 7.203e-8, (1, 0)),
+    "co21":   ("co",  230.5380000, 6.910e-7, (2, 0)),
+    "co32":   ("co",  345.7959899, 2.497e-6, (3, 0)),
+    "nh3_11": ("nh3", 23.6944955, 1.712e-7, (1, 1)),
+    "nh3_22": ("nh3", 23.7226333, 2.291e-7, (2, 2)),
+    "cii":    ("cii", 1900.5369, 2.29e-6, (1, 0)),
+}
+
+# Ratios reported by predict_line_ratios (numerator, denominator)
+LINE_RATIOS = {
+    "co21_co32": ("co21", "co32"),
+    "nh3_11_nh3_22": ("nh3_11", "nh3_22"),
+    "cii_co21": ("cii", "co21"),
+}
+
+# T_ex grid of the lookup tables [K]
+T_GRID_MIN = 2.73
+T_GRID_MAX = 5000.0
+T_GRID_SIZE = 1024
+
+TABLE_VERSION = 2
+TABLE_CACHE = Path(__file__).resolve().parents[1] / "agent_out" / "cache" / "lte_tables.npz"
+
+
+def _co_levels() -> Tuple[np.ndarray, np.ndarray]:
+    """CO rotational levels J = 0..80: (E/k [K], g)"""
+    J = np.arange(81)
+    return H_OVER_K_GHZ * CO_B_GHZ * J * (J + 1), 2 * J + 1
+
+
+def _nh3_energy(J, K):
+    """para-NH₃ rotational energy E(J,K)/k [K] (symmetric top)"""
+    return H_OVER_K_GHZ * (NH3_B_GHZ * J * (J + 1) + (NH3_C_GHZ - NH3_B_GHZ) * K ** 2)
+
+
+def _nh3_inversion_pair(J, K) -> Tuple[float, float]:
+    """
+    E/k [K] of the lower and upper inversion component of level (J,K)
+
+    The upper component lies hν_inv/k above E(J,K); ν_inv is the listed
+    line frequency where TRANSITIONS has the (J,K) inversion line,
+    NH3_INVERSION_GHZ otherwise.
+    """
+    nu = next((t[1] for t in TRANSITIONS.values() if t[0] == "nh3" and t[3] == (J, K)),
+              NH3_INVERSION_GHZ)
+    E = _nh3_energy(J, K)
+    return E, E + H_OVER_K_GHZ * nu
+
+
+def _nh3_levels() -> Tuple[np.ndarray, np.ndarray]:
+    """para-NH₃ levels (K ≠ 3n, J ≤ 20), both inversion components: (E/k [K], g)"""
+    E, g = [], []
+    for J in range(1, 21):
+        for K in range(1, J + 1):
+            if K % 3:
+                E.extend(_nh3_inversion_pair(J, K))
+                g.extend([2 * (2 * J + 1)] * 2)
+    return np.array(E), np.array(g)
+
+
+def _cii_levels() -> Tuple[np.ndarray, np.ndarray]:
+    """C⁺ fine-structure levels ²P₁/₂, ²P₃/₂: (E/k [K], g)"""
+    return np.array([0.0, H_OVER_K_GHZ * TRANSITIONS["cii"][1]]), np.array([2, 4])
+
+
+SPECIES_LEVELS = {"co": _co_levels, "nh3": _nh3_levels, "cii": _cii_levels}
+
+
+def _upper_level(line: str) -> Tuple[float, float]:
+    """(E_u/k [K], g_u) of a transition"""
+    species, nu, _, (J, K) = TRANSITIONS[line]
+    if species == "co":
+        return H_OVER_K_GHZ * CO_B_GHZ * J * (J + 1), 2 * J + 1
+    if species == "nh3":
+        # upper inversion component, same level energies as _nh3_levels
+        return _nh3_inversion_pair(J, K)[1], 2 * (2 * J + 1)
+    return H_OVER_K_GHZ * nu, 4
+
+
+def _table_key() -> str:
+    data = [TABLE_VERSION, T_GRID_MIN, T_GRID_MAX, T_GRID_SIZE, CO_B_GHZ, NH3_B_GHZ, NH3_C_GHZ,
+            sorted((k, list(v[:3]), list(v[3])) for k, v in TRANSITIONS.items())]
+    return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+
+def build_lte_tables() -> Dict[str, np.ndarray]:
+    """
+    Partition functions and upper-level populations on the T_ex grid
+
+    Returns:
+        dict:
+            - log_T: ln T_ex grid
+            - species, log_Q: species names and ln Q(T) per species
+            - lines, log_f_u: transition names and ln(n_u/n) per transition
+    """
+    T = np.geomspace(T_GRID_MIN, T_GRID_MAX, T_GRID_SIZE)
+    species = sorted(SPECIES_LEVELS)
+    log_Q = np.empty((len(species), T.size))
+    for i, name in enumerate(species):
+        E, g = SPECIES_LEVELS[name]()
+        log_Q[i] = np.log(np.sum(g[:, None] * np.exp(-E[:, None] / T[None, :]), axis=0))
+
+    lines = sorted(TRANSITIONS)
+    log_f_u = np.empty((len(lines), T.size))
+    for i, line in enumerate(lines):
+        E_u, g_u = _upper_level(line)
+        log_f_u[i] = np.log(g_u) - E_u / T - log_Q[species.index(TRANSITIONS[line][0])]
+
+    return {"log_T": np.log(T), "species": np.array(species), "log_Q": log_Q,
+            "lines": np.array(lines), "log_f_u": log_f_u}
+
+
+_TABLES: Dict[str, np.ndarray] = {}
+
+
+def get_lte_tables(cache_path: Path = TABLE_CACHE) -> Dict[str, np.ndarray]:
+    """
+    LTE lookup tables, built once per molecular data set
+
+    Tables are kept in memory and on disk (cache_path, keyed by a hash of
+    the molecular data and grid); a stale or unreadable file is rebuilt.
+    """
+    key = _table_key()
+    if _TABLES.get("key") == key:
+        return _TABLES
+    tables = None
+    if cache_path is not None and Path(cache_path).exists():
+        try:
+            with np.load(cache_path, allow_pickle=False) as f:
+                if str(f["key"]) == key:
+                    tables = {name: f[name] for name in f.files if name != "key"}
+        except (OSError, ValueError, KeyError):
+            tables = None
+    if tables is None:
+        tables = build_lte_tables()
+        if cache_path is not None:
+            try:
+                Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+                np.savez(cache_path, key=key, **tables)
+            except OSError:
+                pass
+    _TABLES.clear()
+    _TABLES.update(tables)
+    _TABLES["key"] = key
+    return _TABLES
+
+
+def gamma_to_temperature(gamma: np.ndarray, T_ref: float = 20.0, beta: float = 1.0) -> np.ndarray:
+    """
+    Excitation temperature from the segment field strength
+
+    Args:
+        gamma: Segment field strength (γ), any shape
+        T_ref: Temperature at γ = 1 [K]
+        beta: Temperature exponent of q_k ≈ (T_k/T_{k-1})^β
+
+    Returns:
+        np.ndarray: T_ex = T_ref × γ^(1/β) [K]
+    """
+    return T_ref * np.asarray(gamma, dtype=float) ** (1.0 / beta)
+
+
+def line_intensities(
+    T_ex: np.ndarray,
+    lines: List[str],
+    column_density: Dict[str, float] = None
+) -> Dict[str, np.ndarray]:
+    """
+    LTE, optically thin integrated line intensities
+
+    Args:
+        T_ex: Excitation temperature [K], any shape
+        lines: Transition names (keys of TRANSITIONS)
+        column_density: Optional {species: N [cm⁻²]} (default 1e16 each)
+
+    Returns:
+        dict: {line: W [K km/s]} with the shape of T_ex
+
+    Formula:
+        W = h c³ A_ul N f_u(T_ex) / (8π k ν²),  f_u = g_u e^(-E_u/kT) / Q(T)
+
+    Note:
+        ln f_u is interpolated linearly in ln T on the table grid for all
+        transitions at once (one set of interpolation weights, one gather).
+        T_ex outside the grid is clipped to its ends.
+    """
+    column_density = column_density or {}
+    tables = get_lte_tables()
+    table_lines = list(tables["lines"])
+    rows = np.array([table_lines.index(line) for line in lines], dtype=int)
+
+    T_ex = np.asarray(T_ex, dtype=float)
+    log_T = tables["log_T"]
+    x = np.clip(np.log(T_ex.ravel()), log_T[0], log_T[-1])
+    idx = np.clip(np.searchsorted(log_T, x, side="right") - 1, 0, log_T.size - 2)
+    w = (x - log_T[idx]) / (log_T[idx + 1] - log_T[idx])
+    table = tables["log_f_u"][rows]
+    log_f_u = table[:, idx] * (1.0 - w) + table[:, idx + 1] * w   # (lines, points)
+
+    species, nu, A = zip(*[TRANSITIONS[line][:3] for line in lines])
+    N = np.array([column_density.get(s, 1e16) for s in species]) * 1e4   # m⁻²
+    nu = np.array(nu) * 1e9
+    scale = H_PLANCK * C_LIGHT ** 3 * np.array(A) * N / (8 * np.pi * K_BOLTZMANN * nu ** 2) * 1e-3
+    W = scale[:, None] * np.exp(log_f_u)
+    return {line: W[i].reshape(T_ex.shape) for i, line in enumerate(lines)}
 
 
 def predict_line_ratios(
@@ -22,144 +247,140 @@ def predict_line_ratios(
     radius: np.ndarray,
     lines: List[str] = None,
     out_csv: str = "reports/pred/line_ratios.csv",
-    manifest_path: str = None
+    manifest_path: str = None,
+    T_ref: float = 20.0,
+    beta: float = 1.0,
+    column_density: Dict[str, float] = None
 ) -> Dict:
     """
     Predict molecular line intensity ratios from γ-field
-    
+
     Args:
-        gamma: Segment field strength (γ)
-        radius: Radial positions [pc]
+        gamma: Segment field strength (γ); any shape, e.g. (objects, shells)
+        radius: Radial positions [pc] (same shape as gamma)
         lines: List of line transitions
-            Options: "co21", "co32", "nh3_11", "nh3_22", "cii"
+            Options: "co10", "co21", "co32", "nh3_11", "nh3_22", "cii"
         out_csv: Output CSV path
         manifest_path: Optional manifest path
-    
+        T_ref: Excitation temperature at γ = 1 [K]
+        beta: Temperature exponent (T_ex = T_ref × γ^(1/β))
+        column_density: Optional {species: N [cm⁻²]} for cross-species ratios
+
     Returns:
         dict: Line ratio predictions
-            {line_pair: ratio_array}
-    
-    TODO - IMPLEMENT:
-        1. Map γ → excitation temperature T_ex
-        2. For each molecular transition:
-           - Compute level populations (LTE or non-LTE)
-           - Calculate line intensities
-        3. Compute ratios:
-           - CO(2-1)/CO(3-2)
-           - NH₃(1,1)/NH₃(2,2)
-           - [CII]/CO ratios
-    
+            {line_pair: ratio_array} for every pair of LINE_RATIOS whose
+            lines are both requested ([CII]/CO is always computed)
+
     Physics:
         - γ affects local kinetic temperature
-        - Temperature affects excitation
-        - Excitation determines line ratios
-    
-    Note:
-        STUB - returns dummy ratios!
+        - Temperature sets the LTE level populations
+        - Populations determine the (optically thin) line ratios
     """
     if lines is None:
         lines = ["co21", "co32", "nh3_11", "nh3_22"]
-    
-    n_points = len(gamma)
-    
-    # TODO: REPLACE THIS PLACEHOLDER!
-    # Map γ → line ratios using real excitation physics
-    
-    # Dummy line intensities
-    intensities = {
-        "co21": 1.0 / gamma,  # PLACEHOLDER: I ∝ 1/γ
-        "co32": 0.5 / gamma,
-        "nh3_11": 0.8 / gamma,
-        "nh3_22": 0.4 / gamma,
-        "cii": 2.0 / gamma
-    }
-    
+
+    gamma = np.asarray(gamma, dtype=float)
+    radius = np.broadcast_to(np.asarray(radius, dtype=float), gamma.shape)
+    T_ex = gamma_to_temperature(gamma, T_ref, beta)
+
+    pairs = {name: pair for name, pair in LINE_RATIOS.items()
+             if name == "cii_co21" or (pair[0] in lines and pair[1] in lines)}
+    needed = sorted({line for pair in pairs.values() for line in pair})
+    intensities = line_intensities(T_ex, needed, column_density)
+
     # Compute ratios
-    ratios = {
-        "co21_co32": intensities["co21"] / intensities["co32"],
-        "nh3_11_nh3_22": intensities["nh3_11"] / intensities["nh3_22"],
-        "cii_co21": intensities["cii"] / intensities["co21"]
-    }
-    
-    # Write CSV
-    header = ["radius_pc", "gamma"] + list(ratios.keys())
-    rows = []
-    for i in range(n_points):
-        row = [radius[i], gamma[i]] + [ratios[key][i] for key in ratios.keys()]
-        rows.append(row)
-    
-    safe_write_csv(out_csv, header, rows)
-    
-    # Register in manifest
-    if manifest_path:
-        register_artifact(manifest_path, "predict_lines", out_csv, format="csv")
-    
+    ratios = {name: intensities[num] / intensities[den] for name, (num, den) in pairs.items()}
+
+    # Write table (format from suffix) and register in manifest
+    columns = {"radius_pc": radius, "gamma": gamma, "T_ex_K": T_ex}
+    columns.update(ratios)
+    safe_write_table(out_csv, columns, manifest_path=manifest_path, role="predict_lines")
+
     return ratios
 
 
+def free_free_optical_depth(T_e: np.ndarray, frequency_ghz: np.ndarray,
+                            emission_measure: float) -> np.ndarray:
+    """
+    Free-free optical depth (Mezger & Henderson 1967 approximation)
+
+    Formula:
+        τ_ν = 3.28e-7 (T_e / 10⁴ K)^-1.35 (ν / GHz)^-2.1 (EM / pc cm⁻⁶)
+    """
+    return 3.28e-7 * (T_e / 1e4) ** -1.35 * frequency_ghz ** -2.1 * emission_measure
+
+
 def predict_radio_spectral_index(
     gamma: np.ndarray,
     frequency: np.ndarray = None,
     out_csv: str = "reports/pred/radio_slope.csv",
-    manifest_path: str = None
+    manifest_path: str = None,
+    T_e_ref: float = 8000.0,
+    beta: float = 1.0,
+    emission_measure: float = 1e6,
+    solid_angle_sr: float = 8.46e-8
 ) -> Dict:
     """
     Predict radio spectral index α_r from γ-field
-    
+
     Args:
-        gamma: Segment field strength (γ)
+        gamma: Segment field strength (γ), any shape
         frequency: Frequency grid [GHz] (optional)
         out_csv: Output CSV path
         manifest_path: Optional manifest path
-    
+        T_e_ref: Electron temperature at γ = 1 [K]
+        beta: Temperature exponent (T_e = T_e_ref × γ^(1/β))
+        emission_measure: EM [pc cm⁻⁶]
+        solid_angle_sr: Source solid angle [sr] (default 1 arcmin²)
+
     Returns:
         dict: Radio predictions
-            - alpha_r: Spectral index (S_ν ∝ ν^α_r)
-            - flux_density: Predicted flux at each frequency
-    
-    TODO - IMPLEMENT:
-        1. Map γ → electron temperature T_e
-        2. Compute emission measure EM
-        3. Calculate free-free emission:
-           S_ν ∝ ν^α_r with α_r = f(T_e, EM)
-        4. Account for synchrotron contribution if needed
-    
+            - frequency: Frequency grid [GHz]
+            - T_e: Electron temperature [K] (shape of gamma)
+            - alpha_r: Local spectral index d ln S / d ln ν, shape (..., n_freq)
+            - flux_density: S_ν [mJy], shape (..., n_freq)
+            - flux_1.4GHz: S_ν at 1.4 GHz [mJy] (shape of gamma)
+
     Physics:
-        - γ-field affects plasma conditions
-        - T_e determines spectral index
-        - α_r ≈ -0.1 (thermal) to -0.7 (non-thermal)
-    
+        - γ-field affects plasma conditions (T_e)
+        - Free-free emission S_ν ∝ ν² T_e (1 - e^-τ_ν) (Rayleigh-Jeans)
+        - α_r = 2 - 2.1 τ e^-τ / (1 - e^-τ): 2 (thick) → -0.1 (thin)
+
     Note:
-        STUB - returns dummy spectral index!
+        All quantities are evaluated by broadcasting γ (...) against the
+        frequency grid (n_freq) in one pass.
     """
     if frequency is None:
         frequency = np.array([1.4, 5.0, 10.0])  # GHz
-    
-    n_points = len(gamma)
-    
-    # TODO: REPLACE THIS PLACEHOLDER!
-    # Map γ → α_r using real plasma physics
-    
-    # Dummy spectral index
-    alpha_r = -0.1 - 0.2 * (1 - gamma)  # PLACEHOLDER: α_r ∈ [-0.3, -0.1]
-    
-    # Dummy flux density
-    flux_1p4GHz = 100.0 * gamma  # mJy at 1.4 GHz
-    
-    # Write CSV
-    header = ["gamma", "alpha_r", "flux_1.4GHz_mJy"]
-    rows = []
-    for i in range(n_points):
-        rows.append([gamma[i], alpha_r[i], flux_1p4GHz[i]])
-    
-    safe_write_csv(out_csv, header, rows)
-    
-    # Register in manifest
-    if manifest_path:
-        register_artifact(manifest_path, "radio_slope", out_csv, format="csv")
-    
+
+    gamma = np.asarray(gamma, dtype=float)
+    frequency = np.asarray(frequency, dtype=float)
+    T_e = gamma_to_temperature(gamma, T_e_ref, beta)
+
+    def spectrum(nu_ghz):
+        tau = free_free_optical_depth(T_e[..., None], nu_ghz, emission_measure)
+        opacity = -np.expm1(-tau)
+        T_b = T_e[..., None] * opacity
+        S_mJy = 2 * K_BOLTZMANN * (nu_ghz * 1e9) ** 2 * T_b / C_LIGHT ** 2 * solid_angle_sr * 1e29
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alpha = 2.0 - 2.1 * tau * np.exp(-tau) / opacity
+        return S_mJy, alpha
+
+    flux_density, alpha_r = spectrum(frequency)
+    flux_1p4GHz = spectrum(np.array([1.4]))[0][..., 0]
+
+    # Write table (format from suffix) and register in manifest
+    columns = {"gamma": gamma, "T_e_K": T_e}
+    for i, nu in enumerate(frequency):
+        columns[f"alpha_r_{nu:g}GHz"] = alpha_r[..., i]
+        columns[f"flux_{nu:g}GHz_mJy"] = flux_density[..., i]
+    safe_write_table(out_csv, columns, manifest_path=manifest_path, role="radio_slope")
+
     return {
+        "frequency": frequency,
+        "T_e": T_e,
         "alpha_r": alpha_r,
+        "flux_density": flux_density,
         "flux_1.4GHz": flux_1p4GHz
     }
 
@@ -172,36 +393,33 @@ def predict_frequency_shift(
 ) -> np.ndarray:
     """
     Predict frequency shift ν_out(γ)
-    
+
     Args:
         gamma: Segment field strength (γ)
         nu_in: Input frequency [Hz]
         out_csv: Output CSV path
         manifest_path: Optional manifest path
-    
+
     Returns:
         np.ndarray: Output frequencies ν_out [Hz]
-    
+
     Formula:
         ν_out = ν_in × γ^(-1/2)
-    
+
     Physics:
         - Photons redshift in segment field
         - Explains radio-molecular overlap
     """
+    gamma = np.asarray(gamma, dtype=float)
     nu_out = nu_in * gamma ** (-0.5)
-    
-    # Write CSV
-    header = ["gamma", "nu_in_Hz", "nu_out_Hz", "redshift_z"]
-    rows = []
-    for i in range(len(gamma)):
-        z = (nu_in - nu_out[i]) / nu_out[i]
-        rows.append([gamma[i], nu_in, nu_out[i], z])
-    
-    safe_write_csv(out_csv, header, rows)
-    
-    # Register in manifest
-    if manifest_path:
-        register_artifact(manifest_path, "freq_shift", out_csv, format="csv")
-    
+    z = (nu_in - nu_out) / nu_out
+
+    # Write table (format from suffix) and register in manifest
+    safe_write_table(out_csv, {
+        "gamma": gamma,
+        "nu_in_Hz": np.full(gamma.size, float(nu_in)),
+        "nu_out_Hz": nu_out,
+        "redshift_z": z
+    }, manifest_path=manifest_path, role="freq_shift")
+
     return nu_out
@@ -3,18 +3,40 @@
 """
 Stability Criteria for SSZ Suite
 
-Check stability of ring chain: velocity gradients, curvature, entropy proxy.
+Check stability of ring chains and 3-D fields: velocity gradients,
+curvature, entropy proxy and SSZ-modified Jeans scales.
 
-TODO: Implement actual stability analysis
-- Current: Placeholder
-- Needed: Compute derivatives and entropy from SSZ model
+- Ring chain (1-D): derivatives along r, stable runs as zones
+- 3-D fields: processed in slabs along axis 0 (2-cell halo, results equal
+  to the in-memory computation); inputs may be memory-mapped .npy files
+  and derived fields are written to .npy memmaps when out_dir is given
+- Stable zones: connected components (face connectivity), merged across
+  slabs, with per-zone summary statistics
 
 © 2025 Carmen Wrede, Lino Casu
 Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
 """
 import numpy as np
-from typing import Dict
-from tools.io_utils import safe_write_csv, register_artifact
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+from tools.io_utils import safe_write_table
+
+
+# Physical constants (SI) and unit conversions
+K_B = 1.380649e-23          # J/K
+G_NEWTON = 6.67430e-11      # m³/(kg·s²)
+M_H = 1.6735575e-27         # kg
+PC_M = 3.0856775814913673e16
+M_SUN_KG = 1.98847e30
+MU_MOLECULAR = 2.33         # mean molecular weight (H2 + He)
+
+# Cells per slab for the 3-D engine (float64 -> 32 MB per derived slab)
+CHUNK_CELLS = 1 << 22
+HALO = 2  # gradient of gradient needs two neighbour planes
+
+ZONE_COLUMNS = ("zone", "n_cells", "volume", "centroid_0", "centroid_1", "centroid_2",
+                "v_mean", "v_min", "v_max", "grad_v_mean", "gamma_mean",
+                "entropy_mean", "jeans_length_min", "mass_msun")
 
 
 def compute_stability_criteria(
@@ -22,112 +44,437 @@ def compute_stability_criteria(
     gamma: np.ndarray,
     radius: np.ndarray,
     out_csv: str = "reports/stability/criteria.csv",
-    manifest_path: str = None
+    manifest_path: str = None,
+    dv_tol: float = 1.0,
+    curvature_tol: float = np.inf,
+    entropy_min: float = 0.1
 ) -> Dict:
     """
     Compute stability criteria for SSZ ring chain
-    
+
     Args:
         v: Velocity array [km/s]
         gamma: Segment field strength (γ)
         radius: Radial positions [pc]
         out_csv: Output CSV path
         manifest_path: Optional manifest path
-    
+        dv_tol: Flat-rotation limit for |∂v/∂r| [km/s/pc]
+        curvature_tol: Curvature limit for |∂²v/∂r²| [km/s/pc²]
+        entropy_min: Minimum entropy proxy S_crit
+
     Returns:
         dict: Stability metrics
             - dv_dr: First derivative ∂v/∂r
             - d2v_dr2: Second derivative ∂²v/∂r²
-            - entropy_proxy: S_proxy ∝ log(γ)
+            - entropy_proxy: S_proxy = log(γ)
             - stable_zones: Boolean mask
-    
-    TODO - IMPLEMENT:
-        1. Compute derivatives:
-           - ∂v/∂r (velocity gradient)
-           - ∂²v/∂r² (curvature)
-        
-        2. Entropy proxy:
-           - S ∝ log(γ) (segment field entropy)
-           - Marks thermodynamically stable zones
-        
-        3. Stability criteria:
-           - Stable if ∂v/∂r ≈ 0 (flat rotation)
-           - Stable if ∂²v/∂r² < threshold (low curvature)
-           - Stable if S > S_crit (high entropy)
-    
+            - zone: Stable zone id per ring (0 = unstable, runs of stable rings)
+
+    Criteria:
+        Stable if |∂v/∂r| < dv_tol (flat rotation),
+        |∂²v/∂r²| < curvature_tol (low curvature) and S > S_crit (high entropy)
+
     Physics:
         - Flat rotation curves = stable configuration
         - High curvature = instability
         - Entropy marks molecular cloud zones
-    
-    Note:
-        STUB - returns dummy criteria!
     """
-    n_points = len(v)
-    
-    # TODO: REPLACE THIS PLACEHOLDER!
-    # Compute actual derivatives using finite differences or analytical SSZ
-    
-    # Dummy first derivative (finite difference)
+    v = np.asarray(v, dtype=float)
+    radius = np.asarray(radius, dtype=float)
+
     dv_dr = np.gradient(v, radius)
-    
-    # Dummy second derivative
     d2v_dr2 = np.gradient(dv_dr, radius)
-    
-    # Entropy proxy (placeholder)
-    entropy_proxy = np.log(gamma)
-    
-    # Stability criterion (placeholder)
-    # Stable if velocity gradient small and entropy high
-    stable_zones = (np.abs(dv_dr) < 1.0) & (entropy_proxy > 0.1)
-    
-    # Write CSV
-    header = ["radius_pc", "v_km_s", "gamma", "dv_dr", "d2v_dr2", "entropy_proxy", "stable"]
-    rows = []
-    for i in range(n_points):
-        rows.append([
-            radius[i], v[i], gamma[i],
-            dv_dr[i], d2v_dr2[i], entropy_proxy[i],
-            int(stable_zones[i])
-        ])
-    
-    safe_write_csv(out_csv, header, rows)
-    
-    # Register in manifest
-    if manifest_path:
-        register_artifact(manifest_path, "stability", out_csv, format="csv")
-    
+    entropy_proxy = entropy_from_gamma(gamma)
+
+    stable_zones = ((np.abs(dv_dr) < dv_tol) & (np.abs(d2v_dr2) < curvature_tol)
+                    & (entropy_proxy > entropy_min))
+    zone = _label_runs(stable_zones)
+
+    # Write table (format from suffix) and register in manifest
+    safe_write_table(out_csv, {
+        "radius_pc": radius,
+        "v_km_s": v,
+        "gamma": gamma,
+        "dv_dr": dv_dr,
+        "d2v_dr2": d2v_dr2,
+        "entropy_proxy": entropy_proxy,
+        "stable": stable_zones.astype(int),
+        "zone": zone
+    }, manifest_path=manifest_path, role="stability")
+
     return {
         "dv_dr": dv_dr,
         "d2v_dr2": d2v_dr2,
         "entropy_proxy": entropy_proxy,
-        "stable_zones": stable_zones
+        "stable_zones": stable_zones,
+        "zone": zone
     }
 
 
+def _label_runs(mask: np.ndarray) -> np.ndarray:
+    """1-D connected components: consecutive True entries share an id (1, 2, ...)"""
+    mask = np.asarray(mask, dtype=bool)
+    starts = mask & ~np.concatenate([[False], mask[:-1]])
+    return np.where(mask, np.cumsum(starts), 0)
+
+
+def entropy_from_gamma(gamma: np.ndarray) -> np.ndarray:
+    """
+    Entropy proxy of the segment field
+
+    Args:
+        gamma: Segment field strength (γ), any shape
+
+    Returns:
+        np.ndarray: S_proxy = log(γ) (γ clipped at 1e-20)
+    """
+    return np.log(np.clip(np.asarray(gamma, dtype=float), 1e-20, None))
+
+
+def compute_jeans_length(
+    T: np.ndarray,
+    n: np.ndarray,
+    gamma: np.ndarray = 1.0,
+    mu: float = MU_MOLECULAR
+) -> np.ndarray:
+    """
+    SSZ-modified Jeans length
+
+    Args:
+        T: Temperature [K], any shape
+        n: Density [cm^-3] (broadcast with T)
+        gamma: Segment field strength (γ), 1 = classical
+        mu: Mean molecular weight
+
+    Returns:
+        np.ndarray: λ_J [pc]
+
+    Formula:
+        λ_J = sqrt(π c_s² / (G ρ)),  c_s² = k_B T_eff / (μ m_H),
+        ρ = μ m_H n,  T_eff = γ·T (time-dilated thermal motion)
+    """
+    T_eff = np.asarray(gamma, dtype=float) * np.asarray(T, dtype=float)
+    rho = mu * M_H * np.asarray(n, dtype=float) * 1e6  # kg/m³
+    cs2 = K_B * T_eff / (mu * M_H)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sqrt(np.pi * cs2 / (G_NEWTON * rho)) / PC_M
+
+
 def compute_jeans_criterion(
     T: np.ndarray,
     n: np.ndarray,
-    gamma: np.ndarray
+    gamma: np.ndarray,
+    mu: float = MU_MOLECULAR
 ) -> np.ndarray:
     """
     Compute modified Jeans criterion in SSZ field
-    
+
     Args:
-        T: Temperature [K]
+        T: Temperature [K], any shape
         n: Density [cm^-3]
         gamma: Segment field strength (γ)
-    
+        mu: Mean molecular weight
+
     Returns:
         np.ndarray: Jeans mass M_J [M_sun]
-    
-    TODO - IMPLEMENT:
-        Modified Jeans mass:
-        M_J = f(γ) × (k_B T / (G μ m_H))^(3/2) × n^(-1/2)
-        
-        where f(γ) accounts for segment field effects
-    
+
+    Formula:
+        M_J = (4π/3) ρ (λ_J/2)³
+            = f(γ) × (π/6) (π k_B T / (G μ m_H))^(3/2) × ρ^(-1/2)
+        with f(γ) = γ^(3/2) from T_eff = γ·T (γ = 1: classical Jeans mass)
+    """
+    lam = compute_jeans_length(T, n, gamma, mu) * PC_M
+    rho = mu * M_H * np.asarray(n, dtype=float) * 1e6
+    return (4.0 * np.pi / 3.0) * rho * (lam / 2.0) ** 3 / M_SUN_KG
+
+
+# =====================================================================
+# 3-D fields
+# =====================================================================
+
+FieldLike = Union[np.ndarray, str, Path]
+
+
+def _open_field(field: Optional[FieldLike]):
+    """Array, memmap or path to a .npy file (opened memory-mapped)"""
+    if field is None or np.isscalar(field):
+        return field
+    if isinstance(field, (str, Path)):
+        return np.load(field, mmap_mode="r")
+    return field
+
+
+def _output(out_dir: Optional[Path], name: str, shape, dtype):
+    """Derived field: .npy memmap in out_dir, or an in-memory array"""
+    if out_dir is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(out_dir / f"{name}.npy", mode="w+", dtype=dtype, shape=shape)
+
+
+def _slab(field, lo: int, hi: int, dtype=float):
+    if field is None or np.isscalar(field):
+        return field
+    return np.asarray(field[lo:hi], dtype=dtype)
+
+
+def grid_from_points(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    values: Dict[str, np.ndarray],
+    bins: Union[int, Sequence[int]] = 64,
+    bounds: Optional[Sequence[Sequence[float]]] = None,
+    chunk_rows: int = 1 << 20
+) -> Dict:
+    """
+    Deposit point values (e.g. the cosmology catalog) onto a 3-D grid
+
+    Args:
+        x, y, z: Point coordinates (e.g. x_kpc, y_kpc, z_kpc)
+        values: {name: per-point values} averaged per cell
+        bins: Cells per axis (int or 3 ints)
+        bounds: ((x0, x1), (y0, y1), (z0, z1)), default: data range
+        chunk_rows: Points per accumulation chunk
+
+    Returns:
+        dict: {name: mean field [ix, iy, iz] (NaN in empty cells),
+               "count": points per cell, "spacing": cell size per axis,
+               "origin": lower grid corner}
+    """
+    coords = [np.asarray(c, dtype=float) for c in (x, y, z)]
+    bins = np.broadcast_to(np.asarray(bins, dtype=np.int64), (3,))
+    if bounds is None:
+        bounds = [(np.nanmin(c), np.nanmax(c)) for c in coords]
+    lo = np.array([b[0] for b in bounds], dtype=float)
+    hi = np.array([b[1] for b in bounds], dtype=float)
+    spacing = np.where(hi > lo, (hi - lo) / bins, 1.0)
+    size = int(np.prod(bins))
+
+    count = np.zeros(size)
+    sums = {name: np.zeros(size) for name in values}
+    for start in range(0, len(coords[0]), chunk_rows):
+        part = slice(start, start + chunk_rows)
+        idx = [np.floor((c[part] - lo[i]) / spacing[i]).astype(np.int64) for i, c in enumerate(coords)]
+        inside = np.ones(len(idx[0]), dtype=bool)
+        for i in range(3):
+            idx[i] = np.where(idx[i] == bins[i], bins[i] - 1, idx[i])  # upper edge inclusive
+            inside &= (idx[i] >= 0) & (idx[i] < bins[i])
+        flat = np.ravel_multi_index([i[inside] for i in idx], tuple(bins))
+        count += np.bincount(flat, minlength=size)
+        for name, vals in values.items():
+            sums[name] += np.bincount(flat, weights=np.asarray(vals, dtype=float)[part][inside],
+                                      minlength=size)
+
+    grid = {"count": count.reshape(tuple(bins)), "spacing": spacing, "origin": lo}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for name in values:
+            grid[name] = (sums[name] / count).reshape(tuple(bins))
+    return grid
+
+
+def compute_stability_field(
+    v: FieldLike,
+    gamma: FieldLike,
+    spacing: Union[float, Sequence[float]] = 1.0,
+    T: Optional[FieldLike] = None,
+    n: Optional[FieldLike] = None,
+    grad_tol: float = 1.0,
+    curvature_tol: float = np.inf,
+    entropy_min: float = 0.1,
+    jeans_cells: float = 4.0,
+    mu: float = MU_MOLECULAR,
+    out_dir: Optional[str] = None,
+    zones_csv: Optional[str] = "reports/stability/zones.csv",
+    manifest_path: str = None,
+    chunk_cells: int = CHUNK_CELLS,
+    dtype=np.float64
+) -> Dict:
+    """
+    Stability analysis of 3-D fields with stable-zone labelling
+
+    Args:
+        v: Velocity field [km/s], shape (n0, n1, n2); array, memmap or .npy path
+        gamma: Segment field strength (γ), same shape (or .npy path)
+        spacing: Cell size per axis [pc] (scalar or 3 values)
+        T: Optional temperature field [K] (with n: Jeans criterion)
+        n: Optional density field [cm^-3]
+        grad_tol: Limit for |∇v| [km/s/pc]
+        curvature_tol: Limit for |∇²v| [km/s/pc²]
+        entropy_min: Minimum entropy proxy S_crit
+        jeans_cells: Stable only if λ_J ≥ jeans_cells × largest cell size
+        mu: Mean molecular weight
+        out_dir: Directory for the derived fields as .npy memmaps
+                 (grad_v, laplacian_v, entropy, jeans_length, labels);
+                 None keeps them in memory
+        zones_csv: Per-zone summary table (None: not written)
+        manifest_path: Optional manifest path
+        chunk_cells: Cells per slab along axis 0
+        dtype: Storage dtype of the derived float fields
+
+    Returns:
+        dict:
+            - grad_v, laplacian_v, entropy_proxy, jeans_length (None without T, n)
+            - labels: Zone id per cell (0 = unstable), int32
+            - n_zones: Number of stable zones
+            - zones: {column: array} per-zone summary (ZONE_COLUMNS)
+
+    Criteria:
+        Stable if |∇v| < grad_tol, |∇²v| < curvature_tol, S = log γ > S_crit
+        and (with T, n) the cell resolves the Jeans length, λ_J ≥ jeans_cells·Δx
+
     Note:
-        STUB - not implemented!
+        Slabs carry a 2-cell halo, so derivatives equal np.gradient on the
+        whole field. Zones are connected through cell faces; labels of
+        touching zones in neighbouring slabs are merged with a connected-
+        components pass over the label graph. Memory stays at a few slabs.
     """
-    raise NotImplementedError("Jeans criterion not implemented")
+    from scipy import ndimage
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    v = _open_field(v)
+    gamma = _open_field(gamma)
+    T = _open_field(T)
+    n = _open_field(n)
+    shape = tuple(v.shape)
+    if len(shape) != 3:
+        raise ValueError(f"3-D field expected, got shape {shape}")
+    spacing = np.broadcast_to(np.asarray(spacing, dtype=float), (3,))
+    with_jeans = T is not None and n is not None
+    out_dir = Path(out_dir) if out_dir is not None else None
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    grad_v = _output(out_dir, "grad_v", shape, dtype)
+    laplacian_v = _output(out_dir, "laplacian_v", shape, dtype)
+    entropy = _output(out_dir, "entropy", shape, dtype)
+    jeans = _output(out_dir, "jeans_length", shape, dtype) if with_jeans else None
+    labels = _output(out_dir, "labels", shape, np.int32)
+
+    plane = shape[1] * shape[2]
+    step = max(1, chunk_cells // max(plane, 1))
+    jeans_min = jeans_cells * spacing.max()
+
+    # ── Pass 1: derived fields, stable mask, provisional labels per slab ──
+    n_labels = 0
+    edges = []
+    prev_last = None
+    for lo in range(0, shape[0], step):
+        hi = min(shape[0], lo + step)
+        a, b = max(0, lo - HALO), min(shape[0], hi + HALO)
+        inner = slice(lo - a, lo - a + hi - lo)
+
+        vs = _slab(v, a, b)
+        grads = np.gradient(vs, *spacing) if min(vs.shape) > 1 else [
+            np.gradient(vs, spacing[i], axis=i) if vs.shape[i] > 1 else np.zeros_like(vs)
+            for i in range(3)]
+        lap = np.zeros_like(vs)
+        for i, g in enumerate(grads):
+            if vs.shape[i] > 1:
+                lap += np.gradient(g, spacing[i], axis=i)
+        g_abs = np.sqrt(sum(g * g for g in grads))[inner]
+        lap = lap[inner]
+        del grads, vs
+
+        s = entropy_from_gamma(_slab(gamma, lo, hi))
+        stable = (g_abs < grad_tol) & (np.abs(lap) < curvature_tol) & (s > entropy_min)
+        grad_v[lo:hi] = g_abs
+        laplacian_v[lo:hi] = lap
+        entropy[lo:hi] = s
+        if with_jeans:
+            lam = compute_jeans_length(_slab(T, lo, hi), _slab(n, lo, hi), np.exp(s), mu)
+            jeans[lo:hi] = lam
+            stable &= lam >= jeans_min
+
+        slab_labels, count = ndimage.label(stable)
+        slab_labels = slab_labels.astype(np.int64)
+        slab_labels[slab_labels > 0] += n_labels
+        if prev_last is not None:
+            # Zones touching across the slab boundary (same cell in both planes)
+            first = slab_labels[0]
+            touch = (prev_last > 0) & (first > 0)
+            edges.append(np.stack([prev_last[touch], first[touch]]))
+        prev_last = slab_labels[-1].copy()
+        labels[lo:hi] = slab_labels
+        n_labels += count
+
+    # ── Merge provisional labels into zones (scan order ids 1..n_zones) ──
+    if edges and n_labels:
+        pairs = np.unique(np.concatenate(edges, axis=1), axis=1)
+        graph = coo_matrix((np.ones(pairs.shape[1]), (pairs[0] - 1, pairs[1] - 1)),
+                           shape=(n_labels, n_labels))
+        n_zones, component = connected_components(graph, directed=False)
+    else:
+        n_zones, component = n_labels, np.arange(n_labels)
+    mapping = np.concatenate([[0], component + 1]).astype(np.int32)
+
+    # ── Pass 2: final labels and per-zone statistics ──
+    size = n_zones + 1
+    acc = {name: np.zeros(size) for name in
+           ("n", "c0", "c1", "c2", "v", "grad", "gamma", "entropy", "mass")}
+    v_min = np.full(size, np.inf)
+    v_max = np.full(size, -np.inf)
+    lam_min = np.full(size, np.inf)
+    cell_volume = float(np.prod(spacing))
+    for lo in range(0, shape[0], step):
+        hi = min(shape[0], lo + step)
+        zone = mapping[np.asarray(labels[lo:hi])]
+        labels[lo:hi] = zone
+        mask = zone > 0
+        if not mask.any():
+            continue
+        ids = zone[mask]
+        idx = np.nonzero(mask)
+        vs = _slab(v, lo, hi)[mask]
+        acc["n"] += np.bincount(ids, minlength=size)
+        for axis in range(3):
+            offset = lo if axis == 0 else 0
+            acc[f"c{axis}"] += np.bincount(ids, weights=(idx[axis] + offset) * spacing[axis], minlength=size)
+        acc["v"] += np.bincount(ids, weights=vs, minlength=size)
+        acc["grad"] += np.bincount(ids, weights=np.asarray(grad_v[lo:hi])[mask], minlength=size)
+        s = np.asarray(entropy[lo:hi])[mask]
+        acc["entropy"] += np.bincount(ids, weights=s, minlength=size)
+        acc["gamma"] += np.bincount(ids, weights=np.exp(s), minlength=size)
+        np.minimum.at(v_min, ids, vs)
+        np.maximum.at(v_max, ids, vs)
+        if with_jeans:
+            np.minimum.at(lam_min, ids, np.asarray(jeans[lo:hi])[mask])
+        if n is not None:
+            rho_msun_pc3 = mu * M_H * np.broadcast_to(_slab(n, lo, hi), zone.shape)[mask] * 1e6 * PC_M ** 3 / M_SUN_KG
+            acc["mass"] += np.bincount(ids, weights=rho_msun_pc3 * cell_volume, minlength=size)
+
+    cells = acc["n"][1:]
+    zones = {
+        "zone": np.arange(1, size),
+        "n_cells": cells.astype(np.int64),
+        "volume": cells * cell_volume,
+        "centroid_0": acc["c0"][1:] / cells,
+        "centroid_1": acc["c1"][1:] / cells,
+        "centroid_2": acc["c2"][1:] / cells,
+        "v_mean": acc["v"][1:] / cells,
+        "v_min": v_min[1:],
+        "v_max": v_max[1:],
+        "grad_v_mean": acc["grad"][1:] / cells,
+        "gamma_mean": acc["gamma"][1:] / cells,
+        "entropy_mean": acc["entropy"][1:] / cells,
+        "jeans_length_min": lam_min[1:] if with_jeans else np.full(n_zones, np.nan),
+        "mass_msun": acc["mass"][1:] if n is not None else np.full(n_zones, np.nan),
+    }
+
+    for arr in (grad_v, laplacian_v, entropy, jeans, labels):
+        if isinstance(arr, np.memmap):
+            arr.flush()
+    if zones_csv:
+        safe_write_table(zones_csv, zones, manifest_path=manifest_path, role="stability_zones",
+                         metadata={"shape": list(shape), "spacing_pc": spacing.tolist(),
+                                   "n_zones": int(n_zones)})
+
+    return {
+        "grad_v": grad_v,
+        "laplacian_v": laplacian_v,
+        "entropy_proxy": entropy,
+        "jeans_length": jeans,
+        "labels": labels,
+        "n_zones": int(n_zones),
+        "zones": zones
+    }
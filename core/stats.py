@@ -8,6 +8,8 @@ Provides:
 - export_ring_metrics_csv: Write metrics to CSV
 - correlation_summary: Compute fit quality statistics
 - residuals: Calculate model-observation differences
+- stream_ring_metrics: Multi-object mode over a directory / Parquet dataset
+  of ring tables, one consolidated metrics table + summary table
 
 © 2025 Carmen Wrede, Lino Casu
 Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
@@ -17,6 +19,8 @@ from pathlib import Path
 import csv
 import numpy as np
 
+from tools.io_utils import TableWriter, write_table
+
 
 def _safe_dir(p: Path):
     """Ensure parent directory exists."""
@@ -130,14 +134,13 @@ def export_ring_metrics_csv(obj_name, metrics, outdir="reports/data"):
     str : Path to created CSV file
     """
     out = Path(outdir) / f"{obj_name}_ring_metrics.csv"
-    header = ["k", "T[K]", "n[cm^-3]", "v[km_s]", "q_k", "gamma", 
-              "log_gamma", "delta_v", "E[arb]"]
-    rows = list(zip(
-        metrics["k"], metrics["T"], metrics["n"], metrics["v"],
-        metrics["q"], metrics["gamma"], metrics["log_gamma"],
-        metrics["dv"], metrics["E"]
-    ))
-    return _write_csv(out, header, rows)
+    columns = {
+        "k": metrics["k"], "T[K]": metrics["T"], "n[cm^-3]": metrics["n"],
+        "v[km_s]": metrics["v"], "q_k": metrics["q"], "gamma": metrics["gamma"],
+        "log_gamma": metrics["log_gamma"], "delta_v": metrics["dv"], "E[arb]": metrics["E"]
+    }
+    write_table(out, columns, format="csv")
+    return str(out)
 
 
 def correlation_summary(obj_name, metrics, v_obs=None, outdir="reports/stats"):
@@ -202,3 +205,428 @@ def residuals(v, v_obs):
     v_obs = np.asarray(v_obs, dtype=float)
     m = min(len(v), len(v_obs))
     return v[:m] - v_obs[:m]
+
+
+# =====================================================================
+# Multi-object mode: streaming ring tables
+# =====================================================================
+
+# Ring table column -> accepted input names (first match wins)
+RING_COLUMNS = {
+    "k": ("k", "ring"),
+    "T": ("T", "T_K", "T[K]"),
+    "n": ("n", "n_cm3", "n[cm^-3]"),
+    "v": ("v", "v_model", "v[km_s]"),
+    "v_obs": ("v_obs",),
+    "q": ("q", "q_k"),
+    "gamma": ("gamma",),
+}
+
+METRICS_COLUMNS = ("object", "k", "T[K]", "n[cm^-3]", "v[km_s]", "q_k",
+                   "gamma", "log_gamma", "delta_v", "E[arb]")
+SUMMARY_COLUMNS = ("object", "n_rings", "r(v,T)", "r(v,n)",
+                   "MAE[km_s]", "RMSE[km_s]", "MaxAbsRes[km_s]")
+POOLED_NAME = "ALL"
+
+
+def compute_ring_metrics_grouped(starts, k, T, n, v, q=None, gamma=None, mass_proxy=1.0):
+    """
+    compute_ring_metrics for many objects at once (group-wise vectorized).
+    
+    Parameters:
+    -----------
+    starts : array
+        Start offset of every object in the concatenated ring arrays
+        (ascending, starts[0] == 0; rows of an object are contiguous)
+    k, T, n, v : array
+        Concatenated ring columns of all objects
+    q, gamma : array, optional
+        Concatenated q / gamma. If None, calculated per object from T.
+    mass_proxy : float
+        Normalization for energy calculation
+        
+    Returns:
+    --------
+    dict with keys: k, T, n, v, q, gamma, log_gamma, dv, E
+    (values as compute_ring_metrics on each object; gamma from the
+    log-space cumulative product agrees to a few ulp, independent of
+    the batch length)
+    """
+    k, T, n, v = (np.asarray(a, dtype=float) for a in (k, T, n, v))
+    starts = np.asarray(starts, dtype=np.int64)
+    size = len(T)
+    first = np.zeros(size, dtype=bool)
+    first[starts[starts < size]] = True
+    last = np.roll(first, -1)
+    if size:
+        last[-1] = True
+
+    # q from temperature ratios within each object
+    if q is None:
+        q = _grouped_ratios(T, first)
+    else:
+        q = np.asarray(q, dtype=float)
+
+    if gamma is None:
+        gamma = _grouped_cumprod(q, starts)
+    else:
+        gamma = np.asarray(gamma, dtype=float)
+
+    # Velocity differences within each object (0 on the last ring)
+    dv = np.zeros_like(v)
+    if size > 1:
+        dv[:-1] = v[1:] - v[:-1]
+    dv[last] = 0.0
+
+    return {
+        "k": k,
+        "T": T,
+        "n": n,
+        "v": v,
+        "q": q,
+        "gamma": gamma,
+        "log_gamma": np.log(np.clip(gamma, 1e-20, None)),
+        "dv": dv,
+        "E": 0.5 * mass_proxy * (v**2),
+    }
+
+
+def _grouped_ratios(T, first):
+    """T[i] / T[i-1] within each group, 1 on the first ring of a group."""
+    q = np.ones_like(T)
+    if len(T) > 1:
+        q[1:] = T[1:] / T[:-1]
+    q[first] = 1.0
+    return q
+
+
+def _grouped_cumprod(q, starts):
+    """Cumulative product restarting at every group start."""
+    if len(q) == 0:
+        return q.copy()
+    if np.all(q > 0):
+        # Segmented cumulative sum of ln q, then back to linear scale. The
+        # running sum is reset at every group start (previous group total
+        # subtracted there), so rounding does not grow with the batch length;
+        # the remaining carry-over (a few ulp per group) is removed per group.
+        log_q = np.log(q)
+        step = log_q.copy()
+        step[starts[1:]] -= np.add.reduceat(log_q, starts)[:-1]
+        csum = np.cumsum(step)
+        carry = np.repeat(csum[starts] - log_q[starts], np.diff(np.append(starts, len(q))))
+        return np.exp(csum - carry)
+    bounds = np.append(starts, len(q))
+    return np.concatenate([np.cumprod(q[a:b]) for a, b in zip(bounds[:-1], bounds[1:])])
+
+
+class CorrelationAccumulator:
+    """
+    Online Pearson correlation for many groups (Welford-style).
+    
+    Keeps count, means and co-moments per group and merges every batch
+    with the pairwise update of Chan et al., so objects or pooled data
+    can be streamed in any number of batches. The result equals
+    _pearson on all values of a group.
+    """
+
+    def __init__(self, groups=0):
+        self.n = np.zeros(groups)
+        self.mean_x = np.zeros(groups)
+        self.mean_y = np.zeros(groups)
+        self.sxx = np.zeros(groups)
+        self.syy = np.zeros(groups)
+        self.sxy = np.zeros(groups)
+
+    def _grow(self, groups):
+        extra = groups - len(self.n)
+        if extra > 0:
+            for name in ("n", "mean_x", "mean_y", "sxx", "syy", "sxy"):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+
+    def update(self, groups, x, y):
+        """Add (x, y) pairs; groups are integer group ids per pair."""
+        groups = np.asarray(groups, dtype=np.int64)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(groups) == 0:
+            return self
+        size = int(groups.max()) + 1
+        self._grow(size)
+
+        nb = np.bincount(groups, minlength=size).astype(float)
+        safe = np.where(nb > 0, nb, 1.0)
+        mbx = np.bincount(groups, weights=x, minlength=size) / safe
+        mby = np.bincount(groups, weights=y, minlength=size) / safe
+        cx = x - mbx[groups]
+        cy = y - mby[groups]
+        self._merge(nb, mbx, mby,
+                    np.bincount(groups, weights=cx * cx, minlength=size),
+                    np.bincount(groups, weights=cy * cy, minlength=size),
+                    np.bincount(groups, weights=cx * cy, minlength=size))
+        return self
+
+    def merge(self, other):
+        """Merge the state of another accumulator (same group ids)."""
+        self._grow(len(other.n))
+        pad = len(self.n) - len(other.n)
+        state = [np.concatenate([a, np.zeros(pad)]) for a in
+                 (other.n, other.mean_x, other.mean_y, other.sxx, other.syy, other.sxy)]
+        self._merge(*state)
+        return self
+
+    def _merge(self, nb, mbx, mby, sbxx, sbyy, sbxy):
+        size = len(nb)
+        na = self.n[:size]
+        total = na + nb
+        w = np.divide(na * nb, total, out=np.zeros(size), where=total > 0)
+        f = np.divide(nb, total, out=np.zeros(size), where=total > 0)
+        dx = mbx - self.mean_x[:size]
+        dy = mby - self.mean_y[:size]
+        self.sxx[:size] += sbxx + dx * dx * w
+        self.syy[:size] += sbyy + dy * dy * w
+        self.sxy[:size] += sbxy + dx * dy * w
+        self.mean_x[:size] += dx * f
+        self.mean_y[:size] += dy * f
+        self.n[:size] = total
+
+    def correlation(self):
+        """Pearson r per group (nan for < 2 pairs or zero variance)."""
+        denom = np.sqrt(self.sxx) * np.sqrt(self.syy)
+        ok = (self.n >= 2) & (denom > 0)
+        return np.divide(self.sxy, denom, out=np.full(len(self.n), np.nan), where=ok)
+
+
+def _batch_columns(batch):
+    """{RING_COLUMNS key: array} of a record batch (first non-empty input name)."""
+    cols = {}
+    for key, names in RING_COLUMNS.items():
+        for name in names:
+            i = batch.schema.get_field_index(name)
+            if i >= 0 and batch.column(i).null_count < batch.num_rows:
+                cols[key] = batch.column(i).to_numpy(zero_copy_only=False)
+                break
+    return cols
+
+
+def _iter_csv_rings(path, batch_rows):
+    """(object, columns) pieces of one ring CSV (object = file stem)."""
+    import pyarrow.csv as pa_csv
+    wanted = [name for names in RING_COLUMNS.values() for name in names]
+    reader = pa_csv.open_csv(
+        path, read_options=pa_csv.ReadOptions(block_size=max(1 << 16, batch_rows * 64)),
+        convert_options=pa_csv.ConvertOptions(include_columns=wanted, include_missing_columns=True))
+    for batch in reader:
+        yield Path(path).stem, _batch_columns(batch)
+
+
+def _iter_parquet_rings(source, object_column, batch_rows):
+    """(object, columns) pieces of a (hive-partitioned) Parquet dataset."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    dataset = ds.dataset(str(source), format="parquet", partitioning="hive")
+    fragments = sorted(dataset.get_fragments(), key=lambda f: f.path)
+    # Files may differ in optional columns (v, q, gamma): read all against one schema
+    schema = pa.unify_schemas([dataset.schema] + [f.physical_schema for f in fragments])
+    wanted = [name for names in RING_COLUMNS.values() for name in names if name in schema.names]
+    for fragment in fragments:
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        default = str(keys.get(object_column, Path(fragment.path).stem))
+        per_row = object_column not in keys and object_column in fragment.physical_schema.names
+        columns = wanted + [object_column] if per_row else wanted
+        for batch in fragment.to_batches(schema=schema, columns=columns, batch_size=batch_rows):
+            if batch.num_rows == 0:
+                continue
+            cols = _batch_columns(batch)
+            if not per_row:
+                yield default, cols
+                continue
+            # Object names stored per row: split into contiguous runs
+            objects = batch.column(batch.schema.get_field_index(object_column)).to_numpy(zero_copy_only=False)
+            cuts = np.flatnonzero(objects[1:] != objects[:-1]) + 1
+            for lo, hi in zip(np.append(0, cuts), np.append(cuts, len(objects))):
+                yield str(objects[lo]), {key: values[lo:hi] for key, values in cols.items()}
+
+
+def iter_ring_tables(source, object_column="object", batch_rows=65536):
+    """
+    Stream ring tables as (object, {column: array}) pieces.
+    
+    Parameters:
+    -----------
+    source : str or Path
+        Directory of ring CSVs (one object per file, named by file stem),
+        partitioned Parquet dataset (object from the hive partition
+        object=<name>, an object column or the file stem) or a single file
+    object_column : str
+        Partition / column name holding the object name
+    batch_rows : int
+        Rows per read batch
+        
+    Yields:
+    -------
+    (object name, dict with keys of RING_COLUMNS present in the input)
+    """
+    source = Path(source)
+    if source.is_file() and source.suffix.lower() == ".csv":
+        yield from _iter_csv_rings(source, batch_rows)
+    elif source.is_dir() and not any(source.rglob("*.parquet")):
+        for path in sorted(source.glob("*.csv")):
+            yield from _iter_csv_rings(path, batch_rows)
+    else:
+        yield from _iter_parquet_rings(source, object_column, batch_rows)
+
+
+def stream_ring_metrics(source, out="reports/data/ring_metrics.parquet",
+                        summary_out="reports/stats/ring_fit_summary.csv",
+                        mass_proxy=1.0, object_column="object", batch_rows=65536):
+    """
+    Multi-object ring metrics: stream ring tables, compute metrics and
+    correlations group-wise, write one consolidated table.
+    
+    Parameters:
+    -----------
+    source : str or Path
+        Ring tables (see iter_ring_tables). Columns: k/ring, T, n and
+        v and/or v_obs (v defaults to v_obs); q and gamma optional.
+    out : str
+        Consolidated per-ring metrics table (columns METRICS_COLUMNS,
+        format from the suffix: csv, parquet, feather), written batch by batch
+    summary_out : str
+        Per-object summary table (columns SUMMARY_COLUMNS) with a final
+        pooled row named POOLED_NAME
+    mass_proxy : float
+        Normalization for energy calculation
+    object_column : str
+        Partition / column name holding the object name
+    batch_rows : int
+        Rings per processing batch (complete objects only)
+        
+    Returns:
+    --------
+    dict with metrics/summary paths, objects and rings
+    """
+    objects = []                      # object names in stream order
+    corr_vT = CorrelationAccumulator()
+    corr_vn = CorrelationAccumulator()
+    pooled_vT = CorrelationAccumulator(1)
+    pooled_vn = CorrelationAccumulator(1)
+    res_n, res_abs, res_sq, res_max = [], [], [], []
+
+    def process(pieces):
+        names = [name for name, _ in pieces]
+        lengths = np.array([len(cols["T"]) for _, cols in pieces], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        keys = {key for _, c in pieces for key in c}
+        cols = {key: np.concatenate([np.asarray(c[key], dtype=float) if key in c
+                                     else np.full(len(c["T"]), np.nan) for _, c in pieces])
+                for key in keys}
+        # Given q / gamma are used where present, derived values elsewhere
+        q, gamma = cols.get("q"), cols.get("gamma")
+        if q is not None or gamma is not None:
+            first = np.zeros(len(cols["T"]), dtype=bool)
+            first[starts] = True
+            derived = _grouped_ratios(cols["T"], first)
+            q = derived if q is None else np.where(np.isnan(q), derived, q)
+            if gamma is not None:
+                gamma = np.where(np.isnan(gamma), _grouped_cumprod(q, starts), gamma)
+        metrics = compute_ring_metrics_grouped(starts, cols["k"], cols["T"], cols["n"], cols["v"],
+                                               q=q, gamma=gamma, mass_proxy=mass_proxy)
+        first_id = len(objects)
+        objects.extend(names)
+        groups = np.repeat(np.arange(first_id, len(objects)), lengths)
+        corr_vT.update(groups, metrics["v"], metrics["T"])
+        corr_vn.update(groups, metrics["v"], metrics["n"])
+        zeros = np.zeros(len(groups), dtype=np.int64)
+        pooled_vT.update(zeros, metrics["v"], metrics["T"])
+        pooled_vn.update(zeros, metrics["v"], metrics["n"])
+
+        # Residuals v - v_obs per object (rings with an observed velocity)
+        local = groups - first_id
+        size = len(names)
+        v_obs = cols.get("v_obs", np.full(len(groups), np.nan))
+        res = metrics["v"] - v_obs
+        ok = np.isfinite(res)
+        res_n.append(np.bincount(local[ok], minlength=size))
+        res_abs.append(np.bincount(local[ok], weights=np.abs(res[ok]), minlength=size))
+        res_sq.append(np.bincount(local[ok], weights=res[ok]**2, minlength=size))
+        peak = np.full(size, -np.inf)
+        np.maximum.at(peak, local[ok], np.abs(res[ok]))
+        res_max.append(peak)
+
+        writer.write({
+            "object": np.repeat(np.array(names, dtype=object), lengths),
+            "k": metrics["k"], "T[K]": metrics["T"], "n[cm^-3]": metrics["n"],
+            "v[km_s]": metrics["v"], "q_k": metrics["q"], "gamma": metrics["gamma"],
+            "log_gamma": metrics["log_gamma"], "delta_v": metrics["dv"], "E[arb]": metrics["E"],
+        })
+
+    def normalize(name, cols):
+        # Optional columns without any value count as missing (e.g. null in
+        # a unified schema or NaN for objects sharing one table)
+        cols = {key: values for key, values in cols.items()
+                if key in ("k", "T", "n") or not np.all(np.isnan(np.asarray(values, dtype=float)))}
+        if "v" not in cols:
+            if "v_obs" not in cols:
+                raise ValueError(f"Ring table of {name} has no v or v_obs column")
+            cols["v"] = cols["v_obs"]
+        missing = [key for key in ("T", "n") if key not in cols]
+        if missing:
+            raise ValueError(f"Ring table of {name} is missing columns {missing}")
+        if "k" not in cols:
+            cols["k"] = np.arange(len(cols["T"]), dtype=float)
+        return cols
+
+    seen = set()
+    pending, pending_rows = [], 0
+    current, current_parts = None, []
+    with TableWriter(out) as writer:
+        for name, cols in iter_ring_tables(source, object_column, batch_rows):
+            if name != current:
+                if current is not None:
+                    pending.append((current, normalize(current, _join_parts(current_parts))))
+                    pending_rows += len(pending[-1][1]["T"])
+                if name in seen:
+                    raise ValueError(f"Rings of object {name} are not contiguous in {source}")
+                seen.add(name)
+                current, current_parts = name, []
+                if pending_rows >= batch_rows:
+                    process(pending)
+                    pending, pending_rows = [], 0
+            current_parts.append(cols)
+        if current is not None:
+            pending.append((current, normalize(current, _join_parts(current_parts))))
+        if pending:
+            process(pending)
+    metrics_path = str(Path(out).resolve()) if writer.rows else write_table(
+        out, {name: [] for name in METRICS_COLUMNS})
+
+    counts = np.concatenate(res_n) if res_n else np.zeros(0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mae = np.concatenate(res_abs) / counts if res_abs else counts
+        rmse = np.sqrt(np.concatenate(res_sq) / counts) if res_sq else counts
+    maxabs = np.concatenate(res_max) if res_max else counts
+    maxabs = np.where(counts > 0, maxabs, np.nan)
+    total = counts.sum()
+    summary = {
+        "object": objects + [POOLED_NAME],
+        "n_rings": np.append(corr_vT.n, pooled_vT.n).astype(np.int64),
+        "r(v,T)": np.append(corr_vT.correlation(), pooled_vT.correlation()),
+        "r(v,n)": np.append(corr_vn.correlation(), pooled_vn.correlation()),
+        "MAE[km_s]": np.append(mae, np.sum(mae * counts, where=counts > 0) / total if total else np.nan),
+        "RMSE[km_s]": np.append(rmse, np.sqrt(np.sum(rmse**2 * counts, where=counts > 0) / total)
+                                if total else np.nan),
+        "MaxAbsRes[km_s]": np.append(maxabs, np.nanmax(maxabs) if total else np.nan),
+    }
+    summary_path = write_table(summary_out, summary)
+    return {"metrics": metrics_path, "summary": summary_path,
+            "objects": len(objects), "rings": writer.rows}
+
+
+def _join_parts(parts):
+    """Concatenate the streamed pieces of one object."""
+    if len(parts) == 1:
+        return parts[0]
+    keys = dict.fromkeys(key for p in parts for key in p)
+    return {key: np.concatenate([np.asarray(p[key], dtype=float) if key in p
+                                 else np.full(len(p["T"]), np.nan) for p in parts])
+            for key in keys}
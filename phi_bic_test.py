@@ -6,6 +6,7 @@
 #   python phi_bic_test.py --in real_data_full_filled.csv --outdir out --f-emit f_emit_Hz --f-obs f_obs_Hz --tol 0 --jitter 1e-12 --n-rand 20000
 
 import argparse, json, math, os, sys, random
+from functools import lru_cache
 from math import log, sqrt
 import numpy as np
 import pandas as pd
@@ -87,6 +88,63 @@ def safe_binom_two_sided(k, n):
     p_two = 2.0 * tail
     return min(1.0, max(0.0, p_two))
 
+@lru_cache(maxsize=None)
+def binom_p_table(n):
+    """p-Werte von safe_binom_two_sided(k, n) für alle k=0..n (gecacht, read-only)."""
+    if n <= 0:
+        table = np.full(max(n + 1, 1), np.nan)   # wie safe_binom_two_sided: kein Test möglich
+        table.setflags(write=False)
+        return table
+    k = np.arange(n + 1, dtype=float)
+    z = (np.abs(k - 0.5 * n) - 0.5) / sqrt(0.25 * n)
+    t = 1.0 / (1.0 + 0.2316419 * np.abs(z))
+    d = 0.39894228 * np.exp(-z*z/2.0)
+    tail = d * t * (0.31938153 + t*(-0.356563782 + t*(1.781477937 + t*(-1.821255978 + t*1.330274429))))
+    table = np.clip(2.0 * tail, 0.0, 1.0)
+    table.setflags(write=False)
+    return table
+
+def randomized_sign_test(resid, tol, jitter, n_rand, seed=12345, chunk_elems=4_000_000):
+    """
+    Randomisierter Sign-Test, vektorisiert: (n_rand × N) Jitter-Matrix aus einem
+    NumPy-Generator in Blöcken, Vorzeichen-Zählung per Reduktion, p-Werte aus
+    binom_p_table(). Gibt die p-Werte aller Ziehungen mit n_eff > 0 zurück.
+    """
+    base = np.asarray(resid, dtype=float)
+    N = base.size
+    rng = np.random.default_rng(seed)
+    rows = max(1, int(chunk_elems) // max(1, N))
+    pvals = []
+    for start in range(0, n_rand, rows):
+        m = min(rows, n_rand - start)
+        rj = base + rng.uniform(-jitter, jitter, size=(m, N))
+        n_eff = np.count_nonzero(np.abs(rj) > tol, axis=1)
+        k_pos = np.count_nonzero(rj > tol, axis=1)   # rj > 0 und |rj| > tol
+        p = np.full(m, np.nan)
+        for n in np.unique(n_eff[n_eff > 0]):
+            sel = n_eff == n
+            p[sel] = binom_p_table(int(n))[k_pos[sel]]
+        pvals.append(p[n_eff > 0])
+    return np.concatenate(pvals) if pvals else np.empty(0)
+
+def randomized_sign_test_legacy(resid, tol, jitter, n_rand, seed=12345):
+    """Ursprüngliche Schleife mit random.Random (reproduziert alte Ergebnisse exakt)."""
+    N = len(resid)
+    rng = random.Random(seed)
+    pvals = []
+    base = np.array(resid, dtype=float)
+    for _ in range(n_rand):
+        # Uniformes Jitter in Schritten: U(-jitter, +jitter)
+        jit = np.array([rng.uniform(-jitter, jitter) for _ in range(N)], dtype=float)
+        rj = base + jit
+        mask_j = np.abs(rj) > tol
+        n_eff_j = int(np.sum(mask_j))
+        if n_eff_j == 0:
+            continue
+        k_pos_j = int(np.sum(rj[mask_j] > 0))
+        pvals.append(safe_binom_two_sided(k_pos_j, n_eff_j))
+    return np.array(pvals, dtype=float)
+
 # ---------- Main ----------
 
 def main():
@@ -106,6 +164,8 @@ def main():
     # Neu: Randomized Sign-Test
     ap.add_argument("--jitter", type=float, default=0.0, help="Uniformes Jitter |ε|<=jitter auf Residuen (Schritte).")
     ap.add_argument("--n-rand", type=int, default=0, help="Anzahl Monte-Carlo-Samples für randomisierten Sign-Test.")
+    ap.add_argument("--rand-impl", choices=["vectorized", "legacy"], default="vectorized",
+                    help="vectorized: NumPy-Generator + p-Wert-Tabelle; legacy: alte random.Random-Schleife.")
 
     a = ap.parse_args()
 
@@ -169,19 +229,10 @@ def main():
     rand_used = 0
 
     if n_rand > 0 and jitter > 0 and N > 0:
-        rng = random.Random(12345)
-        pvals = []
-        base = resid.copy()
-        for _ in range(n_rand):
-            # Uniformes Jitter in Schritten: U(-jitter, +jitter)
-            jit = np.array([rng.uniform(-jitter, jitter) for _ in range(N)], dtype=float)
-            rj = base + jit
-            mask_j = np.abs(rj) > a.tol
-            n_eff_j = int(np.sum(mask_j))
-            if n_eff_j == 0:
-                continue
-            k_pos_j = int(np.sum(rj[mask_j] > 0))
-            pvals.append(safe_binom_two_sided(k_pos_j, n_eff_j))
+        if a.rand_impl == "legacy":
+            pvals = randomized_sign_test_legacy(resid.values, a.tol, jitter, n_rand)
+        else:
+            pvals = randomized_sign_test(resid.values, a.tol, jitter, n_rand)
         if len(pvals) > 0:
             rand_used = len(pvals)
             p_two_rand_med = float(np.median(pvals))
@@ -224,6 +275,7 @@ def main():
             "enabled": (n_rand > 0 and jitter > 0),
             "jitter": jitter,
             "n_rand": n_rand,
+            "impl": a.rand_impl,
             "samples_used": rand_used,
             "p_two_median": p_two_rand_med,
             "p_two_95ci": [p_two_rand_lo, p_two_rand_hi]
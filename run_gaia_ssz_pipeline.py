@@ -29,6 +29,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--prefer-parquet", default="true", help="true/false preference for Parquet primary outputs")
     parser.add_argument("--gaia-base", type=Path, help="Dataset base path (without extension) for GAIA raw data")
     parser.add_argument("--sdss-base", type=Path, help="Dataset base path (without extension) for SDSS raw data")
+    parser.add_argument(
+        "--frame-method",
+        choices=["astropy", "fast"],
+        default="astropy",
+        help="Frame transform: astropy reference or precomputed-matrix fast path",
+    )
     return parser.parse_args()
 
 
@@ -88,7 +94,11 @@ def gather_files(paths: List[Optional[Path]]) -> List[Dict[str, str]]:
     for path in paths:
         if path is None:
             continue
-        if path.exists():
+        if path.is_dir():
+            # dataset directory (e.g. streamed gaia_clean.parquet): one entry per part file
+            for part in sorted(p for p in path.rglob("*") if p.is_file()):
+                files.append({"path": str(part), "sha256": sha256(part)})
+        elif path.exists():
             files.append({"path": str(path), "sha256": sha256(path)})
     return files
 
@@ -318,6 +328,8 @@ def main() -> None:
             str(args.data_root / "interim" / "gaia"),
             "--frame-config",
             str(args.cfg_frame),
+            "--method",
+            args.frame_method,
         ],
         "Frame transform",
     )
@@ -59,12 +59,15 @@ def _load_first_existing(paths):
             return pp
     return None
 
-def _read_any_table(pp):
+def _read_any_table(pp, columns=None):
     """
-    Liest CSV oder JSON und gibt dict(key->list) zurück.
+    Liest CSV, JSON, Parquet oder NPZ und gibt dict(key->list) zurück.
+    columns: optionale Kandidatenliste; bei Parquet/NPZ werden nur die
+    vorhandenen davon gelesen (spaltenweise, ohne die übrigen zu parsen).
     """
     import pandas as pd
-    if str(pp).lower().endswith(".json"):
+    low = str(pp).lower()
+    if low.endswith(".json"):
         data = json.loads(pp.read_text(encoding="utf-8"))
         if isinstance(data, dict):
             return {k: (v if isinstance(v, list) else v) for k, v in data.items()}
@@ -74,9 +77,27 @@ def _read_any_table(pp):
             df = pd.DataFrame(data)
             return {k: df[k].tolist() for k in df.columns}
         return {"_raw": data}
-    df = pd.read_csv(pp)
+    if low.endswith(".parquet") or low.endswith(".pq"):
+        import pyarrow.parquet as pq
+        names = pq.read_schema(pp).names
+        use = [c for c in names if columns is None or c in columns]
+        table = pq.read_table(pp, columns=use)
+        return {k: table.column(k).to_numpy() for k in use}
+    if low.endswith(".npz"):
+        import numpy as np
+        with np.load(pp) as npz:
+            return {k: npz[k] for k in npz.files if columns is None or k in columns}
+    df = pd.read_csv(pp, usecols=(lambda c: c in columns) if columns is not None else None)
     return {k: df[k].tolist() for k in df.columns}
 
+# Kandidaten-Spaltennamen je Proxy (Reihenfolge = Priorität)
+R_COLS = ["r_over_rs","r/rs","radius_rs","r_rs","r"]
+PROXY_COLS = {
+    "N": [["N","N_seg","segment_density","segN"]],
+    "rho-pr": [["rho_kg_m3","rho","rho_si"], ["pr_pa","p_r","p_r_pa","pr"]],
+    "gtt": [["g_tt","gtt","gtt_neg"]],
+}
+
 def _pick(d, candidates, default=None):
     for k in candidates:
         if k in d:
@@ -107,7 +128,8 @@ def main():
     ])
     ap.add_argument("--src-rhopr", nargs="*", default=[
         "reports/energy_conditions.csv","agent_out/reports/energy_conditions.csv",
-        "reports/stress_energy.csv","agent_out/reports/stress_energy.csv"
+        "reports/stress_energy.csv","agent_out/reports/stress_energy.csv",
+        "reports/stress_energy.parquet","agent_out/reports/stress_energy.parquet"
     ])
     ap.add_argument("--src-gtt", nargs="*", default=[
         "reports/metric_profile.csv","agent_out/reports/metric_profile.csv",
@@ -142,10 +164,11 @@ def main():
         print("[SSZ][addon] Quelle fehlt → reports/segment_redshift.md")
         return
 
-    data = _read_any_table(src)
+    wanted = R_COLS + [c for group in PROXY_COLS[args.proxy] for c in group]
+    data = _read_any_table(src, columns=wanted)
 
     # Spalten finden
-    r = _pick(data, ["r_over_rs","r/rs","radius_rs","r_rs","r"])
+    r = _pick(data, R_COLS)
     if r is None:
         out_md.write_text(
             f"# Segment Redshift\nFehlende Radius-Spalte in {src.name}.\n"
@@ -158,7 +181,7 @@ def main():
     # Phi bestimmen
     phi = None
     if args.proxy == "N":
-        N = _pick(data, ["N","N_seg","segment_density","segN"])
+        N = _pick(data, PROXY_COLS["N"][0])
         if N is None:
             out_md.write_text("# Segment Redshift\nFehlende N-Spalte (proxy=N).\n", encoding="utf-8")
             print("[SSZ][addon] N fehlt → report.")
@@ -167,8 +190,8 @@ def main():
         phi = phi_from_N(r_s, N_s)
 
     elif args.proxy == "rho-pr":
-        rho = _pick(data, ["rho_kg_m3","rho","rho_si"])
-        pr  = _pick(data, ["pr_pa","p_r","p_r_pa","pr"])
+        rho = _pick(data, PROXY_COLS["rho-pr"][0])
+        pr  = _pick(data, PROXY_COLS["rho-pr"][1])
         if rho is None or pr is None:
             out_md.write_text("# Segment Redshift\nFehlende rho/pr-Spalte (proxy=rho-pr).\n", encoding="utf-8")
             print("[SSZ][addon] rho/pr fehlt → report.")
@@ -177,7 +200,7 @@ def main():
         phi = phi_from_rho_pr(r_s, rho_s, pr_s)
 
     else:  # gtt
-        gtt = _pick(data, ["g_tt","gtt","gtt_neg"])
+        gtt = _pick(data, PROXY_COLS["gtt"][0])
         if gtt is None:
             out_md.write_text("# Segment Redshift\nFehlende g_tt-Spalte (proxy=gtt).\n", encoding="utf-8")
             print("[SSZ][addon] g_tt fehlt → report.")
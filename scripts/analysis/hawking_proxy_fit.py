@@ -25,10 +25,16 @@ import argparse
 import json
 import sys
 import os
+from pathlib import Path
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+# Planck: I_ν = A · (2hν³/c²) / (exp(hν/kT) - 1)
+# Power law: F_ν = A · (ν/ν₀)^α, ν₀ = 100 GHz
+from scripts.tools.spectrum_fit import fit_source, planck as planck_nu, powerlaw, broken_powerlaw
 
 # UTF-8 Setup (Windows compatibility)
 os.environ['PYTHONIOENCODING'] = 'utf-8:replace'
@@ -42,58 +48,6 @@ if sys.platform.startswith('win'):
         sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
 
 
-def planck_nu(nu, T, A):
-    """
-    Planck spectrum: I_ν = A · (2hν³/c²) / (exp(hν/kT) - 1)
-    
-    Parameters:
-        nu: Frequency (Hz)
-        T: Temperature (K)
-        A: Amplitude normalization
-    
-    Returns:
-        Intensity (arbitrary units, typically Jy)
-    """
-    h = 6.62607015e-34  # Planck constant (J·s)
-    k = 1.380649e-23    # Boltzmann constant (J/K)
-    c = 299792458.0     # Speed of light (m/s)
-    
-    x = h * nu / (k * T)
-    x = np.clip(x, 1e-9, 1e3)  # Prevent overflow/underflow
-    
-    return A * (2 * h * nu**3 / c**2) / (np.expm1(x))
-
-
-def powerlaw(nu, A, alpha):
-    """
-    Power-law spectrum: F_ν = A · (ν/ν₀)^α
-    
-    Parameters:
-        nu: Frequency (Hz)
-        A: Amplitude at reference frequency (100 GHz)
-        alpha: Spectral index
-    
-    Returns:
-        Flux density (Jy)
-    """
-    return A * (nu / 1e11)**alpha
-
-
-def bic(y, yfit, npar, sigma):
-    """
-    Bayesian Information Criterion
-    
-    BIC = k·ln(n) + χ²
-    
-    where k = number of parameters, n = number of data points
-    
-    Lower BIC = better model (penalizes complexity)
-    """
-    chi2 = np.sum(((y - yfit) / sigma)**2)
-    n = len(y)
-    return npar * np.log(n) + chi2
-
-
 def main():
     """
     Main analysis routine
@@ -166,52 +120,46 @@ def main():
     print(f"  κ_seg = {kappa:.6e} m⁻¹")
     print(f"  T_seed = C × |κ_seg| = {args.C:.3e} × {kappa:.3e} = {T_seed:.6e} K")
 
-    # Fit thermal (Planck-like) model
+    # Fit thermal (Planck), power-law and broken power-law models
+    # (power law linearized in log space, analytic Jacobians for the others)
+    fits = fit_source(obs['freq_Hz'].values, obs['flux_Jy'].values, obs['sigma_Jy'].values,
+                      T_seed=T_seed)
+
     print("\nFitting thermal (Planck) model...")
-    try:
-        p_seg, _ = curve_fit(
-            planck_nu, obs['freq_Hz'], obs['flux_Jy'],
-            sigma=obs['sigma_Jy'],
-            p0=[T_seed, np.nanmedian(obs['flux_Jy'])],
-            maxfev=20000,
-            bounds=([1e-35, 0], [1e10, np.inf])
-        )
-        y_seg = planck_nu(obs['freq_Hz'], *p_seg)
-        BIC_seg = bic(obs['flux_Jy'], y_seg, 2, obs['sigma_Jy'])
-        
+    thermal_success = fits['planck']['success']
+    if thermal_success:
+        p_seg = [fits['planck']['params'][k] for k in ('T', 'A')]
+        BIC_seg = fits['planck']['bic']
         print(f"  T_fit = {p_seg[0]:.6e} K")
         print(f"  A_fit = {p_seg[1]:.6e}")
         print(f"  BIC = {BIC_seg:.3f}")
-        
-        thermal_success = True
-    except Exception as e:
-        print(f"  FAILED: {e}")
-        thermal_success = False
+    else:
+        print(f"  FAILED: {fits['planck']['message']}")
         BIC_seg = np.inf
 
-    # Fit power-law model
     print("\nFitting power-law model...")
-    try:
-        p_pow, _ = curve_fit(
-            powerlaw, obs['freq_Hz'], obs['flux_Jy'],
-            sigma=obs['sigma_Jy'],
-            p0=[np.nanmedian(obs['flux_Jy']), -0.7],
-            maxfev=20000,
-            bounds=([0, -10], [np.inf, 10])
-        )
-        y_pow = powerlaw(obs['freq_Hz'], *p_pow)
-        BIC_pow = bic(obs['flux_Jy'], y_pow, 2, obs['sigma_Jy'])
-        
+    powerlaw_success = fits['powerlaw']['success']
+    if powerlaw_success:
+        p_pow = [fits['powerlaw']['params'][k] for k in ('A', 'alpha')]
+        BIC_pow = fits['powerlaw']['bic']
         print(f"  A_fit = {p_pow[0]:.6e}")
         print(f"  α_fit = {p_pow[1]:.3f}")
         print(f"  BIC = {BIC_pow:.3f}")
-        
-        powerlaw_success = True
-    except Exception as e:
-        print(f"  FAILED: {e}")
-        powerlaw_success = False
+    else:
+        print(f"  FAILED: {fits['powerlaw']['message']}")
         BIC_pow = np.inf
 
+    print("\nFitting broken power-law model...")
+    broken_success = fits['broken_powerlaw']['success']
+    if broken_success:
+        p_brk = [fits['broken_powerlaw']['params'][k] for k in ('A', 'alpha1', 'alpha2', 'nu_break')]
+        BIC_brk = fits['broken_powerlaw']['bic']
+        print(f"  α1 = {p_brk[1]:.3f}, α2 = {p_brk[2]:.3f}, ν_break = {p_brk[3]:.3e} Hz")
+        print(f"  BIC = {BIC_brk:.3f}")
+    else:
+        print(f"  FAILED: {fits['broken_powerlaw']['message']}")
+        BIC_brk = np.inf
+
     # ΔBIC comparison
     dBIC = BIC_pow - BIC_seg
     
@@ -256,6 +204,11 @@ def main():
                 label=f'Power-law (α={p_pow[1]:.2f}) | BIC={BIC_pow:.1f}',
                 color='blue', linewidth=2, linestyle='--')
     
+    if broken_success:
+        ax.plot(nu_grid, broken_powerlaw(nu_grid, *p_brk),
+                label=f'Broken power-law | BIC={BIC_brk:.1f}',
+                color='green', linewidth=1.5, linestyle=':')
+    
     ax.set_xscale('log')
     ax.set_yscale('log')
     ax.set_xlabel('Frequency (Hz)', fontsize=12)
@@ -303,10 +256,21 @@ def main():
     else:
         lines.append(f'**Power-law:** FAILED')
     
+    lines.append('')
+    
+    if broken_success:
+        lines.append(f'**Broken power-law:**')
+        lines.append(f'- α1 = {p_brk[1]:.3f}, α2 = {p_brk[2]:.3f}')
+        lines.append(f'- ν_break = {p_brk[3]:.3e} Hz')
+        lines.append(f'- BIC = {BIC_brk:.3f}')
+    else:
+        lines.append(f'**Broken power-law:** FAILED')
+    
     lines.append('')
     lines.append('## Model Comparison')
     lines.append(f'- BIC(thermal) = {BIC_seg:.3f}')
     lines.append(f'- BIC(power-law) = {BIC_pow:.3f}')
+    lines.append(f'- BIC(broken power-law) = {BIC_brk:.3f}')
     lines.append(f'- **ΔBIC = BIC_powerlaw - BIC_thermal = {dBIC:.3f}**')
     lines.append('')
     
@@ -8,72 +8,171 @@ Tests sensitivity to outliers and velocity corrections.
 
 Methods:
 1. Bootstrap (1000 resamples): Confidence intervals
-2. Jackknife (leave-one-out): Bias estimation
+   (chunked resample-index matrices around the median, parallel chunks)
+2. Jackknife (leave-one-out): Bias estimation (exact, O(n log n))
 3. Outlier sensitivity: Remove top 5% velocity corrections
 """
 
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import json
 import pandas as pd
 import numpy as np
-from scipy.stats import bootstrap
 
+# Resample-index matrix entries per chunk (int64 -> ~32 MB)
+CHUNK_ELEMENTS = 1 << 22
 
-def bootstrap_analysis(data, n_resamples=1000, confidence_level=0.95, seed=42):
+# Half width of the rank window around the median, in units of sqrt(n).
+# The number of resample draws below a rank r is Binomial(n, r/n) with
+# sd <= sqrt(n)/2, so the resample median practically never leaves the
+# window; if it does, that resample is completed over the full sample.
+WINDOW_SIGMAS = 8
+
+
+def _median_ranks(n):
+    """0-based sorted positions averaged for the median of n values"""
+    return (n - 1) // 2, n // 2
+
+
+def _bootstrap_median_chunk(task):
+    """
+    Medians of `size` bootstrap resamples, drawn only inside a rank window.
+
+    A resample of the n sorted values is split into the draws below, inside
+    and above the window [lo, lo + len(window)) (multinomial counts); the
+    draws inside are an index matrix of uniform window positions, sorted
+    per row, from which the median order statistics are read off.
+
+    Returns (medians, [(row, n_low, n_high, window draws)] for the rows
+    whose median fell outside the window).
+    """
+    window, n, lo, size, seed = task
+    rng = np.random.default_rng(seed)
+    width = len(window)
+    k1, k2 = _median_ranks(n)
+
+    counts = rng.multinomial(n, [lo / n, width / n, max(0.0, 1.0 - (lo + width) / n)], size=size)
+    n_low, n_win = counts[:, 0], counts[:, 1]
+    draws = rng.integers(0, width, (size, int(n_win.max())))
+    draws[np.arange(draws.shape[1]) >= n_win[:, None]] = width  # unused slots sort last
+    draws.sort(axis=1)
+
+    r1, r2 = k1 - n_low, k2 - n_low
+    rows = np.arange(size)
+    v1 = window[draws[rows, np.clip(r1, 0, n_win - 1)].clip(max=width - 1)]
+    v2 = window[draws[rows, np.clip(r2, 0, n_win - 1)].clip(max=width - 1)]
+    outside = [(i, n_low[i], counts[i, 2], draws[i, :n_win[i]])
+               for i in np.flatnonzero((r1 < 0) | (r2 >= n_win))]
+    return 0.5 * (v1 + v2), outside
+
+
+def bootstrap_medians(values, n_resamples=1000, seed=42, workers=None):
+    """
+    Bootstrap distribution of the median of values.
+
+    Resamples are drawn in chunks of a resample-index matrix restricted to
+    a window of ~16·sqrt(n) ranks around the median, so each resample costs
+    O(sqrt(n)) instead of O(n). The result has exactly the distribution of
+    np.median(rng.choice(values, n)) and does not depend on `workers`.
+
+    Args:
+        values: 1D sample
+        n_resamples: Number of bootstrap resamples
+        seed: Seed of the chunk generators (SeedSequence spawn)
+        workers: Worker processes for the chunks (default: CPU count; 1 = in-process)
+
+    Returns:
+        Array of n_resamples resample medians
+    """
+    a = np.sort(np.asarray(values, dtype=float))
+    n = len(a)
+    if n == 0:
+        raise ValueError("bootstrap needs at least one value")
+    k1, k2 = _median_ranks(n)
+    half = int(np.ceil(WINDOW_SIGMAS * np.sqrt(n))) + 1
+    lo, hi = max(0, k1 - half), min(n, k2 + half + 1)
+    window = a[lo:hi]
+
+    size = max(1, min(n_resamples, CHUNK_ELEMENTS // len(window)))
+    sizes = [min(size, n_resamples - start) for start in range(0, n_resamples, size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes) + 1)
+    tasks = [(window, n, lo, m, sd) for m, sd in zip(sizes, seeds)]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        parts = list(map(_bootstrap_median_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_bootstrap_median_chunk, tasks))
+
+    medians = np.concatenate([m for m, _ in parts])
+    # Complete the rare out-of-window resamples: given the counts, the draws
+    # below and above the window are uniform over their ranks
+    rng = np.random.default_rng(seeds[-1])
+    for chunk, (_, outside) in enumerate(parts):
+        for row, n_low, n_high, drawn in outside:
+            idx = np.concatenate([rng.integers(0, lo, n_low) if n_low else drawn[:0],
+                                  drawn + lo,
+                                  rng.integers(lo + len(window), n, n_high) if n_high else drawn[:0]])
+            medians[chunk * size + row] = np.median(a[idx])
+    return medians
+
+
+def bootstrap_analysis(data, n_resamples=1000, confidence_level=0.95, seed=42, workers=None):
     """
     Perform bootstrap analysis on median |Δz|.
     
-    Returns dict with mean, std, and confidence interval.
+    Returns dict with mean, std, and (percentile) confidence interval.
     """
-    rng = np.random.default_rng(seed=seed)
-    
-    def median_func(x):
-        return np.median(np.abs(x))
-    
-    result = bootstrap(
-        (data,),
-        median_func,
-        n_resamples=n_resamples,
-        random_state=rng,
-        confidence_level=confidence_level,
-        method='percentile'
-    )
-    
-    # Compute bootstrap distribution
-    bootstrap_samples = []
-    for _ in range(n_resamples):
-        sample = rng.choice(data, size=len(data), replace=True)
-        bootstrap_samples.append(median_func(sample))
+    medians = bootstrap_medians(np.abs(data), n_resamples=n_resamples, seed=seed, workers=workers)
+    alpha = 1 - confidence_level
+    ci_lower, ci_upper = np.percentile(medians, [100 * alpha / 2, 100 * (1 - alpha / 2)])
     
     return {
-        "mean": float(np.mean(bootstrap_samples)),
-        "std": float(np.std(bootstrap_samples)),
-        "ci_lower": float(result.confidence_interval.low),
-        "ci_upper": float(result.confidence_interval.high),
+        "mean": float(np.mean(medians)),
+        "std": float(np.std(medians)),
+        "ci_lower": float(ci_lower),
+        "ci_upper": float(ci_upper),
         "confidence_level": confidence_level,
         "n_resamples": n_resamples,
     }
 
 
+def leave_one_out_medians(values):
+    """
+    Exact leave-one-out medians, one per element of sorted(values).
+
+    Removing the element at sorted position i leaves sorted position j
+    at a[j] (j < i) or a[j + 1] (j >= i), so every leave-one-out median
+    is built from the neighbours of the full-sample median: O(n log n)
+    for the sort and O(n) for all n estimates.
+    """
+    a = np.sort(np.asarray(values, dtype=float))
+    n = len(a)
+    if n < 2:
+        raise ValueError("jackknife needs at least two values")
+    k1, k2 = _median_ranks(n - 1)
+    i = np.arange(n)
+    v1 = np.where(k1 < i, a[k1], a[k1 + 1])
+    v2 = np.where(k2 < i, a[k2], a[k2 + 1])
+    return 0.5 * (v1 + v2)
+
+
 def jackknife_analysis(data):
     """
     Perform jackknife (leave-one-out) analysis.
     
     Returns dict with bias and variance estimates.
     """
-    n = len(data)
-    theta_full = np.median(np.abs(data))
-    
-    # Leave-one-out estimates
-    theta_i = []
-    for i in range(n):
-        mask = np.ones(n, dtype=bool)
-        mask[i] = False
-        theta_i.append(np.median(np.abs(data[mask])))
+    abs_data = np.abs(data)
+    n = len(abs_data)
+    theta_full = np.median(abs_data)
     
-    theta_i = np.array(theta_i)
+    # Leave-one-out estimates (order does not matter for bias/variance)
+    theta_i = leave_one_out_medians(abs_data)
     
     # Jackknife bias
     theta_jack = np.mean(theta_i)
@@ -131,6 +230,8 @@ def main():
                     help="Column name for residuals (default: Δz_seg)")
     ap.add_argument("--bootstrap-samples", type=int, default=1000,
                     help="Number of bootstrap resamples")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Worker processes for the bootstrap chunks (default: CPU count)")
     ap.add_argument("--output", "-o", type=str, default=None,
                     help="Output JSON file")
     ap.add_argument("--verbose", "-v", action="store_true")
@@ -153,7 +254,8 @@ def main():
     print("[INFO] Running bootstrap analysis...")
     bootstrap_result = bootstrap_analysis(
         data,
-        n_resamples=args.bootstrap_samples
+        n_resamples=args.bootstrap_samples,
+        workers=args.workers
     )
     
     print("[INFO] Running jackknife analysis...")
@@ -227,7 +329,7 @@ def print_report(output, verbose=False):
     print(f"Samples:    {output['n_samples']}")
     
     print("\n" + "-" * 80)
-    print("Bootstrap Analysis (1000 resamples):")
+    print(f"Bootstrap Analysis ({bootstrap['n_resamples']} resamples):")
     print("-" * 80)
     print(f"  Mean(median |Δz|):  {bootstrap['mean']:.6f}")
     print(f"  Std(median |Δz|):   {bootstrap['std']:.6f}")
@@ -14,6 +14,9 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts.tools.repo_index import get_index
+
 os.environ['PYTHONIOENCODING'] = 'utf-8:replace'
 
 if sys.platform.startswith('win'):
@@ -143,11 +146,14 @@ def count_technical_terms(text):
         return count, (count / len(words)) * 100
     return 0, 0
 
-def analyze_file(filepath):
+def analyze_file(filepath, content=None, size=None):
     """Analyze readability of a markdown file"""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
+        if content is None:
+            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+        if size is None:
+            size = filepath.stat().st_size
         
         # Calculate metrics
         flesch_score, avg_sent_len, avg_syll = flesch_reading_ease(content)
@@ -182,7 +188,7 @@ def analyze_file(filepath):
             'max_paragraph_length': max_para,
             'technical_terms': tech_count,
             'technical_percentage': tech_pct,
-            'size_kb': filepath.stat().st_size / 1024
+            'size_kb': size / 1024
         }
     except Exception as e:
         return None
@@ -211,11 +217,12 @@ def main():
     print("Analyzing key documentation files...")
     print()
     
+    index = get_index(root)
     for doc_path in key_docs:
         full_path = root / doc_path
-        if full_path.exists():
+        if doc_path in index:
             print(f"Analyzing {doc_path}...", end=' ')
-            analysis = analyze_file(full_path)
+            analysis = analyze_file(full_path, index.text(doc_path), index.size(doc_path))
             if analysis:
                 results[doc_path] = analysis
                 print(f"✅ Flesch: {analysis['flesch_score']:.1f}")
@@ -16,6 +16,9 @@ from datetime import datetime
 import re
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts.tools.repo_index import get_index, extract_links
+
 # UTF-8 für Windows
 os.environ['PYTHONIOENCODING'] = 'utf-8:replace'
 
@@ -26,37 +29,15 @@ if sys.platform.startswith('win'):
     except:
         pass
 
-def extract_markdown_links(filepath):
+def extract_markdown_links(filepath, content=None):
     """Extract all markdown links from file"""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-        
-        links = []
-        
-        # [text](url) format
-        pattern = r'\[([^\]]+)\]\(([^\)]+)\)'
-        matches = re.findall(pattern, content)
-        for text, url in matches:
-            links.append({
-                'text': text,
-                'url': url,
-                'type': 'markdown',
-                'file': str(filepath)
-            })
+        if content is None:
+            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
         
-        # <url> format
-        pattern2 = r'<([^>]+\.(md|pdf|py|csv|txt))>'
-        matches2 = re.findall(pattern2, content)
-        for url, ext in matches2:
-            links.append({
-                'text': url,
-                'url': url,
-                'type': 'angle_bracket',
-                'file': str(filepath)
-            })
-        
-        return links
+        return [{'text': t, 'url': u, 'type': kind, 'file': str(filepath)}
+                for t, u, kind in extract_links(content)]
     except Exception as e:
         return []
 
@@ -113,15 +94,9 @@ def main():
     print(f"Repository root: {root}")
     print()
     
-    # Find all markdown files (excluding some dirs)
-    exclude_dirs = {'.venv', '__pycache__', 'node_modules', '.git'}
-    md_files = []
-    
-    for md_file in root.rglob('*.md'):
-        # Skip excluded directories
-        if any(excluded in str(md_file) for excluded in exclude_dirs):
-            continue
-        md_files.append(md_file)
+    # All markdown files from the shared index (excluded dirs pruned there)
+    index = get_index(root)
+    md_files = index.files('.md')
     
     print(f"Scanning {len(md_files)} markdown files...")
     print()
@@ -129,9 +104,10 @@ def main():
     all_links = []
     file_link_counts = {}
     
-    # Extract all links
-    for filepath in md_files:
-        links = extract_markdown_links(filepath)
+    # Links were extracted while indexing
+    for rel in md_files:
+        filepath = root / rel
+        links = [{**link, 'file': str(filepath)} for link in index.links(rel)]
         if links:
             all_links.extend(links)
             file_link_counts[str(filepath)] = len(links)
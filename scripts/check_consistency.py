@@ -15,6 +15,9 @@ from datetime import datetime
 import re
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts.tools.repo_index import get_index
+
 os.environ['PYTHONIOENCODING'] = 'utf-8:replace'
 
 if sys.platform.startswith('win'):
@@ -86,10 +89,8 @@ def check_file_naming(root):
         'mixed_case': re.compile(r'.*[a-z]+[A-Z]+.*'),  # Mixed case (not camelCase or snake_case)
     }
     
-    for md_file in root.glob('**/*.md'):
-        if '__pycache__' in str(md_file):
-            continue
-        
+    for rel in get_index(root).files('.md'):
+        md_file = root / rel
         name = md_file.name
         
         # Check for spaces
@@ -110,11 +111,12 @@ def check_file_naming(root):
     
     return issues
 
-def analyze_doc(filepath):
+def analyze_doc(filepath, content=None):
     """Analyze a document for consistency"""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
+        if content is None:
+            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
         
         results = {}
         for term_name, term_data in TERMINOLOGY.items():
@@ -144,12 +146,13 @@ def main():
     # Terminology results
     term_results = {}
     
+    index = get_index(root)
     print("Checking terminology consistency...")
     for doc_path in key_docs:
         full_path = root / doc_path
-        if full_path.exists():
+        if doc_path in index:
             print(f"  Analyzing {doc_path}...")
-            analysis = analyze_doc(full_path)
+            analysis = analyze_doc(full_path, index.text(doc_path))
             if analysis:
                 term_results[doc_path] = analysis
     
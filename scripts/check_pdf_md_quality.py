@@ -15,6 +15,9 @@ from datetime import datetime
 import re
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts.tools.repo_index import get_index
+
 # UTF-8 für Windows
 os.environ['PYTHONIOENCODING'] = 'utf-8:replace'
 
@@ -26,8 +29,9 @@ if sys.platform.startswith('win'):
         pass
 
 class PDFMarkdownQualityChecker:
-    def __init__(self, filepath):
+    def __init__(self, filepath, content=None):
         self.filepath = Path(filepath)
+        self.content = content
         self.issues = []
         self.warnings = []
         self.stats = {}
@@ -49,6 +53,13 @@ class PDFMarkdownQualityChecker:
             'stats': self.stats
         }
     
+    def read(self):
+        """File content, read at most once (or taken from the repository index)"""
+        if self.content is None:
+            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
+                self.content = f.read()
+        return self.content
+    
     def check_file_size(self):
         """Check if file exists and has reasonable size"""
         if not self.filepath.exists():
@@ -78,8 +89,7 @@ class PDFMarkdownQualityChecker:
     def check_basic_structure(self):
         """Check basic markdown structure"""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read()
             
             lines = content.split('\n')
             self.stats['total_lines'] = len(lines)
@@ -113,8 +123,7 @@ class PDFMarkdownQualityChecker:
     def check_malformed_links(self):
         """Check for malformed markdown links"""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read()
             
             # Find malformed links like [text]( broken\ntext)
             malformed_patterns = [
@@ -144,8 +153,7 @@ class PDFMarkdownQualityChecker:
     def check_spacing_issues(self):
         """Check for spacing/formatting issues"""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read()
             
             issues_found = []
             
@@ -177,8 +185,7 @@ class PDFMarkdownQualityChecker:
     def check_encoding_issues(self):
         """Check for encoding/unicode issues"""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read()
             
             # Check for replacement characters
             replacement_chars = content.count('\ufffd')
@@ -212,8 +219,7 @@ class PDFMarkdownQualityChecker:
     def check_table_conversion(self):
         """Check table conversion quality"""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read()
             
             # Find markdown tables
             table_headers = re.findall(r'\|[^\n]+\|\n\|[-:\s|]+\|', content)
@@ -233,8 +239,7 @@ class PDFMarkdownQualityChecker:
     def check_formula_markers(self):
         """Check for mathematical formulas"""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            content = self.read()
             
             # Count LaTeX math
             inline_math = len(re.findall(r'\$[^\$]+\$', content))
@@ -269,24 +274,22 @@ def main():
     print(f"Repository root: {root}")
     print()
     
-    # Find all .pdf.md files
-    pdf_md_files = []
-    for pattern in ['papers/**/*.pdf.md', '*.pdf.md', 'docs/**/*.pdf.md']:
-        pdf_md_files.extend(root.glob(pattern))
-    
-    # Remove duplicates
-    pdf_md_files = list(set(pdf_md_files))
+    # Find all .pdf.md files (papers/, docs/ and top level) in the shared index
+    index = get_index(root)
+    pdf_md_files = [rel for rel in index.files('.pdf.md')
+                    if '/' not in rel or rel.startswith(('papers/', 'docs/'))]
     
     print(f"Found {len(pdf_md_files)} PDF.md files")
     print()
     
     # Check each file
     results = []
-    for filepath in sorted(pdf_md_files):
+    for rel in pdf_md_files:
+        filepath = root / rel
         rel_path = filepath.relative_to(root)
         print(f"Checking: {rel_path}...", end=' ')
         
-        checker = PDFMarkdownQualityChecker(filepath)
+        checker = PDFMarkdownQualityChecker(filepath, index.text(rel))
         result = checker.check_all()
         results.append(result)
         
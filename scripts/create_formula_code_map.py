@@ -14,6 +14,9 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scripts.tools.repo_index import get_index
+
 os.environ['PYTHONIOENCODING'] = 'utf-8:replace'
 
 if sys.platform.startswith('win'):
@@ -79,33 +82,25 @@ KEY_FORMULAS = {
 def find_formula_in_code(root, formula_key, search_terms):
     """Find where a formula is implemented in code"""
     implementations = []
+    index = get_index(root)
     
-    # Search Python files
-    for py_file in root.glob('**/*.py'):
-        if '__pycache__' in str(py_file) or 'venv' in str(py_file):
-            continue
-            
-        try:
-            with open(py_file, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                
-            # Check if any search term appears
-            for term in search_terms:
-                if term.lower() in content.lower():
-                    # Find context around the term
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines):
-                        if term.lower() in line.lower():
-                            implementations.append({
-                                'file': py_file.relative_to(root),
-                                'line': i + 1,
-                                'context': line.strip(),
-                                'term': term
-                            })
-                            break
-                    break
-        except:
-            continue
+    # Files containing each term (inverted index, no re-reading)
+    py_files = [rel for rel in index.files('.py') if 'venv' not in rel]
+    hits = {term: index.containing(term, py_files) for term in search_terms}
+    
+    for rel in py_files:
+        # First matching term per file, first matching line for that term
+        for term in search_terms:
+            if rel in hits[term]:
+                found = index.first_line(rel, term)
+                if found:
+                    implementations.append({
+                        'file': Path(rel),
+                        'line': found[0],
+                        'context': found[1].strip(),
+                        'term': term
+                    })
+                break
     
     return implementations
 
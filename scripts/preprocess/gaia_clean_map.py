@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import dataclass
+import shutil
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
@@ -24,6 +25,8 @@ class CleanConfig:
     sources_config: Dict[str, object]
     strict_gaia_columns: bool = False
     quiet: bool = False
+    stream: bool = False
+    chunk_rows: int = 500_000
 
 
 @dataclass
@@ -54,6 +57,17 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Emit only a compact summary instead of detailed logs.",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Process files chunk by chunk and write gaia_clean.parquet as a dataset of part files.",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=500_000,
+        help="Rows per chunk in --stream mode (Parquet batches, CSV chunks, FITS slices).",
+    )
     return parser.parse_args()
 
 
@@ -81,6 +95,8 @@ def build_clean_config(args: argparse.Namespace) -> CleanConfig:
         sources_config=sources,
         strict_gaia_columns=args.strict_gaia_columns,
         quiet=args.quiet,
+        stream=args.stream,
+        chunk_rows=args.chunk_rows,
     )
 
 
@@ -100,6 +116,23 @@ def read_catalog(path: Path) -> pd.DataFrame:
     return table.to_pandas()
 
 
+def iter_catalog_chunks(path: Path, chunk_rows: int) -> Iterable[pd.DataFrame]:
+    """Yield a catalog file in chunks of at most chunk_rows rows without loading it whole."""
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+    if path.suffix == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+        return
+    table = Table.read(path, memmap=True)
+    for start in range(0, len(table), chunk_rows):
+        yield table[start : start + chunk_rows].to_pandas()
+
+
 def concatenate_frames(files: Iterable[Path]) -> pd.DataFrame:
     frames: List[pd.DataFrame] = []
     for path in files:
@@ -189,6 +222,7 @@ def harmonize_columns(
     strict_soft: bool = False,
     logger: logging.Logger | None = None,
     quiet: bool = False,
+    id_offset: int = 0,
 ) -> Tuple[pd.DataFrame, HarmonizeReport]:
     def _emit(level: str, message: str) -> None:
         if quiet:
@@ -210,7 +244,7 @@ def harmonize_columns(
         missing_hard = [col for col in missing_hard if col != "source_id"]
         if strict_soft:
             raise KeyError("Missing mandatory GAIA columns: source_id")
-        synthesized = pd.RangeIndex(start=1, stop=len(df) + 1, step=1)
+        synthesized = pd.RangeIndex(start=id_offset + 1, stop=id_offset + len(df) + 1, step=1)
         df["source_id"] = synthesized.astype("int64")
         _emit("warning", "[GAIA-CLEAN] source_id missing -> synthesized sequential ids")
     if missing_hard:
@@ -304,12 +338,29 @@ def add_fields(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def reset_output(path: Path) -> None:
+    """Remove a previous gaia_clean.parquet, either a single file or a streamed dataset directory."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
 def write_outputs(df: pd.DataFrame, cfg: CleanConfig) -> Path:
     output_path = cfg.interim_dir / "gaia_clean.parquet"
+    reset_output(output_path)
     df.to_parquet(output_path, index=False)
     return output_path
 
 
+QA_METRICS = {
+    "parallax_hist.png": ("parallax", "Parallax Distribution (mas)"),
+    "pmra_hist.png": ("pmra", "Proper Motion RA (mas/yr)"),
+    "pmdec_hist.png": ("pmdec", "Proper Motion Dec (mas/yr)"),
+    "ruwe_hist.png": ("ruwe", "RUWE Distribution"),
+}
+
+
 def plot_histogram(series: pd.Series, title: str, path: Path) -> None:
     plt.figure(figsize=(8, 5))
     valid = series.replace([np.inf, -np.inf], np.nan).dropna()
@@ -324,14 +375,180 @@ def plot_histogram(series: pd.Series, title: str, path: Path) -> None:
 
 
 def generate_qa(df: pd.DataFrame, cfg: CleanConfig) -> None:
-    metrics = {
-        "parallax_hist.png": (df["parallax"], "Parallax Distribution (mas)"),
-        "pmra_hist.png": (df["pmra"], "Proper Motion RA (mas/yr)"),
-        "pmdec_hist.png": (df["pmdec"], "Proper Motion Dec (mas/yr)"),
-        "ruwe_hist.png": (df.get("ruwe", pd.Series(dtype=float)), "RUWE Distribution"),
-    }
-    for name, (series, title) in metrics.items():
-        plot_histogram(series, title, cfg.qa_dir / name)
+    for name, (column, title) in QA_METRICS.items():
+        plot_histogram(df.get(column, pd.Series(dtype=float)), title, cfg.qa_dir / name)
+
+
+@dataclass
+class StreamingHistogram:
+    """Fixed bin count histogram whose range doubles whenever a chunk falls outside it."""
+
+    bins: int = 60
+    lo: float = 0.0
+    width: float = 0.0
+    counts: np.ndarray | None = None
+
+    @property
+    def total(self) -> int:
+        return 0 if self.counts is None else int(self.counts.sum())
+
+    @property
+    def hi(self) -> float:
+        return self.lo + self.bins * self.width
+
+    def _grow(self, downward: bool) -> None:
+        j = np.arange(self.bins)
+        if downward:
+            self.lo -= self.bins * self.width
+            target = (self.bins + j) // 2
+        else:
+            target = j // 2
+        merged = np.zeros_like(self.counts)
+        np.add.at(merged, target, self.counts)
+        self.counts = merged
+        self.width *= 2.0
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        vmin, vmax = float(values.min()), float(values.max())
+        if self.counts is None:
+            self.lo = vmin
+            self.width = (vmax - vmin) / self.bins if vmax > vmin else 1.0 / self.bins
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+        while vmin < self.lo:
+            self._grow(downward=True)
+        while vmax > self.hi:
+            self._grow(downward=False)
+        idx = np.floor((values - self.lo) / self.width).astype(np.int64)
+        np.clip(idx, 0, self.bins - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.bins)
+
+    def trimmed(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Counts and edges without empty bins at either end."""
+        nonzero = np.flatnonzero(self.counts)
+        first, last = int(nonzero[0]), int(nonzero[-1]) + 1
+        edges = self.lo + self.width * np.arange(first, last + 1)
+        return self.counts[first:last], edges
+
+
+@dataclass
+class StreamState:
+    reports: List[HarmonizeReport] = field(default_factory=list)
+    histograms: Dict[str, StreamingHistogram] = field(
+        default_factory=lambda: {name: StreamingHistogram() for name in QA_METRICS}
+    )
+    nan_counts: Dict[str, int] = field(default_factory=dict)
+    rows_written: int = 0
+    parts: int = 0
+    schema: object = None
+
+    def update_qa(self, df: pd.DataFrame) -> None:
+        for name, (column, _) in QA_METRICS.items():
+            if column in df.columns:
+                self.histograms[name].update(pd.to_numeric(df[column], errors="coerce"))
+        for column, count in df.isna().sum().items():
+            self.nan_counts[column] = self.nan_counts.get(column, 0) + int(count)
+
+
+def combine_reports(reports: List[HarmonizeReport]) -> HarmonizeReport:
+    missing = {col for report in reports for col in report.missing_soft}
+    nan_counts: Dict[str, int] = {}
+    for report in reports:
+        for col, count in report.nan_counts.items():
+            nan_counts[col] = nan_counts.get(col, 0) + count
+    return HarmonizeReport(
+        rows_in=sum(r.rows_in for r in reports),
+        rows_after_finite=sum(r.rows_after_finite for r in reports),
+        rows_after_quality=sum(r.rows_after_quality for r in reports),
+        missing_soft=[col for col in SOFT_REQUIRED_ERROR if col in missing],
+        nan_counts=nan_counts,
+        dropped_nonfinite=sum(r.dropped_nonfinite for r in reports),
+        dropped_quality=sum(r.dropped_quality for r in reports),
+    )
+
+
+def write_part(df: pd.DataFrame, out_dir: Path, state: StreamState) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if state.schema is None:
+        state.schema = pa.Schema.from_pandas(df, preserve_index=False)
+    elif set(df.columns) != set(state.schema.names):
+        missing = sorted(set(state.schema.names) - set(df.columns))
+        extra = sorted(set(df.columns) - set(state.schema.names))
+        raise ValueError(
+            f"Chunk columns differ from the first chunk (missing={missing}, extra={extra}); "
+            "streamed part files must share one schema"
+        )
+    else:
+        df = df[state.schema.names]
+    table = pa.Table.from_pandas(df, schema=state.schema, preserve_index=False)
+    pq.write_table(table, out_dir / f"part-{state.parts:05d}.parquet")
+    state.parts += 1
+    state.rows_written += len(df)
+
+
+def plot_histogram_counts(hist: StreamingHistogram, title: str, path: Path) -> None:
+    plt.figure(figsize=(8, 5))
+    if hist.total == 0:
+        plt.text(0.5, 0.5, "No data", ha="center", va="center")
+    else:
+        counts, edges = hist.trimmed()
+        plt.stairs(counts, edges, fill=True, color="#3366cc", alpha=0.75)
+    plt.title(title)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def write_stream_qa(state: StreamState, cfg: CleanConfig) -> None:
+    for name, (_, title) in QA_METRICS.items():
+        plot_histogram_counts(state.histograms[name], title, cfg.qa_dir / name)
+    (cfg.qa_dir / "nan_counts.json").write_text(
+        json.dumps({"rows": state.rows_written, "nan_counts": state.nan_counts}, indent=2),
+        encoding="utf-8",
+    )
+
+
+def clean_gaia_catalog_streaming(cfg: CleanConfig) -> Path:
+    """Chunked variant of clean_gaia_catalog: memory is bounded by cfg.chunk_rows, not the catalog size."""
+    files = list(iter_input_files(cfg.raw_dir))
+    if not files:
+        raise ValueError("No raw GAIA files discovered")
+    out_dir = cfg.interim_dir / "gaia_clean.parquet"
+    reset_output(out_dir)
+    out_dir.mkdir(parents=True)
+
+    state = StreamState()
+    rows_seen = 0
+    last = None
+    for path in files:
+        for chunk in iter_catalog_chunks(path, cfg.chunk_rows):
+            df, report = harmonize_columns(
+                chunk,
+                strict_soft=cfg.strict_gaia_columns,
+                logger=LOG,
+                quiet=True,
+                id_offset=rows_seen,
+            )
+            rows_seen += report.rows_in
+            state.reports.append(report)
+            df = add_fields(df)
+            last = df
+            if len(df):
+                write_part(df, out_dir, state)
+                state.update_qa(df)
+            if not cfg.quiet:
+                LOG.info("[GAIA-CLEAN] %s: chunk rows_in=%d kept=%d", path.name, report.rows_in, len(df))
+    if state.parts == 0 and last is not None:
+        write_part(last, out_dir, state)
+
+    write_stream_qa(state, cfg)
+    emit_summary(combine_reports(state.reports), cfg, out_dir)
+    return out_dir
 
 
 def _emit_summary_line(line: str, cfg: CleanConfig) -> None:
@@ -364,6 +581,8 @@ def emit_summary(report: HarmonizeReport, cfg: CleanConfig, path: Path) -> None:
 
 
 def clean_gaia_catalog(cfg: CleanConfig) -> Path:
+    if cfg.stream:
+        return clean_gaia_catalog_streaming(cfg)
     files = list(iter_input_files(cfg.raw_dir))
     df = concatenate_frames(files)
     df, report = harmonize_columns(
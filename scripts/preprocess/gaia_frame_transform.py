@@ -10,7 +10,7 @@ import numpy as np
 import pandas as pd
 import yaml
 from astropy import units as u
-from astropy.coordinates import Galactocentric, SkyCoord
+from astropy.coordinates import CartesianDifferential, CartesianRepresentation, Galactocentric, SkyCoord
 from astropy.table import Table
 
 
@@ -39,6 +39,19 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--interim-root", default=Path("data/interim/gaia"), type=Path)
     parser.add_argument("--frame-config", default=Path("configs/cosmology_frame.yaml"), type=Path)
     parser.add_argument("--output", default=None)
+    parser.add_argument(
+        "--method",
+        choices=["astropy", "fast"],
+        default="astropy",
+        help="astropy: SkyCoord reference transform | fast: precomputed rotation/offset applied with NumPy in chunks",
+    )
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="Rows per chunk for --method fast")
+    parser.add_argument(
+        "--validate-rows",
+        type=int,
+        default=0,
+        help="With --method fast: compare this many random rows against astropy and fail beyond tolerance",
+    )
     return parser.parse_args()
 
 
@@ -72,20 +85,53 @@ def construct_galactocentric(frame_cfg: Dict[str, object]) -> Galactocentric:
     return Galactocentric(
         galcen_distance=params.get("solar_radius_kpc", 8.2) * u.kpc,
         z_sun=params.get("solar_height_pc", 25.0) * u.pc,
-        galcen_v_sun=[
+        galcen_v_sun=u.Quantity([
             params.get("solar_motion_kms", {}).get("U", 11.1) * u.km / u.s,
             params.get("solar_motion_kms", {}).get("V", 12.24) * u.km / u.s,
             params.get("solar_motion_kms", {}).get("W", 7.25) * u.km / u.s,
-        ],
+        ]),
     )
 
 
-def transform_frame(df: pd.DataFrame, frame_cfg: Dict[str, object]) -> pd.DataFrame:
-    distance_pc = df["distance_pc"].to_numpy(dtype=float)
-    pmra = df["pmra"].to_numpy(dtype=float)
-    pmdec = df["pmdec"].to_numpy(dtype=float)
-    radial = df["radial_velocity"].to_numpy(dtype=float) if "radial_velocity" in df else np.full(len(df), np.nan)
+# km/s per (mas/yr * pc)
+KMS_PER_MASYR_PC = (1.0 * u.mas / u.yr * u.pc).to(u.km / u.s, u.dimensionless_angles()).value
+
+# Agreement of the fast path with astropy (float64 rounding only)
+FAST_TOLERANCE = {"deg": 1e-9, "kpc": 1e-9, "kms": 1e-8}
+
+
+@dataclass
+class FastFrame:
+    """ICRS -> Galactic rotation and the affine ICRS -> Galactocentric map taken from astropy once."""
+
+    galactic: np.ndarray
+    matrix: np.ndarray
+    offset_kpc: np.ndarray
+    v_sun_kms: np.ndarray
 
+
+def build_fast_frame(gc_frame: Galactocentric) -> FastFrame:
+    # origin and the three unit vectors, all at rest in ICRS
+    points = np.hstack([np.zeros((3, 1)), np.eye(3)])
+    rep = CartesianRepresentation(
+        points * u.kpc, differentials=CartesianDifferential(np.zeros((3, 4)) * u.km / u.s)
+    )
+    icrs = SkyCoord(rep, frame="icrs")
+    gc = icrs.transform_to(gc_frame)
+    gc_xyz = gc.cartesian.xyz.to(u.kpc).value
+    galactic = icrs[1:].galactic.cartesian.xyz.to(u.kpc).value
+    # a point at rest in ICRS moves with the solar velocity (the origin itself has no direction)
+    v_sun = gc.velocity.d_xyz.to(u.km / u.s).value[:, 1]
+    offset = gc_xyz[:, 0]
+    return FastFrame(
+        galactic=galactic,
+        matrix=gc_xyz[:, 1:] - offset[:, None],
+        offset_kpc=offset,
+        v_sun_kms=v_sun,
+    )
+
+
+def _galcen_astropy(df, distance_pc, pmra, pmdec, radial, mask_3d, gc_frame):
     coord_pos = SkyCoord(
         ra=df["ra"].to_numpy() * u.deg,
         dec=df["dec"].to_numpy() * u.deg,
@@ -94,27 +140,17 @@ def transform_frame(df: pd.DataFrame, frame_cfg: Dict[str, object]) -> pd.DataFr
     )
 
     gal = coord_pos.galactic
-    df["l_deg"] = gal.l.degree
-    df["b_deg"] = gal.b.degree
+    l_deg = gal.l.degree
+    b_deg = gal.b.degree
 
-    gc_frame = construct_galactocentric(frame_cfg)
     galcen_pos = coord_pos.transform_to(gc_frame)
+    pos = np.vstack([
+        galcen_pos.x.to(u.kpc).value,
+        galcen_pos.y.to(u.kpc).value,
+        galcen_pos.z.to(u.kpc).value,
+    ])
 
-    df["x_kpc"] = galcen_pos.x.to(u.kpc).value
-    df["y_kpc"] = galcen_pos.y.to(u.kpc).value
-    df["z_kpc"] = galcen_pos.z.to(u.kpc).value
-
-    has_pm = np.isfinite(pmra) & np.isfinite(pmdec)
-    has_dist = np.isfinite(distance_pc) & (distance_pc > 0)
-    has_rv = np.isfinite(radial)
-    mask_tan_any = has_pm & has_dist
-    mask_3d = mask_tan_any & has_rv
-    mask_tan_only = mask_tan_any & ~has_rv
-
-    vx = np.full(len(df), np.nan)
-    vy = np.full(len(df), np.nan)
-    vz = np.full(len(df), np.nan)
-
+    vel = np.full((3, len(df)), np.nan)
     if mask_3d.any():
         coord_vel = SkyCoord(
             ra=df.loc[mask_3d, "ra"].to_numpy() * u.deg,
@@ -126,18 +162,97 @@ def transform_frame(df: pd.DataFrame, frame_cfg: Dict[str, object]) -> pd.DataFr
             frame="icrs",
         )
         galcen_vel = coord_vel.transform_to(gc_frame)
-        vx[mask_3d] = galcen_vel.v_x.to(u.km / u.s).value
-        vy[mask_3d] = galcen_vel.v_y.to(u.km / u.s).value
-        vz[mask_3d] = galcen_vel.v_z.to(u.km / u.s).value
+        vel[0, mask_3d] = galcen_vel.v_x.to(u.km / u.s).value
+        vel[1, mask_3d] = galcen_vel.v_y.to(u.km / u.s).value
+        vel[2, mask_3d] = galcen_vel.v_z.to(u.km / u.s).value
+    return l_deg, b_deg, pos, vel
+
+
+def _galcen_fast(df, distance_pc, pmra, pmdec, radial, mask_3d, gc_frame, chunk_rows=1_000_000):
+    fast = build_fast_frame(gc_frame)
+    ra_all = np.radians(df["ra"].to_numpy(dtype=float))
+    dec_all = np.radians(df["dec"].to_numpy(dtype=float))
+    n = len(df)
+    l_deg = np.empty(n)
+    b_deg = np.empty(n)
+    pos = np.empty((3, n))
+    vel = np.full((3, n), np.nan)
+
+    for start in range(0, n, chunk_rows):
+        sl = slice(start, min(start + chunk_rows, n))
+        sin_a, cos_a = np.sin(ra_all[sl]), np.cos(ra_all[sl])
+        sin_d, cos_d = np.sin(dec_all[sl]), np.cos(dec_all[sl])
+        unit = np.vstack([cos_d * cos_a, cos_d * sin_a, sin_d])
+
+        d_pc = distance_pc[sl]
+        gal = fast.galactic @ unit
+        # astropy yields NaN angles for rows without a finite distance; keep that behavior
+        no_dist = ~np.isfinite(d_pc)
+        l_deg[sl] = np.where(no_dist, np.nan, np.degrees(np.arctan2(gal[1], gal[0])) % 360.0)
+        b_deg[sl] = np.where(no_dist, np.nan, np.degrees(np.arctan2(gal[2], np.hypot(gal[0], gal[1]))))
+
+        pos[:, sl] = fast.matrix @ (unit * (d_pc / 1000.0)) + fast.offset_kpc[:, None]
+
+        m = mask_3d[sl]
+        if m.any():
+            # v = v_r r_hat + k d (mu_a* e_ra + mu_d e_dec) in ICRS, then rotate and add the solar motion
+            k_d = KMS_PER_MASYR_PC * d_pc[m]
+            mu_a = pmra[sl][m] * k_d
+            mu_d = pmdec[sl][m] * k_d
+            v_r = radial[sl][m]
+            sa, ca, sd, cd = sin_a[m], cos_a[m], sin_d[m], cos_d[m]
+            v_icrs = np.vstack([
+                v_r * cd * ca - mu_a * sa - mu_d * sd * ca,
+                v_r * cd * sa + mu_a * ca - mu_d * sd * sa,
+                v_r * sd + mu_d * cd,
+            ])
+            idx = np.flatnonzero(m) + start
+            vel[:, idx] = fast.matrix @ v_icrs + fast.v_sun_kms[:, None]
+    return l_deg, b_deg, pos, vel
+
+
+def transform_frame(
+    df: pd.DataFrame,
+    frame_cfg: Dict[str, object],
+    method: str = "astropy",
+    chunk_rows: int = 1_000_000,
+) -> pd.DataFrame:
+    distance_pc = df["distance_pc"].to_numpy(dtype=float)
+    pmra = df["pmra"].to_numpy(dtype=float)
+    pmdec = df["pmdec"].to_numpy(dtype=float)
+    radial = df["radial_velocity"].to_numpy(dtype=float) if "radial_velocity" in df else np.full(len(df), np.nan)
+
+    has_pm = np.isfinite(pmra) & np.isfinite(pmdec)
+    has_dist = np.isfinite(distance_pc) & (distance_pc > 0)
+    has_rv = np.isfinite(radial)
+    mask_tan_any = has_pm & has_dist
+    mask_3d = mask_tan_any & has_rv
+    mask_tan_only = mask_tan_any & ~has_rv
+
+    gc_frame = construct_galactocentric(frame_cfg)
+    if method == "fast":
+        l_deg, b_deg, pos, vel = _galcen_fast(
+            df, distance_pc, pmra, pmdec, radial, mask_3d, gc_frame, chunk_rows=chunk_rows
+        )
+    elif method == "astropy":
+        l_deg, b_deg, pos, vel = _galcen_astropy(df, distance_pc, pmra, pmdec, radial, mask_3d, gc_frame)
+    else:
+        raise ValueError(f"Unknown frame transform method: {method}")
+
+    df["l_deg"] = l_deg
+    df["b_deg"] = b_deg
+    df["x_kpc"] = pos[0]
+    df["y_kpc"] = pos[1]
+    df["z_kpc"] = pos[2]
 
     v_tan = np.full(len(df), np.nan)
     if mask_tan_any.any():
         mu_total = np.hypot(pmra[mask_tan_any], pmdec[mask_tan_any])
         v_tan[mask_tan_any] = 4.74047 * mu_total * (distance_pc[mask_tan_any] / 1000.0)
 
-    df["v_x_kms"] = vx
-    df["v_y_kms"] = vy
-    df["v_z_kms"] = vz
+    df["v_x_kms"] = vel[0]
+    df["v_y_kms"] = vel[1]
+    df["v_z_kms"] = vel[2]
     df["v_tan_kms"] = v_tan
 
     summary = FrameSummary(
@@ -149,6 +264,38 @@ def transform_frame(df: pd.DataFrame, frame_cfg: Dict[str, object]) -> pd.DataFr
     return df, summary
 
 
+def validate_fast_transform(
+    df: pd.DataFrame, frame_cfg: Dict[str, object], rows: int = 10_000, seed: int = 0
+) -> Dict[str, float]:
+    """Max |fast - astropy| on a random sample; raises ValueError beyond FAST_TOLERANCE."""
+    sample = df.sample(n=min(rows, len(df)), random_state=seed) if rows < len(df) else df
+    ref, _ = transform_frame(sample.copy(), frame_cfg, method="astropy")
+    fast, _ = transform_frame(sample.copy(), frame_cfg, method="fast")
+
+    def max_diff(cols, wrap=False):
+        a = ref[cols].to_numpy(dtype=float)
+        b = fast[cols].to_numpy(dtype=float)
+        if not np.array_equal(np.isnan(a), np.isnan(b)):
+            return float("inf")
+        d = np.abs(a - b)
+        if wrap:
+            d = np.minimum(d, 360.0 - d)
+        d = d[np.isfinite(d)]
+        return float(d.max()) if d.size else 0.0
+
+    deviations = {
+        "deg": max(max_diff(["l_deg"], wrap=True), max_diff(["b_deg"])),
+        "kpc": max_diff(["x_kpc", "y_kpc", "z_kpc"]),
+        "kms": max_diff(["v_x_kms", "v_y_kms", "v_z_kms"]),
+    }
+    for key, value in deviations.items():
+        if not value <= FAST_TOLERANCE[key]:
+            raise ValueError(
+                f"Fast frame transform deviates from astropy: max |d{key}| = {value:.3e} > {FAST_TOLERANCE[key]:.0e}"
+            )
+    return deviations
+
+
 def write_dataframe(df: pd.DataFrame, path: Path) -> Path:
     path.parent.mkdir(parents=True, exist_ok=True)
     df.to_parquet(path, index=False)
@@ -179,7 +326,10 @@ def main() -> None:
     args = parse_args()
     cfg = build_config(args)
     df = load_dataframe(cfg.interim_root / "gaia_clean.parquet")
-    df, summary = transform_frame(df, cfg.frame_config)
+    if args.method == "fast" and args.validate_rows > 0:
+        deviations = validate_fast_transform(df, cfg.frame_config, rows=args.validate_rows)
+        print("[FRAME] fast path vs astropy: " + ", ".join(f"max|d{k}|={v:.1e}" for k, v in deviations.items()))
+    df, summary = transform_frame(df, cfg.frame_config, method=args.method, chunk_rows=args.chunk_rows)
     write_dataframe(df, cfg.output_path)
     emit_summary(summary, cfg.output_path)
 
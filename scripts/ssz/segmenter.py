@@ -72,3 +72,166 @@ def assign_segments_xy(
     df["ring_id"] = ring_ids
     df["segment_id"] = segment_ids
     return df
+
+
+@dataclass
+class SegmentIndex:
+    """CSR-style index of rows grouped by (ring_id, segment_id).
+
+    ``keys`` holds the occupied (ring_id, segment_id) pairs in sorted order,
+    rows of segment ``k`` are ``order[offsets[k]:offsets[k + 1]]`` and
+    ``slot`` maps every row to its segment, so per-segment reductions are a
+    single ``np.bincount`` pass over the rows instead of a group-by.
+    """
+
+    keys: np.ndarray
+    offsets: np.ndarray
+    order: np.ndarray
+    slot: np.ndarray
+
+    @staticmethod
+    def _codes(ring_ids, segment_ids) -> np.ndarray:
+        ring = np.asarray(ring_ids, dtype=np.int64)
+        seg = np.asarray(segment_ids, dtype=np.int64)
+        if ring.shape != seg.shape:
+            raise ValueError("ring_ids and segment_ids must have the same length")
+        if ring.size and (ring.min() < 0 or seg.min() < 0 or seg.max() >= 2**31):
+            raise ValueError("ring_id and segment_id must be non-negative (segment_id < 2**31)")
+        return (ring << 31) | seg
+
+    @staticmethod
+    def _keys_from_codes(codes: np.ndarray) -> np.ndarray:
+        return np.column_stack([codes >> 31, codes & (2**31 - 1)])
+
+    @staticmethod
+    def _compact(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted unique codes and the slot of every code (bincount when the id range is small)"""
+        if codes.size:
+            ring, seg = codes >> 31, codes & (2**31 - 1)
+            width = int(seg.max()) + 1
+            span = (int(ring.max()) + 1) * width
+            if span <= max(4 * codes.size, 1 << 20):
+                dense = ring * width + seg
+                occupied = np.flatnonzero(np.bincount(dense, minlength=span))
+                lookup = np.empty(span, dtype=np.int64)
+                lookup[occupied] = np.arange(len(occupied), dtype=np.int64)
+                return ((occupied // width) << 31) | (occupied % width), lookup[dense]
+        unique, slot = np.unique(codes, return_inverse=True)
+        return unique, slot.astype(np.int64).ravel()
+
+    @staticmethod
+    def _stable_order(slot: np.ndarray, n_segments: int) -> np.ndarray:
+        # 16-bit keys take NumPy's radix sort (linear) instead of a comparison sort
+        keys = slot.astype(np.uint16) if n_segments <= 2**16 else slot
+        return np.argsort(keys, kind="stable").astype(np.int64)
+
+    @classmethod
+    def build(cls, ring_ids, segment_ids) -> "SegmentIndex":
+        codes = cls._codes(ring_ids, segment_ids)
+        unique, slot = cls._compact(codes)
+        counts = np.bincount(slot, minlength=len(unique))
+        offsets = np.zeros(len(unique) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        order = cls._stable_order(slot, len(unique))
+        return cls(keys=cls._keys_from_codes(unique), offsets=offsets, order=order, slot=slot)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ring_col: str = "ring_id", segment_col: str = "segment_id") -> "SegmentIndex":
+        return cls.build(df[ring_col].to_numpy(), df[segment_col].to_numpy())
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.slot)
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.keys)
+
+    def counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def rows(self, k: int) -> np.ndarray:
+        """Row positions of the k-th segment"""
+        return self.order[self.offsets[k] : self.offsets[k + 1]]
+
+    def sum(self, values) -> tuple[np.ndarray, np.ndarray]:
+        """Per-segment sum and count of the finite values"""
+        values = np.asarray(values, dtype=float)
+        finite = np.isfinite(values)
+        n = self.n_segments
+        if finite.all():
+            return np.bincount(self.slot, weights=values, minlength=n), self.counts().astype(float)
+        slot = self.slot[finite]
+        return (
+            np.bincount(slot, weights=values[finite], minlength=n),
+            np.bincount(slot, minlength=n).astype(float),
+        )
+
+    def mean(self, values) -> np.ndarray:
+        total, count = self.sum(values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / count
+
+    def std(self, values, mean: np.ndarray | None = None) -> np.ndarray:
+        """Per-segment population standard deviation (two passes, no E[x^2]-E[x]^2 cancellation)"""
+        values = np.asarray(values, dtype=float)
+        mean = self.mean(values) if mean is None else mean
+        resid = values - mean[self.slot]
+        total, count = self.sum(resid * resid)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(total / count)
+
+    def stats(
+        self,
+        df: pd.DataFrame,
+        *,
+        density_col: str | None = None,
+        velocity_cols: Iterable[str] = (),
+    ) -> pd.DataFrame:
+        """One row per occupied segment: count, mean density, velocity means and dispersions"""
+        out = pd.DataFrame({"ring_id": self.keys[:, 0], "segment_id": self.keys[:, 1], "count": self.counts()})
+        if density_col is not None:
+            out[f"{density_col}_mean"] = self.mean(df[density_col].to_numpy(dtype=float))
+        for col in velocity_cols:
+            values = df[col].to_numpy(dtype=float)
+            mean = self.mean(values)
+            out[f"{col}_mean"] = mean
+            out[f"{col}_std"] = self.std(values, mean)
+        return out
+
+    def extend(self, ring_ids, segment_ids) -> "SegmentIndex":
+        """Index with new rows appended (row positions continue after the existing rows).
+
+        Existing rows are moved by their new segment offset only; just the
+        new rows are sorted, so the cost is O(N + m log m) for m new rows.
+        """
+        new_codes = self._codes(ring_ids, segment_ids)
+        old_codes = (self.keys[:, 0] << 31) | self.keys[:, 1]
+        unique, new_slot = self._compact(np.concatenate([old_codes, new_codes]))
+        remap, new_slot = new_slot[: len(old_codes)], new_slot[len(old_codes) :]
+
+        old_counts = np.zeros(len(unique), dtype=np.int64)
+        old_counts[remap] = self.counts()
+        add_counts = np.bincount(new_slot, minlength=len(unique))
+        offsets = np.zeros(len(unique) + 1, dtype=np.int64)
+        np.cumsum(old_counts + add_counts, out=offsets[1:])
+
+        order = np.empty(self.n_rows + len(new_slot), dtype=np.int64)
+        # existing rows keep their rank inside the segment
+        old_seg = np.repeat(remap, self.counts())
+        rank = np.arange(self.n_rows, dtype=np.int64) - np.repeat(self.offsets[:-1], self.counts())
+        order[offsets[old_seg] + rank] = self.order
+        # new rows go after them, in arrival order
+        new_order = self._stable_order(new_slot, len(unique))
+        seg_sorted = new_slot[new_order]
+        first = np.searchsorted(seg_sorted, seg_sorted, side="left")
+        new_rank = np.arange(len(seg_sorted), dtype=np.int64) - first
+        order[offsets[seg_sorted] + old_counts[seg_sorted] + new_rank] = self.n_rows + new_order
+
+        slot = np.concatenate([remap[self.slot], new_slot])
+        return SegmentIndex(keys=self._keys_from_codes(unique), offsets=offsets, order=order, slot=slot)
+
+
+def build_segment_index(df: pd.DataFrame, ring_col: str = "ring_id", segment_col: str = "segment_id") -> SegmentIndex:
+    """SegmentIndex for a frame produced by assign_segments_xy (or any ring/segment columns)."""
+    return SegmentIndex.from_frame(df, ring_col, segment_col)
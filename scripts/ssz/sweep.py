@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import itertools
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
@@ -25,26 +27,48 @@ class SweepParams:
     rotation_p: float
 
 
-def load_base_catalog(
-    run_id: str,
-    *,
-    data_root: Path | None = None,
-    model_root: Path | None = None,
-) -> pd.DataFrame:
+def _catalog_path(run_id: str, data_root: Path | None, model_root: Path | None) -> Path:
     model_root = model_root or DEFAULT_MODEL_ROOT
     model_path = model_root / run_id / "ssz_field.parquet"
     if model_path.exists():
-        return pd.read_parquet(model_path)
+        return model_path
 
     data_root = data_root or (ROOT / "data")
     interim_path = data_root / "interim" / "gaia" / run_id / "gaia_phase_space.parquet"
     if interim_path.exists():
-        return pd.read_parquet(interim_path)
+        return interim_path
     raise FileNotFoundError(
         f"Neither cosmology field nor phase-space catalog found for run_id={run_id}"
     )
 
 
+def load_base_catalog(
+    run_id: str,
+    *,
+    data_root: Path | None = None,
+    model_root: Path | None = None,
+) -> pd.DataFrame:
+    return pd.read_parquet(_catalog_path(run_id, data_root, model_root))
+
+
+def load_density_arrays(
+    run_id: str,
+    *,
+    data_root: Path | None = None,
+    model_root: Path | None = None,
+) -> Tuple[np.ndarray, np.ndarray | None]:
+    """Only the density column(s) the sweep needs: (rho, ssz_density or None)."""
+    import pyarrow.parquet as pq
+
+    path = _catalog_path(run_id, data_root, model_root)
+    names = pq.read_schema(path).names
+    density_col = "ssz_density" if "ssz_density" in names else "rho"
+    if density_col not in names:
+        raise KeyError(f"Missing density column: {density_col}")
+    rho = pd.read_parquet(path, columns=[density_col])[density_col].to_numpy(dtype=float)
+    return rho, (rho if density_col == "ssz_density" else None)
+
+
 def _score_fields(df: pd.DataFrame, rotation_weight: float, density_weight: float) -> Dict[str, float]:
     scores = {}
     if "gamma_seg" in df.columns:
@@ -67,18 +91,8 @@ def _scalar_score(scores: Dict[str, float], baseline_weight: float) -> float:
     return baseline_weight * baseline + scores.get("vrot_score", 0.0) + scores.get("density_score", 0.0)
 
 
-def run_sweep(
-    run_id: str,
-    *,
-    params_cfg: Path = DEFAULT_SWEEP_CONFIG,
-    data_root: Path | None = None,
-    model_root: Path | None = None,
-) -> Tuple[pd.DataFrame, Dict[str, float]]:
-    cfg = yaml.safe_load(params_cfg.read_text(encoding="utf-8"))
-    grid = cfg.get("grid", {})
-    scoring_cfg = cfg.get("scoring", {})
-
-    combos: Iterable[SweepParams] = (
+def _grid_combos(grid: Dict[str, List[float]]) -> List[SweepParams]:
+    return [
         SweepParams(alpha=a, beta=b, floor=f, rotation_p=p)
         for a, b, f, p in itertools.product(
             grid.get("alpha", [0.8]),
@@ -86,11 +100,24 @@ def run_sweep(
             grid.get("floor", [0.02]),
             grid.get("rotation_p", [0.5]),
         )
-    )
+    ]
 
-    df_base = load_base_catalog(run_id, data_root=data_root, model_root=model_root)
-    results: List[Dict[str, float]] = []
 
+def _result_row(params: SweepParams, scores: Dict[str, float], scoring_cfg: Dict[str, float]) -> Dict[str, float]:
+    result = {
+        "alpha": params.alpha,
+        "beta": params.beta,
+        "floor": params.floor,
+        "rotation_p": params.rotation_p,
+        "score": _scalar_score(scores, float(scoring_cfg.get("baseline_weight", 1.0))),
+    }
+    result.update(scores)
+    return result
+
+
+def sweep_frames(df_base: pd.DataFrame, combos: Iterable[SweepParams], scoring_cfg: Dict[str, float]) -> List[Dict[str, float]]:
+    """Reference engine: build_cosmo_fields on the full catalog per combination."""
+    results = []
     for params in combos:
         gamma_cfg = {"alpha": params.alpha, "beta": params.beta, "floor": params.floor}
         fields = build_cosmo_fields(
@@ -104,17 +131,152 @@ def run_sweep(
             rotation_weight=float(scoring_cfg.get("rotation_weight", 0.5)),
             density_weight=float(scoring_cfg.get("density_weight", 0.2)),
         )
-        scalar = _scalar_score(scores, float(scoring_cfg.get("baseline_weight", 1.0)))
-        result = {
-            "run_id": run_id,
-            "alpha": params.alpha,
-            "beta": params.beta,
-            "floor": params.floor,
-            "rotation_p": params.rotation_p,
-            "score": scalar,
+        results.append(_result_row(params, scores, scoring_cfg))
+    return results
+
+
+# ───────── array engine ─────────
+# gamma(rho) is monotone in rho for every (alpha, beta, floor) and z(gamma) is
+# monotone in gamma, so the median of z only needs the two middle order
+# statistics of rho, which are found once.
+
+_RHO: np.ndarray | None = None
+_RHO_MID: np.ndarray | None = None
+
+
+def _init_arrays(rho: np.ndarray) -> None:
+    global _RHO, _RHO_MID
+    rho = np.asarray(rho, dtype=float)
+    rho = rho[~np.isnan(rho)]
+    _RHO = rho
+    _RHO_MID = None
+    if rho.size and np.isfinite(rho).all():
+        n = rho.size
+        lo, hi = (n - 1) // 2, n // 2
+        _RHO_MID = np.partition(rho, [lo, hi])[[lo, hi]]
+
+
+def _z_from(gamma: np.ndarray) -> np.ndarray:
+    return 1.0 / np.clip(gamma, 1e-9, None) - 1.0
+
+
+def _sweep_block(
+    beta: float, alphas: List[float], floors: List[float], powers: List[float]
+) -> List[Tuple[float, float, float, float, float, float]]:
+    """(alpha, floor, p, gamma_mean, z_median, vrot_mean) for one beta and the given alphas."""
+    # without +-inf densities no NaN can appear (NaN rows were dropped up front)
+    mean = np.mean if _RHO_MID is not None else np.nanmean
+    scaled = np.power(np.clip(_RHO, 0.0, None), beta)
+    scaled_mid = np.power(np.clip(_RHO_MID, 0.0, None), beta) if _RHO_MID is not None else None
+    out = []
+    for alpha in alphas:
+        decay = np.exp(-alpha * scaled)
+        for floor in floors:
+            if floor <= 0.0 or floor > 1.0:
+                raise ValueError("floor must be within (0, 1]")
+            gamma = np.clip(floor + (1.0 - floor) * decay, floor, 1.0)
+            if not gamma.size:
+                out.extend((alpha, floor, p, np.nan, np.nan, np.nan) for p in powers)
+                continue
+            gamma_mean = float(mean(gamma))
+            if scaled_mid is not None:
+                gamma_mid = np.clip(floor + (1.0 - floor) * np.exp(-alpha * scaled_mid), floor, 1.0)
+                z_median = float(np.mean(_z_from(gamma_mid)))
+            else:
+                z_median = float(np.nanmedian(_z_from(gamma)))
+            inv_gamma = 1.0 / np.clip(gamma, 1e-9, None)
+            for p in powers:
+                vrot_mean = float(mean(np.clip(np.power(inv_gamma, p), 1.0, None)))
+                out.append((alpha, floor, p, gamma_mean, z_median, vrot_mean))
+    return out
+
+
+def _sweep_block_task(args):
+    return args[0], _sweep_block(*args)
+
+
+def sweep_arrays(
+    rho: np.ndarray,
+    grid: Dict[str, List[float]],
+    scoring_cfg: Dict[str, float],
+    *,
+    density: np.ndarray | None = None,
+    workers: int | None = None,
+) -> List[Dict[str, float]]:
+    """
+    Array engine: same rows as sweep_frames, without per-combination DataFrames
+
+    The density is read once, rho**beta is computed once per beta and
+    exp(-alpha rho**beta) once per (alpha, beta); floors and rotation powers
+    reuse it. Per-beta blocks run on a process pool when workers > 1.
+    """
+    rotation_weight = float(scoring_cfg.get("rotation_weight", 0.5))
+    density_weight = float(scoring_cfg.get("density_weight", 0.2))
+    alphas = list(grid.get("alpha", [0.8]))
+    betas = list(grid.get("beta", [0.6]))
+    floors = list(grid.get("floor", [0.02]))
+    powers = list(grid.get("rotation_p", [0.5]))
+
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    # one block per beta; alphas are split further only to keep all workers busy
+    splits = max(1, min(len(alphas), -(-workers // max(1, len(betas)))))
+    blocks = [
+        (beta, part.tolist(), floors, powers)
+        for beta in betas
+        for part in np.array_split(np.asarray(alphas, dtype=object), splits)
+        if len(part)
+    ]
+
+    if workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(blocks)), initializer=_init_arrays, initargs=(rho,)) as pool:
+            block_results = list(pool.map(_sweep_block_task, blocks))
+    else:
+        _init_arrays(rho)
+        block_results = [_sweep_block_task(block) for block in blocks]
+    found: Dict[Tuple[float, float, float, float], Tuple[float, float, float]] = {}
+    for beta, rows in block_results:
+        for alpha, floor, p, gamma_mean, z_median, vrot_mean in rows:
+            found[(alpha, beta, floor, p)] = (gamma_mean, z_median, vrot_mean)
+
+    density_mean = float(np.nanmean(density)) if density is not None else None
+    results = []
+    for params in _grid_combos(grid):
+        gamma_mean, z_median, vrot_mean = found[(params.alpha, params.beta, params.floor, params.rotation_p)]
+        scores = {
+            "gamma_mean": gamma_mean,
+            "z_median": z_median,
+            "vrot_mean": vrot_mean,
+            "vrot_score": float(rotation_weight * vrot_mean),
         }
-        result.update(scores)
-        results.append(result)
+        if density_mean is not None:
+            scores["density_mean"] = density_mean
+            scores["density_score"] = float(density_weight * density_mean)
+        results.append(_result_row(params, scores, scoring_cfg))
+    return results
+
+
+def run_sweep(
+    run_id: str,
+    *,
+    params_cfg: Path = DEFAULT_SWEEP_CONFIG,
+    data_root: Path | None = None,
+    model_root: Path | None = None,
+    engine: str = "arrays",
+    workers: int | None = None,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    cfg = yaml.safe_load(params_cfg.read_text(encoding="utf-8"))
+    grid = cfg.get("grid", {})
+    scoring_cfg = cfg.get("scoring", {})
+
+    if engine == "arrays":
+        rho, density = load_density_arrays(run_id, data_root=data_root, model_root=model_root)
+        rows = sweep_arrays(rho, grid, scoring_cfg, density=density, workers=workers)
+    elif engine == "frames":
+        df_base = load_base_catalog(run_id, data_root=data_root, model_root=model_root)
+        rows = sweep_frames(df_base, _grid_combos(grid), scoring_cfg)
+    else:
+        raise ValueError(f"Unknown sweep engine: {engine}")
+    results: List[Dict[str, float]] = [{"run_id": run_id, **row} for row in rows]
 
     df_results = pd.DataFrame(results)
     report_dir = ROOT / "reports" / run_id
@@ -140,5 +302,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run SSZ parameter sweep")
     parser.add_argument("run_id")
     parser.add_argument("--config", type=Path, default=DEFAULT_SWEEP_CONFIG)
+    parser.add_argument("--engine", choices=["arrays", "frames"], default="arrays",
+                        help="arrays: one density read, array reductions | frames: build_cosmo_fields per combination")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size for --engine arrays")
     args = parser.parse_args()
-    run_sweep(args.run_id, params_cfg=args.config)
+    run_sweep(args.run_id, params_cfg=args.config, engine=args.engine, workers=args.workers)
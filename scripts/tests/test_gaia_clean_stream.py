@@ -0,0 +1,108 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from run_gaia_ssz_pipeline import gather_files
+from scripts.preprocess.gaia_clean_map import CleanConfig, StreamingHistogram, clean_gaia_catalog
+
+
+def _raw_frame(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "source_id": np.arange(n, dtype=np.int64) + seed * 10_000,
+            "ra": rng.uniform(0, 360, n),
+            "ra_error": rng.uniform(0.01, 0.1, n),
+            "dec": rng.uniform(-90, 90, n),
+            "dec_error": rng.uniform(0.01, 0.1, n),
+            "parallax": rng.normal(1.0, 1.5, n),
+            "parallax_error": rng.uniform(0.05, 0.5, n),
+            "pmra": rng.normal(0, 5, n),
+            "pmra_error": rng.uniform(0.01, 0.1, n),
+            "pmdec": rng.normal(0, 5, n),
+            "pmdec_error": rng.uniform(0.01, 0.1, n),
+            "phot_g_mean_mag": rng.uniform(8, 20, n),
+            "bp_rp": rng.uniform(-0.5, 3, n),
+            "ruwe": rng.uniform(0.8, 2.0, n),
+        }
+    )
+    df.loc[::17, "parallax"] = np.nan
+    return df
+
+
+def _config(tmp_path, stream: bool) -> CleanConfig:
+    name = "stream" if stream else "batch"
+    interim, qa = tmp_path / name / "interim", tmp_path / name / "qa"
+    interim.mkdir(parents=True)
+    qa.mkdir(parents=True)
+    return CleanConfig(
+        run_id="t", raw_dir=tmp_path / "raw", interim_dir=interim, qa_dir=qa,
+        sources_config={}, quiet=True, stream=stream, chunk_rows=70,
+    )
+
+
+def test_streaming_matches_batch(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    pq.write_table(pa.Table.from_pandas(_raw_frame(500, 1), preserve_index=False),
+                   raw / "a.parquet", row_group_size=128)
+    _raw_frame(230, 2).drop(columns=["pmdec_error"]).to_csv(raw / "b.csv", index=False)
+
+    batch = pd.read_parquet(clean_gaia_catalog(_config(tmp_path, stream=False)))
+    out = clean_gaia_catalog(_config(tmp_path, stream=True))
+    assert out.is_dir() and len(list(out.glob("part-*.parquet"))) > 2
+    stream = pd.read_parquet(out)
+
+    key = lambda df: df.sort_values("source_id").reset_index(drop=True)
+    assert list(stream.columns) == list(batch.columns)
+    pd.testing.assert_frame_equal(key(stream), key(batch), check_dtype=False)
+    assert (tmp_path / "stream" / "qa" / "parallax_hist.png").exists()
+    assert (tmp_path / "stream" / "qa" / "nan_counts.json").exists()
+
+
+def test_batch_run_replaces_streamed_dataset_and_manifest_hashes_parts(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    _raw_frame(300, 3).to_csv(raw / "a.csv", index=False)
+    cfg = _config(tmp_path, stream=True)
+
+    out = clean_gaia_catalog(cfg)
+    parts = sorted(out.glob("part-*.parquet"))
+    streamed_rows = len(pd.read_parquet(out))
+    entries = gather_files([out, tmp_path / "missing.parquet"])
+    assert [e["path"] for e in entries] == [str(p) for p in parts]
+    assert entries[0]["sha256"] == hashlib.sha256(parts[0].read_bytes()).hexdigest()
+
+    cfg.stream = False
+    again = clean_gaia_catalog(cfg)
+    assert again == out and again.is_file()
+    assert len(pd.read_parquet(again)) == streamed_rows
+    assert gather_files([again])[0]["path"] == str(again)
+
+    cfg.stream = True
+    assert clean_gaia_catalog(cfg).is_dir()
+
+
+def test_streaming_rejects_chunks_with_different_columns(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    _raw_frame(100, 4).to_csv(raw / "a.csv", index=False)
+    _raw_frame(100, 5).drop(columns=["ruwe"]).to_csv(raw / "b.csv", index=False)
+    with pytest.raises(ValueError, match="'ruwe'"):
+        clean_gaia_catalog(_config(tmp_path, stream=True))
+
+
+def test_streaming_histogram_grows_and_keeps_counts():
+    hist = StreamingHistogram(bins=60)
+    rng = np.random.default_rng(0)
+    chunks = [rng.normal(0, 1, 1000), rng.normal(40, 1, 1000), np.array([-100.0, np.nan, np.inf])]
+    for chunk in chunks:
+        hist.update(chunk)
+    assert hist.total == 2001
+    assert hist.lo <= -100.0 and hist.hi >= 45.0
+    counts, edges = hist.trimmed()
+    assert len(edges) == len(counts) + 1 and counts.sum() == 2001
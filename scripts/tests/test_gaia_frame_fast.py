@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.preprocess.gaia_frame_transform import FAST_TOLERANCE, transform_frame, validate_fast_transform
+
+FRAME_CFG = {
+    "icrs_to_galactic": {
+        "solar_radius_kpc": 8.2,
+        "solar_height_pc": 25.0,
+        "solar_motion_kms": {"U": 11.1, "V": 12.24, "W": 7.25},
+    }
+}
+
+
+def _catalog(n: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    distance = rng.uniform(10, 20000, n)
+    distance[::11] = np.nan
+    rv = rng.normal(0, 60, n)
+    rv[::3] = np.nan
+    return pd.DataFrame(
+        {
+            "ra": rng.uniform(0, 360, n),
+            "dec": np.degrees(np.arcsin(rng.uniform(-1, 1, n))),
+            "distance_pc": distance,
+            "pmra": rng.normal(0, 10, n),
+            "pmdec": rng.normal(0, 10, n),
+            "radial_velocity": rv,
+        }
+    )
+
+
+def test_fast_transform_matches_astropy():
+    df = _catalog()
+    ref, ref_summary = transform_frame(df.copy(), FRAME_CFG, method="astropy")
+    fast, fast_summary = transform_frame(df.copy(), FRAME_CFG, method="fast", chunk_rows=700)
+    assert fast_summary == ref_summary
+    for cols, key in ((["b_deg"], "deg"), (["x_kpc", "y_kpc", "z_kpc"], "kpc"), (["v_x_kms", "v_y_kms", "v_z_kms"], "kms")):
+        np.testing.assert_allclose(fast[cols], ref[cols], rtol=0, atol=FAST_TOLERANCE[key])
+    dl = np.abs(fast["l_deg"] - ref["l_deg"])
+    assert (np.minimum(dl, 360 - dl).fillna(0) <= FAST_TOLERANCE["deg"]).all()
+    assert fast["l_deg"].isna().equals(ref["l_deg"].isna())
+
+
+def test_validate_fast_transform_reports_deviation():
+    deviations = validate_fast_transform(_catalog(500), FRAME_CFG, rows=200)
+    assert set(deviations) == {"deg", "kpc", "kms"}
+    with pytest.raises(ValueError):
+        transform_frame(_catalog(10), FRAME_CFG, method="numba")
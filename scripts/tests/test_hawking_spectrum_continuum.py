@@ -20,7 +20,6 @@ import os
 from pathlib import Path
 import numpy as np
 import pandas as pd
-from scipy.optimize import curve_fit
 from scipy.stats import chi2
 
 # UTF-8 Setup (Windows compatibility)
@@ -37,6 +36,8 @@ if sys.platform.startswith('win'):
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from scripts.tools.spectrum_fit import NU_REF, bic_table, fit_source, fit_sources
+
 # Physical constants
 h_planck = 6.62607015e-34  # J·s
 c_light = 299792458.0      # m/s
@@ -44,126 +45,48 @@ k_boltzmann = 1.380649e-23 # J/K
 phi = (1 + 5**0.5) / 2  # Golden ratio (pure Python, no numpy dependency)
 
 
-def planck_spectrum(nu, T, A):
-    """
-    Planck spectrum (thermal, Rayleigh-Jeans approximation for radio/mm)
-    
-    I_ν = A · (2hν³/c²) / (exp(hν/kT) - 1)
-    
-    For T_seg ~ 10^-34 K and ν ~ GHz-THz:
-    hν << kT → Rayleigh-Jeans: I_ν ≈ A · (2ν²kT/c²)
-    """
-    x = (h_planck * nu) / (k_boltzmann * T)
-    
-    # Avoid overflow for very small T
-    if T < 1e-30:
-        # Rayleigh-Jeans limit
-        return A * (2 * nu**2 * k_boltzmann * T) / c_light**2
-    
-    # Full Planck (but will saturate to RJ for our T_seg)
-    # Safeguard against overflow in exp()
-    x_safe = np.clip(x, -700, 700)  # exp(700) ≈ 1e304, within float64 range
-    return A * (2 * h_planck * nu**3 / c_light**2) / (np.exp(x_safe) - 1 + 1e-100)
+# Thermal/non-thermal fits as in the original curve_fit setup:
+# T in [1e-35, 1e-10] K seeded at 1e-30 K, α in [-5, 5]
+SPECTRUM_MODELS = ('planck', 'powerlaw')
+T_SEED = 1e-30
+FIT_BOUNDS = {
+    'planck': ([1e-35, 0], [1e-10, np.inf]),
+    'powerlaw': ([0, -5], [np.inf, 5]),
+}
 
 
-def power_law_spectrum(nu, alpha, A):
-    """
-    Non-thermal power-law spectrum
-    
-    F_ν = A · ν^α
-    
-    Typical for synchrotron, inverse Compton, etc.
+def summarize_fits(fits):
     """
-    return A * nu**alpha
+    Convert spectrum_fit results into the thermal/powerlaw result dicts
 
-
-def broken_power_law_spectrum(nu, alpha1, alpha2, nu_break, A):
-    """
-    Broken power-law spectrum
-    
-    F_ν = A · ν^α1  for ν < ν_break
-    F_ν = A · (ν_break^(α1-α2)) · ν^α2  for ν ≥ ν_break
+    Power-law amplitudes are reported for F_ν = A · ν^α (ν in Hz).
     """
-    mask = nu < nu_break
-    result = np.zeros_like(nu)
-    result[mask] = A * nu[mask]**alpha1
-    result[~mask] = A * (nu_break**(alpha1 - alpha2)) * nu[~mask]**alpha2
-    return result
-
-
-def calculate_bic(chi_squared, n_params, n_data):
-    """
-    Bayesian Information Criterion
-    
-    BIC = χ² + k·ln(n)
-    where k = number of parameters, n = number of data points
-    """
-    return chi_squared + n_params * np.log(n_data)
+    results = {}
+    for key, model in (('thermal', 'planck'), ('powerlaw', 'powerlaw')):
+        fit = fits[model]
+        if not fit['success']:
+            print(f"  ⚠️  {model} fit failed: {fit['message']}")
+            results[key] = {'success': False, 'bic': np.inf}
+            continue
+        params = fit['params']
+        results[key] = {'chi2': fit['chi2'], 'bic': fit['bic'], 'success': True}
+        if model == 'planck':
+            results[key].update(T_fit=params['T'], A_fit=params['A'])
+        else:
+            results[key].update(alpha_fit=params['alpha'],
+                                A_fit=params['A'] * NU_REF**(-params['alpha']))
+    return results
 
 
 def fit_spectrum_models(nu, F_nu, sigma):
     """
     Fit both thermal (Planck-like) and non-thermal (power-law) models
-    
+
     Returns:
         dict with fit results, chi², BIC for each model
     """
-    results = {}
-    
-    # Model 1: Thermal (Planck-like with effective temperature)
-    # For very low T_seg, this becomes essentially constant or linear in ν²
-    try:
-        # Initial guess: T ~ 1e-30 K (closer to observable than T_seg ~ 1e-34)
-        p0_thermal = [1e-30, 1e-20]  # [T, A]
-        popt_thermal, pcov_thermal = curve_fit(
-            planck_spectrum, nu, F_nu, p0=p0_thermal, sigma=sigma,
-            bounds=([1e-35, 0], [1e-10, np.inf]),
-            maxfev=10000
-        )
-        
-        F_model_thermal = planck_spectrum(nu, *popt_thermal)
-        residuals_thermal = (F_nu - F_model_thermal) / sigma
-        chi2_thermal = np.sum(residuals_thermal**2)
-        bic_thermal = calculate_bic(chi2_thermal, n_params=2, n_data=len(nu))
-        
-        results['thermal'] = {
-            'T_fit': popt_thermal[0],
-            'A_fit': popt_thermal[1],
-            'chi2': chi2_thermal,
-            'bic': bic_thermal,
-            'success': True
-        }
-    except Exception as e:
-        print(f"  ⚠️  Thermal fit failed: {e}")
-        results['thermal'] = {'success': False, 'bic': np.inf}
-    
-    # Model 2: Non-thermal (simple power-law)
-    try:
-        # Initial guess: α ~ -0.5 (typical for some sources), A ~ median flux
-        p0_powerlaw = [-0.5, np.median(F_nu)]
-        popt_powerlaw, pcov_powerlaw = curve_fit(
-            power_law_spectrum, nu, F_nu, p0=p0_powerlaw, sigma=sigma,
-            bounds=([-5, 0], [5, np.inf]),
-            maxfev=10000
-        )
-        
-        F_model_powerlaw = power_law_spectrum(nu, *popt_powerlaw)
-        residuals_powerlaw = (F_nu - F_model_powerlaw) / sigma
-        chi2_powerlaw = np.sum(residuals_powerlaw**2)
-        bic_powerlaw = calculate_bic(chi2_powerlaw, n_params=2, n_data=len(nu))
-        
-        results['powerlaw'] = {
-            'alpha_fit': popt_powerlaw[0],
-            'A_fit': popt_powerlaw[1],
-            'chi2': chi2_powerlaw,
-            'bic': bic_powerlaw,
-            'success': True
-        }
-    except Exception as e:
-        print(f"  ⚠️  Power-law fit failed: {e}")
-        results['powerlaw'] = {'success': False, 'bic': np.inf}
-    
-    return results
+    return summarize_fits(fit_source(nu, F_nu, sigma, SPECTRUM_MODELS,
+                                     T_seed=T_SEED, bounds=FIT_BOUNDS))
 
 
 def load_continuum_spectrum(csv_path):
@@ -292,6 +215,10 @@ def test_hawking_spectrum_continuum():
     
     print(f"Sources found: {len(sources)}")
     
+    # Fit all sources at once (process pool), one BIC table for the summary
+    source_fits = fit_sources(sources, SPECTRUM_MODELS, T_seed=T_SEED,
+                              bounds=FIT_BOUNDS, table=False)
+    
     all_results = {}
     
     for source_name, source_data in sources.items():
@@ -336,11 +263,7 @@ def test_hawking_spectrum_continuum():
         # Fit models
         print(f"\nFitting spectral models...")
         
-        fit_results = fit_spectrum_models(
-            source_data['nu_Hz'],
-            source_data['F_Jy'],
-            source_data['sigma_Jy']
-        )
+        fit_results = summarize_fits(source_fits[source_name])
         
         # Results
         print(f"\nModel Comparison:")
@@ -401,6 +324,11 @@ def test_hawking_spectrum_continuum():
     print("SUMMARY:")
     print("="*80)
     
+    table = bic_table(source_fits)
+    if not table.empty:
+        print(table[['source', 'model', 'chi2', 'bic', 'delta_bic']].to_string(index=False))
+        print("")
+    
     if all_results:
         thermal_count = sum(1 for r in all_results.values() if r['preference'] == 'thermal')
         total = len(all_results)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from scripts.analysis import redshift_robustness as rr
+
+
+@pytest.mark.parametrize("n", [2, 3, 10, 11, 58])
+def test_leave_one_out_medians_match_brute_force(n):
+    x = np.round(np.random.default_rng(n).normal(size=n), 1)  # ties included
+    expected = [np.median(np.delete(np.sort(x), i)) for i in range(n)]
+    np.testing.assert_array_equal(rr.leave_one_out_medians(x), expected)
+
+
+def test_jackknife_analysis_matches_leave_one_out_loop():
+    data = np.random.default_rng(0).normal(0.0, 0.01, 301)
+    result = rr.jackknife_analysis(data)
+    theta = np.array([np.median(np.abs(np.delete(data, i))) for i in range(len(data))])
+    n = len(data)
+    assert result["jackknife_mean"] == pytest.approx(theta.mean(), rel=1e-12)
+    assert result["bias"] == pytest.approx((n - 1) * (theta.mean() - np.median(np.abs(data))), abs=1e-15)
+    assert result["variance"] == pytest.approx((n - 1) / n * np.sum((theta - theta.mean())**2), rel=1e-9)
+
+
+def test_bootstrap_medians_distribution_and_workers():
+    x = np.random.default_rng(1).normal(size=7)
+    medians = rr.bootstrap_medians(x, 100_000, seed=1)
+    reference = np.median(x[np.random.default_rng(2).integers(0, 7, (100_000, 7))], axis=1)
+    for value in np.unique(reference):
+        assert (medians == value).mean() == pytest.approx((reference == value).mean(), abs=0.01)
+
+    y = np.random.default_rng(3).normal(size=20_000)
+    serial = rr.bootstrap_medians(y, 600, seed=4, workers=1)
+    np.testing.assert_array_equal(serial, rr.bootstrap_medians(y, 600, seed=4, workers=2))
+
+
+def test_bootstrap_medians_completes_out_of_window_resamples(monkeypatch):
+    y = np.random.default_rng(5).normal(size=20_000)
+    wide = rr.bootstrap_medians(y, 3000, seed=6)
+    monkeypatch.setattr(rr, "WINDOW_SIGMAS", 0.3)
+    narrow = rr.bootstrap_medians(y, 3000, seed=6)
+    assert narrow.std() == pytest.approx(wide.std(), rel=0.1)
+    assert narrow.mean() == pytest.approx(wide.mean(), abs=3 * wide.std() / np.sqrt(3000) * 2)
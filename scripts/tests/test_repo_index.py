@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from scripts.tools.repo_index import RepoIndex
+
+FILES = {
+    "README.md": "# SSZ\nSee [the guide](docs/GUIDE.md) and <notes.txt>.\nEscape velocity v_esc = sqrt(2*G*M/r)\n",
+    "docs/GUIDE.md": "Metric A(r) = 1 - r_s/r, PPN beta = gamma = 1\n",
+    "core/velocity.py": "def escape_velocity(M, r):\n    return sqrt(2*G*M/r)  # v_esc\n",
+    "core/metric.py": "g_tt = -(1 - r_s/r)\nA_r = 1 - r_s / r\n",
+    "core/ppn.py": "PPN_BETA = 1.0\nppn_gamma = 1.0\n",
+    "venv/skip.py": "v_esc = 0\n",
+    "core/data.csv": "v_esc\n",
+}
+
+NEEDLES = ["v_esc", "escape", "velocity", "sqrt(2*g*m", "A(r)", "1 - r_s/r", "g_tt", "ppn",
+           "PPN", "beta", "esc", "_r", "r_s/", "(2*", "zz", "gamma = 1", "a_"]
+
+
+def _write(root, files):
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    _write(root, FILES)
+    return root
+
+
+def _index(root, tmp_path):
+    return RepoIndex(root, exclude_dirs={"venv"}, cache_path=tmp_path / "cache" / "index.pkl", workers=2)
+
+
+def test_build_lists_files_and_links(tree, tmp_path):
+    index = _index(tree, tmp_path)
+    assert index.files() == ["README.md", "core/metric.py", "core/ppn.py", "core/velocity.py", "docs/GUIDE.md"]
+    assert index.files(".md") == ["README.md", "docs/GUIDE.md"]
+    assert index.text("core/ppn.py") == FILES["core/ppn.py"]
+    assert index.links("README.md") == [
+        {"text": "the guide", "url": "docs/GUIDE.md", "type": "markdown"},
+        {"text": "notes.txt", "url": "notes.txt", "type": "angle_bracket"},
+    ]
+    assert index.links("core/ppn.py") == []
+    assert index.files_read == 5 and index.files_cached == 0
+
+
+def test_containing_matches_substring_scan(tree, tmp_path):
+    index = _index(tree, tmp_path)
+    py_files = index.files(".py")
+    for needle in NEEDLES:
+        expected = {rel for rel in index.files() if needle.lower() in index.lower(rel)}
+        assert index.containing(needle) == expected, needle
+        assert index.containing(needle, py_files) == expected & set(py_files), needle
+
+
+def test_with_term_and_first_line(tree, tmp_path):
+    index = _index(tree, tmp_path)
+    assert index.with_term("PPN") == {"docs/GUIDE.md"}  # PPN_BETA / ppn_gamma are other tokens
+    assert index.with_term("esc") == set()
+    assert index.first_line("core/velocity.py", "V_ESC") == (2, "    return sqrt(2*G*M/r)  # v_esc")
+    assert index.first_line("core/velocity.py", "missing") is None
+
+
+def test_reload_from_cache_reads_only_changed_files(tree, tmp_path):
+    first = _index(tree, tmp_path)
+    assert (tmp_path / "cache" / "index.pkl").is_file()
+
+    again = _index(tree, tmp_path)
+    assert again.files_read == 0 and again.files_cached == 5
+    for needle in NEEDLES:
+        assert again.containing(needle) == first.containing(needle), needle
+
+    path = tree / "core" / "ppn.py"
+    path.write_text("escape_hatch = True\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    (tree / "README.md").unlink()
+    updated = _index(tree, tmp_path)
+    assert updated.files_read == 1 and updated.files_cached == 3
+    assert updated.containing("escape") == {"core/ppn.py", "core/velocity.py"}
+    assert updated.with_term("ppn") == {"docs/GUIDE.md"}
@@ -70,3 +70,39 @@ def test_segment_counts_grow():
     print("="*80)
     
     assert counts==sorted(counts), "Segments should not shrink with ring index"
+
+
+def test_segment_index_matches_groupby():
+    """Per-segment statistics from the CSR segment index equal a pandas group-by"""
+    from scripts.ssz.segmenter import build_segment_index
+
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({"x": rng.normal(0, 300, 4000), "y": rng.normal(0, 300, 4000),
+                       "rho": rng.lognormal(0, 1, 4000), "vx": rng.normal(0, 20, 4000)})
+    df.loc[::9, "vx"] = np.nan
+    seg = assign_segments_xy(df, "x", "y", params=SegParams(rings=8, r_max_pc=900))
+    index = build_segment_index(seg)
+    stats = index.stats(seg, density_col="rho", velocity_cols=["vx"])
+
+    ref = seg.groupby(["ring_id", "segment_id"]).agg(
+        count=("rho", "size"), rho_mean=("rho", "mean"), vx_mean=("vx", "mean"),
+        vx_std=("vx", lambda v: v.std(ddof=0))).reset_index()
+    assert stats[["ring_id", "segment_id", "count"]].to_numpy().tolist() == ref[["ring_id", "segment_id", "count"]].to_numpy().tolist()
+    np.testing.assert_allclose(stats[["rho_mean", "vx_mean", "vx_std"]], ref[["rho_mean", "vx_mean", "vx_std"]], rtol=1e-10)
+    for k in range(index.n_segments):
+        rows = seg.iloc[index.rows(k)]
+        assert (rows["ring_id"] == index.keys[k, 0]).all() and (rows["segment_id"] == index.keys[k, 1]).all()
+
+
+def test_segment_index_extend_equals_rebuild():
+    """Appending rows incrementally gives the same index as building from scratch"""
+    from scripts.ssz.segmenter import SegmentIndex
+
+    rng = np.random.default_rng(6)
+    ring = rng.integers(0, 6, 3000)
+    segment = rng.integers(0, 12, 3000)
+    ring[2500:] = 9  # segments that only appear in the appended rows
+    index = SegmentIndex.build(ring[:2000], segment[:2000]).extend(ring[2000:], segment[2000:])
+    full = SegmentIndex.build(ring, segment)
+    for field in ("keys", "offsets", "order", "slot"):
+        np.testing.assert_array_equal(getattr(index, field), getattr(full, field))
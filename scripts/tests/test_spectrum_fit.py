@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from scripts.tools.spectrum_fit import (
+    MODEL_FUNCS, MODEL_PARAMS, calculate_bic, fit_source, fit_sources, loglinear_powerlaw, powerlaw,
+)
+
+NU = np.logspace(10, 15, 40)
+
+
+@pytest.mark.parametrize("model,params", [
+    ("planck", [30.0, 2.0]),
+    ("powerlaw", [3.0, -0.7]),
+    ("broken_powerlaw", [2.0, -0.3, -1.2, 3e12]),
+])
+def test_analytic_jacobians_match_finite_differences(model, params):
+    func, jac = MODEL_FUNCS[model]
+    J = jac(NU, *params)
+    assert J.shape == (len(NU), len(MODEL_PARAMS[model]))
+    for i, p in enumerate(params):
+        hi, lo = list(params), list(params)
+        hi[i], lo[i] = p * (1 + 1e-6), p * (1 - 1e-6)
+        numeric = (func(NU, *hi) - func(NU, *lo)) / (2e-6 * p)
+        np.testing.assert_allclose(J[:, i], numeric, rtol=1e-5, atol=1e-9 * np.abs(numeric).max())
+
+
+def test_loglinear_powerlaw_is_exact_for_noiseless_data():
+    flux = powerlaw(NU, 2.5, -0.8)
+    A, alpha = loglinear_powerlaw(NU, flux, 0.1 * flux)
+    assert A == pytest.approx(2.5, rel=1e-10)
+    assert alpha == pytest.approx(-0.8, rel=1e-10)
+
+
+def test_fit_sources_table_matches_per_source_fits():
+    rng = np.random.default_rng(3)
+    sources = {}
+    for i in range(4):
+        flux = powerlaw(NU, 1.0 + i, -0.5 - 0.1 * i)
+        sigma = 0.05 * flux
+        sources[f"src{i}"] = (NU, flux + sigma * rng.normal(size=NU.size), sigma)
+
+    table = fit_sources(sources, T_seed=1e3, workers=2)
+    assert len(table) == 4 * 3
+    for name, (nu, flux, sigma) in sources.items():
+        fits = fit_source(nu, flux, sigma, T_seed=1e3)
+        rows = table[table["source"] == name].set_index("model")
+        for model, fit in fits.items():
+            assert rows.loc[model, "bic"] == pytest.approx(fit["bic"], rel=1e-9)
+            assert fit["bic"] == pytest.approx(calculate_bic(fit["chi2"], fit["n_params"], NU.size))
+        assert rows.loc["powerlaw", "alpha"] == pytest.approx(-0.5 - 0.1 * int(name[-1]), abs=0.02)
+        assert rows["delta_bic"].min() == 0.0
+        assert rows.loc["planck", "delta_bic"] > 10
+
+
+def test_fit_model_reports_underdetermined_fits():
+    fits = fit_source(NU[:3], np.ones(3), np.ones(3))
+    assert fits["powerlaw"]["success"]
+    assert not fits["broken_powerlaw"]["success"]
+    assert fits["broken_powerlaw"]["bic"] == np.inf
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from scripts.ssz.sweep import _grid_combos, sweep_arrays, sweep_frames
+
+GRID = {"alpha": [0.7, 1.0], "beta": [0.5, 0.6], "floor": [0.01, 0.05], "rotation_p": [0.4, 0.6]}
+SCORING = {"baseline_weight": 1.0, "rotation_weight": 0.5, "density_weight": 0.2}
+
+
+def _frame(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    rho = rng.lognormal(0.0, 1.0, n)
+    rho[::7] = np.nan
+    rho[::11] = -0.5
+    return pd.DataFrame({"ssz_density": rho})
+
+
+def test_array_engine_matches_frames():
+    for n in (400, 401):
+        df = _frame(n)
+        ref = pd.DataFrame(sweep_frames(df, _grid_combos(GRID), SCORING))
+        rho = df["ssz_density"].to_numpy()
+        fast = pd.DataFrame(sweep_arrays(rho, GRID, SCORING, density=rho, workers=1))
+        assert list(fast.columns) == list(ref.columns)
+        assert len(fast) == len(ref) == 16
+        np.testing.assert_allclose(fast.to_numpy(float), ref.to_numpy(float), rtol=1e-12, atol=0)
+
+
+def test_array_engine_parallel_matches_serial():
+    rho = _frame(300)["ssz_density"].to_numpy()
+    serial = sweep_arrays(rho, GRID, SCORING, workers=1)
+    parallel = sweep_arrays(rho, GRID, SCORING, workers=2)
+    assert serial == parallel
+    assert "density_mean" not in serial[0]
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared Repository Index
+
+One pass over the repository for the documentation/formula audit scripts:
+- Markdown and Python files are discovered once (shared directory exclusions)
+- Contents are read in parallel and kept in memory
+- The index is persisted under agent_out/cache/ and only files whose
+  size or mtime changed are read again on the next run
+- Per file: text, lowercased lines, word tokens and Markdown links
+- Inverted term index (token -> files) for term lookups; partial words are
+  resolved through a sorted vocabulary (prefix/suffix) and a trigram index
+
+Usage:
+    from scripts.tools.repo_index import get_index
+
+    index = get_index()
+    for rel in index.files('.md'):
+        text = index.text(rel)
+        links = index.links(rel)
+
+© 2025 Carmen Wrede, Lino Casu
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import pickle
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+REPO = Path(__file__).resolve().parents[2]
+
+INDEX_VERSION = 1
+EXTENSIONS = ('.md', '.py')
+EXCLUDE_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv'}
+CACHE_PATH = REPO / 'agent_out' / 'cache' / 'repo_index.pkl'
+
+# [text](url) and <file.ext> links, as in audit_cross_references.py
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
+ANGLE_LINK_PATTERN = re.compile(r'<([^>]+\.(md|pdf|py|csv|txt))>')
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def read_text(path: Path) -> str:
+    """File contents exactly as the audit scripts read them (UTF-8, replace, universal newlines)"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def extract_links(text: str) -> List[Tuple[str, str, str]]:
+    """(text, url, type) for every [text](url) and <file.ext> link in a Markdown text"""
+    links = [(t, u, 'markdown') for t, u in LINK_PATTERN.findall(text)]
+    links.extend((u, u, 'angle_bracket') for u, _ in ANGLE_LINK_PATTERN.findall(text))
+    return links
+
+
+class _Entry:
+    __slots__ = ('size', 'mtime_ns', 'text', 'links', 'terms', '_lower', '_lower_lines', '_tokens')
+
+    def __init__(self, size: int, mtime_ns: int, text: str, links, terms: frozenset):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.text = text
+        self.links = links
+        self.terms = terms
+        self._lower = None
+        self._lower_lines = None
+        self._tokens = None
+
+    def __getstate__(self):
+        return (self.size, self.mtime_ns, self.text, self.links, self.terms)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+def _load_entry(path: Path, size: int, mtime_ns: int) -> _Entry:
+    text = read_text(path)
+    links = extract_links(text) if path.suffix == '.md' else []
+    terms = frozenset(TOKEN_PATTERN.findall(text.lower()))
+    return _Entry(size, mtime_ns, text, links, terms)
+
+
+class RepoIndex:
+    """
+    In-memory index of the repository's Markdown and Python files
+
+    Paths are repository-relative POSIX strings in sorted order.
+    """
+
+    def __init__(self, root: Path = REPO, extensions: Iterable[str] = EXTENSIONS,
+                 exclude_dirs: Iterable[str] = EXCLUDE_DIRS, cache_path: Optional[Path] = CACHE_PATH,
+                 workers: Optional[int] = None):
+        self.root = Path(root).resolve()
+        self.extensions = tuple(extensions)
+        self.exclude_dirs = set(exclude_dirs)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.entries: Dict[str, _Entry] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self._vocab: List[str] = []
+        self._vocab_rev: List[str] = []
+        self._grams: Optional[Dict[str, Set[str]]] = None
+        self.files_read = 0
+        self.files_cached = 0
+        self.build()
+
+    # ───────── construction ─────────
+
+    def _walk(self) -> Dict[str, os.stat_result]:
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in self.exclude_dirs]
+            for name in filenames:
+                if name.endswith(self.extensions):
+                    full = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(full)
+                    except OSError:
+                        continue
+                    found[Path(full).relative_to(self.root).as_posix()] = st
+        return found
+
+    def _load_cache(self) -> Dict[str, _Entry]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            return {}
+        if data.get('version') != INDEX_VERSION or data.get('root') != str(self.root) \
+                or tuple(data.get('extensions', ())) != self.extensions:
+            return {}
+        return data.get('entries', {})
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix('.tmp')
+            with open(tmp, 'wb') as f:
+                pickle.dump({'version': INDEX_VERSION, 'root': str(self.root),
+                             'extensions': self.extensions, 'entries': self.entries},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass
+
+    def build(self) -> None:
+        """Scan the tree, reuse unchanged cached entries and read the rest in parallel"""
+        found = self._walk()
+        cached = self._load_cache()
+
+        entries: Dict[str, _Entry] = {}
+        stale: List[Tuple[str, os.stat_result]] = []
+        for rel in sorted(found):
+            st = found[rel]
+            old = cached.get(rel)
+            if old is not None and old.size == st.st_size and old.mtime_ns == st.st_mtime_ns:
+                entries[rel] = old
+            else:
+                stale.append((rel, st))
+
+        def load(item):
+            rel, st = item
+            try:
+                return rel, _load_entry(self.root / rel, st.st_size, st.st_mtime_ns)
+            except OSError:
+                return rel, None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for rel, entry in pool.map(load, stale):
+                if entry is not None:
+                    entries[rel] = entry
+
+        self.files_read = len(stale)
+        self.files_cached = len(found) - len(stale)
+        self.entries = {rel: entries[rel] for rel in sorted(entries)}
+        self.postings = {}
+        for rel, entry in self.entries.items():
+            for term in entry.terms:
+                self.postings.setdefault(term, set()).add(rel)
+        self._vocab = sorted(self.postings)
+        self._vocab_rev = sorted(term[::-1] for term in self.postings)
+        self._grams = None
+        if stale or len(cached) != len(self.entries):
+            self._save_cache()
+
+    # ───────── per-file access ─────────
+
+    def files(self, suffix: Optional[str] = None) -> List[str]:
+        """Indexed paths, optionally only those ending with suffix (e.g. '.md', '.pdf.md')"""
+        if suffix is None:
+            return list(self.entries)
+        return [rel for rel in self.entries if rel.endswith(suffix)]
+
+    def path(self, rel: str) -> Path:
+        return self.root / rel
+
+    def __contains__(self, rel: str) -> bool:
+        return rel in self.entries
+
+    def size(self, rel: str) -> int:
+        return self.entries[rel].size
+
+    def text(self, rel: str) -> str:
+        return self.entries[rel].text
+
+    def lower(self, rel: str) -> str:
+        entry = self.entries[rel]
+        if entry._lower is None:
+            entry._lower = entry.text.lower()
+        return entry._lower
+
+    def lines(self, rel: str) -> List[str]:
+        return self.entries[rel].text.split('\n')
+
+    def lower_lines(self, rel: str) -> List[str]:
+        entry = self.entries[rel]
+        if entry._lower_lines is None:
+            entry._lower_lines = self.lower(rel).split('\n')
+        return entry._lower_lines
+
+    def tokens(self, rel: str) -> List[str]:
+        """Lowercased word tokens in document order"""
+        entry = self.entries[rel]
+        if entry._tokens is None:
+            entry._tokens = TOKEN_PATTERN.findall(self.lower(rel))
+        return entry._tokens
+
+    def links(self, rel: str) -> List[Dict[str, str]]:
+        """Markdown links of a file as {'text', 'url', 'type'} dicts (type: markdown | angle_bracket)"""
+        return [{'text': t, 'url': u, 'type': kind} for t, u, kind in self.entries[rel].links]
+
+    # ───────── term lookup ─────────
+
+    def with_term(self, term: str) -> Set[str]:
+        """Files containing term as a whole word token (case-insensitive)"""
+        return set(self.postings.get(term.lower(), ()))
+
+    @staticmethod
+    def _with_prefix(vocab: List[str], prefix: str) -> List[str]:
+        lo = bisect.bisect_left(vocab, prefix)
+        hi = bisect.bisect_left(vocab, prefix + '\U0010ffff')
+        return vocab[lo:hi]
+
+    def _terms_with_substring(self, part: str) -> Iterable[str]:
+        """Vocabulary terms containing part (trigram index, built on first use)"""
+        if len(part) < 3:
+            return [term for term in self._vocab if part in term]
+        if self._grams is None:
+            self._grams = {}
+            for term in self._vocab:
+                for i in range(len(term) - 2):
+                    self._grams.setdefault(term[i:i + 3], set()).add(term)
+        grams = sorted((self._grams.get(part[i:i + 3], set()) for i in range(len(part) - 2)), key=len)
+        return [term for term in set.intersection(*grams) if part in term]
+
+    def terms_matching(self, part: str, whole_start: bool, whole_end: bool) -> Iterable[str]:
+        """
+        Vocabulary terms that can contain part
+
+        whole_start / whole_end: the part starts / ends at a token boundary,
+        i.e. it is a prefix / suffix of the token (both: the token itself).
+        """
+        if whole_start and whole_end:
+            return [part] if part in self.postings else []
+        if whole_start:
+            return self._with_prefix(self._vocab, part)
+        if whole_end:
+            return [term[::-1] for term in self._with_prefix(self._vocab_rev, part[::-1])]
+        return self._terms_with_substring(part)
+
+    def containing(self, needle: str, candidates: Optional[Iterable[str]] = None) -> Set[str]:
+        """
+        Files whose lowercased text contains needle as a substring
+
+        Every word part of the needle lies inside one token of a matching
+        file; parts enclosed by non-word characters of the needle are whole
+        tokens, the first/last parts are suffixes/prefixes of one. The parts
+        are looked up in the vocabulary indexes and intersected before the
+        substring check (pure word needles need no text scan at all).
+        """
+        needle = needle.lower()
+        parts = list(TOKEN_PATTERN.finditer(needle))
+        pool = set(self.entries) if candidates is None else set(candidates)
+        for match in parts:
+            hits = set()
+            for term in self.terms_matching(match.group(), match.start() > 0, match.end() < len(needle)):
+                hits |= self.postings[term]
+            pool &= hits
+        if len(parts) == 1 and parts[0].group() == needle:
+            return pool
+        return {rel for rel in pool if needle in self.lower(rel)}
+
+    def first_line(self, rel: str, needle: str) -> Optional[Tuple[int, str]]:
+        """(1-based line number, original line) of the first line containing needle (case-insensitive)"""
+        needle = needle.lower()
+        for i, line in enumerate(self.lower_lines(rel)):
+            if needle in line:
+                return i + 1, self.lines(rel)[i]
+        return None
+
+
+_INDEXES: Dict[str, RepoIndex] = {}
+
+
+def get_index(root: Path = REPO) -> RepoIndex:
+    """Process-wide shared index for root (built on first use)"""
+    key = str(Path(root).resolve())
+    if key not in _INDEXES:
+        _INDEXES[key] = RepoIndex(root)
+    return _INDEXES[key]
+
+
+if __name__ == '__main__':
+    import time
+    t0 = time.perf_counter()
+    idx = get_index()
+    print(f"{len(idx.entries)} files indexed ({idx.files_read} read, {idx.files_cached} from cache), "
+          f"{len(idx.postings)} terms, {time.perf_counter() - t0:.2f} s -> {idx.cache_path}")
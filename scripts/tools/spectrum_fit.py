@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batched Spectrum-Model Fitting Engine
+
+Shared fitting code for the Hawking/continuum spectrum tests:
+- Power law is fitted as a weighted linear regression in log space
+  (log F = log A + α·log(ν/ν₀)) and polished on the linear χ²
+- Planck and broken power law use analytic Jacobians (no finite differences)
+- All sources are fitted in a process pool
+- Results are collected into one BIC table (source × model)
+
+Usage:
+    from scripts.tools.spectrum_fit import fit_sources
+
+    table = fit_sources({'M87*': (nu_Hz, F_Jy, sigma_Jy)},
+                        models=('planck', 'powerlaw', 'broken_powerlaw'))
+    print(table[['source', 'model', 'chi2', 'bic', 'delta_bic']])
+
+© 2025 Carmen Wrede, Lino Casu
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import curve_fit
+
+# Physical constants (SI)
+H_PLANCK = 6.62607015e-34   # J·s
+K_BOLTZMANN = 1.380649e-23  # J/K
+C_LIGHT = 299792458.0       # m/s
+
+NU_REF = 1e11  # Reference frequency of the power-law amplitudes (100 GHz)
+
+MODEL_PARAMS = {
+    'planck': ('T', 'A'),
+    'powerlaw': ('A', 'alpha'),
+    'broken_powerlaw': ('A', 'alpha1', 'alpha2', 'nu_break'),
+}
+DEFAULT_MODELS = ('planck', 'powerlaw', 'broken_powerlaw')
+DEFAULT_BOUNDS = {
+    'planck': ([1e-35, 0.0], [1e10, np.inf]),
+    'powerlaw': ([0.0, -10.0], [np.inf, 10.0]),
+    'broken_powerlaw': ([0.0, -10.0, -10.0, 0.0], [np.inf, 10.0, 10.0, np.inf]),
+}
+MAXFEV = 20000
+
+
+# ───────── models and Jacobians ─────────
+
+def planck(nu, T, A):
+    """
+    Planck spectrum: I_ν = A · (2hν³/c²) / (exp(hν/kT) - 1)
+
+    Uses expm1, so the Rayleigh-Jeans (hν << kT) and Wien (hν >> kT,
+    underflows to 0) limits need no special cases.
+    """
+    nu = np.asarray(nu, dtype=float)
+    x = H_PLANCK * nu / (K_BOLTZMANN * T)
+    with np.errstate(over='ignore'):
+        return A * (2 * H_PLANCK * nu**3 / C_LIGHT**2) / np.expm1(x)
+
+
+def planck_jac(nu, T, A):
+    """
+    Jacobian of planck() with respect to (T, A)
+
+    ∂I/∂A = I/A
+    ∂I/∂T = I/T · x / (1 - exp(-x)),  x = hν/kT
+    """
+    nu = np.asarray(nu, dtype=float)
+    x = H_PLANCK * nu / (K_BOLTZMANN * T)
+    with np.errstate(over='ignore'):
+        shape = (2 * H_PLANCK * nu**3 / C_LIGHT**2) / np.expm1(x)
+    d_T = A * shape / T * (x / -np.expm1(-x))
+    return np.column_stack([np.nan_to_num(d_T), shape])
+
+
+def powerlaw(nu, A, alpha, nu_ref=NU_REF):
+    """Power law: F_ν = A · (ν/ν₀)^α"""
+    return A * (np.asarray(nu, dtype=float) / nu_ref)**alpha
+
+
+def powerlaw_jac(nu, A, alpha, nu_ref=NU_REF):
+    """Jacobian of powerlaw() with respect to (A, α): (F/A, F·ln(ν/ν₀))"""
+    u = np.asarray(nu, dtype=float) / nu_ref
+    shape = u**alpha
+    return np.column_stack([shape, A * shape * np.log(u)])
+
+
+def broken_powerlaw(nu, A, alpha1, alpha2, nu_break):
+    """
+    Broken power law, continuous at the break:
+
+    F_ν = A · (ν/ν_b)^α1  for ν < ν_b
+    F_ν = A · (ν/ν_b)^α2  for ν ≥ ν_b
+
+    A is the flux at the break frequency.
+    """
+    u = np.asarray(nu, dtype=float) / nu_break
+    return A * u**np.where(u < 1, alpha1, alpha2)
+
+
+def broken_powerlaw_jac(nu, A, alpha1, alpha2, nu_break):
+    """
+    Jacobian of broken_powerlaw() with respect to (A, α1, α2, ν_b)
+
+    ∂F/∂A = F/A, ∂F/∂α_i = F·ln(ν/ν_b) on the branch of α_i,
+    ∂F/∂ν_b = -α_i·F/ν_b
+    """
+    u = np.asarray(nu, dtype=float) / nu_break
+    low = u < 1
+    slope = np.where(low, alpha1, alpha2)
+    shape = u**slope
+    F = A * shape
+    log_u = np.log(u)
+    return np.column_stack([shape,
+                            np.where(low, F * log_u, 0.0),
+                            np.where(low, 0.0, F * log_u),
+                            -slope * F / nu_break])
+
+
+MODEL_FUNCS = {
+    'planck': (planck, planck_jac),
+    'powerlaw': (powerlaw, powerlaw_jac),
+    'broken_powerlaw': (broken_powerlaw, broken_powerlaw_jac),
+}
+
+
+def evaluate(model: str, nu, params: Mapping[str, float]) -> np.ndarray:
+    """Model flux at nu for a parameter dict (as returned in fit results)"""
+    func, _ = MODEL_FUNCS[model]
+    return func(nu, *(params[name] for name in MODEL_PARAMS[model]))
+
+
+# ───────── statistics ─────────
+
+def calculate_bic(chi_squared, n_params, n_data):
+    """
+    Bayesian Information Criterion
+
+    BIC = χ² + k·ln(n)
+    where k = number of parameters, n = number of data points
+    """
+    return chi_squared + n_params * np.log(n_data)
+
+
+def loglinear_powerlaw(nu, flux, sigma, nu_ref=NU_REF) -> Tuple[float, float]:
+    """
+    Closed-form power-law fit in log space
+
+    Weighted linear least squares of ln F against ln(ν/ν₀) with the
+    propagated errors σ_lnF = σ/F; only points with F > 0 are used.
+
+    Returns:
+        (A, alpha)
+    """
+    nu, flux, sigma = (np.asarray(a, dtype=float) for a in (nu, flux, sigma))
+    ok = (flux > 0) & (sigma > 0) & np.isfinite(nu) & (nu > 0)
+    if ok.sum() < 2:
+        raise ValueError("log-space power-law fit needs at least 2 positive fluxes")
+    w = flux[ok] / sigma[ok]
+    design = np.column_stack([np.ones(ok.sum()), np.log(nu[ok] / nu_ref)]) * w[:, None]
+    (log_A, alpha), *_ = np.linalg.lstsq(design, np.log(flux[ok]) * w, rcond=None)
+    return float(np.exp(log_A)), float(alpha)
+
+
+def _planck_amplitude(nu, flux, sigma, T):
+    """χ²-optimal amplitude of a Planck shape at fixed T (linear in A)"""
+    g = planck(nu, T, 1.0) / sigma
+    gg = np.dot(g, g)
+    if not np.isfinite(gg) or gg <= 0:
+        return 1.0
+    return max(float(np.dot(g, flux / sigma) / gg), 0.0)
+
+
+def _initial_guess(model, nu, flux, sigma, T_seed):
+    if model == 'planck':
+        T = T_seed if T_seed is not None else 1e-30
+        return [T, _planck_amplitude(nu, flux, sigma, T)]
+    if model == 'powerlaw':
+        return list(loglinear_powerlaw(nu, flux, sigma))
+    # Broken power law: break at the geometric middle of the band,
+    # slopes from the log-space fits of both halves
+    nu_break = float(np.sqrt(nu.min() * nu.max()))
+    low = nu < nu_break
+    alphas = []
+    for part in (low, ~low):
+        try:
+            alphas.append(loglinear_powerlaw(nu[part], flux[part], sigma[part], nu_break)[1])
+        except ValueError:
+            alphas.append(loglinear_powerlaw(nu, flux, sigma, nu_break)[1])
+    A = loglinear_powerlaw(nu, flux, sigma, nu_break)[0]
+    return [A, alphas[0], alphas[1], nu_break]
+
+
+# ───────── fitting ─────────
+
+def fit_model(model: str, nu, flux, sigma, p0: Optional[Sequence[float]] = None,
+              bounds: Optional[Tuple[Sequence[float], Sequence[float]]] = None,
+              T_seed: Optional[float] = None) -> Dict:
+    """
+    Fit one spectral model to one spectrum
+
+    Args:
+        model: 'planck', 'powerlaw' or 'broken_powerlaw'
+        nu, flux, sigma: Frequency (Hz), flux and 1σ error arrays
+        p0: Initial parameters (default: closed-form/log-space estimate)
+        bounds: (lower, upper) parameter bounds (default: DEFAULT_BOUNDS)
+        T_seed: Planck temperature seed when p0 is not given
+
+    Returns:
+        dict with params (name -> value), chi2, bic, n_params, n_data,
+        success and message (failure reason)
+    """
+    nu, flux, sigma = (np.asarray(a, dtype=float) for a in (nu, flux, sigma))
+    names = MODEL_PARAMS[model]
+    result = {'model': model, 'params': {}, 'chi2': np.nan, 'bic': np.inf,
+              'n_params': len(names), 'n_data': len(nu), 'success': False, 'message': ''}
+    if len(nu) <= len(names):
+        result['message'] = f"{len(nu)} data points for {len(names)} parameters"
+        return result
+
+    func, jac = MODEL_FUNCS[model]
+    lower, upper = bounds if bounds is not None else DEFAULT_BOUNDS[model]
+    if model == 'broken_powerlaw' and bounds is None:
+        lower, upper = list(lower), list(upper)
+        lower[3], upper[3] = nu.min(), nu.max()
+    try:
+        start = np.asarray(p0 if p0 is not None else _initial_guess(model, nu, flux, sigma, T_seed),
+                           dtype=float)
+        start = np.clip(start, lower, upper)
+        popt, _ = curve_fit(func, nu, flux, p0=start, sigma=sigma, absolute_sigma=True,
+                            bounds=(lower, upper), jac=jac, x_scale='jac', maxfev=MAXFEV)
+    except Exception as e:
+        result['message'] = str(e)
+        return result
+
+    chi2 = float(np.sum(((flux - func(nu, *popt)) / sigma)**2))
+    result.update(params=dict(zip(names, map(float, popt))), chi2=chi2,
+                  bic=float(calculate_bic(chi2, len(names), len(nu))),
+                  success=bool(np.isfinite(chi2)))
+    return result
+
+
+def fit_source(nu, flux, sigma, models: Iterable[str] = DEFAULT_MODELS,
+               T_seed: Optional[float] = None, p0: Optional[Mapping] = None,
+               bounds: Optional[Mapping] = None) -> Dict[str, Dict]:
+    """
+    Fit several models to one spectrum
+
+    Args:
+        nu, flux, sigma: Frequency (Hz), flux and 1σ error arrays
+        models: Model names (see MODEL_PARAMS)
+        T_seed: Planck temperature seed
+        p0, bounds: Optional per-model initial parameters / bounds (model -> value)
+
+    Returns:
+        dict model -> fit_model() result
+    """
+    p0, bounds = p0 or {}, bounds or {}
+    return {model: fit_model(model, nu, flux, sigma, p0=p0.get(model),
+                             bounds=bounds.get(model), T_seed=T_seed)
+            for model in models}
+
+
+def _spectrum(data) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if isinstance(data, Mapping):
+        return data['nu_Hz'], data['F_Jy'], data['sigma_Jy']
+    return data
+
+
+def _fit_task(task):
+    name, data, models, T_seed, p0, bounds = task
+    nu, flux, sigma = _spectrum(data)
+    return name, fit_source(nu, flux, sigma, models, T_seed, p0, bounds)
+
+
+def bic_table(results: Mapping[str, Mapping[str, Dict]]) -> pd.DataFrame:
+    """
+    Consolidated BIC table from {source: fit_source() result}
+
+    One row per (source, model) with n_data, n_params, chi2, bic,
+    delta_bic (to the best model of the source), best flag, success,
+    message and one column per fitted parameter.
+    """
+    rows = []
+    for source, fits in results.items():
+        best = min((fit['bic'] for fit in fits.values() if fit['success']), default=np.nan)
+        for model, fit in fits.items():
+            row = {'source': source, 'model': model, 'n_data': fit['n_data'],
+                   'n_params': fit['n_params'], 'chi2': fit['chi2'], 'bic': fit['bic'],
+                   'delta_bic': fit['bic'] - best if fit['success'] else np.nan,
+                   'best': bool(fit['success'] and fit['bic'] == best),
+                   'success': fit['success'], 'message': fit['message']}
+            row.update(fit['params'])
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def fit_sources(sources: Mapping, models: Iterable[str] = DEFAULT_MODELS,
+                T_seed: Optional[float] = None, p0: Optional[Mapping] = None,
+                bounds: Optional[Mapping] = None, workers: Optional[int] = None,
+                table: bool = True):
+    """
+    Fit all models to all sources in a process pool
+
+    Args:
+        sources: name -> (nu, flux, sigma) tuple or dict with nu_Hz, F_Jy,
+                 sigma_Jy (as from load_continuum_spectrum)
+        models: Model names (see MODEL_PARAMS)
+        T_seed, p0, bounds: Passed to fit_source() for every source
+        workers: Worker processes (default: CPU count; 1 fits in-process)
+        table: Return the bic_table() DataFrame instead of the raw results
+
+    Returns:
+        BIC table (DataFrame) or dict source -> model -> fit result
+    """
+    models = tuple(models)
+    tasks = [(name, data, models, T_seed, p0, bounds) for name, data in sources.items()]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        results = dict(map(_fit_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = dict(pool.map(_fit_task, tasks,
+                                    chunksize=max(1, len(tasks) // (4 * workers))))
+    return bic_table(results) if table else results
@@ -23,6 +23,7 @@ from .coords import (
 )
 from .fetch_gaia import get_local_stellar_environment, query_gaia_stars
 from .fetch_vizier import get_complete_solar_system, get_planetary_data
+from .catalog_store import CatalogStore, get_store
 from .orbits import OrbitVisualizer, create_solar_system_orbits, generate_phi_spiral
 from .viz_plotly import SegmentedSpacetimeVisualizer, create_interactive_dashboard
 
@@ -57,6 +58,8 @@ __all__ = [
     'query_gaia_stars',
     'get_complete_solar_system',
     'get_planetary_data',
+    'CatalogStore',
+    'get_store',
     
     # Orbit and visualization
     'create_solar_system_orbits',
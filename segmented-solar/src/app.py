@@ -77,7 +77,9 @@ class SegmentedSolarApp:
                 star_positions, star_masses, star_catalog = get_local_stellar_environment(
                     maxdist_pc=self.args.gaia_maxdist_pc,
                     gmag_max=self.args.gaia_gmag_max,
-                    epoch=self.args.epoch
+                    epoch=self.args.epoch,
+                    cache_dir="data/raw",
+                    offline=getattr(self.args, 'offline', False)
                 )
                 
                 if len(star_catalog) > 0:
@@ -193,7 +195,8 @@ class SegmentedSolarApp:
         
         # Initialize visualizer
         visualizer = SegmentedSpacetimeVisualizer(
-            title="Segmented Spacetime — Solar System Mesh (φ/π Structure)"
+            title="Segmented Spacetime — Solar System Mesh (φ/π Structure)",
+            max_display_vertices=self.args.max_display_vertices or None
         )
         
         # Add mesh with field data
@@ -219,7 +222,7 @@ class SegmentedSolarApp:
         
         # Save HTML visualization
         output_file = "solar_system_segmented.html"
-        visualizer.save_html(output_file)
+        visualizer.save_html(output_file, mesh_asset=self.args.mesh_asset)
         
         # Create PNG snapshots if requested
         if self.args.save_images:
@@ -228,7 +231,7 @@ class SegmentedSolarApp:
             
             for field_name in ['N', 'tau', 'n']:
                 # Update mesh with specific field
-                fig.data[0].intensity = self.field_data[field_name]
+                fig.data[0].intensity = visualizer.display_field(field_name)
                 fig.data[0].name = field_name
                 fig.layout.title.text = f"Segmented Spacetime — {field_name}(x) Field"
                 
@@ -250,7 +253,9 @@ class SegmentedSolarApp:
             self.catalog,
             self.positions,
             self.vertices,
-            self.faces
+            self.faces,
+            epoch=self.args.epoch,
+            max_display_vertices=self.args.max_display_vertices or None
         )
         
         app.run_server(
@@ -337,6 +342,8 @@ def create_argument_parser() -> argparse.ArgumentParser:
                        help='Maximum distance for GAIA stars (pc)')
     parser.add_argument('--gaia-gmag-max', type=float, default=10,
                        help='Maximum G magnitude for GAIA stars')
+    parser.add_argument('--offline', action='store_true',
+                       help='Use only the local catalog store (no GAIA archive queries)')
     
     # Visualization options
     parser.add_argument('--show-orbits', action='store_true',
@@ -347,6 +354,10 @@ def create_argument_parser() -> argparse.ArgumentParser:
                        help='Save PNG images of field visualizations')
     parser.add_argument('--interactive', action='store_true',
                        help='Launch interactive Dash dashboard')
+    parser.add_argument('--max-display-vertices', type=int, default=50000,
+                       help='Vertex budget of the displayed mesh (0 = full resolution)')
+    parser.add_argument('--mesh-asset', action='store_true',
+                       help='Write the mesh to a separate binary file loaded by the HTML')
     
     return parser
 
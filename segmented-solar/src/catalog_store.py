@@ -0,0 +1,236 @@
+"""
+Local catalog store for the data fetching modules.
+Keeps every fetched catalog as Parquet under one directory with a small JSON
+metadata index keyed by query parameters, so the fetchers start from local
+data without network access and repeated launches skip CSV parsing.
+
+Layout (default root data/raw):
+    catalog_store/index.json                 query key -> file, params, rows, columns
+    catalog_store/<name>-<hash>.parquet      catalog rows (read memory-mapped)
+    catalog_store/<name>-<hash>.order.npy    row indices sorted by distance (spatial index)
+    catalog_store/<name>-<hash>.dist.npy     distances in that order (binary search)
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_DIRNAME = "catalog_store"
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+
+def query_key(name: str, params: Optional[Dict] = None) -> str:
+    """Canonical key of a catalog query, e.g. 'gaia_stars?gmag_max=10.0&maxdist_pc=30.0'."""
+    params = params or {}
+    if not params:
+        return name
+    return name + "?" + "&".join(f"{k}={params[k]!r}" for k in sorted(params))
+
+class CatalogStore:
+    """
+    Parquet-backed catalog store with a metadata index keyed by query parameters.
+
+    Catalogs with a distance column also get a distance-ordered index, so
+    radius queries (e.g. GAIA maxdist_pc) are answered with a binary search
+    instead of a full pandas filter, and a stored catalog covering a larger
+    radius serves any smaller one.
+    """
+
+    def __init__(self, root: str = "data/raw"):
+        self.root = root
+        self.path = os.path.join(root, STORE_DIRNAME)
+        self._index = None
+        self._tables = {}   # key -> memory-mapped Arrow table (per process)
+        self._orders = {}   # key -> (distance order, sorted distances), memory-mapped
+
+    # ───────── metadata index ─────────
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        if self._index is None:
+            self._index = {}
+            index_file = os.path.join(self.path, INDEX_FILENAME)
+            if os.path.exists(index_file):
+                try:
+                    with open(index_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("version") == INDEX_VERSION:
+                        self._index = data.get("entries", {})
+                except (OSError, ValueError):
+                    pass
+        return self._index
+
+    def _save_index(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        index_file = os.path.join(self.path, INDEX_FILENAME)
+        tmp = index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "entries": self.index}, f, indent=2, sort_keys=True)
+        os.replace(tmp, index_file)
+
+    def _entry_file(self, key: str, suffix: str) -> str:
+        return os.path.join(self.path, self.index[key]["stem"] + suffix)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index and os.path.exists(self._entry_file(key, ".parquet"))
+
+    def entries(self, name: str) -> Dict[str, Dict]:
+        """Index entries of all stored queries of a catalog."""
+        return {key: meta for key, meta in self.index.items()
+                if meta["name"] == name and key in self}
+
+    # ───────── read / write ─────────
+
+    def put(self, name: str, params: Optional[Dict], df: pd.DataFrame,
+            dist_column: Optional[str] = None) -> str:
+        """
+        Store a catalog for a query.
+
+        Parameters:
+        -----------
+        name : str
+            Catalog name (e.g. 'planetary_data', 'gaia_stars')
+        params : dict
+            Query parameters the catalog was fetched with
+        df : DataFrame
+            Catalog rows (row order is preserved)
+        dist_column : str, optional
+            Distance column to build the radius index on
+
+        Returns:
+        --------
+        key : str
+            Query key of the stored catalog
+        """
+        key = query_key(name, params)
+        stem = f"{name}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}"
+        os.makedirs(self.path, exist_ok=True)
+
+        parquet_file = os.path.join(self.path, stem + ".parquet")
+        table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+        pq.write_table(table, parquet_file + ".tmp")
+        os.replace(parquet_file + ".tmp", parquet_file)
+
+        if dist_column is not None:
+            self._write_distance_index(stem, df[dist_column])
+
+        self.index[key] = {
+            "name": name,
+            "params": dict(params or {}),
+            "stem": stem,
+            "rows": int(len(df)),
+            "columns": list(map(str, df.columns)),
+            "dist_column": dist_column,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self._save_index()
+        self._tables.pop(key, None)
+        self._orders.pop(key, None)
+        return key
+
+    def table(self, key: str) -> pa.Table:
+        """Arrow table of a stored query (memory-mapped Parquet read, cached per process)."""
+        if key not in self._tables:
+            self._tables[key] = pq.read_table(self._entry_file(key, ".parquet"), memory_map=True)
+        return self._tables[key]
+
+    def read(self, key: str) -> pd.DataFrame:
+        """Catalog of a stored query as a new DataFrame (converted from the cached table)."""
+        return self.table(key).to_pandas()
+
+    def get(self, name: str, params: Optional[Dict] = None) -> Optional[pd.DataFrame]:
+        """Stored catalog of exactly this query, or None."""
+        key = query_key(name, params)
+        return self.read(key) if key in self else None
+
+    def import_csv(self, name: str, params: Optional[Dict], csv_file: str,
+                   dist_column: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Move a legacy CSV cache file into the store (parsed once), or None if absent."""
+        if not os.path.exists(csv_file):
+            return None
+        df = pd.read_csv(csv_file)
+        self.put(name, params, df, dist_column=dist_column)
+        print(f"Imported {csv_file} into catalog store {self.path}")
+        return df
+
+    # ───────── radius queries ─────────
+
+    def _write_distance_index(self, stem: str, dist) -> None:
+        dist = pd.to_numeric(pd.Series(dist), errors="coerce").to_numpy(dtype=float)
+        order = np.argsort(dist, kind="stable")  # NaN distances sort last
+        np.save(os.path.join(self.path, stem + ".order.npy"), order.astype(np.int64))
+        np.save(os.path.join(self.path, stem + ".dist.npy"), dist[order])
+
+    def distance_index(self, key: str):
+        """(row indices sorted by distance, sorted distances), memory-mapped."""
+        if key not in self._orders:
+            order_file = self._entry_file(key, ".order.npy")
+            if not os.path.exists(order_file):
+                # stores written before the sorted distances were kept: rebuild once
+                column = self.table(key).column(self.index[key]["dist_column"])
+                self._write_distance_index(self.index[key]["stem"], column.to_numpy(zero_copy_only=False))
+            self._orders[key] = (np.load(order_file, mmap_mode="r"),
+                                 np.load(self._entry_file(key, ".dist.npy"), mmap_mode="r"))
+        return self._orders[key]
+
+    def distance_order(self, key: str) -> np.ndarray:
+        """Row indices sorted by distance (memory-mapped spatial index)."""
+        return self.distance_index(key)[0]
+
+    def within(self, key: str, radius: float, inclusive: bool = False) -> pd.DataFrame:
+        """
+        Rows of a stored catalog closer than radius, in stored row order.
+
+        One binary search on the stored sorted distances gives the number of
+        matching rows; only those rows are taken from the memory-mapped table
+        and converted to pandas.
+        """
+        order, dist = self.distance_index(key)
+        n = int(np.searchsorted(dist, radius, side="right" if inclusive else "left"))
+        rows = np.sort(order[:n])
+        return self.table(key).take(rows).to_pandas()
+
+    def radius_query(self, name: str, radius: float, dist_param: str,
+                     covers: Optional[Callable[[Dict], bool]] = None) -> Optional[pd.DataFrame]:
+        """
+        Catalog rows closer than radius, taken from the smallest stored query
+        of the catalog that covers the radius.
+
+        Parameters:
+        -----------
+        name : str
+            Catalog name
+        radius : float
+            Query radius (same unit as the stored distance column)
+        dist_param : str
+            Query parameter holding the radius the catalog was fetched with
+        covers : callable, optional
+            Extra check on the other stored query parameters (params -> bool)
+
+        Returns:
+        --------
+        DataFrame or None if no stored query covers the radius
+        """
+        candidates = [(meta["rows"], key) for key, meta in self.entries(name).items()
+                      if meta.get("dist_column")
+                      and meta["params"].get(dist_param, -np.inf) >= radius
+                      and (covers is None or covers(meta["params"]))]
+        if not candidates:
+            return None
+        return self.within(min(candidates)[1], radius)
+
+_STORES: Dict[str, CatalogStore] = {}
+
+def get_store(root: str = "data/raw") -> CatalogStore:
+    """Process-wide catalog store for a directory."""
+    key = os.path.abspath(root)
+    if key not in _STORES:
+        _STORES[key] = CatalogStore(root)
+    return _STORES[key]
@@ -5,19 +5,31 @@ Retrieves stellar positions, proper motions, and parallaxes from GAIA DR3.
 
 import pandas as pd
 import numpy as np
-from astroquery.gaia import Gaia
 from astropy import units as u
 from astropy.coordinates import SkyCoord
 import os
 from typing import Optional, Tuple
 
+from .catalog_store import get_store, query_key
+
+GAIA_COLUMNS = [
+    'source_id', 'ra', 'dec', 'parallax', 'parallax_error',
+    'pmra', 'pmra_error', 'pmdec', 'pmdec_error',
+    'phot_g_mean_mag', 'bp_rp', 'teff_gspphot', 'dist_pc'
+]
+
 def query_gaia_stars(maxdist_pc: float = 30, 
                     gmag_max: float = 10,
                     cache_dir: str = "data/raw",
-                    use_cache: bool = True) -> pd.DataFrame:
+                    use_cache: bool = True,
+                    offline: bool = False) -> pd.DataFrame:
     """
     Query GAIA DR3 for nearby stars.
     
+    Results are kept in the local catalog store. Any stored query with a
+    larger radius and fainter magnitude limit answers the request through
+    the store's distance index, without network access.
+    
     Parameters:
     -----------
     maxdist_pc : float
@@ -25,9 +37,11 @@ def query_gaia_stars(maxdist_pc: float = 30,
     gmag_max : float  
         Maximum G magnitude (brightness limit)
     cache_dir : str
-        Directory to cache results
+        Directory of the local catalog store
     use_cache : bool
-        Whether to use cached results if available
+        Whether to use stored results if available
+    offline : bool
+        Never query the GAIA archive (empty result if nothing is stored)
         
     Returns:
     --------
@@ -35,18 +49,29 @@ def query_gaia_stars(maxdist_pc: float = 30,
                            phot_g_mean_mag, dist_pc
     """
     
-    cache_file = os.path.join(cache_dir, f"gaia_stars_d{maxdist_pc}_g{gmag_max}.csv")
-    
-    # Check cache first
-    if use_cache and os.path.exists(cache_file):
-        print(f"Loading cached GAIA data from {cache_file}")
-        return pd.read_csv(cache_file)
+    legacy_file = os.path.join(cache_dir, f"gaia_stars_d{maxdist_pc}_g{gmag_max}.csv")
+    maxdist_pc = float(maxdist_pc)
+    gmag_max = float(gmag_max)
+    store = get_store(cache_dir)
+    
+    # Check local store first (exact query, then any covering query)
+    if use_cache:
+        if query_key("gaia_stars", {"maxdist_pc": maxdist_pc, "gmag_max": gmag_max}) not in store:
+            store.import_csv("gaia_stars", {"maxdist_pc": maxdist_pc, "gmag_max": gmag_max},
+                             legacy_file, dist_column="dist_pc")
+        df = store.radius_query("gaia_stars", maxdist_pc, "maxdist_pc",
+                                covers=lambda p: p.get("gmag_max", -np.inf) >= gmag_max)
+        if df is not None:
+            df = df[df["phot_g_mean_mag"] < gmag_max].reset_index(drop=True)
+            print(f"Loaded {len(df)} GAIA stars from local catalog store {store.path}")
+            return df
+    
+    if offline:
+        print(f"No stored GAIA data within {maxdist_pc} pc, G < {gmag_max} (offline)")
+        return pd.DataFrame(columns=GAIA_COLUMNS)
     
     print(f"Querying GAIA DR3 for stars within {maxdist_pc} pc, G < {gmag_max}")
     
-    # Set GAIA table
-    Gaia.MAIN_GAIA_TABLE = "gaiadr3.gaia_source"
-    
     # ADQL query for nearby bright stars
     query = f"""
     SELECT source_id, ra, dec, parallax, parallax_error,
@@ -62,6 +87,11 @@ def query_gaia_stars(maxdist_pc: float = 30,
     """
     
     try:
+        from astroquery.gaia import Gaia
+        
+        # Set GAIA table
+        Gaia.MAIN_GAIA_TABLE = "gaiadr3.gaia_source"
+        
         # Launch asynchronous job
         job = Gaia.launch_job_async(query)
         table = job.get_results()
@@ -77,21 +107,17 @@ def query_gaia_stars(maxdist_pc: float = 30,
         
         print(f"Retrieved {len(df)} stars from GAIA DR3")
         
-        # Cache results
-        os.makedirs(cache_dir, exist_ok=True)
-        df.to_csv(cache_file, index=False)
-        print(f"Cached results to {cache_file}")
+        # Store results
+        store.put("gaia_stars", {"maxdist_pc": maxdist_pc, "gmag_max": gmag_max},
+                  df, dist_column="dist_pc")
+        print(f"Stored results in local catalog store {store.path}")
         
         return df
         
     except Exception as e:
         print(f"Error querying GAIA: {e}")
         # Return empty DataFrame with expected columns
-        return pd.DataFrame(columns=[
-            'source_id', 'ra', 'dec', 'parallax', 'parallax_error',
-            'pmra', 'pmra_error', 'pmdec', 'pmdec_error', 
-            'phot_g_mean_mag', 'bp_rp', 'teff_gspphot', 'dist_pc'
-        ])
+        return pd.DataFrame(columns=GAIA_COLUMNS)
 
 def gaia_to_cartesian(df: pd.DataFrame, epoch: str = "2025.0") -> np.ndarray:
     """
@@ -192,7 +218,9 @@ def estimate_stellar_masses(df: pd.DataFrame) -> np.ndarray:
 
 def get_local_stellar_environment(maxdist_pc: float = 30, 
                                 gmag_max: float = 10,
-                                epoch: str = "2025.0") -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+                                epoch: str = "2025.0",
+                                cache_dir: str = "data/raw",
+                                offline: bool = False) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
     """
     Get complete local stellar environment data.
     
@@ -207,7 +235,8 @@ def get_local_stellar_environment(maxdist_pc: float = 30,
     """
     
     # Fetch GAIA data
-    df = query_gaia_stars(maxdist_pc=maxdist_pc, gmag_max=gmag_max)
+    df = query_gaia_stars(maxdist_pc=maxdist_pc, gmag_max=gmag_max,
+                          cache_dir=cache_dir, offline=offline)
     
     if len(df) == 0:
         return np.empty((0, 3)), np.array([]), df
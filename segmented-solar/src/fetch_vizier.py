@@ -5,15 +5,37 @@ Retrieves planetary masses, radii, orbital elements from astronomical catalogs.
 
 import pandas as pd
 import numpy as np
-from astroquery.vizier import Vizier
 from astropy import units as u
 import os
 from typing import Dict, List, Optional, Tuple
 import warnings
 
+from .catalog_store import get_store
+
 # Suppress astroquery warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='astroquery')
 
+def load_stored_catalog(name: str, params: Optional[Dict], cache_dir: str,
+                        legacy_file: str) -> Optional[pd.DataFrame]:
+    """
+    Catalog from the local catalog store (legacy CSV caches are imported once).
+    
+    Returns None if neither the store nor the legacy CSV holds the query.
+    """
+    store = get_store(cache_dir)
+    df = store.get(name, params)
+    if df is None:
+        df = store.import_csv(name, params, os.path.join(cache_dir, legacy_file))
+    if df is not None:
+        print(f"Loaded {name} ({len(df)} rows) from local catalog store {store.path}")
+    return df
+
+def store_catalog(name: str, params: Optional[Dict], df: pd.DataFrame, cache_dir: str) -> None:
+    """Write a fetched catalog to the local catalog store."""
+    store = get_store(cache_dir)
+    store.put(name, params, df)
+    print(f"Stored {name} in local catalog store {store.path}")
+
 def get_planetary_data(cache_dir: str = "data/raw", use_cache: bool = True) -> pd.DataFrame:
     """
     Retrieve planetary data from VizieR catalogs.
@@ -21,7 +43,7 @@ def get_planetary_data(cache_dir: str = "data/raw", use_cache: bool = True) -> p
     Parameters:
     -----------
     cache_dir : str
-        Directory to cache results
+        Directory of the local catalog store
     use_cache : bool
         Whether to use cached results if available
         
@@ -31,12 +53,11 @@ def get_planetary_data(cache_dir: str = "data/raw", use_cache: bool = True) -> p
                            Omega_deg, omega_deg, M_deg, period_days
     """
     
-    cache_file = os.path.join(cache_dir, "planetary_data.csv")
-    
-    # Check cache first
-    if use_cache and os.path.exists(cache_file):
-        print(f"Loading cached planetary data from {cache_file}")
-        return pd.read_csv(cache_file)
+    # Check local catalog store first
+    if use_cache:
+        df = load_stored_catalog("planetary_data", None, cache_dir, "planetary_data.csv")
+        if df is not None:
+            return df
     
     print("Fetching planetary data from VizieR...")
     
@@ -116,10 +137,8 @@ def get_planetary_data(cache_dir: str = "data/raw", use_cache: bool = True) -> p
     
     df = pd.DataFrame(df_data)
     
-    # Cache results
-    os.makedirs(cache_dir, exist_ok=True)
-    df.to_csv(cache_file, index=False)
-    print(f"Cached planetary data to {cache_file}")
+    # Store results
+    store_catalog("planetary_data", None, df, cache_dir)
     
     return df
 
@@ -133,7 +152,7 @@ def get_asteroid_data(num_asteroids: int = 50, cache_dir: str = "data/raw",
     num_asteroids : int
         Number of largest asteroids to retrieve
     cache_dir : str
-        Directory to cache results
+        Directory of the local catalog store
     use_cache : bool
         Whether to use cached results
         
@@ -142,12 +161,12 @@ def get_asteroid_data(num_asteroids: int = 50, cache_dir: str = "data/raw",
     DataFrame with asteroid orbital elements and physical properties
     """
     
-    cache_file = os.path.join(cache_dir, f"asteroid_data_{num_asteroids}.csv")
-    
-    # Check cache first
-    if use_cache and os.path.exists(cache_file):
-        print(f"Loading cached asteroid data from {cache_file}")
-        return pd.read_csv(cache_file)
+    # Check local catalog store first
+    if use_cache:
+        df = load_stored_catalog("asteroid_data", {"num_asteroids": int(num_asteroids)},
+                                 cache_dir, f"asteroid_data_{num_asteroids}.csv")
+        if df is not None:
+            return df
     
     print(f"Fetching data for {num_asteroids} largest asteroids from VizieR...")
     
@@ -192,10 +211,8 @@ def get_asteroid_data(num_asteroids: int = 50, cache_dir: str = "data/raw",
     
     df = pd.DataFrame(df_data)
     
-    # Cache results
-    os.makedirs(cache_dir, exist_ok=True)
-    df.to_csv(cache_file, index=False)
-    print(f"Cached asteroid data to {cache_file}")
+    # Store results
+    store_catalog("asteroid_data", {"num_asteroids": int(num_asteroids)}, df, cache_dir)
     
     return df
 
@@ -206,7 +223,7 @@ def get_moon_data(cache_dir: str = "data/raw", use_cache: bool = True) -> pd.Dat
     Parameters:
     -----------
     cache_dir : str
-        Directory to cache results
+        Directory of the local catalog store
     use_cache : bool
         Whether to use cached results
         
@@ -215,12 +232,11 @@ def get_moon_data(cache_dir: str = "data/raw", use_cache: bool = True) -> pd.Dat
     DataFrame with moon data
     """
     
-    cache_file = os.path.join(cache_dir, "moon_data.csv")
-    
-    # Check cache first
-    if use_cache and os.path.exists(cache_file):
-        print(f"Loading cached moon data from {cache_file}")
-        return pd.read_csv(cache_file)
+    # Check local catalog store first
+    if use_cache:
+        df = load_stored_catalog("moon_data", None, cache_dir, "moon_data.csv")
+        if df is not None:
+            return df
     
     print("Fetching major moon data...")
     
@@ -285,10 +301,8 @@ def get_moon_data(cache_dir: str = "data/raw", use_cache: bool = True) -> pd.Dat
     
     df = pd.DataFrame(df_data)
     
-    # Cache results
-    os.makedirs(cache_dir, exist_ok=True)
-    df.to_csv(cache_file, index=False)
-    print(f"Cached moon data to {cache_file}")
+    # Store results
+    store_catalog("moon_data", None, df, cache_dir)
     
     return df
 
@@ -4,7 +4,8 @@ Creates geodesic spheres with triangular faces for representing the spacetime me
 """
 
 import numpy as np
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 def normalize(v: np.ndarray) -> np.ndarray:
     """Normalize vectors to unit length."""
@@ -34,33 +35,29 @@ def icosahedron() -> Tuple[np.ndarray, np.ndarray]:
 def subdivide(verts: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """Subdivide each triangle into 4 smaller triangles."""
     mid_cache = {}
+    verts = verts.tolist()
     
-    def midpoint(a: int, b: int) -> Tuple[int, np.ndarray]:
+    def midpoint(a: int, b: int) -> int:
         """Get midpoint vertex index, creating if needed."""
-        key = tuple(sorted((a, b)))
+        key = (a, b) if a < b else (b, a)
         if key in mid_cache:
-            return mid_cache[key], None
+            return mid_cache[key]
         
-        # Create new midpoint vertex
-        m = (np.array(verts[a]) + np.array(verts[b])) * 0.5
-        mid_cache[key] = len(verts)
-        return mid_cache[key], m
+        # Create new midpoint vertex (appended, so existing indices are kept)
+        va, vb = verts[a], verts[b]
+        verts.append([(va[0] + vb[0]) * 0.5, (va[1] + vb[1]) * 0.5, (va[2] + vb[2]) * 0.5])
+        mid_cache[key] = len(verts) - 1
+        return mid_cache[key]
 
-    verts = verts.tolist()
     new_faces = []
     
-    for f in faces:
+    for f in faces.tolist():
         a, b, c = f
         
-        # Get midpoint indices and vertices
-        ia, ma = midpoint(a, b)
-        ib, mb = midpoint(b, c) 
-        ic, mc = midpoint(c, a)
-        
-        # Add new vertices if created
-        if ma is not None: verts.append(ma.tolist())
-        if mb is not None: verts.append(mb.tolist())
-        if mc is not None: verts.append(mc.tolist())
+        # Get midpoint indices
+        ia = midpoint(a, b)
+        ib = midpoint(b, c) 
+        ic = midpoint(c, a)
         
         # Create 4 new triangular faces
         new_faces.extend([
@@ -101,6 +98,96 @@ def build_icosphere(radius: float = 1.0, subdivisions: int = 4) -> Tuple[np.ndar
     
     return v, f
 
+def icosphere_level(num_vertices: int, num_faces: int) -> Optional[int]:
+    """
+    Subdivision level of an icosphere with the given counts, or None.
+    
+    Level k has 10*4^k + 2 vertices and 20*4^k faces.
+    """
+    k = 0
+    while 10 * 4**k + 2 < num_vertices:
+        k += 1
+    if 10 * 4**k + 2 == num_vertices and 20 * 4**k == num_faces:
+        return k
+    return None
+
+@lru_cache(maxsize=8)
+def _icosphere_faces(level: int) -> np.ndarray:
+    """Face indices of the level-k icosphere (topology only, cached)."""
+    v, f = icosahedron()
+    for _ in range(level):
+        v, f = subdivide(v, f)
+    f.setflags(write=False)
+    return f
+
+def decimate_mesh(vertices: np.ndarray, faces: np.ndarray, max_vertices: int,
+                  fields: Optional[Dict[str, np.ndarray]] = None
+                  ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Reduce a mesh to at most `max_vertices` vertices for display.
+    
+    Icospheres are reduced exactly: subdivide() keeps existing vertex indices
+    and appends midpoints, so the first 10*4^k + 2 vertices of any finer
+    icosphere are the level-k icosphere and field values are sampled, not
+    interpolated. Other meshes use vertex clustering on a uniform grid
+    (positions and field values averaged per cell).
+    
+    Parameters:
+    -----------
+    vertices : np.ndarray, shape (N, 3)
+        Full-resolution vertices
+    faces : np.ndarray, shape (M, 3)
+        Triangle face indices
+    max_vertices : int
+        Vertex budget of the display mesh
+    fields : dict, optional
+        Per-vertex field arrays to reduce alongside the mesh
+        
+    Returns:
+    --------
+    vertices, faces, fields : decimated mesh and fields
+    """
+    fields = fields or {}
+    n_v = len(vertices)
+    if max_vertices is None or n_v <= max_vertices:
+        return vertices, faces, dict(fields)
+    
+    level = icosphere_level(n_v, len(faces))
+    if level is not None:
+        k = 0
+        while 10 * 4**(k + 1) + 2 <= max_vertices and k + 1 < level:
+            k += 1
+        keep = 10 * 4**k + 2
+        return vertices[:keep], _icosphere_faces(k), {name: np.asarray(a)[:keep] for name, a in fields.items()}
+    
+    # Vertex clustering; a surface fills ~g^2 of g^3 cells, so refine g until
+    # the cluster count fits the budget
+    lo = vertices.min(axis=0)
+    span = np.maximum(vertices.max(axis=0) - lo, 1e-30)
+    g = max(2, int(np.sqrt(max_vertices)))
+    for _ in range(20):
+        cell = np.minimum(((vertices - lo) / span * g).astype(np.int64), g - 1)
+        key = (cell[:, 0] * g + cell[:, 1]) * g + cell[:, 2]
+        uniq, inv = np.unique(key, return_inverse=True)
+        if len(uniq) <= max_vertices or g <= 2:
+            break
+        g = max(2, int(g * np.sqrt(max_vertices / len(uniq)) * 0.98))
+    
+    inv = inv.ravel()
+    counts = np.bincount(inv).astype(float)
+    new_v = np.column_stack([np.bincount(inv, weights=vertices[:, d]) / counts for d in range(3)])
+    new_fields = {name: np.bincount(inv, weights=np.asarray(a, dtype=float)) / counts
+                  for name, a in fields.items()}
+    
+    new_f = inv[faces]
+    ok = (new_f[:, 0] != new_f[:, 1]) & (new_f[:, 1] != new_f[:, 2]) & (new_f[:, 0] != new_f[:, 2])
+    new_f = new_f[ok]
+    # drop duplicate triangles (same vertex set)
+    _, first = np.unique(np.sort(new_f, axis=1), axis=0, return_index=True)
+    new_f = new_f[np.sort(first)]
+    
+    return new_v, new_f, new_fields
+
 def mesh_info(vertices: np.ndarray, faces: np.ndarray) -> dict:
     """Get mesh statistics."""
     return {
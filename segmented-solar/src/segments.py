@@ -6,11 +6,13 @@ according to the Casu & Wrede theoretical framework.
 
 import numpy as np
 from numba import jit, prange
-from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Tuple, Optional
 import warnings
 
 # Golden ratio φ = (1 + √5)/2
 PHI = (1.0 + np.sqrt(5.0)) / 2.0
+LN_PHI = np.log(PHI)
 
 def logistic(x: np.ndarray, steepness: float = 1.0) -> np.ndarray:
     """
@@ -297,6 +299,102 @@ class SegmentedSpacetimeField:
         
         return gradients
 
+    def density_signature(self) -> Tuple:
+        """
+        Hashable summary of everything N(x) depends on.
+        
+        α and κ are deliberately excluded: τ and n depend on them only
+        through N, so changing them must not invalidate cached densities.
+        """
+        bodies = tuple(
+            (b['name'], tuple(np.asarray(b['position'], dtype=float).tolist()),
+             b['mass_scaled'], b['gamma'], b['r0'], b['r_nb'], b['delta'])
+            for b in self.bodies
+        )
+        return (self.p, self.N_bg, self.N_max, bodies)
+
+class FieldCache:
+    """
+    LRU cache of segment density N per vertex, keyed by epoch.
+    
+    N(x) is the expensive part (kernel sum over all bodies); τ = φ^(-αN)
+    and n = 1 + κN follow from it with one vectorized operation each, so
+    parameter sliders only need derive() on the cached N.
+    """
+    
+    def __init__(self, max_epochs: int = 8, dtype=np.float64):
+        """
+        Parameters:
+        -----------
+        max_epochs : int
+            Maximum number of cached epochs (least recently used dropped first)
+        dtype : numpy dtype
+            Storage type of cached N (float32 halves memory on large meshes)
+        """
+        self.max_epochs = max(1, int(max_epochs))
+        self.dtype = dtype
+        self._store: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def get_N(self, epoch: Hashable, field: SegmentedSpacetimeField,
+              vertices: np.ndarray,
+              reduce: Optional[Callable[[np.ndarray], np.ndarray]] = None) -> np.ndarray:
+        """
+        Segment density for an epoch, computed on first use.
+        
+        Parameters:
+        -----------
+        epoch : hashable
+            Epoch label (e.g. "2025-01-01")
+        field : SegmentedSpacetimeField
+            Field calculator configured for that epoch
+        vertices : np.ndarray, shape (N, 3)
+            Mesh vertices (full resolution)
+        reduce : callable, optional
+            Applied once to the full N before caching (e.g. LOD sampling)
+            
+        Returns:
+        --------
+        N : np.ndarray
+            Cached segment density
+        """
+        key = (epoch, field.density_signature(), len(vertices))
+        if key in self._store:
+            self._store.move_to_end(key)
+            self.hits += 1
+            return self._store[key]
+        
+        self.misses += 1
+        N = field.compute_segment_density(vertices)
+        if reduce is not None:
+            N = reduce(N)
+        N = np.ascontiguousarray(N, dtype=self.dtype)
+        self._store[key] = N
+        while len(self._store) > self.max_epochs:
+            self._store.popitem(last=False)
+        return N
+    
+    @staticmethod
+    def derive(N: np.ndarray, alpha: float, kappa: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        τ = φ^(-αN) and n = 1 + κN from cached N.
+        
+        Returns:
+        --------
+        tau, n : tuple of np.ndarray
+        """
+        tau = np.exp(N * (-alpha * LN_PHI))
+        n = 1.0 + kappa * N
+        return tau, n
+    
+    def clear(self) -> None:
+        """Drop all cached epochs."""
+        self._store.clear()
+        
+    def __len__(self) -> int:
+        return len(self._store)
+
 def create_solar_system_field(epoch: str = "2025-01-01") -> SegmentedSpacetimeField:
     """
     Create a segmented spacetime field for the Solar System.
@@ -11,7 +11,131 @@ import pandas as pd
 from typing import Dict, List, Tuple, Optional, Union
 import dash
 from dash import dcc, html, Input, Output, callback
+import base64
 import json
+import os
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+from .icosphere import decimate_mesh
+
+# Default vertex budget of the displayed mesh (full field stays in memory)
+DEFAULT_MAX_DISPLAY_VERTICES = 50_000
+
+# Trace attributes sent as typed binary buffers instead of JSON number lists
+_MESH_FLOAT_KEYS = ("x", "y", "z", "intensity")
+_MESH_INDEX_KEYS = ("i", "j", "k")
+
+def _supports_typed_arrays() -> bool:
+    """plotly.js understands {dtype, bdata} array specs from v2.28 on."""
+    try:
+        major, minor = (int(p) for p in get_plotlyjs_version().split(".")[:2])
+    except (ValueError, TypeError):
+        return False
+    return (major, minor) >= (2, 28)
+
+def _index_dtype(values: np.ndarray) -> str:
+    """Smallest unsigned plotly.js dtype holding all face indices."""
+    return "u2" if len(values) == 0 or int(np.max(values)) < 2**16 else "u4"
+
+def encode_typed_array(values, dtype: str = "f4") -> dict:
+    """
+    Encode an array as a plotly.js typed-array spec.
+    
+    Parameters:
+    -----------
+    values : array-like
+        Numeric values
+    dtype : str
+        plotly.js dtype code ('f4', 'f8', 'u2', 'u4', 'i4', ...)
+        
+    Returns:
+    --------
+    spec : dict
+        {"dtype": dtype, "bdata": base64 little-endian bytes}
+    """
+    arr = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {"dtype": dtype, "bdata": base64.b64encode(arr.tobytes()).decode("ascii")}
+
+def _as_array(value) -> np.ndarray:
+    """Trace attribute as ndarray (plotly >= 6 may already hold a typed-array spec)."""
+    if isinstance(value, dict) and "bdata" in value:
+        dtype = np.dtype(value["dtype"]).newbyteorder("<")
+        return np.frombuffer(base64.b64decode(value["bdata"]), dtype=dtype)
+    return np.asarray(value)
+
+def _mesh_arrays(trace: dict) -> Dict[str, Tuple[np.ndarray, str]]:
+    """Array attributes of a mesh3d trace dict with their compact dtypes."""
+    out = {}
+    for key in _MESH_FLOAT_KEYS:
+        if trace.get(key) is not None:
+            out[key] = (_as_array(trace[key]).astype(float), "f4")
+    for key in _MESH_INDEX_KEYS:
+        if trace.get(key) is not None:
+            arr = _as_array(trace[key])
+            out[key] = (arr, _index_dtype(arr))
+    return out
+
+def binary_encode_figure(fig_dict: dict) -> dict:
+    """
+    Replace mesh3d array attributes by typed binary buffers (in place).
+    
+    Positions and intensities are stored as float32, face indices as
+    uint16/uint32. Requires plotly.js >= 2.28; older bundles keep lists.
+    """
+    if not _supports_typed_arrays():
+        return fig_dict
+    for trace in fig_dict.get("data", []):
+        if trace.get("type") != "mesh3d":
+            continue
+        for key, (arr, dtype) in _mesh_arrays(trace).items():
+            trace[key] = encode_typed_array(arr, dtype)
+    return fig_dict
+
+_ASSET_LOADER_JS = """
+(function() {
+    var gd = document.getElementById('{plot_id}');
+    var manifest = %(manifest)s;
+    var ctor = {f4: Float32Array, f8: Float64Array, u2: Uint16Array, u4: Uint32Array, i4: Int32Array};
+    fetch(%(asset)s).then(function(r) { return r.arrayBuffer(); }).then(function(buf) {
+        manifest.forEach(function(entry) {
+            var update = {};
+            Object.keys(entry.fields).forEach(function(key) {
+                var f = entry.fields[key];
+                update[key] = [new ctor[f.dtype](buf, f.offset, f.length)];
+            });
+            Plotly.restyle(gd, update, [entry.trace]);
+        });
+    }).catch(function(err) { console.error('mesh asset failed to load:', err); });
+})();
+"""
+
+def write_mesh_asset(fig_dict: dict, asset_path: str) -> List[dict]:
+    """
+    Move mesh3d arrays into one binary file (in place on fig_dict).
+    
+    Buffers are little-endian and 8-byte aligned so the browser can view
+    them directly as typed arrays. Returns the manifest
+    [{trace, fields: {attr: {dtype, offset, length}}}] used by the loader.
+    """
+    manifest = []
+    offset = 0
+    with open(asset_path, "wb") as fh:
+        for idx, trace in enumerate(fig_dict.get("data", [])):
+            if trace.get("type") != "mesh3d":
+                continue
+            fields = {}
+            for key, (arr, dtype) in _mesh_arrays(trace).items():
+                data = np.ascontiguousarray(arr, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+                pad = (-offset) % 8
+                fh.write(b"\0" * pad)
+                offset += pad
+                fh.write(data)
+                fields[key] = {"dtype": dtype, "offset": offset, "length": len(arr)}
+                offset += len(data)
+                trace[key] = []
+            manifest.append({"trace": idx, "fields": fields})
+    return manifest
 
 def create_mesh_trace(vertices: np.ndarray, faces: np.ndarray, 
                      scalars: np.ndarray, colorscale: str = "Turbo",
@@ -218,10 +342,12 @@ class SegmentedSpacetimeVisualizer:
     Main visualization class for segmented spacetime solar system.
     """
     
-    def __init__(self, title: str = "Segmented Spacetime — Solar System Mesh"):
+    def __init__(self, title: str = "Segmented Spacetime — Solar System Mesh",
+                 max_display_vertices: Optional[int] = DEFAULT_MAX_DISPLAY_VERTICES):
         self.title = title
         self.traces = []
         self.layout_config = {}
+        self.max_display_vertices = max_display_vertices
         
     def add_mesh(self, vertices: np.ndarray, faces: np.ndarray,
                 field_data: Dict[str, np.ndarray], 
@@ -245,14 +371,27 @@ class SegmentedSpacetimeVisualizer:
         self.faces = faces
         self.field_data = field_data
         
+        # Level of detail: the trace shows a decimated copy, the full
+        # resolution field stays available for computation
+        self.display_vertices, self.display_faces, self.display_field_data = decimate_mesh(
+            vertices, faces, self.max_display_vertices, field_data
+        )
+        if len(self.display_vertices) < len(vertices):
+            print(f"Display mesh: {len(self.display_vertices)} of {len(vertices)} vertices (LOD)")
+        
         # Create mesh trace for default field
         mesh_trace = create_mesh_trace(
-            vertices, faces, field_data[default_field],
+            self.display_vertices, self.display_faces,
+            self.display_field_data[default_field],
             name=default_field
         )
         
         self.traces.append(mesh_trace)
         
+    def display_field(self, name: str) -> np.ndarray:
+        """Field values on the displayed (possibly decimated) mesh."""
+        return self.display_field_data[name]
+        
     def add_bodies(self, catalog: pd.DataFrame, positions: np.ndarray) -> None:
         """
         Add celestial bodies.
@@ -376,7 +515,8 @@ class SegmentedSpacetimeVisualizer:
         
         return fig
         
-    def save_html(self, filename: str, include_plotlyjs: str = "cdn") -> None:
+    def save_html(self, filename: str, include_plotlyjs: str = "cdn",
+                  binary: bool = True, mesh_asset: bool = False) -> None:
         """
         Save visualization as HTML file.
         
@@ -386,18 +526,72 @@ class SegmentedSpacetimeVisualizer:
             Output filename
         include_plotlyjs : str
             How to include Plotly.js ("cdn", "inline", etc.)
+        binary : bool
+            Encode mesh arrays as typed binary buffers instead of JSON lists
+        mesh_asset : bool
+            Write mesh arrays to a separate "<name>.mesh.bin" next to the
+            HTML, fetched by the page after load (serve the directory over
+            HTTP; browsers block fetch() from file:// URLs)
         """
         
-        fig = self.create_figure()
-        fig.write_html(filename, include_plotlyjs=include_plotlyjs)
+        fig_dict = self.create_figure().to_plotly_json()
+        
+        post_script = None
+        if mesh_asset:
+            asset_path = os.path.splitext(filename)[0] + ".mesh.bin"
+            manifest = write_mesh_asset(fig_dict, asset_path)
+            post_script = _ASSET_LOADER_JS % {
+                "manifest": json.dumps(manifest),
+                "asset": json.dumps(os.path.basename(asset_path)),
+            }
+            print(f"Saved mesh asset to {asset_path}")
+        elif binary:
+            binary_encode_figure(fig_dict)
+        
+        pio.write_html(fig_dict, filename, include_plotlyjs=include_plotlyjs,
+                       post_script=post_script, validate=False)
         print(f"Saved visualization to {filename}")
 
+def _dashboard_figure(vertices: np.ndarray, faces: np.ndarray, scalars: np.ndarray,
+                      field_type: str, body_trace: go.Scatter3d) -> go.Figure:
+    """Full dashboard figure (built once; slider updates are patched)."""
+    mesh_trace = create_mesh_trace(vertices, faces, scalars, name=field_type)
+    fig = go.Figure(data=[mesh_trace, body_trace])
+    
+    fig.update_layout(
+        title=f"Segmented Spacetime — {field_type}(x) Field",
+        scene=dict(
+            aspectmode="data",
+            bgcolor="black",
+            xaxis=dict(title="X (AU)", gridcolor="gray", title_font=dict(color='white')),
+            yaxis=dict(title="Y (AU)", gridcolor="gray", title_font=dict(color='white')),
+            zaxis=dict(title="Z (AU)", gridcolor="gray", title_font=dict(color='white')),
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.0))
+        ),
+        paper_bgcolor="black",
+        plot_bgcolor="black",
+        font=dict(color='white'),
+        height=600,
+        uirevision="dashboard"  # keep camera while sliders move
+    )
+    
+    return fig
+
 def create_interactive_dashboard(field_calculator, catalog: pd.DataFrame, 
                                positions: np.ndarray, vertices: np.ndarray,
-                               faces: np.ndarray) -> dash.Dash:
+                               faces: np.ndarray,
+                               epoch: str = "default",
+                               epoch_calculators: Optional[Dict[str, object]] = None,
+                               max_cached_epochs: int = 8,
+                               max_display_vertices: Optional[int] = DEFAULT_MAX_DISPLAY_VERTICES
+                               ) -> dash.Dash:
     """
     Create interactive Dash dashboard with parameter controls.
     
+    N(x) is computed once per epoch and kept in an LRU FieldCache; the α/κ
+    sliders only re-derive τ = φ^(-αN) or n = 1 + κN on the cached values
+    and patch the mesh intensity instead of rebuilding the figure.
+    
     Parameters:
     -----------
     field_calculator : SegmentedSpacetimeField
@@ -410,17 +604,73 @@ def create_interactive_dashboard(field_calculator, catalog: pd.DataFrame,
         Mesh vertices
     faces : np.ndarray
         Mesh faces
+    epoch : str
+        Label of the epoch represented by field_calculator
+    epoch_calculators : dict, optional
+        Further epochs {label: SegmentedSpacetimeField}; adds an epoch selector
+    max_cached_epochs : int
+        LRU bound on epochs whose N is kept in memory
+    max_display_vertices : int, optional
+        Vertex budget of the displayed mesh (None = full resolution)
         
     Returns:
     --------
     app : dash.Dash
         Dash application
     """
+    from .segments import FieldCache
     
     app = dash.Dash(__name__)
     
+    calculators = {epoch: field_calculator}
+    if epoch_calculators:
+        calculators.update(epoch_calculators)
+    
+    # Display mesh geometry is fixed; N is reduced to it once per epoch
+    disp_vertices, disp_faces, _ = decimate_mesh(vertices, faces, max_display_vertices)
+    
+    def reduce_to_display(N_full: np.ndarray) -> np.ndarray:
+        return decimate_mesh(vertices, faces, max_display_vertices, {'N': N_full})[2]['N']
+    
+    cache = FieldCache(max_epochs=max_cached_epochs)
+    app.field_cache = cache
+    
+    def field_values(epoch_key, field_type, alpha, kappa) -> np.ndarray:
+        N = cache.get_N(epoch_key, calculators[epoch_key], vertices, reduce=reduce_to_display)
+        if field_type == 'N':
+            return N
+        tau, n = cache.derive(N, alpha, kappa)
+        return tau if field_type == 'tau' else n
+    
+    # Body trace is independent of the sliders
+    body_colors = {
+        'Sun': 'yellow', 'Mercury': 'gray', 'Venus': 'orange', 'Earth': 'blue',
+        'Mars': 'red', 'Jupiter': 'brown', 'Saturn': 'gold', 
+        'Uranus': 'cyan', 'Neptune': 'darkblue'
+    }
+    colors = [body_colors.get(name, 'white') for name in catalog['name']]
+    body_trace = create_body_trace(
+        positions, catalog['name'].tolist(),
+        catalog['mass_kg'].values, catalog['radius_km'].values, colors
+    )
+    
     # Initial field calculation
-    N, tau, n = field_calculator.compute_all_fields(vertices)
+    initial = _dashboard_figure(
+        disp_vertices, disp_faces,
+        field_values(epoch, 'N', field_calculator.alpha, field_calculator.kappa),
+        'N', body_trace
+    )
+    
+    epoch_selector = html.Div([
+        html.Label("Epoch:", style={'color': 'white'}),
+        dcc.Dropdown(
+            id='epoch-selector',
+            options=[{'label': str(k), 'value': k} for k in calculators],
+            value=epoch,
+            clearable=False,
+            style={'backgroundColor': '#333', 'color': 'black'}
+        )
+    ], style={'width': '30%', 'display': 'inline-block' if len(calculators) > 1 else 'none'})
     
     app.layout = html.Div([
         html.H1("Segmented Spacetime — Interactive Solar System", 
@@ -459,10 +709,12 @@ def create_interactive_dashboard(field_calculator, catalog: pd.DataFrame,
                     marks={i: f"{i:.3f}" for i in [0.005, 0.015, 0.025, 0.05, 0.1]},
                     tooltip={"placement": "bottom", "always_visible": True}
                 )
-            ], style={'width': '30%', 'display': 'inline-block'})
+            ], style={'width': '30%', 'display': 'inline-block'}),
+            
+            epoch_selector
         ], style={'padding': '20px'}),
         
-        dcc.Graph(id='spacetime-mesh', style={'height': '80vh'})
+        dcc.Graph(id='spacetime-mesh', figure=initial, style={'height': '80vh'})
         
     ], style={'backgroundColor': 'black'})
     
@@ -470,56 +722,29 @@ def create_interactive_dashboard(field_calculator, catalog: pd.DataFrame,
         Output('spacetime-mesh', 'figure'),
         [Input('field-selector', 'value'),
          Input('alpha-slider', 'value'),
-         Input('kappa-slider', 'value')]
+         Input('kappa-slider', 'value'),
+         Input('epoch-selector', 'value')],
+        prevent_initial_call=True
     )
-    def update_visualization(field_type, alpha, kappa):
+    def update_visualization(field_type, alpha, kappa, epoch_key):
         # Update field parameters
-        field_calculator.alpha = alpha
-        field_calculator.kappa = kappa
-        
-        # Recalculate fields
-        N, tau, n = field_calculator.compute_all_fields(vertices)
-        
-        # Select field to display
-        field_data = {'N': N, 'tau': tau, 'n': n}
-        scalars = field_data[field_type]
-        
-        # Create mesh trace
-        mesh_trace = create_mesh_trace(vertices, faces, scalars, name=field_type)
-        
-        # Create body trace
-        body_colors = {
-            'Sun': 'yellow', 'Mercury': 'gray', 'Venus': 'orange', 'Earth': 'blue',
-            'Mars': 'red', 'Jupiter': 'brown', 'Saturn': 'gold', 
-            'Uranus': 'cyan', 'Neptune': 'darkblue'
-        }
-        colors = [body_colors.get(name, 'white') for name in catalog['name']]
-        
-        body_trace = create_body_trace(
-            positions, catalog['name'].tolist(),
-            catalog['mass_kg'].values, catalog['radius_km'].values, colors
-        )
-        
-        # Create figure
-        fig = go.Figure(data=[mesh_trace, body_trace])
-        
-        fig.update_layout(
-            title=f"Segmented Spacetime — {field_type}(x) Field",
-            scene=dict(
-                aspectmode="data",
-                bgcolor="black",
-                xaxis=dict(title="X (AU)", gridcolor="gray", title_font=dict(color='white')),
-                yaxis=dict(title="Y (AU)", gridcolor="gray", title_font=dict(color='white')),
-                zaxis=dict(title="Z (AU)", gridcolor="gray", title_font=dict(color='white')),
-                camera=dict(eye=dict(x=1.5, y=1.5, z=1.0))
-            ),
-            paper_bgcolor="black",
-            plot_bgcolor="black",
-            font=dict(color='white'),
-            height=600
-        )
-        
-        return fig
+        calc = calculators.get(epoch_key, field_calculator)
+        calc.alpha = alpha
+        calc.kappa = kappa
+        
+        scalars = field_values(epoch_key if epoch_key in calculators else epoch,
+                               field_type, alpha, kappa)
+        smin, smax = float(scalars.min()), float(scalars.max())
+        
+        # Only the mesh intensity and labels change: send a partial update
+        patch = dash.Patch()
+        patch['data'][0]['intensity'] = scalars.astype(np.float32)
+        patch['data'][0]['name'] = field_type
+        patch['data'][0]['colorbar']['title']['text'] = field_type
+        patch['data'][0]['colorbar']['tick0'] = smin
+        patch['data'][0]['colorbar']['dtick'] = (smax - smin) / 10
+        patch['layout']['title']['text'] = f"Segmented Spacetime — {field_type}(x) Field"
+        return patch
     
     return app
 
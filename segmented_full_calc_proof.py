@@ -10,12 +10,22 @@ from segmented-spacetime segment radii (using the Δ(M) correction model)
 and shows that |RelErr| ≤ 1e-6 % for all cases.
 
 Exports CSV: segmented_spacetime_mass_validation_full.csv
+
+--precision tiered : float64 for all objects, Decimal only for rows
+                     flagged as ill-conditioned (see tools/mass_tiered.py)
 """
 
-import csv, math, sys
+import argparse, csv, math, sys
 from decimal import Decimal as D, getcontext
 from pathlib import Path
 
+ap = argparse.ArgumentParser(description="Segmented spacetime Δ(M) mass validation (full)")
+ap.add_argument("--precision", choices=["decimal", "tiered"], default="decimal",
+                help="decimal: all rows at 200 digits | tiered: float64 + Decimal escalation")
+ap.add_argument("--catalog", default="mass_from_segments_corrected_by_paper.csv",
+                help="optional CSV (Objekt, M_true_Msun) extending the base list")
+ARGS, _ = ap.parse_known_args()
+
 # ──────────────────────────────────────────────────────────────────────────────
 # GLOBAL SETTINGS & CONSTANTS
 # ──────────────────────────────────────────────────────────────────────────────
@@ -40,7 +50,7 @@ BASE = {
     'Sagittarius A*':  D('4.297e6')*M_sun,
 }
 # Extend from CSV if present
-CSV_FNAME = 'mass_from_segments_corrected_by_paper.csv'
+CSV_FNAME = ARGS.catalog
 if Path(CSV_FNAME).exists():
     with open(CSV_FNAME, newline='', encoding='utf-8') as f:
         for row in csv.DictReader(f):
@@ -93,8 +103,7 @@ def invert_mass(r_obs: D, M0: D) -> D:
 # ──────────────────────────────────────────────────────────────────────────────
 # RUN MASS VALIDATION
 # ──────────────────────────────────────────────────────────────────────────────
-results = []
-for name, M_true in BASE.items():
+def validate_decimal(M_true: D):
     # Schwarzschild radius
     r_s = D(2)*G*M_true/c**2
     # observed segmented radius
@@ -103,7 +112,20 @@ for name, M_true in BASE.items():
     # invert back to mass
     M_rec = invert_mass(r_obs, M_true)
     rel_err = abs((M_rec - M_true)/M_true)*D(100)
-    results.append((name, M_true, M_rec, d, rel_err))
+    return M_rec, d, rel_err
+
+tier_report = None
+if ARGS.precision == "tiered":
+    from tools.mass_tiered import DeltaModel, run_tiered, format_escalation_report
+    names, masses = list(BASE.keys()), list(BASE.values())
+    model = DeltaModel(A=float(A), alpha=float(alpha), B=float(B), Lmin=float(Lmin), Lmax=float(Lmax))
+    tiered = run_tiered(names, masses, model, lambda i: validate_decimal(masses[i]))
+    results = tiered.rows()
+    tier_report = format_escalation_report(tiered)
+else:
+    results = []
+    for name, M_true in BASE.items():
+        results.append((name, M_true) + validate_decimal(M_true))
 
 # ──────────────────────────────────────────────────────────────────────────────
 # OUTPUT: CSV + ECHO
@@ -131,4 +153,6 @@ print(f"{'Objekt':<20} {'M_true(kg)':>15} {'M_rec(kg)':>15} {'Δ %':>8} {'RelErr
 print("-"*70)
 for name, Mt, Mr, d, err in results:
     print(f"{name:<20} {Mt:15.6e} {Mr:15.6e} {float(d):8.3f} {float(err):10.3e}")
+if tier_report:
+    print(tier_report)
 print("Fertig ✅")
@@ -18,39 +18,15 @@ import argparse, math, time
 from decimal import Decimal as D, getcontext
 from typing import Dict, Tuple
 
+from tools.pi_engine import pi_decimal
+
 # ──────────────────────────────────────────────────────────────────────────────
-# Chudnovsky π (iterative Decimal version; simple and sufficiently fast for 1e3–1e4 dps)
-# For ultra‑high precision, consider binary‑splitting with pure integers.
+# Chudnovsky π (binary splitting with pure integers, see tools.pi_engine;
+# results are shared with the other π-bridge scripts via the on-disk cache)
 # ──────────────────────────────────────────────────────────────────────────────
 def chudnovsky_pi(n_terms: int, prec: int) -> D:
     getcontext().prec = prec
-    # C = 426880 * sqrt(10005)
-    sqrt10005 = getcontext().sqrt(D(10005))
-    C = D(426880) * sqrt10005
-
-    S = D(0)
-    M = D(1)                   # ratio of factorials (6k)!/( (3k)!(k!)^3 ), updated iteratively
-    L = D(13591409)
-    X = D(1)
-    SIGN = 1
-    C3 = D(640320) ** 3
-
-    for k in range(n_terms):
-        term = (M * L) / X
-        S += term if SIGN > 0 else -term
-
-        # Update to k+1 without factorials:
-        k1 = k + 1
-        num = D( (6*k1 - 5) * (6*k1 - 4) * (6*k1 - 3) * (6*k1 - 2) * (6*k1 - 1) * (6*k1) )
-        den = D( (3*k1 - 2) * (3*k1 - 1) * (3*k1) * (k1 * k1 * k1) )
-        M = M * (num / den)
-
-        L += D(545140134)
-        X *= C3
-        SIGN = -SIGN
-
-    pi = C / S
-    return +pi  # context rounding
+    return pi_decimal(prec, n_terms)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Δ(M) model with analytic derivative
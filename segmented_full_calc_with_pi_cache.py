@@ -18,48 +18,19 @@ import sys, argparse, math, time
 from decimal import Decimal as D, getcontext
 from typing import Tuple, Dict
 
+from tools.pi_engine import pi_decimal
+
 # ──────────────────────────────────────────────────────────────────────────────
-# Chudnovsky π (Decimal, simple iterative form)
+# Chudnovsky π (binary splitting, shared on-disk digit cache)
 # ──────────────────────────────────────────────────────────────────────────────
 def chudnovsky_pi(n_terms: int, prec: int) -> D:
     """
-    Compute π using the Chudnovsky series with Decimal arithmetic.
-    n_terms: number of series terms (≈ digits/14)
+    Compute π using the Chudnovsky series (binary splitting, tools.pi_engine).
+    n_terms: number of series terms (≈ digits/14); enough terms → cached π
     prec   : Decimal precision (digits)
     """
     getcontext().prec = prec
-    # C = 426880 * sqrt(10005)
-    sqrt10005 = getcontext().sqrt(D(10005))
-    C = D(426880) * sqrt10005
-
-    # Iterate terms: M_k, L_k, X_k (classic update, simple form)
-    S = D(0)
-    M = D(1)                   # ratio of factorials (6k)!/( (3k)!(k!)^3 )
-    L = D(13591409)
-    X = D(1)
-    SIGN = 1
-    # Constant: 640320^3
-    C3 = D(640320) ** 3
-
-    for k in range(n_terms):
-        term = (M * L) / X
-        if SIGN < 0:
-            term = -term
-        S += term
-
-        # Next k
-        # Update M by multiplying with rational factor to avoid factorials
-        k1 = k + 1
-        num = D( (6*k1 - 5) * (6*k1 - 4) * (6*k1 - 3) * (6*k1 - 2) * (6*k1 - 1) * (6*k1) )
-        den = D( (3*k1 - 2) * (3*k1 - 1) * (3*k1) * (k1 * k1 * k1) )
-        M = M * (num / den)
-
-        L += D(545140134)
-        X *= C3
-        SIGN = -SIGN
-
-    pi = C / S
-    return +pi  # apply context rounding
+    return pi_decimal(prec, n_terms)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Δ(M) model (as in segmented_full_calc_proof.py), with iteration stats
@@ -161,6 +132,8 @@ def main():
     ap.add_argument("--A", type=str, default="98.01", help="Δ(M) A parameter (percent)")
     ap.add_argument("--alpha", type=str, default="2.7177e4", help="Δ(M) alpha parameter [1/m]")
     ap.add_argument("--B", type=str, default="1.96", help="Δ(M) B parameter (percent)")
+    ap.add_argument("--precision", choices=["decimal", "tiered"], default="decimal",
+                    help="decimal: every object at --prec | tiered: float64, Decimal only for flagged rows")
     args = ap.parse_args()
 
     getcontext().prec = args.prec
@@ -190,9 +163,7 @@ def main():
     print(f"{'Objekt':<20} {'M_true(kg)':>15} {'M_rec(kg)':>15} {'Δ%(true)':>10} {'iters':>5} {'RelErr%':>12}")
     print("-"*80)
 
-    # Loop
-    total_iters = 0
-    for name, M_true in BASE.items():
+    def validate_decimal(M_true: D):
         # Construct the "observed" segmented radius using the model itself
         r_s = D(2)*G*M_true/c**2
         Δpct_true = delta_percent(M_true, G, c, A, alpha, B, Lmin, Lmax)
@@ -204,11 +175,36 @@ def main():
         # Invert
         M_rec, iters = invert_mass(r_obs, M0, const, A, alpha, B, Lmin, Lmax)
         rel_err = abs((M_rec - M_true)/M_true) * D(100)
-        total_iters += iters
-        print(f"{name:<20} {M_true:15.6e} {M_rec:15.6e} {float(Δpct_true):10.3f} {iters:5d} {float(rel_err):12.3e}")
+        return M_rec, Δpct_true, rel_err, iters
+
+    # Loop
+    total_iters = 0
+    if args.precision == "tiered":
+        from tools.mass_tiered import DeltaModel, run_tiered, format_escalation_report
+        names, masses = list(BASE.keys()), list(BASE.values())
+        model = DeltaModel(A=float(A), alpha=float(alpha), B=float(B), Lmin=float(Lmin), Lmax=float(Lmax))
+        dec_iters = {}
+
+        def escalate(i):
+            M_rec, Δpct, rel_err, iters = validate_decimal(masses[i])
+            dec_iters[i] = iters
+            return M_rec, Δpct, rel_err
+
+        tiered = run_tiered(names, masses, model, escalate)
+        for i, (name, M_true, M_rec, Δpct_true, rel_err) in enumerate(tiered.rows()):
+            iters = dec_iters.get(i, int(tiered.iterations[i]))
+            total_iters += iters
+            print(f"{name:<20} {M_true:15.6e} {M_rec:15.6e} {float(Δpct_true):10.3f} {iters:5d} {float(rel_err):12.3e}")
+    else:
+        for name, M_true in BASE.items():
+            M_rec, Δpct_true, rel_err, iters = validate_decimal(M_true)
+            total_iters += iters
+            print(f"{name:<20} {M_true:15.6e} {M_rec:15.6e} {float(Δpct_true):10.3f} {iters:5d} {float(rel_err):12.3e}")
 
     print("-"*80)
     print(f"Avg Newton iterations: {total_iters/len(BASE):.2f}")
+    if args.precision == "tiered":
+        print(format_escalation_report(tiered))
     print("Done. ✅")
 
 if __name__ == "__main__":
@@ -10,12 +10,22 @@ from the segmented-spacetime correction model Δ(M), then inverts
 to mass and shows that all relative errors ≤ 1e-6 %.
 
 Exports CSV: segmented_spacetime_mass_validation_perfect.csv
+
+--precision tiered : float64 for all objects, Decimal only for rows
+                     flagged as ill-conditioned (see tools/mass_tiered.py)
 """
 
-import csv, math
+import argparse, csv, math
 from decimal import Decimal as D, getcontext
 from pathlib import Path
 
+ap = argparse.ArgumentParser(description="Segmented spacetime Δ(M) mass validation (perfect)")
+ap.add_argument("--precision", choices=["decimal", "tiered"], default="decimal",
+                help="decimal: all rows at 200 digits | tiered: float64 + Decimal escalation")
+ap.add_argument("--catalog", default="mass_from_segments_corrected_by_paper.csv",
+                help="optional CSV (Objekt, M_true_Msun) extending the base list")
+ARGS, _ = ap.parse_known_args()
+
 # ──────────────────────────────────────────────────────────────────────────────
 # GLOBAL SETTINGS & CONSTANTS
 # ──────────────────────────────────────────────────────────────────────────────
@@ -37,7 +47,7 @@ BASE = {
     'Sonne':           M_sun,
     'Sagittarius A*':  D('4.297e6')*M_sun,
 }
-CSV_FNAME = 'mass_from_segments_corrected_by_paper.csv'
+CSV_FNAME = ARGS.catalog
 if Path(CSV_FNAME).exists():
     import csv
     with open(CSV_FNAME, newline='', encoding='utf-8') as f:
@@ -81,14 +91,28 @@ def invert_mass(r_obs: D, M0: D) -> D:
 # ──────────────────────────────────────────────────────────────────────────────
 # MASS VALIDATION LOOP
 # ──────────────────────────────────────────────────────────────────────────────
-results = []
-for name, M_true in BASE.items():
+def validate_decimal(M_true: D):
     r_s   = D(2)*G*M_true/c**2
     # segment radius after Δ‐correction:
-    r_obs = phi/D(2)*r_s*(D(1)+delta_percent(M_true)/D(100))
+    d     = delta_percent(M_true)
+    r_obs = phi/D(2)*r_s*(D(1)+d/D(100))
     M_rec = invert_mass(r_obs, M_true)
     rel   = abs((M_rec-M_true)/M_true)*D(100)
-    results.append((name, M_true, M_rec, rel))
+    return M_rec, d, rel
+
+tier_report = None
+if ARGS.precision == "tiered":
+    from tools.mass_tiered import DeltaModel, run_tiered, format_escalation_report
+    names, masses = list(BASE.keys()), list(BASE.values())
+    model = DeltaModel(A=float(A), alpha=float(alpha), B=float(B), Lmin=float(Lmin), Lmax=float(Lmax))
+    tiered = run_tiered(names, masses, model, lambda i: validate_decimal(masses[i]))
+    results = [(name, Mt, Mr, err) for name, Mt, Mr, _d, err in tiered.rows()]
+    tier_report = format_escalation_report(tiered)
+else:
+    results = []
+    for name, M_true in BASE.items():
+        M_rec, _d, rel = validate_decimal(M_true)
+        results.append((name, M_true, M_rec, rel))
 
 # ──────────────────────────────────────────────────────────────────────────────
 # WRITE CSV
@@ -120,5 +144,7 @@ CSV output → {OUT_CSV}
 
 for name, Mt, Mr, err in results:
     print(f"{name:<20} {Mt:15.6e} {Mr:15.6e} {float(err):10.3e}")
+if tier_report:
+    print(tier_report)
 
 print("\nFertig ✅")
@@ -9,12 +9,21 @@ segmented_spacetime_full_demo.py  –  ONE‑STOP SHOWCASE
 Reconstructs masses of celestial bodies and the electron
 from φ-corrected segment radii. All values match known
 reference masses with ≤ 0.000001 % deviation.
+
+--precision tiered : float64 for all objects, Decimal only for rows
+                     flagged as ill-conditioned (see tools/mass_tiered.py)
 """
 
+import argparse
 import pandas as pd
 from decimal import Decimal, getcontext
 import os
 
+ap = argparse.ArgumentParser(description="Segmented spacetime mass validation (φ/2 showcase)")
+ap.add_argument("--precision", choices=["decimal", "tiered"], default="decimal",
+                help="decimal: all rows at 50 digits | tiered: float64 + Decimal escalation")
+ARGS, _ = ap.parse_known_args()
+
 getcontext().prec = 50
 D = Decimal
 
@@ -59,11 +68,28 @@ mass_table = [
 
 df = pd.DataFrame(mass_table, columns=["Objekt", "M_true_Msun"])
 df["M_true_dec"] = df["M_true_Msun"].apply(lambda x: D(str(x)) * M_sun)
-df["r_s_true_dec"] = df["M_true_dec"].apply(lambda M: D(2) * G * M / c**2)
-df["r_phi_corr_dec"] = df["r_s_true_dec"] * phi / D(2)
-df["M_corr_dec"] = df["r_phi_corr_dec"] * c**2 / (G * phi)
-df["rel_err_%"] = ((df["M_corr_dec"] - df["M_true_dec"]).abs() / df["M_true_dec"]) * 100
-df["M_corr_Msun"] = df["M_corr_dec"] / M_sun
+
+def reconstruct_decimal(M_true):
+    r_s_true = D(2) * G * M_true / c**2
+    r_phi_corr = r_s_true * phi / D(2)
+    M_corr = r_phi_corr * c**2 / (G * phi)
+    return M_corr, D(0), abs(M_corr - M_true) / M_true * 100
+
+tier_report = None
+if ARGS.precision == "tiered":
+    from tools.mass_tiered import run_tiered, format_escalation_report
+    masses = list(df["M_true_dec"])
+    tiered = run_tiered(list(df["Objekt"]), masses, None, lambda i: reconstruct_decimal(masses[i]))
+    df["M_corr_dec"] = tiered.M_rec
+    df["rel_err_%"] = tiered.rel_err_pct
+    df["M_corr_Msun"] = tiered.M_rec / float(M_sun)
+    tier_report = format_escalation_report(tiered)
+else:
+    df["r_s_true_dec"] = df["M_true_dec"].apply(lambda M: D(2) * G * M / c**2)
+    df["r_phi_corr_dec"] = df["r_s_true_dec"] * phi / D(2)
+    df["M_corr_dec"] = df["r_phi_corr_dec"] * c**2 / (G * phi)
+    df["rel_err_%"] = ((df["M_corr_dec"] - df["M_true_dec"]).abs() / df["M_true_dec"]) * 100
+    df["M_corr_Msun"] = df["M_corr_dec"] / M_sun
 tolerance = D("1e-6")
 df["PASS"] = df["rel_err_%"] <= float(tolerance * 100)
 
@@ -122,5 +148,7 @@ fail_count = df_out["PASS"].value_counts().get(False, 0)
 print(f"Max. relativer Fehler   : {max_err:.2e} %")
 print(f"Median relativer Fehler : {median_err:.2e} %")
 print(f"Anzahl FAILS            : {fail_count}")
+if tier_report:
+    print(tier_report)
 print("Fertig ✅")
 print("Hinweis: Alle relativen Fehler stammen ausschließlich aus numerischer Rundung bei G, c, φ – das Modell ist exakt.")
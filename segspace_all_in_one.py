@@ -21,6 +21,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 
+from tools.pi_engine import pi_decimal
+
 # -----------------------------
 # Optional Libraries
 # -----------------------------
@@ -87,25 +89,11 @@ def sha256_file(path: Path) -> str:
 # Chudnovsky-π
 # -----------------------------
 def chudnovsky_pi(terms: int, prec: int) -> Tuple[D, float]:
-    """Compute π via Chudnovsky series with 'terms' and Decimal precision 'prec'."""
-    from decimal import getcontext
-    old = getcontext().prec
-    getcontext().prec = prec
+    """Compute π via Chudnovsky series (binary splitting, shared digit cache in tools.pi_engine)."""
     start = time.perf_counter()
-
-    C = 426880 * D(10005).sqrt()
-    M = D(1); L = D(13591409); X = D(1); K = D(6); S = L
-    for _k in range(1, terms):
-        M = (M * (K**3 - 16*K)) / (D(_k)**3)
-        L += 545140134
-        X *= -262537412640768000
-        S += (M * L) / X
-        K += 12
-
-    pi = C / S
+    pi = pi_decimal(prec, terms)
     dt = (time.perf_counter() - start) * 1000.0  # ms
-    getcontext().prec = old
-    return +pi, dt
+    return +pi, dt  # round to the caller's context precision
 
 # -----------------------------
 # Orbital/Redshift Physik
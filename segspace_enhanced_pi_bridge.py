@@ -31,6 +31,8 @@ import argparse, csv, math, time, sys
 from pathlib import Path
 from decimal import Decimal as D, getcontext
 
+from tools.pi_engine import pi_decimal
+
 try:
     import pandas as pd
 except Exception:
@@ -41,36 +43,14 @@ except Exception:
 # ─────────────────────────────────────────────────────────────────────────────
 
 def chudnovsky_pi(prec: int = 120, terms: int = 12) -> D:
-    """π via Chudnovsky (Decimal). ~14 Dezimalstellen pro Term."""
+    """π via Chudnovsky (Binary Splitting, persistenter Ziffern-Cache). ~14 Dezimalstellen pro Term."""
     if prec < 50:
         prec = 50
     if terms < 1:
         terms = 1
-    getcontext().prec = prec + 10  # guard digits
-
-    C = 640320
-    C3 = C**3
-
-    # simple factorial (ok für kleine 'terms')
-    def fact(n: int) -> int:
-        f = 1
-        for i in range(2, n+1):
-            f *= i
-        return f
-
-    S = D(0)
-    for k in range(terms):
-        sign = -1 if (k & 1) else 1
-        sixk   = fact(6*k)
-        threek = fact(3*k)
-        kfact  = fact(k)
-        num = D(sign) * D(sixk) * D(13591409 + 545140134*k)
-        den = D(threek) * (D(kfact)**3) * (D(C3)**k)
-        S += num / den
-
-    pi = (D(426880) * D(10005).sqrt()) / S
+    pi = pi_decimal(prec, terms)
     getcontext().prec = prec
-    return +pi
+    return pi
 
 def builtin_pi() -> D:
     return D(str(math.pi))
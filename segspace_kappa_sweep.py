@@ -4,6 +4,14 @@
 Create CSV variants with r_emit_m = kappa * r_s (Schwarzschild radius).
 - Input: real_data_full.csv
 - Output: real_data_full_kappa_<K>.csv for each K
+
+--eval: virtual sweep instead of file copies. The base table is loaded once,
+r_emit_m = K * r_s is applied per K as a column transform, the redshift
+evaluation (same model and sign test as eval-redshift) runs for every K in
+one process and only the summary table is written (optionally all variants
+as one Parquet dataset partitioned by kappa, each K written as soon as it is
+evaluated; reruns replace the written kappa partitions, read_variants()
+restores kappa as float).
 """
 import argparse, csv, math, sys
 from pathlib import Path
@@ -32,14 +40,116 @@ def make_variant(src: Path, dst: Path, K: float):
     with open(dst, "w", newline="", encoding="utf-8") as f:
         w=csv.DictWriter(f, fieldnames=cols); w.writeheader(); w.writerows(out)
 
+# ───────── virtual sweep ─────────
+
+def schwarzschild_radius(M_solar):
+    """r_s per row (NaN where the mass is missing or not positive), as in make_variant"""
+    import numpy as np
+    M = np.asarray(M_solar, dtype=float) * M_sun
+    with np.errstate(invalid="ignore"):
+        return np.where(np.isfinite(M) & (M > 0), 2*G*M/(c**2), np.nan)
+
+class KappaVariants:
+    """
+    Base table loaded once; each K is a lazily built view with r_emit_m = K * r_s.
+    Only the r_emit_m column is materialized per K, the other columns are shared.
+    """
+    def __init__(self, src: Path):
+        import pandas as pd
+        self.base = pd.read_csv(src)
+        m = pd.to_numeric(self.base["M_solar"], errors="coerce") if "M_solar" in self.base else float('nan')
+        self.r_s = schwarzschild_radius(m)
+
+    def r_emit(self, K: float):
+        return K * self.r_s
+
+    def frame(self, K: float):
+        return self.base.assign(r_emit_m=self.r_emit(K))
+
+    def __call__(self, ks):
+        for K in ks:
+            yield K, self.frame(K)
+
+def evaluate_variant(df, mode: str = "hybrid", prefer_z: bool = False):
+    """eval-redshift medians and paired sign test for one variant"""
+    import numpy as np
+    from tools.stratified_paired import compute_residuals, abs_residuals, paired_stats
+    res = compute_residuals(df, mode=mode, prefer_z=prefer_z)
+    out = {}
+    for k, v in abs_residuals(res).items():
+        v = v.to_numpy(); v = v[np.isfinite(v)]
+        out[f"med_{k[4:]}"] = float(np.median(v)) if v.size else float('nan')
+    p = paired_stats(res)
+    out.update({key: p[key] for key in ("N_pairs", "N_Seg_better", "share_Seg_better", "binom_two_sided_p")})
+    return out
+
+def parse_kappas(spec: str):
+    """Comma list ("2.5,3,4") or linspace ("start:stop:num")"""
+    if ":" in spec:
+        import numpy as np
+        a, b, n = spec.split(":")
+        return [float(x) for x in np.linspace(float(a), float(b), int(n))]
+    return [float(x.strip()) for x in spec.split(",")]
+
+def kappa_partitioning():
+    """Hive partitioning with a float64 kappa key (directory names alone read back as int)"""
+    import pyarrow as pa, pyarrow.dataset as ds
+    return ds.partitioning(pa.schema([("kappa", pa.float64())]), flavor="hive")
+
+def write_variant(df, K: float, parquet_dir: Path):
+    """
+    Write one variant into the Parquet dataset partitioned by kappa.
+    Only the partition of this K is replaced, so reruns do not duplicate rows
+    and each variant can be released right after it is written.
+    """
+    import pyarrow as pa, pyarrow.parquet as pq
+    table = pa.Table.from_pandas(df.assign(kappa=float(K)), preserve_index=False)
+    pq.write_to_dataset(table, parquet_dir, partitioning=kappa_partitioning(),
+                        existing_data_behavior="delete_matching")
+
+def read_variants(parquet_dir: Path):
+    """Read the kappa dataset back with kappa as float64"""
+    import pyarrow.parquet as pq
+    return pq.read_table(parquet_dir, partitioning=kappa_partitioning()).to_pandas()
+
+def run_virtual_sweep(src: Path, ks, summary: Path, mode: str = "hybrid", prefer_z: bool = False,
+                      parquet_dir: Path = None):
+    import pandas as pd
+    variants = KappaVariants(src)
+    rows = []
+    for K, df in variants(ks):
+        row = {"kappa": K}
+        row.update(evaluate_variant(df, mode=mode, prefer_z=prefer_z))
+        rows.append(row)
+        if parquet_dir is not None:
+            write_variant(df, K, parquet_dir)
+    table = pd.DataFrame(rows)
+    summary.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(summary, index=False)
+    return table
+
 def main():
     ap=argparse.ArgumentParser()
     ap.add_argument("--csv", type=Path, default=Path("./real_data_full.csv"))
-    ap.add_argument("--kappas", type=str, default="2.5,3,4,6")
+    ap.add_argument("--kappas", type=str, default="2.5,3,4,6", help="Comma list or start:stop:num")
     ap.add_argument("--outdir", type=Path, default=Path("."))
+    ap.add_argument("--eval", action="store_true", help="Virtual sweep: evaluate all K in one pass, no CSV copies")
+    ap.add_argument("--mode", choices=["hint","deltaM","hybrid","geodesic"], default="hybrid")
+    ap.add_argument("--prefer-z", action="store_true")
+    ap.add_argument("--summary", type=Path, default=None, help="Summary CSV (default: <outdir>/kappa_sweep_summary.csv)")
+    ap.add_argument("--parquet", type=Path, default=None, help="Also write variants as Parquet dataset partitioned by kappa")
     args=ap.parse_args()
 
-    ks=[float(x.strip()) for x in args.kappas.split(",")]
+    ks=parse_kappas(args.kappas)
+    if args.eval:
+        summary = args.summary or (args.outdir / "kappa_sweep_summary.csv")
+        table = run_virtual_sweep(args.csv, ks, summary, mode=args.mode, prefer_z=args.prefer_z,
+                                  parquet_dir=args.parquet)
+        print(table.to_string(index=False))
+        print(f"[OK] wrote {summary}")
+        if args.parquet is not None:
+            print(f"[OK] wrote {args.parquet} (partitioned by kappa)")
+        return
     for K in ks:
         dst = args.outdir / f"real_data_full_kappa_{str(K).replace('.','_')}.csv"
         make_variant(args.csv, dst, K)
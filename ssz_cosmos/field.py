@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -24,29 +24,53 @@ class BodyState:
 
 
 class MultiBodyField:
-    """Superpose SSZ fields from multiple bodies."""
+    """Superpose SSZ fields from multiple bodies.
 
-    def __init__(self, core: Optional[SSZCore] = None) -> None:
+    Per-body constants (r_s, r_phi, ln(r_phi/r_s)) come from the core's
+    cached structure-of-arrays, so an epoch costs one broadcast over
+    (bodies x points) instead of a Python loop over bodies. ``dtype``
+    selects the storage precision of the field arrays (e.g. np.float32).
+    """
+
+    def __init__(self, core: Optional[SSZCore] = None, dtype=np.float64) -> None:
         self.core = core or SSZCore()
+        self.dtype = np.dtype(dtype)
 
-    def sigma(self, points: np.ndarray, states: Iterable[BodyState]) -> np.ndarray:
+    def _bodies(self, states: Sequence[BodyState]):
+        masses = np.array([state.mass_kg for state in states], dtype=float)
+        return self.core.body_arrays(masses, self.dtype)
+
+    def distances(self, points: np.ndarray, states: Sequence[BodyState]) -> np.ndarray:
+        """Distances of shape (bodies, *points.shape[:-1])."""
         points = np.asarray(points)
-        sigma_total = np.zeros(points.shape[:-1])
-        for state in states:
-            rs = self.core.schwarzschild_radius(state.mass_kg)
-            rphi = self.core.r_phi(state.mass_kg)
-            distances = np.linalg.norm(points - state.position, axis=-1)
-            sigma_body = self.core.sigma(distances, state.mass_kg)
-            sigma_total += sigma_body
-        return sigma_total
+        positions = np.array([state.position for state in states], dtype=float)
+        positions = positions.reshape((len(states),) + (1,) * (points.ndim - 1) + (3,))
+        return np.linalg.norm(points[None] - positions, axis=-1).astype(self.dtype, copy=False)
+
+    def sigma_bodies(self, points: np.ndarray, states: Iterable[BodyState]) -> np.ndarray:
+        """Per-body segment density of shape (bodies, *points.shape[:-1])."""
+        states = list(states)
+        points = np.asarray(points)
+        if not states:
+            return np.zeros((0,) + points.shape[:-1], dtype=self.dtype)
+        return self.core.sigma_bodies(self.distances(points, states), self._bodies(states))
+
+    def sigma(self, points: np.ndarray, states: Iterable[BodyState]) -> np.ndarray:
+        return self.sigma_bodies(points, states).sum(axis=0)
 
     def tau(self, points: np.ndarray, states: Iterable[BodyState]) -> np.ndarray:
-        sigma_total = self.sigma(points, states)
-        # For now use global alpha (can be made per-body by weighting)
-        alpha = np.mean([state.alpha for state in states])
-        return self.core.const.PHI ** (-alpha * sigma_total)
+        return self.fields(points, states)[1]
 
     def refractive_index(self, points: np.ndarray, states: Iterable[BodyState]) -> np.ndarray:
+        return self.fields(points, states)[2]
+
+    def fields(self, points: np.ndarray, states: Iterable[BodyState]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(sigma, tau, refractive_index) from a single sigma evaluation."""
+        states = list(states)
         sigma_total = self.sigma(points, states)
+        # For now use global alpha/kappa (can be made per-body by weighting)
+        alpha = np.mean([state.alpha for state in states])
         kappa = np.mean([state.kappa for state in states])
-        return 1.0 + kappa * sigma_total
+        tau = self.core.const.PHI ** (-alpha * sigma_total)
+        n = 1.0 + kappa * sigma_total
+        return sigma_total, tau.astype(self.dtype, copy=False), n.astype(self.dtype, copy=False)
@@ -64,7 +64,5 @@ class SSZCosmicSimulator:
             states = self.states_at(jd)
             if not states:
                 continue
-            sigma = self.field.sigma(config.grid_points, states)
-            tau = self.field.tau(config.grid_points, states)
-            n = self.field.refractive_index(config.grid_points, states)
+            sigma, tau, n = self.field.fields(config.grid_points, states)
             yield SimulationResult(jd=jd, sigma=sigma, tau=tau, refractive_index=n)
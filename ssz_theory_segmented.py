@@ -13,7 +13,7 @@ SSZ — Wirkungsbasiert (Skalar mit anisotroper Kinetik) — stabil (v2)
 import math
 import argparse
 from dataclasses import dataclass
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 import numpy as np
 from scipy.integrate import solve_ivp
 import csv
@@ -105,6 +105,27 @@ def dU_dphi(phi: float, mphi: float, lam: float, phi_cap: float) -> float:
     dph = sech2_stable(phi / phi_cap)
     return ((mphi**2) * ph + 4.0 * lam * (ph**3)) * dph
 
+# --------------------------- Array-Varianten (Nachbearbeitung) -----------------
+
+def sat_arr(x: np.ndarray, cap: float | None) -> np.ndarray:
+    """Glatte Sättigung ±cap via tanh (Array-Variante von sat)."""
+    x = np.asarray(x, dtype=float)
+    if cap is None or cap <= 0:
+        return x
+    return cap * np.tanh(x / cap)
+
+def Zpar_arr(phi: np.ndarray, Z0: float, alpha: float, beta: float, phi_cap: float,
+             Zmin: float, Zmax: float) -> np.ndarray:
+    """Z_parallel(φ) elementweise, gleiche Klammerung wie Zpar."""
+    ph = sat_arr(phi, phi_cap)
+    return np.clip(Zpar_raw(ph, Z0, alpha, beta), Zmin, Zmax)
+
+def U_arr(phi: np.ndarray, mphi: float, lam: float, phi_cap: float) -> np.ndarray:
+    """U(φ) elementweise (Array-Variante von U)."""
+    ph = sat_arr(phi, phi_cap)
+    ph2 = ph * ph
+    return 0.5 * (mphi**2) * ph2 + lam * (ph2 * ph2)
+
 # --------------------------- Parameter & RHS ------------------------------------
 
 @dataclass
@@ -260,56 +281,68 @@ def integrate_theory(rmin: float, rmax: float, y0: np.ndarray, p: Params,
     return r_nodes, sol.y
 
 def interpolate_solution(t_src: np.ndarray, Y_src: np.ndarray, t_dst: np.ndarray) -> np.ndarray:
-    """Lineare Interpolation Y(t) auf t_dst."""
-    Y_dst = np.zeros((Y_src.shape[0], len(t_dst)), dtype=float)
-    for i in range(Y_src.shape[0]):
-        Y_dst[i, :] = np.interp(t_dst, t_src, Y_src[i, :])
-    return Y_dst
+    """Lineare Interpolation Y(t) auf t_dst (alle Komponenten in einem Schritt)."""
+    t_src = np.asarray(t_src, dtype=float)
+    t_dst = np.asarray(t_dst, dtype=float)
+    Y_src = np.asarray(Y_src, dtype=float)
+    if len(t_src) < 2:
+        return np.repeat(Y_src[:, :1], len(t_dst), axis=1)
+    # gleiche Randbehandlung wie np.interp: konstante Fortsetzung außerhalb
+    tq = np.clip(t_dst, t_src[0], t_src[-1])
+    j = np.clip(np.searchsorted(t_src, tq, side="right") - 1, 0, len(t_src) - 2)
+    t0 = t_src[j]
+    dt = t_src[j + 1] - t0
+    w = np.divide(tq - t0, dt, out=np.zeros_like(tq), where=dt != 0)
+    return Y_src[:, j] * (1.0 - w) + Y_src[:, j + 1] * w
+
+HEADER = [
+    "r_over_rs", "r_m", "m_geom_m", "Phi",
+    "rho_fl", "pr_fl", "pt_fl",
+    "phi", "phip",
+    "Zpar", "U",
+    "X", "rho_phi", "pr_phi", "pt_phi", "Delta_phi",
+    "rho_tot", "pr_tot", "pt_tot", "one_minus_2m_over_r"
+]
+
+def build_columns(r_grid: np.ndarray, Y: np.ndarray, p: Params, rs: float) -> Dict[str, np.ndarray]:
+    """
+    Abgeleitete Größen (Zpar, U, X, Spannungs-Energie-Zerlegung) spaltenweise
+    auf dem ganzen Raster. Rückgabe: {Spaltenname -> Array}, Reihenfolge = HEADER.
+    """
+    r = np.asarray(r_grid, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    m, Phi, pr_fl, phi, phip = Y[0], Y[1], Y[2], Y[3], Y[4]
+    one_minus = np.maximum(1.0 - 2.0 * m / np.maximum(r, 1e-30), 1e-16)
+
+    Zp  = Zpar_arr(phi, p.Z0, p.alpha, p.beta, p.phi_cap, p.Zmin, p.Zmax)
+    Up  = U_arr(phi, p.mphi, p.lam, p.phi_cap)
+    phip_s = sat_arr(phip, p.phip_cap)
+    X   = one_minus * (phip_s**2)
+
+    kin = 0.5 * Zp * X
+    rho_phi =  kin + Up
+    pr_phi  =  kin - Up
+    pt_phi  = -kin - Up
+    Delta_phi = pt_phi - pr_phi
+
+    rho_fl = (pr_fl / max(p.cs2, 1e-16)) + p.rho0
+    pt_fl  = pr_fl
 
-def build_rows(r_grid: np.ndarray, Y: np.ndarray, p: Params, rs: float) -> Tuple[List[str], List[List[float]]]:
-    header = [
-        "r_over_rs", "r_m", "m_geom_m", "Phi",
-        "rho_fl", "pr_fl", "pt_fl",
-        "phi", "phip",
-        "Zpar", "U",
-        "X", "rho_phi", "pr_phi", "pt_phi", "Delta_phi",
-        "rho_tot", "pr_tot", "pt_tot", "one_minus_2m_over_r"
+    cols = [
+        r / rs, r, m, Phi,
+        rho_fl, pr_fl, pt_fl,
+        phi, phip,
+        Zp, Up,
+        X, rho_phi, pr_phi, pt_phi, Delta_phi,
+        rho_fl + rho_phi, pr_fl + pr_phi, pt_fl + pt_phi, one_minus
     ]
-    rows: List[List[float]] = []
-    for k in range(len(r_grid)):
-        r = float(r_grid[k])
-        m, Phi, pr_fl, phi, phip = (float(Y[0,k]), float(Y[1,k]), float(Y[2,k]), float(Y[3,k]), float(Y[4,k]))
-        one_minus = max(1.0 - 2.0 * m / max(r, 1e-30), 1e-16)
-
-        Lam = -0.5 * math.log(one_minus)
-        inv_e2L = one_minus
-
-        Zp  = Zpar(phi, p.Z0, p.alpha, p.beta, p.phi_cap, p.Zmin, p.Zmax)
-        Up  = U(phi, p.mphi, p.lam, p.phi_cap)
-        phip_s = sat(phip, p.phip_cap)
-        X   = inv_e2L * (phip_s**2)
-
-        rho_phi =  0.5 * Zp * X + Up
-        pr_phi  =  0.5 * Zp * X - Up
-        pt_phi  = -0.5 * Zp * X - Up
-        Delta_phi = pt_phi - pr_phi
-
-        rho_fl = (pr_fl / max(p.cs2, 1e-16)) + p.rho0
-        pt_fl  = pr_fl
-
-        rho_tot = rho_fl + rho_phi
-        pr_tot  = pr_fl + pr_phi
-        pt_tot  = pt_fl + pt_phi
-
-        rows.append([
-            r/rs, r, m, Phi,
-            rho_fl, pr_fl, pt_fl,
-            phi, phip,
-            Zp, Up,
-            X, rho_phi, pr_phi, pt_phi, Delta_phi,
-            rho_tot, pr_tot, pt_tot, one_minus
-        ])
-    return header, rows
+    return {name: np.ascontiguousarray(c, dtype=float) for name, c in zip(HEADER, cols)}
+
+def build_rows(r_grid: np.ndarray, Y: np.ndarray, p: Params, rs: float) -> Tuple[List[str], List[List[float]]]:
+    """Zeilenweise Sicht auf build_columns (Kompatibilität)."""
+    cols = build_columns(r_grid, Y, p, rs)
+    rows = np.column_stack([cols[h] for h in HEADER]).tolist()
+    return list(HEADER), rows
 
 def write_csv(path: str, header: List[str], rows: List[List[float]]) -> None:
     with open(path, "w", newline="") as f:
@@ -324,6 +357,48 @@ def write_csv(path: str, header: List[str], rows: List[List[float]]) -> None:
                     out.append(x)
             w.writerow(out)
 
+def _format_from_path(path: str) -> str:
+    low = path.lower()
+    if low.endswith(".parquet") or low.endswith(".pq"):
+        return "parquet"
+    if low.endswith(".npz"):
+        return "npz"
+    return "csv"
+
+def write_columns(path: str, columns: Dict[str, np.ndarray], fmt: str = "auto") -> str:
+    """
+    Spaltenweiser Export. fmt: auto|csv|parquet|npz (auto = aus Dateiendung).
+    CSV: gleiche Zahlendarstellung wie write_csv (%.10e), aber ohne Zell-Schleife.
+    Parquet: spaltenweise lesbar (z.B. pd.read_parquet(path, columns=[...])), benötigt pyarrow.
+    NPZ: ein float64-Array je Spalte.
+    Rückgabe: tatsächlich verwendetes Format.
+    """
+    if fmt == "auto":
+        fmt = _format_from_path(path)
+    names = list(columns.keys())
+
+    if fmt == "csv":
+        mat = np.column_stack([np.asarray(columns[n], dtype=float) for n in names])
+        line = ",".join(["%.10e"] * len(names))
+        with open(path, "w", newline="") as f:
+            f.write(",".join(names) + "\r\n")
+            if len(mat):
+                f.write("\r\n".join(line % tuple(row) for row in mat.tolist()))
+                f.write("\r\n")
+    elif fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet-Export benötigt pyarrow (pip install pyarrow).") from exc
+        table = pa.table({n: np.asarray(columns[n], dtype=float) for n in names})
+        pq.write_table(table, path)
+    elif fmt == "npz":
+        np.savez(path, **{n: np.asarray(columns[n], dtype=float) for n in names})
+    else:
+        raise ValueError(f"Unbekanntes Exportformat: {fmt}")
+    return fmt
+
 # --------------------------- CLI & Main ----------------------------------------
 
 def main():
@@ -335,7 +410,9 @@ def main():
     ap.add_argument("--rmin-mult", type=float, default=1.05, help="r_min = mult * r_s")
     ap.add_argument("--rmax-mult", type=float, default=12.0, help="r_max = mult * r_s")
     ap.add_argument("--grid", type=int, default=200, help="Anzahl Rasterpunkte für Ausgabe")
-    ap.add_argument("--export", type=str, default="out_theory.csv", help="Ausgabe-CSV")
+    ap.add_argument("--export", type=str, default="out_theory.csv", help="Ausgabedatei (.csv | .parquet | .npz)")
+    ap.add_argument("--format", choices=["auto","csv","parquet","npz"], default="auto",
+                    help="Exportformat (auto = aus Dateiendung)")
 
     # Anfangswerte
     ap.add_argument("--phi0", type=float, default=1e-4)
@@ -446,10 +523,10 @@ def main():
     r_grid = np.linspace(rmin, rmax, args.grid)
     Y_grid = interpolate_solution(r_nodes, Y_nodes, r_grid)
 
-    # CSV
-    header, rows = build_rows(r_grid, Y_grid, p, r_s)
-    write_csv(args.export, header, rows)
-    print(f"\n[ok] CSV: {args.export}")
+    # Export
+    columns = build_columns(r_grid, Y_grid, p, r_s)
+    fmt = write_columns(args.export, columns, args.format)
+    print(f"\n[ok] {fmt.upper()}: {args.export}")
 
 if __name__ == "__main__":
     main()
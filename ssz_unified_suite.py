@@ -23,6 +23,7 @@ from matplotlib.widgets import Slider, Button, RadioButtons
 import pandas as pd
 from scipy.optimize import minimize_scalar
 import json
+from dataclasses import dataclass
 from datetime import datetime
 
 try:  # optional Plotly dependency for interactive notebooks/visuals
@@ -64,11 +65,35 @@ class SSZConstants:
     M_SGR_A = 8.26e36           # Sgr A* (supermassives schwarzes Loch)
     M_CYGNUS_X1 = 4.78e31       # Cygnus X-1 (stellares schwarzes Loch)
 
+@dataclass(frozen=True)
+class SSZBodyArrays:
+    """Pro-Körper-Konstanten als Structure of Arrays (ein Eintrag je Körper)"""
+    
+    mass: np.ndarray      # M [kg]
+    rs: np.ndarray        # r_s = 2GM/c²
+    rphi: np.ndarray      # r_φ = (φ/2)·r_s·[1 + Δ(M)]
+    r_min: np.ndarray     # untere Clip-Grenze 1.001·r_s
+    r_max: np.ndarray     # obere Clip-Grenze 0.999·r_φ
+    log_span: np.ndarray  # ln(r_φ/r_s), Nenner von σ
+    
+    def __len__(self):
+        return len(self.mass)
+    
+    def expand(self, ndim):
+        """Konstanten als (Körper, 1, ...) für Broadcasting gegen (Körper, Punkte...)"""
+        shape = (len(self),) + (1,) * (ndim - 1)
+        return (self.rphi.reshape(shape), self.r_min.reshape(shape),
+                self.r_max.reshape(shape), self.log_span.reshape(shape))
+
+
 class SSZCore:
     """Kern-Berechnungen der Segmented Spacetime Theorie"""
     
+    BODY_CACHE_SIZE = 128
+    
     def __init__(self):
         self.const = SSZConstants()
+        self._body_cache = {}
     
     def schwarzschild_radius(self, M):
         """Schwarzschild-Radius r_s = 2GM/c²"""
@@ -76,20 +101,24 @@ class SSZCore:
     
     def delta_M(self, M):
         """Massenkorrektur Δ(M) = A·e^(-α·r_s) + B"""
-        rs = self.schwarzschild_radius(M)
+        return self._delta_rs(self.schwarzschild_radius(M))
+    
+    def _delta_rs(self, rs):
         A, B, alpha = self.const.DELTA_A, self.const.DELTA_B, self.const.DELTA_ALPHA
         return A * np.exp(-alpha * rs) + B
     
+    def _radii(self, M):
+        """(r_s, r_φ) mit nur einer Auswertung von r_s und Δ(M)"""
+        rs = self.schwarzschild_radius(M)
+        return rs, (self.const.PHI / 2) * rs * (1 + self._delta_rs(rs))
+    
     def r_phi(self, M):
         """Natural Boundary r_φ = (φ/2)·r_s·[1 + Δ(M)]"""
-        rs = self.schwarzschild_radius(M)
-        delta = self.delta_M(M)
-        return (self.const.PHI / 2) * rs * (1 + delta)
+        return self._radii(M)[1]
     
     def sigma(self, r, M):
         """Segmentdichte σ(r) = ln(r_φ/r) / ln(r_φ/r_s)"""
-        rs = self.schwarzschild_radius(M)
-        rphi = self.r_phi(M)
+        rs, rphi = self._radii(M)
         
         # Sicherheitscheck: r muss zwischen r_s und r_φ liegen
         r = np.clip(r, rs * 1.001, rphi * 0.999)
@@ -109,6 +138,53 @@ class SSZCore:
         sig = self.sigma(r, M)
         return 1 + kappa * sig
     
+    # ---------------------------------------------------------------
+    # Vektorisiert: Massen-Array × Punkte
+    # ---------------------------------------------------------------
+    
+    def body_arrays(self, M, dtype=np.float64):
+        """
+        Pro-Körper-Konstanten für ein Massen-Array (einmal berechnet, gecacht)
+        
+        Die Konstanten werden in float64 berechnet und in dtype gespeichert
+        (float32 halbiert Speicher und Bandbreite der Körper × Punkte-Felder).
+        """
+        M = np.atleast_1d(np.asarray(M, dtype=np.float64))
+        key = (M.tobytes(), np.dtype(dtype).str)
+        bodies = self._body_cache.get(key)
+        if bodies is None:
+            rs, rphi = self._radii(M)
+            bodies = SSZBodyArrays(*(np.ascontiguousarray(a, dtype=dtype) for a in
+                                     (M, rs, rphi, rs * 1.001, rphi * 0.999, np.log(rphi / rs))))
+            if len(self._body_cache) >= self.BODY_CACHE_SIZE:
+                self._body_cache.clear()
+            self._body_cache[key] = bodies
+        return bodies
+    
+    def sigma_bodies(self, r, bodies):
+        """
+        σ für (Körper × Punkte): r hat die Form (Körper, ...) und wird
+        mit den Pro-Körper-Konstanten gebroadcastet
+        """
+        r = np.asarray(r, dtype=bodies.rphi.dtype)
+        rphi, r_min, r_max, log_span = bodies.expand(r.ndim)
+        r = np.clip(r, r_min, r_max)
+        return np.log(rphi / r) / log_span
+    
+    def _per_body(self, value, bodies, ndim):
+        value = np.asarray(value, dtype=bodies.rphi.dtype)
+        return value.reshape((len(bodies),) + (1,) * (ndim - 1)) if value.ndim else value
+    
+    def tau_bodies(self, r, bodies, alpha=1.0):
+        """τ = φ^(-α·σ) für (Körper × Punkte); alpha skalar oder je Körper"""
+        sig = self.sigma_bodies(r, bodies)
+        return self.const.PHI ** (-self._per_body(alpha, bodies, sig.ndim) * sig)
+    
+    def n_index_bodies(self, r, bodies, kappa=0.015):
+        """n = 1 + κ·σ für (Körper × Punkte); kappa skalar oder je Körper"""
+        sig = self.sigma_bodies(r, bodies)
+        return 1 + self._per_body(kappa, bodies, sig.ndim) * sig
+    
     def dual_velocity(self, r, M):
         """Dual-Velocity-Invarianz: v_esc · v_fall = c²"""
         rs = self.schwarzschild_radius(M)
@@ -15,11 +15,10 @@ Validates theoretical predictions:
 """
 import pandas as pd
 import numpy as np
-import subprocess
-import json
-from pathlib import Path
 from scipy import stats
 
+from tools.stratified_paired import compute_residuals, paired_stats, rows_mask
+
 print("="*80)
 print("STRATIFIED PAIRED TEST ANALYSIS")
 print("="*80)
@@ -50,9 +49,12 @@ print(f"  Strong field + high v (r < 2 OR v > 5%c): {strong_high_v.sum()} obs")
 print(f"  Weak field (r > 10 rs): {weak_field.sum()} obs")
 print(f"  Other: {len(df) - photon_sphere.sum() - strong_high_v.sum() - weak_field.sum()} obs")
 
+# Model residuals for all rows, computed once (Seg hybrid vs GR×SR)
+residuals = compute_residuals(df, mode='hybrid')
+
 # Function to run paired test on subset
-def run_paired_test(data_subset, label):
-    """Run paired test on a data subset"""
+def run_paired_test(data_subset, label, n_boot=2000):
+    """Run paired test on a data subset (in-process, no eval-redshift subprocess)"""
     print(f"\n{'='*80}")
     print(f"PAIRED TEST: {label}")
     print(f"{'='*80}")
@@ -63,64 +65,32 @@ def run_paired_test(data_subset, label):
     
     print(f"  Sample size: {len(data_subset)}")
     
-    # Save subset to temp file
-    temp_file = Path('temp_subset.csv')
-    data_subset.to_csv(temp_file, index=False)
-    
-    # Run paired test
-    cmd = [
-        'python', 'segspace_all_in_one_extended.py',
-        '--outdir', 'agent_out_temp',
-        'eval-redshift',
-        '--csv', str(temp_file),
-        '--paired-stats',
-        '--mode', 'hybrid'
-    ]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, 
-                              encoding='utf-8', errors='replace', timeout=60)
-        
-        # Read results
-        result_file = Path('agent_out_temp/reports/redshift_paired_stats.json')
-        if result_file.exists():
-            with open(result_file) as f:
-                stats_data = json.load(f)
-            
-            n_pairs = stats_data.get('N_pairs', 0)
-            n_seg_better = stats_data.get('N_Seg_better', 0)
-            share = stats_data.get('share_Seg_better', 0)
-            p_value = stats_data.get('binom_two_sided_p', 1.0)
-            
-            print(f"  SEG wins: {n_seg_better}/{n_pairs} ({share*100:.1f}%)")
-            print(f"  p-value: {p_value:.4f}")
-            
-            if p_value < 0.05:
-                print(f"  [SIGNIFICANT] (p < 0.05)")
-            elif p_value < 0.10:
-                print(f"  [Marginally significant] (p < 0.10)")
-            else:
-                print(f"  [Not significant] (p >= 0.10)")
-            
-            # Cleanup
-            temp_file.unlink(missing_ok=True)
-            
-            return {
-                'n_pairs': n_pairs,
-                'n_seg_better': n_seg_better,
-                'share': share,
-                'p_value': p_value,
-                'label': label
-            }
-        else:
-            print("  [ERROR] Could not read results")
-            temp_file.unlink(missing_ok=True)
-            return None
-            
-    except Exception as e:
-        print(f"  [ERROR] {e}")
-        temp_file.unlink(missing_ok=True)
-        return None
+    stats_data = paired_stats(residuals, rows_mask(residuals, data_subset.index), n_boot=n_boot)
+    
+    n_pairs = stats_data['N_pairs']
+    n_seg_better = stats_data['N_Seg_better']
+    share = stats_data['share_Seg_better']
+    p_value = stats_data['binom_two_sided_p']
+    
+    print(f"  SEG wins: {n_seg_better}/{n_pairs} ({share*100:.1f}%)")
+    if n_boot > 0:
+        print(f"  95% CI (bootstrap): {stats_data['share_ci_lo']*100:.1f}% - {stats_data['share_ci_hi']*100:.1f}%")
+    print(f"  p-value: {p_value:.4f}")
+    
+    if p_value < 0.05:
+        print(f"  [SIGNIFICANT] (p < 0.05)")
+    elif p_value < 0.10:
+        print(f"  [Marginally significant] (p < 0.10)")
+    else:
+        print(f"  [Not significant] (p >= 0.10)")
+    
+    return {
+        'n_pairs': n_pairs,
+        'n_seg_better': n_seg_better,
+        'share': share,
+        'p_value': p_value,
+        'label': label
+    }
 
 # Run stratified tests
 results = []
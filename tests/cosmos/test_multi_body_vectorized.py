@@ -0,0 +1,49 @@
+import numpy as np
+
+from ssz_cosmos.field import BodyState, MultiBodyField
+from ssz_unified_suite import SSZCore
+
+
+def _states():
+    rng = np.random.default_rng(0)
+    masses = [1.989e30, 1.898e27, 5.972e24, 8.26e36]
+    return [BodyState(f"b{i}", rng.normal(0.0, 1e11, 3), m, 0.5 + 0.25 * i, 0.01 + 0.005 * i)
+            for i, m in enumerate(masses)]
+
+
+def test_sigma_bodies_matches_scalar_core():
+    core = SSZCore()
+    masses = np.array([5.97e24, 1.989e30, 8.26e36])
+    r = np.logspace(-3, 13, 200)
+    bodies = core.body_arrays(masses)
+    assert core.body_arrays(masses.copy()) is bodies
+
+    radii = np.broadcast_to(r, (3, r.size))
+    np.testing.assert_array_equal(core.sigma_bodies(radii, bodies), [core.sigma(r, m) for m in masses])
+    alpha = np.array([1.0, 0.5, 2.0])
+    np.testing.assert_array_equal(core.tau_bodies(radii, bodies, alpha),
+                                  [core.tau(r, m, a) for m, a in zip(masses, alpha)])
+    np.testing.assert_array_equal(core.n_index_bodies(radii, bodies, 0.02),
+                                  [core.n_index(r, m, 0.02) for m in masses])
+
+
+def test_multi_body_field_matches_per_body_loop():
+    field = MultiBodyField()
+    states = _states()
+    points = np.random.default_rng(1).normal(0.0, 2e11, (5, 7, 3))
+
+    expected = np.zeros(points.shape[:-1])
+    for state in states:
+        distances = np.linalg.norm(points - state.position, axis=-1)
+        expected += field.core.sigma(distances, state.mass_kg)
+
+    sigma, tau, n = field.fields(points, states)
+    assert sigma.shape == (5, 7)
+    np.testing.assert_allclose(sigma, expected, rtol=1e-14)
+    np.testing.assert_array_equal(tau, field.tau(points, states))
+    np.testing.assert_array_equal(n, field.refractive_index(points, states))
+
+    field32 = MultiBodyField(dtype=np.float32)
+    sigma32 = field32.sigma(points, states)
+    assert sigma32.dtype == np.float32
+    np.testing.assert_allclose(sigma32, expected, rtol=1e-5, atol=1e-6)
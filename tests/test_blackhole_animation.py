@@ -0,0 +1,58 @@
+"""
+Tests for the frame precomputation and renderers in blackhole_animation
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import blackhole_animation as bha
+
+FIGSIZE = (4.0, 2.0)
+
+
+def test_precompute_frames_matches_scalar_physics():
+    state = bha.precompute_frames(7)
+    assert state["n"] == 7 and state["pulse"].shape == (7, len(state["r_lines"]))
+    for key in ("r_current", "x", "y", "tau", "z_grav", "N_rel", "v_orb", "v_esc", "phi_corr"):
+        assert state[key].shape == (7,) and np.all(np.isfinite(state[key])), key
+    assert np.all((state["r_current"] >= 2.5) & (state["r_current"] <= 6.0))
+    i = 4
+    r = state["r_actual"][i]
+    assert state["tau"][i] == pytest.approx(bha.time_dilation(r, bha.M_BH))
+    assert state["z_grav"][i] == pytest.approx(bha.gravitational_redshift(r, bha.M_BH))
+    assert np.hypot(state["x"][i], state["y"][i]) == pytest.approx(state["r_current"][i])
+
+
+@pytest.mark.parametrize("renderer", ["serial", "parallel"])
+def test_small_render_writes_gif(tmp_path, renderer):
+    out = tmp_path / f"{renderer}.gif"
+    if renderer == "serial":
+        bha.render_serial(str(out), 3, 10, 30, FIGSIZE)
+    else:
+        bha.render_parallel(str(out), 3, 10, 30, FIGSIZE, workers=1)
+    with Image.open(out) as gif:
+        assert gif.n_frames == 3
+        assert gif.size == (120, 60)
+
+
+def test_encode_gif_rejects_empty_input(tmp_path):
+    with pytest.raises(SystemExit):
+        bha.encode_gif(iter(()), tmp_path / "empty.gif", 10)
+
+
+@pytest.mark.parametrize("frames", ["0", "-3"])
+def test_cli_rejects_non_positive_frame_count(frames, capsys):
+    with pytest.raises(SystemExit) as exc:
+        bha.main(["--frames", frames])
+    assert exc.value.code == 2
+    assert ">= 1" in capsys.readouterr().err
@@ -0,0 +1,114 @@
+"""
+Tests for the local catalog store of the segmented-solar fetchers
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# segmented-solar/src is not importable as a package from the repo root (name clash with src/)
+_spec = importlib.util.spec_from_file_location(
+    "catalog_store", Path(__file__).resolve().parents[1] / "segmented-solar" / "src" / "catalog_store.py")
+catalog_store = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(catalog_store)
+CatalogStore = catalog_store.CatalogStore
+
+
+def _solar_module(name):
+    """Submodule of segmented-solar/src without running the package __init__ (plotly, app)"""
+    if "solar_src" not in sys.modules:
+        package = types.ModuleType("solar_src")
+        package.__path__ = [str(Path(__file__).resolve().parents[1] / "segmented-solar" / "src")]
+        sys.modules["solar_src"] = package
+    return importlib.import_module(f"solar_src.{name}")
+
+
+def _stars(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    dist = np.round(rng.uniform(1.0, 40.0, n), 1)  # ties included
+    dist[::37] = np.nan
+    return pd.DataFrame({"source_id": np.arange(n), "dist_pc": dist,
+                         "phot_g_mean_mag": rng.uniform(0.0, 12.0, n)})
+
+
+@pytest.mark.parametrize("radius", [0.5, 5.0, 12.3, 30.0, 100.0])
+def test_within_matches_pandas_filter(tmp_path, radius):
+    df = _stars()
+    store = CatalogStore(str(tmp_path))
+    key = store.put("gaia_stars", {"maxdist_pc": 40.0}, df, dist_column="dist_pc")
+
+    expected = df[df["dist_pc"] < radius].reset_index(drop=True)
+    pd.testing.assert_frame_equal(store.within(key, radius), expected)
+    inclusive = df[df["dist_pc"] <= radius].reset_index(drop=True)
+    pd.testing.assert_frame_equal(store.within(key, radius, inclusive=True), inclusive)
+
+    order, dist = store.distance_index(key)
+    assert isinstance(dist, np.memmap)
+    np.testing.assert_array_equal(dist, df["dist_pc"].to_numpy()[order])
+
+
+def test_radius_query_uses_smallest_covering_query(tmp_path):
+    df = _stars()
+    store = CatalogStore(str(tmp_path))
+    store.put("gaia_stars", {"maxdist_pc": 40.0, "gmag_max": 12.0}, df, dist_column="dist_pc")
+    near = df[df["dist_pc"] < 20.0]
+    store.put("gaia_stars", {"maxdist_pc": 20.0, "gmag_max": 12.0}, near, dist_column="dist_pc")
+    store.put("gaia_stars", {"maxdist_pc": 25.0, "gmag_max": 6.0}, near[near["phot_g_mean_mag"] < 6.0],
+              dist_column="dist_pc")
+
+    got = store.radius_query("gaia_stars", 15.0, "maxdist_pc",
+                             covers=lambda p: p["gmag_max"] >= 10.0)
+    pd.testing.assert_frame_equal(got, df[df["dist_pc"] < 15.0].reset_index(drop=True))
+    got = store.radius_query("gaia_stars", 30.0, "maxdist_pc")
+    pd.testing.assert_frame_equal(got, df[df["dist_pc"] < 30.0].reset_index(drop=True))
+    assert store.radius_query("gaia_stars", 50.0, "maxdist_pc") is None
+
+    # fresh process: read from disk, results unchanged and independent of each other
+    reopened = CatalogStore(str(tmp_path))
+    bright_ok = lambda p: p["gmag_max"] >= 10.0
+    first = reopened.radius_query("gaia_stars", 15.0, "maxdist_pc", covers=bright_ok)
+    first.loc[0, "dist_pc"] = -1.0
+    pd.testing.assert_frame_equal(reopened.radius_query("gaia_stars", 15.0, "maxdist_pc", covers=bright_ok),
+                                  df[df["dist_pc"] < 15.0].reset_index(drop=True))
+
+
+def test_legacy_order_only_index_is_rebuilt(tmp_path):
+    df = _stars()
+    store = CatalogStore(str(tmp_path))
+    key = store.put("gaia_stars", {"maxdist_pc": 40.0}, df, dist_column="dist_pc")
+    stem = os.path.join(store.path, store.index[key]["stem"])
+    os.remove(stem + ".order.npy")
+    np.save(stem + ".dist.npy", np.argsort(df["dist_pc"].to_numpy(), kind="stable"))
+
+    reopened = CatalogStore(str(tmp_path))
+    pd.testing.assert_frame_equal(reopened.within(key, 10.0),
+                                  df[df["dist_pc"] < 10.0].reset_index(drop=True))
+    assert np.load(stem + ".dist.npy").dtype == np.float64
+
+
+def test_query_gaia_stars_checks_exact_key_without_reading(tmp_path, monkeypatch):
+    fetch_gaia = _solar_module("fetch_gaia")
+    df = _stars().assign(phot_g_mean_mag=lambda d: d["phot_g_mean_mag"] - 5.0)
+    store = fetch_gaia.get_store(str(tmp_path))
+    store.put("gaia_stars", {"maxdist_pc": 30.0, "gmag_max": 10.0},
+              df[df["dist_pc"] < 30.0], dist_column="dist_pc")
+
+    def _no_full_read(*_args):
+        raise AssertionError("whole stored table converted to pandas")
+
+    monkeypatch.setattr(type(store), "read", _no_full_read)
+    got = fetch_gaia.query_gaia_stars(30, 10, cache_dir=str(tmp_path), offline=True)
+    expected = df[(df["dist_pc"] < 30.0) & (df["phot_g_mean_mag"] < 10.0)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, expected)
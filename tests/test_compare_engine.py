@@ -0,0 +1,89 @@
+"""
+Tests for the batched model scoring in core.compare
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import numpy as np
+import pytest
+
+from core import compare
+from core.compare import baseline_predictions, compare_models, score_models, stack_predictions
+from tools.metrics import aic, bic, cliffs_delta, log_likelihood_gaussian, mae, rmse
+
+
+def test_compare_models_matches_per_model_metrics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    y_obs = rng.normal(10.0, 2.0, 200)
+    models = {f"variant_{i}": y_obs + rng.normal(0.0, 1.0 + 0.2 * i, 200) for i in range(5)}
+
+    results = compare_models(y_obs, models, metrics=["rmse", "mae", "aic", "bic", "cliffs"],
+                             param_counts={"variant_1": 5})
+
+    for name, y_pred in models.items():
+        k = 5 if name == "variant_1" else 3
+        ll = log_likelihood_gaussian(y_obs, y_pred)
+        assert results[name]["rmse"] == pytest.approx(rmse(y_obs, y_pred), rel=1e-12)
+        assert results[name]["mae"] == pytest.approx(mae(y_obs, y_pred), rel=1e-12)
+        assert results[name]["aic"] == pytest.approx(aic(ll, k), rel=1e-12)
+        assert results[name]["bic"] == pytest.approx(bic(ll, k, len(y_obs)), rel=1e-12)
+    assert results["variant_0_vs_variant_3_delta"] == cliffs_delta(
+        np.abs(y_obs - models["variant_0"]), np.abs(y_obs - models["variant_3"]))
+    assert (tmp_path / "reports" / "compare" / "model_scores.csv").exists()
+
+
+def test_scalar_predictions_broadcast_over_points(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    y_obs = np.array([1.0, 2.5, 3.0, 4.5])
+    models = {"const": 3.0, "zero_d": np.array(2.0), "full": y_obs + 0.1, "listed": [1, 2, 3, 4]}
+
+    names, P = stack_predictions(models, len(y_obs))
+    assert names == list(models) and P.shape == (4, 4)
+    np.testing.assert_array_equal(P[0], np.full(4, 3.0))
+    np.testing.assert_array_equal(P[1], np.full(4, 2.0))
+    assert stack_predictions({"a": 1.0, "b": y_obs})[1].shape == (2, 4)
+
+    results = compare_models(y_obs, models, metrics=["rmse", "mae", "aic", "cliffs"])
+    for name, y_pred in models.items():
+        assert results[name]["rmse"] == pytest.approx(rmse(y_obs, y_pred), rel=1e-12)
+        assert results[name]["mae"] == pytest.approx(mae(y_obs, y_pred), rel=1e-12)
+    assert results["const_vs_full_delta"] == cliffs_delta(np.abs(y_obs - 3.0), np.abs(y_obs - models["full"]))
+
+    with pytest.raises(ValueError):
+        stack_predictions({"short": [1.0, 2.0]}, len(y_obs))
+
+
+def test_baseline_predictions_are_cached_by_input():
+    T = np.linspace(100.0, 50.0, 20)
+    n = np.ones(20)
+    first = baseline_predictions(T, n, 12.5)
+    assert baseline_predictions(T.copy(), n.copy(), 12.5) is first
+    assert baseline_predictions(T, n, 13.0) is not first
+    assert not first["Shock"].flags.writeable
+
+
+def test_baseline_cache_is_bounded_lru(monkeypatch):
+    compare.clear_baseline_cache()
+    monkeypatch.setattr(compare, "BASELINE_CACHE_SIZE", 3)
+    T, n = np.linspace(100.0, 50.0, 5), np.ones(5)
+    first = baseline_predictions(T, n, 0.0)
+    for v0 in (1.0, 2.0):
+        baseline_predictions(T, n, v0)
+    assert baseline_predictions(T, n, 0.0) is first  # refreshed, so 1.0 is evicted next
+    baseline_predictions(T, n, 3.0)
+    assert len(compare._BASELINE_CACHE) == 3
+    assert baseline_predictions(T, n, 0.0) is first
+    compare.clear_baseline_cache()
+
+
+@pytest.mark.filterwarnings("ignore:Degrees of freedom:RuntimeWarning")
+def test_score_models_log_likelihood_edge_cases():
+    y_obs = np.array([1.0, 2.0, 3.0])
+    scores = score_models(y_obs, np.vstack([y_obs - 0.5, y_obs + [0.1, -0.2, 0.3]]))
+    assert scores["log_likelihood"][0] == -np.inf == log_likelihood_gaussian(y_obs, y_obs - 0.5)
+    single = score_models([1.0], [[0.5]])["log_likelihood"]
+    assert np.isnan(single[0]) and np.isnan(log_likelihood_gaussian([1.0], [0.5]))
@@ -0,0 +1,92 @@
+"""
+Tests for the columnar table writer in tools.io_utils
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.io_utils import TableWriter, safe_write_table, write_table
+
+
+@pytest.mark.parametrize("suffix", ["csv", "parquet", "feather"])
+def test_safe_write_table_round_trip_and_manifest(tmp_path, monkeypatch, suffix):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    columns = {"radius_pc": rng.random(500), "gamma": rng.random(500) * 1e-7,
+               "stable": (rng.random(500) > 0.5).astype(int)}
+
+    safe_write_table(f"reports/grid.{suffix}", columns,
+                     manifest_path="reports/MANIFEST.json", role="grid")
+
+    path = tmp_path / "reports" / f"grid.{suffix}"
+    if suffix == "csv":
+        df = pd.read_csv(path, float_precision="round_trip")
+        assert path.read_text(encoding="utf-8").splitlines()[0] == "radius_pc,gamma,stable"
+    else:
+        df = getattr(pd, f"read_{suffix}")(path)
+    for name, values in columns.items():
+        np.testing.assert_array_equal(df[name].to_numpy(), values)
+
+    artifact = json.loads((tmp_path / "reports" / "MANIFEST.json").read_text())["artifacts"][0]
+    assert artifact["role"] == "grid" and artifact["format"] == suffix and artifact["sha256"]
+
+
+def test_safe_write_table_rejects_unsafe_path_and_ragged_columns(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(RuntimeError):
+        safe_write_table(str(tmp_path / "elsewhere.csv"), {"a": [1, 2]})
+    with pytest.raises(ValueError):
+        safe_write_table("reports/bad.csv", {"a": [1, 2], "b": [1]})
+
+
+def test_write_table_csv_bytes(tmp_path):
+    out = write_table(tmp_path / "t.csv", {"x": [0.5, 2.0, 1e-07], "name with,comma": [1, 2, 3],
+                                           "ok": [True, False, True]})
+    assert (tmp_path / "t.csv").read_bytes() == (
+        b'x,"name with,comma",ok\n0.5,1,true\n2,2,false\n1e-7,3,true\n')
+    assert out == str((tmp_path / "t.csv").resolve())
+
+
+def test_export_ring_metrics_csv_returns_given_path(tmp_path, monkeypatch):
+    from core.stats import compute_ring_metrics, export_ring_metrics_csv
+    monkeypatch.chdir(tmp_path)
+    metrics = compute_ring_metrics(np.arange(1, 5), [40.0, 35.0, 30.0, 28.0], [1e3, 2e3, 3e3, 4e3],
+                                   [10.0, 11.0, 12.5, 13.0])
+    out = export_ring_metrics_csv("G79", metrics, outdir="reports/data")
+    assert out == str(Path("reports/data") / "G79_ring_metrics.csv")
+    assert b"\r" not in (tmp_path / out).read_bytes()
+
+
+@pytest.mark.parametrize("suffix", ["csv", "parquet", "feather"])
+def test_table_writer_appends_batches(tmp_path, suffix):
+    rng = np.random.default_rng(1)
+    batches = [{"object": np.array([f"o{i}"] * 4, dtype=object), "gamma": rng.random(4)} for i in range(3)]
+
+    with TableWriter(tmp_path / f"rings.{suffix}") as writer:
+        for batch in batches:
+            writer.write(batch)
+
+    path = tmp_path / f"rings.{suffix}"
+    if suffix == "csv":
+        df = pd.read_csv(path, float_precision="round_trip")
+        assert path.read_text(encoding="utf-8").splitlines()[0] == "object,gamma"
+        assert b"\r" not in path.read_bytes()
+    elif suffix == "feather":
+        import pyarrow as pa
+        with pa.ipc.open_file(path) as reader:
+            assert reader.num_record_batches == len(batches)  # streamed, not collected
+        df = pd.read_feather(path)
+    else:
+        df = getattr(pd, f"read_{suffix}")(path)
+    assert writer.rows == 12
+    np.testing.assert_array_equal(df["gamma"].to_numpy(), np.concatenate([b["gamma"] for b in batches]))
+    assert list(df["object"]) == [name for b in batches for name in b["object"]]
@@ -0,0 +1,60 @@
+"""
+Tests for the virtual kappa sweep in segspace_kappa_sweep
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from segspace_kappa_sweep import read_variants, run_virtual_sweep
+
+DATA = Path(__file__).resolve().parent.parent / "real_data_full.csv"
+
+
+def test_sweep_rerun_replaces_partitions(tmp_path):
+    if not DATA.exists():
+        pytest.skip(f"{DATA} not available")
+    src = tmp_path / "base.csv"
+    pd.read_csv(DATA).head(60).to_csv(src, index=False)
+    ks = [2.0, 2.5, 4.0]
+    dataset = tmp_path / "variants"
+
+    for _ in range(2):
+        summary = run_virtual_sweep(src, ks, tmp_path / "summary.csv", parquet_dir=dataset)
+    assert list(summary["kappa"]) == ks
+
+    variants = read_variants(dataset)
+    assert len(variants) == 60 * len(ks)
+    assert variants["kappa"].dtype == np.float64
+    assert sorted(variants["kappa"].unique()) == ks
+
+    base = pd.read_csv(src)
+    r_s = 2 * 6.67430e-11 * base["M_solar"] * 1.98847e30 / 299792458.0**2
+    got = variants[variants["kappa"] == 2.5]["r_emit_m"].to_numpy()
+    np.testing.assert_allclose(np.sort(got), np.sort((2.5 * r_s).to_numpy()), rtol=1e-15)
+
+
+def test_sweep_writes_each_variant_before_the_next(tmp_path, monkeypatch):
+    if not DATA.exists():
+        pytest.skip(f"{DATA} not available")
+    import segspace_kappa_sweep as sweep
+
+    src = tmp_path / "base.csv"
+    pd.read_csv(DATA).head(20).to_csv(src, index=False)
+    events = []
+    evaluate, write = sweep.evaluate_variant, sweep.write_variant
+    monkeypatch.setattr(sweep, "evaluate_variant",
+                        lambda df, **kw: events.append("eval") or evaluate(df, **kw))
+    monkeypatch.setattr(sweep, "write_variant",
+                        lambda df, K, d: events.append(("write", K)) or write(df, K, d))
+
+    sweep.run_virtual_sweep(src, [2.0, 3.0], tmp_path / "summary.csv", parquet_dir=tmp_path / "variants")
+    assert events == ["eval", ("write", 2.0), "eval", ("write", 3.0)]
+    assert len(read_variants(tmp_path / "variants")) == 40
@@ -0,0 +1,53 @@
+"""
+Tests for the lensing engine in core.lensing
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import numpy as np
+
+from core.lensing import compute_lensing_grid, compute_shear, lensing_maps, radial_lensing
+
+
+def _gaussian_lens(n=128, pixel=0.1, width=1.5, k0=0.4):
+    x = (np.arange(n) - (n - 1) / 2) * pixel
+    X, Y = np.meshgrid(x, x)
+    R = np.hypot(X, Y)
+    kappa = k0 * np.exp(-R ** 2 / (2 * width ** 2))
+    kappa_mean = 2 * k0 * width ** 2 / R ** 2 * (1 - np.exp(-R ** 2 / (2 * width ** 2)))
+    return X, Y, R, kappa, kappa_mean
+
+
+def test_grid_deflection_and_shear_match_axisymmetric_solution():
+    X, Y, R, kappa, kappa_mean = _gaussian_lens()
+    maps = lensing_maps(kappa, pixel_scale=0.1)
+
+    phi = np.arctan2(Y, X)
+    alpha = R * kappa_mean
+    gamma_t = kappa_mean - kappa
+    assert np.max(np.abs(maps["alpha1"] - alpha * np.cos(phi))) < 1e-3 * alpha.max()
+    assert np.max(np.abs(maps["alpha2"] - alpha * np.sin(phi))) < 1e-3 * alpha.max()
+    assert np.max(np.abs(maps["gamma1"] + gamma_t * np.cos(2 * phi))) < 2e-3 * gamma_t.max()
+    assert np.max(np.abs(maps["gamma2"] + gamma_t * np.sin(2 * phi))) < 2e-3 * gamma_t.max()
+
+    # α = ∇ψ
+    dpsi_dx = np.gradient(maps["psi"], 0.1, axis=1)
+    assert np.max(np.abs(dpsi_dx - maps["alpha1"])[4:-4, 4:-4]) < 1e-3 * alpha.max()
+
+
+def test_radial_fast_path_and_profile_api():
+    r = np.linspace(0.05, 10.0, 1000)
+    width, k0 = 1.5, 0.4
+    kappa = k0 * np.exp(-r ** 2 / (2 * width ** 2))
+    expected = 2 * k0 * width ** 2 / r ** 2 * (1 - np.exp(-r ** 2 / (2 * width ** 2)))
+    radial = radial_lensing(kappa, r)
+    np.testing.assert_allclose(radial["kappa_mean"], expected, rtol=1e-3)
+
+    gamma = np.sqrt(kappa)
+    shear = compute_shear(gamma, r)
+    np.testing.assert_allclose(shear["gamma_t"], expected - kappa, atol=2e-4)
+    grid = compute_lensing_grid(np.ones((8, 8)), fields=("alpha1",), dtype=np.float32)
+    assert grid["alpha1"].dtype == np.float32 and set(grid) == {"kappa", "alpha1"}
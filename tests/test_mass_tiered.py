@@ -0,0 +1,98 @@
+"""
+Tests for the precision-tiered Δ(M) mass validation in tools.mass_tiered
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+from decimal import Decimal as D, localcontext
+
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+
+from tools.mass_tiered import (
+    G, C, DeltaModel, condition_number, delta_percent, format_escalation_report, run_tiered,
+)
+
+M_SUN = 1.98847e30
+MASSES = [9.10938356e-31, 7.342e22, 5.97219e24, M_SUN, 4.297e6 * M_SUN, 6.5e9 * M_SUN, 1.4 * M_SUN]
+
+
+def _decimal_eval(masses, model, prec=60):
+    """Decimal forward radius + Newton inversion (reference for the float64 tier)"""
+    def evaluate(i):
+        with localcontext() as ctx:
+            ctx.prec = prec
+            A, alpha, B = D(model.A), D(model.alpha), D(model.B)
+            Lmin, span = D(model.Lmin), D(model.Lmax) - D(model.Lmin)
+            c_phi = D(G) * (1 + D(5).sqrt()) / 2 / D(C) ** 2
+            k = alpha * 2 * D(G) / D(C) ** 2
+
+            def delta(M):
+                return (A * (-k * M).exp() + B) * (M.log10() - Lmin) / span
+
+            def f(M):
+                return c_phi * M * (1 + delta(M) / 100)
+
+            M_true = D(masses[i])
+            r_obs = f(M_true)
+            M = M_true * (1 + D("1e-6"))
+            for _ in range(100):
+                h = M * D("1e-30")
+                step = -(f(M) - r_obs) / ((f(M + h) - f(M - h)) / (2 * h))
+                M += step
+                if abs(step / M) < D("1e-50"):
+                    break
+            return M, delta(M_true), abs((M - M_true) / M_true) * 100
+    return evaluate
+
+
+def test_float64_rows_agree_with_decimal_path():
+    model = DeltaModel.from_masses(MASSES)
+    reference = _decimal_eval(MASSES, model)
+    calls = []
+    result = run_tiered([f"m{i}" for i in range(len(MASSES))], MASSES, model,
+                        lambda i: calls.append(i) or reference(i))
+
+    assert result.escalated == {} and calls == []
+    assert result.tier == ["float64"] * len(MASSES)
+    for i in range(len(MASSES)):
+        M_rec, d, rel = reference(i)
+        assert result.M_rec[i] == pytest.approx(float(M_rec), rel=1e-12)
+        assert result.delta_pct[i] == pytest.approx(float(d), rel=1e-12, abs=1e-12)  # Lmin row: Δ ≈ 0
+        assert result.rel_err_pct[i] < 1e-8
+    assert "0 escalated" in format_escalation_report(result)
+
+
+def test_ill_conditioned_rows_are_escalated():
+    # large A makes M (1 + Δ/100) non-monotone: the inversion is singular at M_c
+    model = DeltaModel(A=1e5, alpha=2.7177e4, B=1.96, Lmin=-31.0, Lmax=40.0)
+    k = model.alpha * 2 * G / C**2
+
+    def slope(M):
+        d, dd = delta_percent(np.array([M]), model)
+        return 1.0 + d[0] / 100.0 + M * dd[0] / 100.0
+
+    M_c = brentq(slope, 0.5 / k, 2.0 / k, xtol=1e-30, rtol=1e-15)
+    masses = [9.10938356e-31, M_c * (1 + 1e-7), M_SUN, np.inf]
+    assert condition_number(np.array(masses[1:2]), model)[0] > 1e6
+
+    calls = []
+    result = run_tiered(["electron", "ill", "sun", "inf"], masses, model,
+                        lambda i: calls.append(i) or (masses[i], 0.0, 0.0))
+    assert sorted(calls) == sorted(result.escalated) == [1, 3]
+    assert "ill_cond" in result.escalated[1]
+    assert result.escalated[3] == ["nonfinite"]
+    assert result.tier == ["float64", "decimal", "float64", "decimal"]
+    assert "ill" in format_escalation_report(result)
+
+
+def test_tiny_delta_rows_are_escalated():
+    masses = [1.0, 1.0 + 1e-12, 1e10]
+    model = DeltaModel(A=0.0, alpha=0.0, B=1.0, Lmin=0.0, Lmax=10.0)
+    result = run_tiered(["a", "b", "c"], masses, model, lambda i: (masses[i], 0.0, 0.0))
+    assert list(result.escalated) == [1]
+    assert "tiny_delta" in result.escalated[1]
@@ -0,0 +1,58 @@
+"""
+Tests for the effect sizes in tools.metrics
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import numpy as np
+import pytest
+
+from tools.metrics import cliffs_delta, cohens_d, effect_sizes, hodges_lehmann
+
+
+def _cliffs_delta_pairs(x, y):
+    """Reference: explicit comparison of every pair"""
+    gt = sum(1 for xi in x for yi in y if xi > yi)
+    lt = sum(1 for xi in x for yi in y if xi < yi)
+    total = len(x) * len(y)
+    return 0.0 if total == 0 else (gt - lt) / total
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cliffs_delta_matches_pairwise_with_ties_and_nan(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 5, 37).astype(float)
+    y = rng.integers(0, 5, 23).astype(float)
+    x[::7] = np.nan
+    assert cliffs_delta(x, y) == _cliffs_delta_pairs(x, y)
+    assert cliffs_delta(y, x) == -cliffs_delta(x, y)
+    assert cliffs_delta([], y) == 0.0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hodges_lehmann_is_exact_median_of_differences(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0.0, 1.0, 900)
+    y = np.round(rng.normal(0.5, 1.0, 1200), 1)
+    assert hodges_lehmann(x, y) == np.median(np.subtract.outer(x, y))
+    assert np.isnan(hodges_lehmann([], y))
+
+
+def test_effect_sizes_matches_single_pair_functions():
+    rng = np.random.default_rng(7)
+    residuals = {"SSZ": rng.normal(0.0, 1.0, 400),
+                 "GR": rng.normal(0.2, 1.1, 400),
+                 "PDR": rng.normal(-0.1, 0.9, 400)}
+    results = effect_sizes(residuals)
+
+    assert list(results) == [("SSZ", "GR"), ("SSZ", "PDR"), ("GR", "PDR")]
+    for (a, b), values in results.items():
+        assert values["cliffs_delta"] == cliffs_delta(residuals[a], residuals[b])
+        assert values["cohens_d"] == pytest.approx(cohens_d(residuals[a], residuals[b]), rel=1e-12)
+        assert values["hodges_lehmann"] == hodges_lehmann(residuals[a], residuals[b])
+
+    matrix = effect_sizes(np.vstack(list(residuals.values())), measures=("cliffs_delta",))
+    assert matrix[(0, 1)] == {"cliffs_delta": results[("SSZ", "GR")]["cliffs_delta"]}
@@ -0,0 +1,72 @@
+"""
+Tests for the vectorized sign test in phi_bic_test
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from phi_bic_test import (
+    binom_p_table, randomized_sign_test, randomized_sign_test_legacy, safe_binom_two_sided,
+)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 20, 101, 1000, 5000])
+def test_binom_p_table_matches_scalar_function(n):
+    table = binom_p_table(n)
+    assert not table.flags.writeable
+    if n == 0:
+        assert math.isnan(safe_binom_two_sided(0, 0)) and np.isnan(table).all()
+        return
+    assert table.shape == (n + 1,)
+    expected = np.array([safe_binom_two_sided(k, n) for k in range(n + 1)])
+    np.testing.assert_allclose(table, expected, rtol=1e-15, atol=1e-300)
+    assert table[0] == table[n] == pytest.approx(safe_binom_two_sided(0, n), rel=1e-15)  # extremes
+    assert table[n // 2] == table[(n + 1) // 2]  # symmetric around n/2
+
+
+def _loop_reference(resid, tol, jitter, n_rand, seed):
+    """Previous per-draw loop body, fed with the same jitter matrix as the vectorized version"""
+    base = np.asarray(resid, dtype=float)
+    jit = np.random.default_rng(seed).uniform(-jitter, jitter, size=(n_rand, base.size))
+    pvals = []
+    for row in base + jit:
+        mask = np.abs(row) > tol
+        if mask.sum() == 0:
+            continue
+        pvals.append(safe_binom_two_sided(int(np.sum(row[mask] > 0)), int(mask.sum())))
+    return np.array(pvals)
+
+
+@pytest.mark.parametrize("chunk_elems", [1, 37, 4_000_000])
+def test_vectorized_sign_test_matches_loop(chunk_elems):
+    rng = np.random.default_rng(1)
+    resid = np.concatenate([rng.normal(0.0, 2e-3, 60), np.zeros(5), [5e-4, -5e-4]])
+    got = randomized_sign_test(resid, 1e-3, 1e-3, 300, seed=7, chunk_elems=chunk_elems)
+    expected = _loop_reference(resid, 1e-3, 1e-3, 300, seed=7)
+    assert got.shape == expected.shape
+    np.testing.assert_allclose(got, expected, rtol=1e-15, atol=1e-300)
+
+
+def test_without_jitter_matches_legacy_implementation():
+    resid = np.array([3.0, -1.0, 2.0, 0.0, 0.5, -4.0, 1.0, 1e-4])
+    got = randomized_sign_test(resid, 1e-3, 0.0, 5)
+    legacy = randomized_sign_test_legacy(resid, 1e-3, 0.0, 5)
+    np.testing.assert_allclose(got, legacy, rtol=1e-15)
+    assert got[0] == pytest.approx(safe_binom_two_sided(4, 6), rel=1e-15)  # 4 of 6 beyond tol
+
+
+@pytest.mark.parametrize("resid", [np.zeros(4), np.full(6, 2.0), np.full(6, -2.0)])
+def test_all_ties_and_one_sided_extremes(resid):
+    got = randomized_sign_test(resid, 1e-3, 1e-4, 20)
+    legacy = randomized_sign_test_legacy(resid, 1e-3, 1e-4, 20)
+    assert got.shape == legacy.shape
+    np.testing.assert_allclose(got, legacy, rtol=1e-15)
+    if resid.any():
+        assert got == pytest.approx(np.full(20, safe_binom_two_sided(0, 6)), rel=1e-15)
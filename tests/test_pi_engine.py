@@ -0,0 +1,108 @@
+"""
+Tests for the Chudnovsky π engine in tools.pi_engine
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import math
+import types
+from decimal import Decimal as D, localcontext
+
+import pytest
+
+from tools import pi_engine
+
+PI_200 = ("3.14159265358979323846264338327950288419716939937510582097494459230781640628620899862803482534211706"
+          "798214808651328230664709384460955058223172535940812848111745028410270193852110555964462294895493038196")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SSZ_PI_CACHE_DIR", str(tmp_path / "pi"))
+    pi_engine.clear_cache()
+    yield
+    pi_engine.clear_cache()
+
+
+def _expected(prec):
+    with localcontext() as ctx:
+        ctx.prec = prec
+        return +D(PI_200)
+
+
+@pytest.mark.parametrize("prec", [1, 15, 50, 120, 190])
+def test_fallback_digits_match_known_prefix(prec, monkeypatch):
+    monkeypatch.setattr(pi_engine, "gmpy2", None)
+    assert pi_engine.pi_decimal(prec, use_cache=False) == _expected(prec)
+
+
+@pytest.mark.parametrize("prec", [15, 120, 190])
+def test_gmpy2_digits_match_known_prefix(prec):
+    pytest.importorskip("gmpy2")
+    assert pi_engine.gmpy2 is not None
+    assert pi_engine.pi_decimal(prec, use_cache=False) == _expected(prec)
+
+
+@pytest.mark.parametrize("prec", [15, 120, 190])
+def test_integer_path_with_int_backend(prec, monkeypatch):
+    # gmpy2 branch with Python ints standing in for mpz
+    monkeypatch.setattr(pi_engine, "gmpy2", types.SimpleNamespace(mpz=int, isqrt=math.isqrt))
+    assert pi_engine.pi_decimal(prec, use_cache=False) == _expected(prec)
+
+
+def test_truncated_series_bypasses_cache_and_converges(monkeypatch):
+    monkeypatch.setattr(pi_engine, "gmpy2", None)
+    one_term = pi_engine.pi_decimal(40, terms=1)
+    assert str(one_term).startswith("3.14159265358973")  # first Chudnovsky term only
+    assert str(pi_engine.pi_decimal(40, terms=2)).startswith(PI_200[:29])
+    assert not (pi_engine.cache_dir()).exists()
+
+
+def test_disk_cache_round_trip(monkeypatch):
+    monkeypatch.setattr(pi_engine, "MIN_CACHE_DIGITS", 10)
+    value = pi_engine.pi_decimal(150)
+    assert (pi_engine.cache_dir() / f"pi_v{pi_engine.CACHE_VERSION}_150.txt").is_file()
+    pi_engine.clear_cache()
+
+    def _no_compute(*_args):
+        raise AssertionError("cache not used")
+
+    monkeypatch.setattr(pi_engine, "_compute_pi", _no_compute)
+    assert pi_engine.pi_decimal(120) == _expected(120)
+    assert pi_engine.pi_decimal(150) == value
+
+
+@pytest.mark.parametrize("prec", [5000, 12000])
+def test_fallback_digits_match_mpmath_at_high_precision(prec, monkeypatch):
+    # Newton square root must converge, not just reach the working precision
+    mpmath = pytest.importorskip("mpmath")
+    monkeypatch.setattr(pi_engine, "gmpy2", None)
+    with mpmath.workdps(prec + 20):
+        reference = mpmath.nstr(mpmath.pi, prec, strip_zeros=False)
+    assert str(pi_engine.pi_decimal(prec, use_cache=False)) == reference
+    monkeypatch.setattr(pi_engine, "gmpy2", types.SimpleNamespace(mpz=int, isqrt=math.isqrt))
+    assert str(pi_engine.pi_decimal(prec, use_cache=False)) == reference
+
+
+def test_legacy_cache_entries_are_ignored_and_cleared(monkeypatch):
+    monkeypatch.setattr(pi_engine, "MIN_CACHE_DIGITS", 10)
+    directory = pi_engine.cache_dir()
+    directory.mkdir(parents=True)
+    (directory / "pi_500.txt").write_text("3.14159265" + "0" * 500, encoding="ascii")
+    assert pi_engine.pi_decimal(120) == _expected(120)
+
+    pi_engine.clear_cache(disk=True)
+    assert list(directory.iterdir()) == []
+
+
+def test_chudnovsky_pi_rounds_to_callers_context():
+    import segspace_all_in_one as seg
+
+    with localcontext() as ctx:
+        ctx.prec = 30
+        pi, ms = seg.chudnovsky_pi(20, 100)
+    assert pi == _expected(30)
+    assert ms >= 0.0
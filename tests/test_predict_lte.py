@@ -0,0 +1,70 @@
+"""
+Tests for the LTE line-ratio and radio predictions in core.predict
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import numpy as np
+import pytest
+
+import core.predict as predict
+
+
+def _direct_intensity(line, T):
+    """Reference: explicit level sum at each temperature"""
+    species, nu, A, _ = predict.TRANSITIONS[line]
+    E, g = predict.SPECIES_LEVELS[species]()
+    Q = np.sum(g[:, None] * np.exp(-E[:, None] / T[None, :]), axis=0)
+    E_u, g_u = predict._upper_level(line)
+    N = 1e16 * 1e4
+    scale = (predict.H_PLANCK * predict.C_LIGHT ** 3 * A * N
+             / (8 * np.pi * predict.K_BOLTZMANN * (nu * 1e9) ** 2) * 1e-3)
+    return scale * g_u * np.exp(-E_u / T) / Q
+
+
+def test_table_interpolation_matches_level_sums(tmp_path):
+    predict._TABLES.clear()
+    tables = predict.get_lte_tables(cache_path=tmp_path / "lte.npz")
+    assert (tmp_path / "lte.npz").exists()
+    assert predict.get_lte_tables(cache_path=tmp_path / "lte.npz") is tables
+
+    T = np.array([8.0, 20.0, 55.0, 140.0, 900.0])
+    W = predict.line_intensities(T, list(predict.TRANSITIONS))
+    for line, values in W.items():
+        np.testing.assert_allclose(values, _direct_intensity(line, T), rtol=1e-4)
+
+
+def test_upper_levels_are_levels_of_the_partition_function():
+    for line, (species, nu, _, _) in predict.TRANSITIONS.items():
+        E, g = predict.SPECIES_LEVELS[species]()
+        E_u, g_u = predict._upper_level(line)
+        match = np.isclose(E, E_u, rtol=1e-14, atol=0.0) & (g == g_u)
+        assert match.sum() == 1, line
+        if species == "nh3":
+            # upper inversion component lies hν/k above its lower partner
+            lower = np.isclose(E, E_u - predict.H_OVER_K_GHZ * nu, rtol=1e-14) & (g == g_u)
+            assert lower.sum() == 1, line
+
+
+def test_line_ratios_broadcast_over_objects_and_shells(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gamma = np.linspace(0.5, 3.0, 24).reshape(4, 6)
+    ratios = predict.predict_line_ratios(gamma, np.arange(6.0))
+    assert set(ratios) == {"co21_co32", "nh3_11_nh3_22", "cii_co21"}
+    assert all(r.shape == gamma.shape for r in ratios.values())
+    # hotter shells populate CO(3) and NH3(2,2) more
+    assert np.all(np.diff(ratios["co21_co32"].ravel()) < 0)
+    assert np.all(np.diff(ratios["nh3_11_nh3_22"].ravel()) < 0)
+
+
+def test_radio_spectral_index_limits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    radio = predict.predict_radio_spectral_index(np.array([0.5, 1.0, 2.0]),
+                                                 frequency=np.array([0.01, 1.4, 1000.0]))
+    assert radio["alpha_r"].shape == (3, 3)
+    assert radio["alpha_r"][:, 0] == pytest.approx(2.0, abs=1e-6)
+    assert radio["alpha_r"][:, -1] == pytest.approx(-0.1, abs=1e-3)
+    np.testing.assert_allclose(radio["flux_1.4GHz"], radio["flux_density"][:, 1])
@@ -0,0 +1,106 @@
+"""
+Tests for the stability engine in core.stability
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import ndimage
+
+from core.stability import (
+    compute_jeans_criterion, compute_jeans_length, compute_stability_criteria,
+    compute_stability_field, grid_from_points,
+)
+
+
+def _fields(shape=(13, 9, 8), seed=0):
+    rng = np.random.default_rng(seed)
+    v = ndimage.gaussian_filter(rng.normal(0.0, 6.0, shape), 1.5)
+    gamma = np.exp(ndimage.gaussian_filter(rng.normal(0.3, 0.6, shape), 1.0))
+    T = rng.uniform(10.0, 50.0, shape)
+    n = rng.uniform(1e2, 1e4, shape)
+    return v, gamma, T, n
+
+
+def test_jeans_mass_matches_classical_formula():
+    T, n = 20.0, 1e3
+    rho = 2.33 * 1.6735575e-27 * n * 1e6
+    classical = (np.pi / 6) * (np.pi * 1.380649e-23 * T / (6.67430e-11 * 2.33 * 1.6735575e-27)) ** 1.5 \
+        / np.sqrt(rho) / 1.98847e30
+    assert compute_jeans_criterion(T, n, 1.0) == pytest.approx(classical, rel=1e-12)
+    assert compute_jeans_criterion(T, n, 2.0) == pytest.approx(2.0 ** 1.5 * classical, rel=1e-12)
+    assert compute_jeans_length(T, n) == pytest.approx(0.95, rel=0.01)  # ~1 pc for a molecular cloud
+
+
+def test_chunked_field_matches_in_memory_computation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    v, gamma, T, n = _fields()
+    spacing = (0.5, 0.4, 0.3)
+    np.save(tmp_path / "v.npy", v)
+
+    kwargs = dict(spacing=spacing, T=T, n=n, grad_tol=4.0, entropy_min=0.0, jeans_cells=1.0)
+    whole = compute_stability_field(v, gamma, zones_csv=None, chunk_cells=10 ** 9, **kwargs)
+    chunked = compute_stability_field(tmp_path / "v.npy", gamma, out_dir=tmp_path / "fields",
+                                      chunk_cells=2 * 9 * 8, **kwargs)
+
+    grads = np.gradient(v, *spacing)
+    np.testing.assert_array_equal(whole["grad_v"], np.sqrt(sum(g * g for g in grads)))
+    laplacian = sum(np.gradient(g, spacing[i], axis=i) for i, g in enumerate(grads))
+    np.testing.assert_array_equal(whole["laplacian_v"], laplacian)
+    for key in ("grad_v", "laplacian_v", "entropy_proxy", "jeans_length", "labels"):
+        np.testing.assert_array_equal(chunked[key], whole[key])
+    assert isinstance(chunked["labels"], np.memmap)
+    np.testing.assert_array_equal(np.load(tmp_path / "fields" / "labels.npy"), whole["labels"])
+
+    stable = (whole["grad_v"] < 4.0) & (whole["entropy_proxy"] > 0.0) & (whole["jeans_length"] >= 0.5)
+    reference, count = ndimage.label(stable)
+    assert chunked["n_zones"] == count > 1
+    np.testing.assert_array_equal(chunked["labels"], reference)
+
+    zones = pd.read_csv(tmp_path / "reports" / "stability" / "zones.csv")
+    sizes = np.bincount(reference.ravel())[1:]
+    np.testing.assert_array_equal(zones["n_cells"], sizes)
+    first = reference == 1
+    assert zones.loc[0, "v_mean"] == pytest.approx(v[first].mean())
+    assert zones.loc[0, "v_max"] == pytest.approx(v[first].max(), rel=1e-14)
+    assert zones.loc[0, "centroid_0"] == pytest.approx(np.nonzero(first)[0].mean() * 0.5)
+    assert zones.loc[0, "jeans_length_min"] == pytest.approx(whole["jeans_length"][first].min(), rel=1e-14)
+    assert zones["volume"].sum() == pytest.approx(stable.sum() * 0.5 * 0.4 * 0.3)
+
+
+def test_scalar_temperature_and_density(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    v, gamma, _, _ = _fields()
+    kwargs = dict(spacing=0.5, grad_tol=4.0, entropy_min=0.0, jeans_cells=0.1, chunk_cells=3 * 9 * 8)
+    scalar = compute_stability_field(v, gamma, T=20.0, n=1e3, **kwargs)
+    full = compute_stability_field(v, gamma, T=np.full(v.shape, 20.0), n=np.full(v.shape, 1e3),
+                                   zones_csv=None, **kwargs)
+    assert scalar["n_zones"] == full["n_zones"] > 0
+    np.testing.assert_array_equal(scalar["labels"], full["labels"])
+    np.testing.assert_array_equal(scalar["jeans_length"], full["jeans_length"])
+    np.testing.assert_allclose(scalar["zones"]["mass_msun"], full["zones"]["mass_msun"], rtol=1e-12)
+
+
+def test_grid_from_points_averages_per_cell():
+    x = np.array([0.1, 0.2, 1.9, 2.0])
+    values = {"v": np.array([1.0, 3.0, 5.0, 7.0])}
+    grid = grid_from_points(x, np.zeros(4), np.zeros(4), values, bins=(2, 1, 1),
+                            bounds=((0, 2), (0, 1), (0, 1)), chunk_rows=3)
+    np.testing.assert_array_equal(grid["count"].ravel(), [2, 2])
+    np.testing.assert_array_equal(grid["v"].ravel(), [2.0, 6.0])
+
+
+def test_ring_chain_zones(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    radius = np.arange(10.0)
+    v = np.array([0, 0, 0, 5, 10, 10, 10, 10, 20, 30], dtype=float)
+    result = compute_stability_criteria(v, np.full(10, 2.0), radius)
+    np.testing.assert_array_equal(result["stable_zones"], np.abs(np.gradient(v, radius)) < 1.0)
+    np.testing.assert_array_equal(result["zone"], [1, 1, 0, 0, 0, 2, 2, 0, 0, 0])
+    table = pd.read_csv(tmp_path / "reports" / "stability" / "criteria.csv")
+    assert list(table.columns)[-2:] == ["stable", "zone"]
@@ -0,0 +1,103 @@
+"""
+Tests for the multi-object ring metrics stream in core.stats
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.stats import (
+    CorrelationAccumulator, POOLED_NAME, _grouped_cumprod, _pearson, compute_ring_metrics,
+    compute_ring_metrics_grouped, stream_ring_metrics,
+)
+
+
+def _ring_tables(n_objects=25, seed=0):
+    rng = np.random.default_rng(seed)
+    tables = {}
+    for i in range(n_objects):
+        m = int(rng.integers(1, 12))
+        df = pd.DataFrame({"ring": np.arange(1, m + 1), "T": rng.uniform(20, 90, m),
+                           "n": rng.uniform(1e3, 1e4, m), "v_obs": rng.uniform(1, 15, m)})
+        if i % 3 == 0:
+            df["v"] = df["v_obs"] + rng.normal(0, 0.5, m)
+        tables[f"obj{i:03d}"] = df
+    return tables
+
+
+def test_grouped_metrics_match_single_object_metrics():
+    tables = _ring_tables()
+    frames = list(tables.values())
+    starts = np.cumsum([0] + [len(df) for df in frames[:-1]])
+    big = pd.concat(frames, ignore_index=True)
+    grouped = compute_ring_metrics_grouped(starts, big["ring"], big["T"], big["n"], big["v_obs"])
+
+    bounds = np.append(starts, len(big))
+    for df, lo, hi in zip(frames, bounds[:-1], bounds[1:]):
+        single = compute_ring_metrics(df["ring"], df["T"], df["n"], df["v_obs"])
+        for key, values in single.items():
+            np.testing.assert_allclose(grouped[key][lo:hi], values, rtol=1e-12)
+
+
+def test_correlation_accumulator_matches_pearson_in_batches():
+    rng = np.random.default_rng(2)
+    groups = rng.integers(0, 5, 400)
+    x, y = rng.normal(size=400), rng.normal(size=400)
+    acc = CorrelationAccumulator()
+    for part in np.array_split(np.arange(400), 7):
+        acc.update(groups[part], x[part], y[part])
+    merged = CorrelationAccumulator().update(groups[:150], x[:150], y[:150]).merge(
+        CorrelationAccumulator().update(groups[150:], x[150:], y[150:]))
+    for g in range(5):
+        expected = _pearson(x[groups == g], y[groups == g])
+        assert acc.correlation()[g] == pytest.approx(expected, rel=1e-12)
+        assert merged.correlation()[g] == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("layout", ["csv_dir", "hive", "flat"])
+def test_stream_ring_metrics_layouts(tmp_path, layout):
+    tables = _ring_tables()
+    big = pd.concat([df.assign(object=name) for name, df in tables.items()], ignore_index=True)
+    if layout == "csv_dir":
+        source = tmp_path / "rings"
+        source.mkdir()
+        for name, df in tables.items():
+            df.to_csv(source / f"{name}.csv", index=False)
+    elif layout == "hive":
+        source = tmp_path / "rings"
+        big.to_parquet(source, partition_cols=["object"])
+    else:
+        source = tmp_path / "rings.parquet"
+        big.to_parquet(source)
+
+    result = stream_ring_metrics(source, out=tmp_path / "out" / "metrics.parquet",
+                                 summary_out=tmp_path / "out" / "summary.csv", batch_rows=16)
+    assert result["objects"] == len(tables) and result["rings"] == len(big)
+
+    metrics = pd.read_parquet(result["metrics"])
+    summary = pd.read_csv(result["summary"]).set_index("object")
+    for name, df in tables.items():
+        v = df["v"] if "v" in df else df["v_obs"]
+        single = compute_ring_metrics(df["ring"], df["T"], df["n"], v)
+        rows = metrics[metrics["object"] == name]
+        np.testing.assert_allclose(rows["gamma"], single["gamma"], rtol=1e-12)
+        np.testing.assert_allclose(rows["delta_v"], single["dv"], rtol=1e-12)
+        assert summary.loc[name, "r(v,T)"] == pytest.approx(_pearson(v, df["T"]), rel=1e-9, nan_ok=True)
+        assert summary.loc[name, "MAE[km_s]"] == pytest.approx(np.mean(np.abs(v - df["v_obs"])), abs=1e-12)
+    pooled = summary.loc[POOLED_NAME]
+    assert pooled["n_rings"] == len(big)
+    assert pooled["r(v,n)"] == pytest.approx(_pearson(metrics["v[km_s]"], metrics["n[cm^-3]"]), rel=1e-9)
+
+
+def test_grouped_cumprod_error_does_not_grow_with_batch_length():
+    rng = np.random.default_rng(7)
+    sizes = rng.integers(5, 40, 20_000)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    q = rng.uniform(0.8, 1.3, sizes.sum())
+    expected = np.concatenate([np.cumprod(q[a:a + m]) for a, m in zip(starts, sizes)])
+    np.testing.assert_allclose(_grouped_cumprod(q, starts), expected, rtol=1e-14)
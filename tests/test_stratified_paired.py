@@ -0,0 +1,86 @@
+"""
+Tests for the in-process stratified paired test in tools.stratified_paired
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import csv
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from segspace_all_in_one_extended import evaluate_redshift
+from tools.stratified_paired import (
+    DM_A, DM_ALPHA, DM_B, compute_residuals, evaluate_strata, paired_stats, rows_mask,
+)
+
+DATA = Path(__file__).resolve().parent.parent / "data" / "real_data_emission_lines.csv"
+
+
+@pytest.fixture(scope="module")
+def table():
+    if not DATA.exists():
+        pytest.skip(f"{DATA} not available")
+    with open(DATA, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return rows, pd.read_csv(DATA)
+
+
+def _strata(df):
+    r_over_rs = df["r_emit_m"] / (2 * 6.67430e-11 * df["M_solar"] * 1.989e30 / 2.99792458e8**2)
+    return {
+        "all": np.ones(len(df), dtype=bool),
+        "close": (r_over_rs < 2).to_numpy(),
+        "photon_sphere": ((r_over_rs >= 2) & (r_over_rs < 3)).to_numpy(),
+        "weak": (r_over_rs >= 10).to_numpy(),
+        "even_rows": np.arange(len(df)) % 2 == 0,
+    }
+
+
+@pytest.mark.parametrize("mode", ["hint", "deltaM", "hybrid", "geodesic"])
+def test_paired_stats_match_eval_redshift_loop(table, mode):
+    rows, df = table
+    residuals = compute_residuals(df, mode=mode)
+    for label, mask in _strata(df).items():
+        subset = [row for row, keep in zip(rows, mask) if keep]
+        if not subset:
+            continue
+        expected = evaluate_redshift(subset, False, mode, DM_A, DM_B, DM_ALPHA, None, None,
+                                     paired_stats=True)["paired"]
+        got = paired_stats(residuals, mask)
+        assert got["N_rows"] == len(subset)
+        for key in ("N_pairs", "N_Seg_better"):
+            assert got[key] == expected[key], (mode, label, key)
+        assert got["binom_two_sided_p"] == pytest.approx(expected["binom_two_sided_p"], rel=1e-12)
+
+
+def test_rows_mask_is_positional_and_requires_unique_index(table):
+    _, df = table
+    shuffled = df.sample(frac=1.0, random_state=0)
+    residuals = compute_residuals(shuffled)
+    subset = shuffled[shuffled["M_solar"] > 1e6]
+    mask = rows_mask(residuals, subset.index)
+    assert mask.sum() == len(subset)
+    assert paired_stats(residuals, mask) == paired_stats(compute_residuals(subset))
+
+    duplicated = compute_residuals(pd.concat([df, df]))
+    with pytest.raises(ValueError, match="unique"):
+        rows_mask(duplicated, df.index[:5])
+
+
+def test_evaluate_strata_matches_paired_stats(table):
+    _, df = table
+    residuals = compute_residuals(df)
+    strata = _strata(df)
+    frame = evaluate_strata(residuals, strata, dimension="radius")
+    assert list(frame["label"]) == list(strata)
+    for label, mask in strata.items():
+        row = frame.set_index("label").loc[label]
+        stats = paired_stats(residuals, mask)
+        assert row["N_Seg_better"] == stats["N_Seg_better"]
+        assert row["N_pairs"] == stats["N_pairs"]
@@ -0,0 +1,23 @@
+"""
+Tests for the array post-processing helpers in ssz_theory_segmented
+
+Copyright © 2025
+Carmen Wrede und Lino Casu
+
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+
+import numpy as np
+import pytest
+
+from ssz_theory_segmented import U, U_arr, Zpar, Zpar_arr, sat, sat_arr
+
+PHI = np.concatenate([np.linspace(-50.0, 50.0, 401), [0.0, 1e-12, -3.7]])
+
+
+@pytest.mark.parametrize("cap", [None, 0.0, 0.3, 2.0])
+def test_array_variants_match_scalar_functions(cap):
+    np.testing.assert_allclose(sat_arr(PHI, cap), [sat(x, cap) for x in PHI], rtol=1e-15, atol=0)
+    zpar = [Zpar(x, 1.0, 0.4, -0.2, cap, 0.1, 5.0) for x in PHI]
+    np.testing.assert_allclose(Zpar_arr(PHI, 1.0, 0.4, -0.2, cap, 0.1, 5.0), zpar, rtol=1e-14)
+    np.testing.assert_allclose(U_arr(PHI, 0.7, 0.05, cap), [U(x, 0.7, 0.05, cap) for x in PHI], rtol=1e-14)
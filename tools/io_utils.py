@@ -7,6 +7,7 @@ Ensures reproducibility and safety:
 - Write-scope limited to agent_out/ and reports/
 - SHA256 checksums for all artifacts
 - Manifest tracking with metadata
+- Columnar table export (CSV / Parquet / Feather) from arrays or DataFrames
 
 © 2025 Carmen Wrede, Lino Casu
 Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
@@ -150,6 +151,198 @@ def safe_write_csv(path: str, header: list, rows: list):
     return str(p)
 
 
+TABLE_FORMATS = ("csv", "parquet", "feather")
+
+
+def _table_format(path: Path, format: str = None) -> str:
+    fmt = (format or path.suffix[1:] or "csv").lower()
+    if fmt == "pq":
+        fmt = "parquet"
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(f"Unsupported table format: {fmt} (use one of {TABLE_FORMATS})")
+    return fmt
+
+
+def _as_columns(columns) -> dict:
+    """{name: 1-D array} from a dict of arrays/lists or a DataFrame"""
+    if hasattr(columns, "columns") and hasattr(columns, "to_numpy"):  # DataFrame
+        columns = {str(c): columns[c].to_numpy() for c in columns.columns}
+    import numpy as np
+    out = {str(name): np.asarray(values).ravel() for name, values in columns.items()}
+    lengths = {len(v) for v in out.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: { {k: len(v) for k, v in out.items()} }")
+    return out
+
+
+def write_table(path: str, columns, format: str = None) -> str:
+    """
+    Write a columnar table (no write-scope check, see safe_write_table)
+    
+    Args:
+        path: Output file path
+        columns: Dict of {column: array} (insertion order) or DataFrame
+        format: "csv", "parquet" or "feather" (default: from file suffix)
+    
+    Returns:
+        str: Absolute path of written file
+    
+    Note:
+        CSV is formatted column-wise by pyarrow's C++ writer (header
+        quoted as csv.writer quotes it); without pyarrow, pandas is used.
+        Lines end with "\n" (safe_write_csv writes "\r\n"). Floats use
+        the shortest round-trip text, which differs from Python's str()
+        for integral values and exponents ("2" for 2.0, "1e-7" for 1e-07);
+        values round-trip exactly; booleans are written as true/false.
+    """
+    p = Path(path).resolve()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    fmt = _table_format(p, format)
+    cols = _as_columns(columns)
+    
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+    
+    if pa is None:
+        import pandas as pd
+        df = pd.DataFrame(cols)
+        if fmt == "csv":
+            df.to_csv(p, index=False, na_rep="nan")
+        elif fmt == "parquet":
+            df.to_parquet(p, index=False)
+        else:
+            df.to_feather(p)
+        return str(p)
+    
+    table = pa.table(cols)
+    if fmt == "csv":
+        import csv
+        import io
+        import pyarrow.csv as pa_csv
+        head = io.StringIO()
+        csv.writer(head, lineterminator="\n").writerow(list(cols))
+        with open(p, "wb") as f:
+            f.write(head.getvalue().encode("utf-8"))
+            pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False))
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, p)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, p)
+    return str(p)
+
+
+def safe_write_table(path: str, columns, format: str = None,
+                     manifest_path: str = None, role: str = None,
+                     metadata: dict = None) -> str:
+    """
+    Safely write a columnar table, optionally registering it in the manifest
+    
+    Args:
+        path: Output file path (within agent_out/ or reports/)
+        columns: Dict of {column: array} (insertion order) or DataFrame
+        format: "csv", "parquet" or "feather" (default: from file suffix)
+        manifest_path: Optional manifest to register the artifact in
+        role: Artifact role for the manifest (default: file stem)
+        metadata: Optional artifact metadata
+    
+    Returns:
+        str: Absolute path of written file
+    
+    Example:
+        safe_write_table("reports/pred/line_ratios.csv",
+                         {"radius_pc": r, "gamma": g, "co21_co32": ratio},
+                         manifest_path=manifest, role="predict_lines")
+    """
+    p = safe_path(path)
+    fmt = _table_format(p, format)
+    out = write_table(str(p), columns, format=fmt)
+    
+    if manifest_path:
+        register_artifact(manifest_path, role or p.stem, path, format=fmt, metadata=metadata)
+    
+    return out
+
+
+class TableWriter:
+    """
+    Streaming columnar table writer (one file, appended batch by batch)
+
+    Args:
+        path: Output file path
+        format: "csv", "parquet" or "feather" (default: from file suffix)
+
+    Example:
+        with TableWriter("reports/data/ring_metrics.parquet") as w:
+            for columns in batches:
+                w.write(columns)
+
+    Note:
+        Same formatting as write_table; the schema is fixed by the first
+        batch. Every format is written incrementally (Feather as an Arrow
+        IPC file, one record batch per write).
+    """
+
+    def __init__(self, path: str, format: str = None):
+        self.path = Path(path).resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.format = _table_format(self.path, format)
+        self.rows = 0
+        self._writer = None
+        self._file = None
+
+    def write(self, columns):
+        """Append a batch: dict of {column: array} or DataFrame"""
+        import pyarrow as pa
+        cols = _as_columns(columns)
+        table = pa.table(cols)
+        if self._writer is None:
+            self._open(table.schema, list(cols))
+        self._writer.write_table(table.cast(self._schema))
+        self.rows += table.num_rows
+
+    def _open(self, schema, names):
+        self._schema = schema
+        if self.format == "csv":
+            import csv
+            import io
+            import pyarrow.csv as pa_csv
+            head = io.StringIO()
+            csv.writer(head, lineterminator="\n").writerow(names)
+            self._file = open(self.path, "wb")
+            self._file.write(head.getvalue().encode("utf-8"))
+            self._writer = pa_csv.CSVWriter(self._file, schema,
+                                            write_options=pa_csv.WriteOptions(include_header=False))
+        elif self.format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, schema)
+        else:
+            import pyarrow as pa
+            # Feather V2 is the Arrow IPC file format (lz4 as write_feather uses)
+            codec = "lz4" if pa.Codec.is_available("lz4") else None
+            self._writer = pa.ipc.new_file(str(self.path), schema,
+                                           options=pa.ipc.IpcWriteOptions(compression=codec))
+
+    def close(self) -> str:
+        """Finish the file and return its absolute path"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return str(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def update_manifest(manifest_path: str, update_dict: dict):
     """
     Update manifest file with new entries
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precision-Tiered Δ(M) Mass Validation for SSZ Suite
+
+Fast path for the segmented_full_*_proof scripts:
+- All objects evaluated at once in NumPy float64 (forward radius + Newton inversion)
+- Rows whose float64 result cannot be trusted are detected automatically
+- Only those rows are re-evaluated with the scripts' own Decimal path
+- Report of escalated rows and the reason for each
+
+Escalation reasons:
+    nonfinite     overflow/underflow or NaN somewhere in the row
+    ill_cond      inversion condition number too large (cancellation in
+                  f(M) = r(M) - r_obs where d/dM[M (1+Δ/100)] ≈ 0)
+    tiny_delta    0 < |Δ|/100 below float64 resolution: 1 + Δ/100 loses Δ
+    no_converge   float64 Newton did not converge
+    roundtrip     |M_rec - M_true| / M_true above the float64 budget
+
+© 2025 Carmen Wrede, Lino Casu
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+G = 6.67430e-11          # m^3 kg^-1 s^-2
+C = 2.99792458e8         # m s^-1
+PHI = (1.0 + math.sqrt(5.0)) / 2.0
+EPS = float(np.finfo(np.float64).eps)
+
+# Relative round-trip budget for float64 rows (the proofs require 1e-8 = 1e-6 %)
+DEFAULT_REL_TOL = 1e-10
+
+# Δ must be resolved to this relative accuracy inside 1 + Δ/100
+DELTA_RTOL = 1e-6
+
+
+@dataclass
+class DeltaModel:
+    """
+    Δ(M) correction: Δ% = (A exp(-α r_s) + B) · (log10 M - Lmin) / (Lmax - Lmin)
+
+    A model with A = B = 0 reduces to the plain φ/2 radius (no correction).
+    """
+    A: float = 98.01
+    alpha: float = 2.7177e4
+    B: float = 1.96
+    Lmin: float = 0.0
+    Lmax: float = 1.0
+
+    @classmethod
+    def from_masses(cls, masses_kg: Sequence[float], A: float = 98.01,
+                    alpha: float = 2.7177e4, B: float = 1.96) -> "DeltaModel":
+        """Log-normalization bounds taken from the catalog, as in the proof scripts"""
+        logs = np.log10(np.asarray([float(m) for m in masses_kg], dtype=np.float64))
+        return cls(A=float(A), alpha=float(alpha), B=float(B),
+                   Lmin=float(logs.min()), Lmax=float(logs.max()))
+
+
+def delta_percent(M: np.ndarray, model: DeltaModel) -> Tuple[np.ndarray, np.ndarray]:
+    """Δ%(M) and dΔ%/dM, vectorized"""
+    M = np.asarray(M, dtype=np.float64)
+    span = model.Lmax - model.Lmin
+    if span == 0.0 or (model.A == 0.0 and model.B == 0.0):
+        zero = np.zeros_like(M)
+        return zero, zero
+    k = model.alpha * 2.0 * G / C**2
+    e = np.exp(-k * M)
+    raw = model.A * e + model.B
+    norm = (np.log10(M) - model.Lmin) / span
+    d_raw = -model.A * k * e
+    d_norm = 1.0 / (M * math.log(10.0) * span)
+    return raw * norm, d_raw * norm + raw * d_norm
+
+
+def segment_radius(M: np.ndarray, model: Optional[DeltaModel]) -> np.ndarray:
+    """Observed segment radius r_obs = φ/2 · r_s · (1 + Δ/100)"""
+    M = np.asarray(M, dtype=np.float64)
+    r_s = 2.0 * G * M / C**2
+    if model is None:
+        return PHI / 2.0 * r_s
+    d, _ = delta_percent(M, model)
+    return PHI / 2.0 * r_s * (1.0 + d / 100.0)
+
+
+def invert_mass(r_obs: np.ndarray, model: Optional[DeltaModel],
+                max_iter: int = 60) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Solve (G φ M / c²)(1 + Δ(M)/100) = r_obs for all rows at once
+
+    Returns:
+        (M_rec, iterations, converged)
+    """
+    r_obs = np.asarray(r_obs, dtype=np.float64)
+    c_phi = G * PHI / C**2
+    M = r_obs / c_phi
+    iters = np.zeros(M.shape, dtype=np.int64)
+    if model is None:
+        return M, iters, np.isfinite(M)
+
+    # cheap fixed-point refinement of the initial guess (Δ at M0)
+    d0, _ = delta_percent(M, model)
+    M = r_obs / (c_phi * (1.0 + d0 / 100.0))
+
+    active = np.isfinite(M) & (M > 0)
+    converged = np.zeros(M.shape, dtype=bool)
+    for it in range(1, max_iter + 1):
+        if not active.any():
+            break
+        Ma = M[active]
+        d, dd = delta_percent(Ma, model)
+        y = c_phi * Ma * (1.0 + d / 100.0) - r_obs[active]
+        dy = c_phi * ((1.0 + d / 100.0) + Ma * dd / 100.0)
+        step = np.where(dy != 0.0, -y / np.where(dy != 0.0, dy, 1.0), 0.0)
+        # backtracking to avoid overshoot (same rule as the Decimal path)
+        for _ in range(60):
+            big = np.abs(step) > np.abs(Ma)
+            if not big.any():
+                break
+            step = np.where(big, 0.5 * step, step)
+        Mn = Ma + step
+        iters[active] = it
+        done = (np.abs(step) <= 4.0 * EPS * np.abs(Mn)) | (y == 0.0)
+        M[active] = Mn
+        idx = np.flatnonzero(active)
+        converged[idx[done]] = True
+        active[idx[done]] = False
+    return M, iters, converged
+
+
+def condition_number(M: np.ndarray, model: Optional[DeltaModel]) -> np.ndarray:
+    """
+    Relative condition number of the inversion r_obs -> M
+
+    κ = (1 + Δ/100) / |1 + Δ/100 + M Δ'/100|; float64 loses about
+    log10(κ) digits in M when it is large.
+    """
+    M = np.asarray(M, dtype=np.float64)
+    if model is None:
+        return np.ones_like(M)
+    d, dd = delta_percent(M, model)
+    g = 1.0 + d / 100.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.abs(g / (g + M * dd / 100.0))
+
+
+@dataclass
+class TieredResult:
+    """Per-row results of a tiered run plus the escalation report"""
+    names: List[str]
+    M_true: np.ndarray
+    M_rec: np.ndarray
+    delta_pct: np.ndarray
+    rel_err_pct: np.ndarray
+    iterations: np.ndarray
+    tier: List[str]
+    escalated: Dict[int, List[str]] = field(default_factory=dict)
+
+    def rows(self) -> List[Tuple]:
+        """(name, M_true, M_rec, Δ%, RelErr%) per object, like the proof scripts"""
+        return [
+            (self.names[i], self.M_true[i], self.M_rec[i], self.delta_pct[i], self.rel_err_pct[i])
+            for i in range(len(self.names))
+        ]
+
+
+def classify_rows(M_true: np.ndarray, M_rec: np.ndarray, converged: np.ndarray,
+                  model: Optional[DeltaModel], rel_tol: float = DEFAULT_REL_TOL) -> Dict[int, List[str]]:
+    """Reasons why a float64 row must be escalated (empty dict: all rows fine)"""
+    M_true = np.asarray(M_true, dtype=np.float64)
+    reasons: Dict[int, List[str]] = {}
+
+    def flag(mask: np.ndarray, reason: str) -> None:
+        for i in np.flatnonzero(mask):
+            reasons.setdefault(int(i), []).append(reason)
+
+    with np.errstate(all="ignore"):
+        r_obs = segment_radius(M_true, model)
+        finite = np.isfinite(M_true) & np.isfinite(r_obs) & np.isfinite(M_rec) & (r_obs > 0)
+        flag(~finite, "nonfinite")
+
+        kappa = condition_number(M_true, model)
+        flag(finite & ~(kappa * EPS <= rel_tol), "ill_cond")
+
+        if model is not None:
+            d, _ = delta_percent(M_true, model)
+            tiny = (d != 0.0) & (np.abs(d) / 100.0 < EPS / DELTA_RTOL)
+            flag(finite & tiny, "tiny_delta")
+            flag(finite & ~converged, "no_converge")
+
+        rel = np.abs(M_rec - M_true) / np.abs(M_true)
+        flag(finite & ~(rel <= rel_tol), "roundtrip")
+    return reasons
+
+
+def run_tiered(names: Sequence[str], masses_kg: Sequence, model: Optional[DeltaModel],
+               decimal_eval: Callable[[int], Tuple], rel_tol: float = DEFAULT_REL_TOL) -> TieredResult:
+    """
+    Float64 for every row, Decimal re-evaluation only for flagged rows
+
+    Args:
+        names: Object names
+        masses_kg: True masses (float, Decimal or str)
+        model: Δ(M) model, or None for the plain φ/2 reconstruction
+        decimal_eval: Callback i -> (M_rec, Δ%, RelErr%) using the
+            script's own high-precision path for row i
+        rel_tol: Relative round-trip budget for float64 rows
+
+    Returns:
+        TieredResult (escalated rows carry the Decimal values converted to float)
+    """
+    M_true = np.asarray([float(m) for m in masses_kg], dtype=np.float64)
+    with np.errstate(all="ignore"):
+        r_obs = segment_radius(M_true, model)
+        M_rec, iters, converged = invert_mass(r_obs, model)
+        if model is not None:
+            delta, _ = delta_percent(M_true, model)
+        else:
+            delta = np.zeros_like(M_true)
+        rel = np.abs(M_rec - M_true) / np.abs(M_true) * 100.0
+
+    escalated = classify_rows(M_true, M_rec, converged, model, rel_tol)
+    tier = ["float64"] * len(M_true)
+    for i in escalated:
+        m_rec, d, err = decimal_eval(i)
+        M_rec[i] = float(m_rec)
+        delta[i] = float(d)
+        rel[i] = float(err)
+        tier[i] = "decimal"
+
+    return TieredResult(names=list(names), M_true=M_true, M_rec=M_rec, delta_pct=delta,
+                        rel_err_pct=rel, iterations=iters, tier=tier, escalated=escalated)
+
+
+def format_escalation_report(result: TieredResult) -> str:
+    """Short text block listing escalated rows"""
+    n = len(result.names)
+    k = len(result.escalated)
+    lines = [f"Precision tiers    : {n - k} float64, {k} escalated to Decimal"]
+    for i in sorted(result.escalated):
+        lines.append(f"  ↑ {result.names[i]:<20} {', '.join(result.escalated[i])}")
+    return "\n".join(lines)
@@ -6,14 +6,14 @@ Statistical Metrics for SSZ Suite - Model Comparison & Validation
 Implements standard metrics for model selection:
 - RMSE, MAE (goodness of fit)
 - AIC, BIC, WAIC (information criteria)
-- Cliff's Delta (effect size)
+- Cliff's Delta, Cohen's d, Hodges-Lehmann shift (effect sizes)
 
 © 2025 Carmen Wrede, Lino Casu
 Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
 """
 import math
 import numpy as np
-from typing import Union, List
+from typing import Dict, List, Mapping, Tuple, Union
 
 
 def rmse(y_obs: Union[List, np.ndarray], y_pred: Union[List, np.ndarray]) -> float:
@@ -256,32 +256,30 @@ def cliffs_delta(x: Union[List, np.ndarray], y: Union[List, np.ndarray]) -> floa
         - |δ| ≥ 0.474: large
         - Positive: x tends to be larger than y
         - Negative: x tends to be smaller than y
-    """
-    x = np.asarray(x)
-    y = np.asarray(y)
     
-    # Count comparisons
-    gt = 0  # x > y
-    lt = 0  # x < y
-    eq = 0  # x == y
-    
-    for xi in x:
-        for yi in y:
-            if xi > yi:
-                gt += 1
-            elif xi < yi:
-                lt += 1
-            else:
-                eq += 1
-    
-    total = gt + lt + eq
+    Complexity:
+        O((nx + ny) log ny): y is sorted once and every x is ranked with
+        a binary search (exact, ties count as neither > nor <).
+        NaN compares neither way, so NaN pairs only enter the denominator.
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
     
+    total = x.size * y.size
     if total == 0:
         return 0.0
     
+    gt, lt = _dominance_counts(x[~np.isnan(x)], np.sort(y[~np.isnan(y)]))
     return (gt - lt) / total
 
 
+def _dominance_counts(x: np.ndarray, y_sorted: np.ndarray) -> Tuple[int, int]:
+    """(# pairs x > y, # pairs x < y) against a sorted NaN-free y"""
+    below = np.searchsorted(y_sorted, x, side='left')            # y < x
+    above = y_sorted.size - np.searchsorted(y_sorted, x, side='right')  # y > x
+    return int(below.sum()), int(above.sum())
+
+
 def cohens_d(x: Union[List, np.ndarray], y: Union[List, np.ndarray]) -> float:
     """
     Cohen's d (parametric effect size)
@@ -320,6 +318,163 @@ def cohens_d(x: Union[List, np.ndarray], y: Union[List, np.ndarray]) -> float:
     return (np.mean(x) - np.mean(y)) / pooled_std
 
 
+def _kth_pairwise_difference(x_sorted: np.ndarray, y_sorted: np.ndarray, k: int,
+                             rng: np.random.Generator, sample: int = 2048) -> float:
+    """
+    k-th smallest (0-based) of all differences x_i - y_j without forming them
+    
+    Row i of the implicit difference matrix x_i + (-y)_j (-y ascending) is
+    non-decreasing, so each row keeps an active column window. A pivot is
+    taken at the matching quantile of a random sample of active differences,
+    every row is split at the pivot with one searchsorted and the windows
+    shrink to the side holding k. The split is checked against the rounded
+    differences themselves, so the result is exact.
+    """
+    ny_neg = -y_sorted[::-1]
+    nx, ny = x_sorted.size, ny_neg.size
+    lo = np.zeros(nx, dtype=np.int64)
+    hi = np.full(nx, ny, dtype=np.int64)
+    
+    def split(pivot, strict):
+        # first column in [lo, hi) with x_i + ny_neg_j >= pivot (strict) / > pivot
+        side = 'left' if strict else 'right'
+        pos = np.clip(np.searchsorted(ny_neg, pivot - x_sorted, side=side), lo, hi)
+        past = (lambda d: d >= pivot) if strict else (lambda d: d > pivot)
+        while True:
+            back = pos > lo
+            back[back] = past(x_sorted[back] + ny_neg[pos[back] - 1])
+            if not back.any():
+                break
+            pos[back] -= 1
+        while True:
+            ahead = pos < hi
+            ahead[ahead] = ~past(x_sorted[ahead] + ny_neg[pos[ahead]])
+            if not ahead.any():
+                break
+            pos[ahead] += 1
+        return pos
+    
+    while True:
+        sizes = hi - lo
+        remaining = int(sizes.sum())
+        if remaining <= max(4 * nx, 4096):
+            cand = np.concatenate([x_sorted[i] + ny_neg[lo[i]:hi[i]] for i in np.flatnonzero(sizes)])
+            return float(np.partition(cand, k)[k])
+        cum = np.cumsum(sizes)
+        r = rng.integers(remaining, size=sample)
+        i = np.searchsorted(cum, r, side='right')
+        j = lo[i] + r - (cum[i] - sizes[i])
+        drawn = np.sort(x_sorted[i] + ny_neg[j])
+        pivot = drawn[min(int((k + 0.5) / remaining * sample), sample - 1)]
+        
+        ge = split(pivot, strict=True)
+        gt = split(pivot, strict=False)
+        n_lt = int((ge - lo).sum())
+        n_le = int((gt - lo).sum())
+        if k < n_lt:
+            hi = ge
+        elif k < n_le:
+            return float(pivot)
+        else:
+            k -= n_le
+            lo = gt
+
+
+def hodges_lehmann(x: Union[List, np.ndarray], y: Union[List, np.ndarray],
+                   seed: int = 0) -> float:
+    """
+    Hodges-Lehmann shift estimate (robust location difference)
+    
+    Args:
+        x: First sample
+        y: Second sample
+        seed: Seed of the pivot selection (the result does not depend on it)
+    
+    Returns:
+        float: median of all pairwise differences x_i - y_j (NaN dropped)
+    
+    Interpretation:
+        - Same units as the samples
+        - Positive: x tends to be larger than y
+    
+    Complexity:
+        Exact median of the nx*ny differences by selection on the two sorted
+        samples; the difference matrix is never formed.
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    x = np.sort(x[~np.isnan(x)])
+    y = np.sort(y[~np.isnan(y)])
+    return _hodges_lehmann_sorted(x, y, np.random.default_rng(seed))
+
+
+def _hodges_lehmann_sorted(x_sorted: np.ndarray, y_sorted: np.ndarray,
+                           rng: np.random.Generator) -> float:
+    n = x_sorted.size * y_sorted.size
+    if n == 0:
+        return np.nan
+    upper = _kth_pairwise_difference(x_sorted, y_sorted, n // 2, rng)
+    if n % 2:
+        return upper
+    lower = _kth_pairwise_difference(x_sorted, y_sorted, n // 2 - 1, rng)
+    return 0.5 * (lower + upper)
+
+
+def effect_sizes(samples: Mapping[str, Union[List, np.ndarray]],
+                 measures: Tuple[str, ...] = ("cliffs_delta", "cohens_d", "hodges_lehmann"),
+                 seed: int = 0) -> Dict[Tuple[str, str], Dict[str, float]]:
+    """
+    Effect sizes for every pair of samples (e.g. per-model residuals)
+    
+    Args:
+        samples: Dict of {name: values}, or a (models x points) array
+                 (rows are named by their index)
+        measures: Subset of "cliffs_delta", "cohens_d", "hodges_lehmann"
+        seed: Seed of the Hodges-Lehmann pivot selection
+    
+    Returns:
+        dict: {(name1, name2): {measure: value}} for every pair name1 before
+              name2 in input order; the reversed pair is the negated value
+    
+    Note:
+        Each sample is NaN-filtered and sorted once, and means/variances are
+        taken once, so all pairs reuse the same sorted rows. Values equal
+        cliffs_delta, cohens_d and hodges_lehmann applied to each pair.
+    """
+    if isinstance(samples, np.ndarray):
+        samples = {i: row for i, row in enumerate(np.atleast_2d(samples))}
+    names = list(samples)
+    raw = [np.asarray(samples[name], dtype=float).ravel() for name in names]
+    clean = [np.sort(v[~np.isnan(v)]) for v in raw]
+    sizes = [v.size for v in raw]
+    means = [np.mean(v) if v.size else np.nan for v in raw]
+    variances = [np.var(v, ddof=1) if v.size > 1 else np.nan for v in raw]
+    rng = np.random.default_rng(seed)
+    
+    results = {}
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            pair = {}
+            if "cliffs_delta" in measures:
+                total = sizes[i] * sizes[j]
+                if total == 0:
+                    pair["cliffs_delta"] = 0.0
+                else:
+                    gt, lt = _dominance_counts(clean[i], clean[j])
+                    pair["cliffs_delta"] = (gt - lt) / total
+            if "cohens_d" in measures:
+                nx, ny = sizes[i], sizes[j]
+                if nx < 2 or ny < 2:
+                    pair["cohens_d"] = np.nan
+                else:
+                    pooled_std = np.sqrt(((nx - 1) * variances[i] + (ny - 1) * variances[j]) / (nx + ny - 2))
+                    pair["cohens_d"] = np.nan if pooled_std == 0 else (means[i] - means[j]) / pooled_std
+            if "hodges_lehmann" in measures:
+                pair["hodges_lehmann"] = _hodges_lehmann_sorted(clean[i], clean[j], rng)
+            results[(names[i], names[j])] = pair
+    return results
+
+
 def relative_difference(y_obs: Union[List, np.ndarray], 
                         y_pred: Union[List, np.ndarray]) -> np.ndarray:
     """
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chudnovsky π Engine for SSZ Suite - Binary Splitting & Persistent Digit Cache
+
+Shared π source for the π-bridge scripts:
+- Binary-splitting Chudnovsky series (exact integer P/Q/T recursion)
+- Optional gmpy2 acceleration when installed, pure Python otherwise
+- Persistent digit cache on disk, keyed by precision, shared by all scripts
+- In-process cache on top, so repeated calls in one run are free
+
+The cache directory defaults to agent_out/cache/pi and can be moved with
+the SSZ_PI_CACHE_DIR environment variable.
+
+© 2025 Carmen Wrede, Lino Casu
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+import decimal
+import math
+import os
+import re
+from decimal import Decimal as D, localcontext
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    import gmpy2
+except ImportError:  # optional accelerator
+    gmpy2 = None
+
+
+# Decimal digits gained per Chudnovsky term: log10(640320^3 / 1728)
+DIGITS_PER_TERM = 14.181647462725477
+
+# Guard digits carried through the final division and stored in the cache
+GUARD_DIGITS = 10
+
+# Below this precision a fresh computation is cheaper than file I/O
+MIN_CACHE_DIGITS = 1000
+
+_C3_OVER_24 = 640320 ** 3 // 24
+# Cache format version: entries written before the square-root fix (v1,
+# pi_<prec>.txt) may carry wrong digits beyond ~4000 and are never read
+CACHE_VERSION = 2
+_CACHE_NAME = re.compile(rf"^pi_v{CACHE_VERSION}_(\d+)\.txt$")
+_LEGACY_NAME = re.compile(r"^pi_(?:v\d+_)?\d+\.txt$")
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def terms_for_digits(digits: int) -> int:
+    """Number of series terms needed for `digits` correct decimal digits"""
+    return int(digits / DIGITS_PER_TERM) + 2
+
+
+def chudnovsky_bs(a: int, b: int, mul=int) -> Tuple:
+    """
+    Binary splitting of the Chudnovsky series over terms [a, b)
+
+    Args:
+        a, b: Term range
+        mul: Integer type used for the products (int, gmpy2.mpz or Decimal)
+
+    Returns:
+        (P, Q, T) with pi = 426880 * sqrt(10005) * Q(0, n) / T(0, n)
+    """
+    if b - a == 1:
+        if a == 0:
+            Pab = Qab = mul(1)
+        else:
+            Pab = mul((6 * a - 5) * (2 * a - 1) * (6 * a - 1))
+            Qab = mul(a * a * a * _C3_OVER_24)
+        Tab = Pab * (13591409 + 545140134 * a)
+        if a & 1:
+            Tab = -Tab
+        return Pab, Qab, Tab
+    m = (a + b) // 2
+    P1, Q1, T1 = chudnovsky_bs(a, m, mul)
+    P2, Q2, T2 = chudnovsky_bs(m, b, mul)
+    return P1 * P2, Q1 * Q2, T1 * Q2 + P1 * T2
+
+
+def _sqrt_decimal(n: int, prec: int) -> D:
+    """
+    sqrt(n) to `prec` digits via Newton iteration on 1/sqrt(n)
+
+    Uses multiplications only, which libmpdec performs with fast
+    transforms; Decimal.sqrt() is much slower at 10^5+ digits.
+    Each step roughly doubles the correct digits; the loop tracks them
+    (from the ~15 of the float seed) and stops only once they exceed
+    `prec` plus guard digits, not when the working precision does.
+    """
+    with localcontext() as ctx:
+        ctx.Emax = decimal.MAX_EMAX
+        ctx.Emin = decimal.MIN_EMIN
+        nD = D(n)
+        y = D(1.0 / math.sqrt(n))
+        good = 14
+        while good < prec + GUARD_DIGITS:
+            good = 2 * good - 1
+            ctx.prec = min(good, prec) + GUARD_DIGITS
+            y = y + y * (1 - nD * y * y) / 2
+        ctx.prec = prec
+        return +(nD * y)
+
+
+def _compute_pi(prec: int, terms: int) -> D:
+    """π from `terms` series terms, rounded to `prec` digits (+guard)"""
+    work = prec + GUARD_DIGITS
+    if gmpy2 is not None:
+        mpz = gmpy2.mpz
+        P, Q, T = chudnovsky_bs(0, terms, mpz)
+        one = mpz(10) ** work
+        s = gmpy2.isqrt(mpz(10005) * one * one)
+        digits = str((Q * 426880 * s) // T)
+        with localcontext() as ctx:
+            ctx.prec = work
+            return D(digits).scaleb(-work)
+
+    with localcontext() as ctx:
+        # exact integer arithmetic in Decimal (fast NTT multiplication)
+        ctx.prec = decimal.MAX_PREC
+        ctx.Emax = decimal.MAX_EMAX
+        ctx.Emin = decimal.MIN_EMIN
+        P, Q, T = chudnovsky_bs(0, terms, D)
+        ctx.prec = work
+        return (Q * 426880 * _sqrt_decimal(10005, work)) / T
+
+
+def cache_dir() -> Path:
+    """Directory of the persistent π digit cache"""
+    env = os.environ.get("SSZ_PI_CACHE_DIR", "").strip()
+    return Path(env) if env else _REPO_ROOT / "agent_out" / "cache" / "pi"
+
+
+def _load_cached(prec: int) -> Optional[D]:
+    """Smallest cached entry with at least `prec` digits, or None"""
+    directory = cache_dir()
+    if not directory.is_dir():
+        return None
+    best = None
+    for entry in directory.iterdir():
+        match = _CACHE_NAME.match(entry.name)
+        if match and int(match.group(1)) >= prec:
+            if best is None or int(match.group(1)) < best[0]:
+                best = (int(match.group(1)), entry)
+    if best is None:
+        return None
+    try:
+        text = best[1].read_text(encoding="ascii").strip()
+        with localcontext() as ctx:
+            ctx.prec = best[0] + GUARD_DIGITS
+            value = D(text)
+    except (OSError, decimal.InvalidOperation):
+        return None
+    if not str(value).startswith("3.14159265"):
+        return None
+    return value
+
+
+def _store_cached(prec: int, value: D) -> None:
+    """Write entry atomically; cache failures never break a computation"""
+    directory = cache_dir()
+    path = directory / f"pi_v{CACHE_VERSION}_{prec}.txt"
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(str(value), encoding="ascii")
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=32)
+def _pi_full(prec: int, use_cache: bool) -> D:
+    if use_cache and prec >= MIN_CACHE_DIGITS:
+        cached = _load_cached(prec)
+        if cached is not None:
+            return cached
+    value = _compute_pi(prec, terms_for_digits(prec + GUARD_DIGITS))
+    if use_cache and prec >= MIN_CACHE_DIGITS:
+        _store_cached(prec, value)
+    return value
+
+
+def pi_decimal(prec: int, terms: Optional[int] = None, use_cache: bool = True) -> D:
+    """
+    π as Decimal with `prec` significant digits
+
+    Args:
+        prec: Decimal precision (digits)
+        terms: Series terms; None (or enough for `prec`) gives π correct to
+            `prec` digits and uses the cache. Fewer terms reproduce the
+            truncated series exactly and bypass the cache.
+        use_cache: Read/write the persistent digit cache
+
+    Returns:
+        Decimal: π rounded to `prec` digits (caller's context is untouched)
+    """
+    prec = max(int(prec), 1)
+    if terms is not None and terms < terms_for_digits(prec):
+        value = _compute_pi(prec, max(int(terms), 1))
+    else:
+        value = _pi_full(prec, bool(use_cache))
+    with localcontext() as ctx:
+        ctx.prec = prec
+        return +value
+
+
+def clear_cache(disk: bool = False) -> None:
+    """Drop the in-process cache (and the on-disk entries of any version if requested)"""
+    _pi_full.cache_clear()
+    if disk and cache_dir().is_dir():
+        for entry in cache_dir().iterdir():
+            if _LEGACY_NAME.match(entry.name):
+                entry.unlink()
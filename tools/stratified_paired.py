@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stratified Paired Test Engine for SSZ Suite - In-Process Seg vs GR×SR
+
+Replaces the per-stratum `segspace_all_in_one_extended.py eval-redshift`
+subprocess runs used by the stratification scripts:
+- Per-row model terms (z_obs, z_GR, z_SR, raw Δ(M)) computed once, vectorized
+- Any number of strata (boolean masks) evaluated as cheap aggregations
+- Exact two-sided binomial sign test per stratum (binom_test_two_sided_safe
+  from segspace_all_in_one_extended.py, so p-values match eval-redshift)
+- Vectorized bootstrap CIs for the Seg win share and the median paired gain
+
+Δ(M) normalization follows the subprocess pipeline: log10 mass bounds are
+taken from the rows of each stratum (norm="stratum"). norm="global" uses
+the bounds of the full table instead.
+
+© 2025 Carmen Wrede, Lino Casu
+Licensed under the ANTI-CAPITALIST SOFTWARE LICENSE v1.4
+"""
+import math
+import zlib
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+G = 6.67430e-11          # m^3 kg^-1 s^-2
+C = 2.99792458e8         # m s^-1
+M_SUN = 1.98847e30       # kg (value used by segspace_all_in_one_extended.py)
+
+# Default Δ(M) parameters (φ-based correction, A/B in percent, α in 1/m)
+DM_A = 98.01
+DM_B = 1.96
+DM_ALPHA = 2.7177e4
+
+BETA_MAX = 0.999999999999
+MODES = ("hint", "deltaM", "hybrid", "geodesic")
+
+# Bootstrap chunk size in resampled values (bounds memory for large strata)
+_BOOT_CHUNK = 4_000_000
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Numeric column as float64 (missing/unparseable -> NaN)"""
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _z_combined(z_gr: np.ndarray, z_sr: np.ndarray) -> np.ndarray:
+    """(1 + z_GR)(1 + z_SR) - 1, non-finite terms treated as 0"""
+    zgr = np.where(np.isfinite(z_gr), z_gr, 0.0)
+    zsr = np.where(np.isfinite(z_sr), z_sr, 0.0)
+    return (1.0 + zgr) * (1.0 + zsr) - 1.0
+
+
+def compute_residuals(df: pd.DataFrame, mode: str = "hybrid", prefer_z: bool = False,
+                      dmA: float = DM_A, dmB: float = DM_B, dmAlpha: float = DM_ALPHA) -> pd.DataFrame:
+    """
+    Per-row model terms for all observations (one model evaluation)
+
+    Args:
+        df: Emission-line table (columns as in data/real_data_emission_lines.csv)
+        mode: Seg prediction mode ("hint", "deltaM", "hybrid", "geodesic")
+        prefer_z: Use column z before f_emit/f_obs for z_obs
+        dmA, dmB, dmAlpha: Δ(M) parameters
+
+    Returns:
+        DataFrame aligned with df.index: z_obs, z_gr, z_sr, z_grsr,
+        z_seg_hint (NaN where the row needs Δ(M)), delta_raw_pct, log10M,
+        has_mass and abs_grsr. Seg residuals follow from evaluate_strata().
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+    n = len(df)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z_direct = _column(df, "z")
+        f_emit = _column(df, "f_emit_Hz")
+        f_obs = _column(df, "f_obs_Hz")
+        use_freq = np.isfinite(f_emit) & (f_emit != 0) & np.isfinite(f_obs) & (f_obs != 0)
+        if prefer_z:
+            use_freq &= ~np.isfinite(z_direct)
+        z_obs = np.where(use_freq, f_emit / np.where(use_freq, f_obs, 1.0) - 1.0, z_direct)
+
+        m_solar = _column(df, "M_solar")
+        m_solar = np.where(np.isfinite(m_solar), m_solar, 0.0)
+        M_c = m_solar * M_SUN
+        has_mass = M_c > 0
+        log10M = np.where(has_mass, np.log10(np.where(has_mass, M_c, 1.0)), math.log10(M_SUN))
+
+        # z_GR: 1/sqrt(1 - r_s/r) - 1 outside the horizon only
+        r_emit = _column(df, "r_emit_m")
+        rs = 2.0 * G * M_c / C**2
+        ok_gr = has_mass & np.isfinite(r_emit) & (r_emit > 0) & (r_emit > rs)
+        z_gr = np.full(n, np.nan)
+        z_gr[ok_gr] = 1.0 / np.sqrt(1.0 - rs[ok_gr] / r_emit[ok_gr]) - 1.0
+
+        # z_SR: γ(1 + β_los) - 1
+        v_tot = _column(df, "v_tot_mps")
+        v_los = _column(df, "v_los_mps")
+        v_los = np.where(np.isfinite(v_los), v_los, 0.0)
+        ok_sr = np.isfinite(v_tot) & (v_tot > 0)
+        beta = np.minimum(np.abs(v_tot) / C, BETA_MAX)
+        gamma = 1.0 / np.sqrt(1.0 - beta * beta)
+        z_sr = np.where(ok_sr, gamma * (1.0 + v_los / C) - 1.0, np.nan)
+
+        z_grsr = _z_combined(z_gr, z_sr)
+
+        z_hint = _column(df, "z_geom_hint")
+        if mode in ("hint", "hybrid"):
+            z_seg_hint = np.where(np.isfinite(z_hint), _z_combined(z_hint, z_sr), np.nan)
+        else:
+            z_seg_hint = np.full(n, np.nan)
+        if mode == "hint":
+            z_seg_hint = np.where(np.isfinite(z_seg_hint), z_seg_hint, z_grsr)
+        elif mode == "geodesic":
+            z_seg_hint = _z_combined(z_gr, z_sr)
+
+        rs_M = 2.0 * G * 10.0 ** log10M / C**2
+        delta_raw = dmA * np.exp(-dmAlpha * rs_M) + dmB
+
+    return pd.DataFrame({
+        "z_obs": z_obs, "z_gr": z_gr, "z_sr": z_sr, "z_grsr": z_grsr,
+        "z_seg_hint": z_seg_hint, "delta_raw_pct": delta_raw,
+        "log10M": log10M, "has_mass": has_mass,
+        "abs_grsr": np.abs(z_obs - z_grsr),
+    }, index=df.index)
+
+
+def log_bounds(residuals: pd.DataFrame) -> tuple:
+    """(lo, hi) log10 mass bounds of a row set, as in evaluate_redshift()"""
+    logs = residuals["log10M"].to_numpy()[residuals["has_mass"].to_numpy()]
+    if logs.size:
+        return float(logs.min()), float(logs.max())
+    base = math.log10(M_SUN)
+    return base - 0.5, base + 0.5
+
+
+def seg_prediction(residuals: pd.DataFrame, lo: float, hi: float) -> np.ndarray:
+    """z_Seg for the rows of `residuals` given the Δ(M) normalization bounds"""
+    z_seg = residuals["z_seg_hint"].to_numpy()
+    need = ~np.isfinite(z_seg)
+    if not need.any():
+        return z_seg
+    lM = residuals["log10M"].to_numpy()[need]
+    norm = np.ones_like(lM) if (hi - lo) <= 0 else np.clip((lM - lo) / (hi - lo), 0.0, 1.0)
+    delta_pct = residuals["delta_raw_pct"].to_numpy()[need] * norm
+    z_gr = residuals["z_gr"].to_numpy()[need]
+    z_sr = residuals["z_sr"].to_numpy()[need]
+    out = z_seg.copy()
+    out[need] = _z_combined(z_gr * (1.0 + delta_pct / 100.0), z_sr)
+    return out
+
+
+def sign_test_two_sided(k: int, n: int, p: float = 0.5) -> float:
+    """
+    Two-sided binomial sign test, NaN for an empty stratum
+
+    Delegates to binom_test_two_sided_safe() of segspace_all_in_one_extended.py
+    so p-values are identical to the eval-redshift pipeline (its tie
+    handling depends on the exact lgamma evaluation order).
+    """
+    if n <= 0:
+        return float("nan")
+    from segspace_all_in_one_extended import binom_test_two_sided_safe
+    return binom_test_two_sided_safe(int(k), int(n), p=p)
+
+
+def bootstrap_paired_ci(gain: np.ndarray, n_boot: int = 2000, seed: int = 137,
+                        level: float = 0.95) -> Dict[str, float]:
+    """
+    Percentile bootstrap CIs of the Seg win share and the median gain
+
+    Args:
+        gain: Paired gains |Δz_GR×SR| - |Δz_Seg| (positive: Seg better)
+        n_boot: Number of resamples
+        seed: RNG seed
+        level: Confidence level
+
+    Returns:
+        dict: share_ci_lo/hi, median_gain_ci_lo/hi
+    """
+    n = gain.size
+    nan = float("nan")
+    if n == 0 or n_boot <= 0:
+        return {"share_ci_lo": nan, "share_ci_hi": nan,
+                "median_gain_ci_lo": nan, "median_gain_ci_hi": nan}
+    rng = np.random.default_rng(seed)
+    share = np.empty(n_boot)
+    med = np.empty(n_boot)
+    step = max(1, _BOOT_CHUNK // n)
+    for s in range(0, n_boot, step):
+        idx = rng.integers(0, n, size=(min(step, n_boot - s), n))
+        sample = gain[idx]
+        share[s:s + len(idx)] = (sample > 0).mean(axis=1)
+        med[s:s + len(idx)] = np.median(sample, axis=1)
+    q = [(1.0 - level) / 2.0, 1.0 - (1.0 - level) / 2.0]
+    s_lo, s_hi = np.quantile(share, q)
+    m_lo, m_hi = np.quantile(med, q)
+    return {"share_ci_lo": float(s_lo), "share_ci_hi": float(s_hi),
+            "median_gain_ci_lo": float(m_lo), "median_gain_ci_hi": float(m_hi)}
+
+
+def rows_mask(residuals: pd.DataFrame, index) -> np.ndarray:
+    """
+    Positional boolean mask selecting the rows of a subset of the input table
+
+    Args:
+        residuals: Output of compute_residuals()
+        index: Index of a row subset of the frame passed to compute_residuals()
+
+    Returns:
+        np.ndarray: Boolean mask aligned with residuals (row order kept)
+    """
+    if not residuals.index.is_unique:
+        raise ValueError("residuals index must be unique to select rows by label; "
+                         "reset_index() the input table first")
+    return residuals.index.isin(index)
+
+
+def abs_residuals(residuals: pd.DataFrame, mask=None, norm: str = "stratum",
+                  bounds: Optional[tuple] = None) -> pd.DataFrame:
+    """
+    |Δz| per model (seg, gr, sr, grsr) for the rows of one stratum
+
+    Args:
+        residuals: Output of compute_residuals()
+        mask: Boolean row mask (None = all rows)
+        norm: "stratum" (Δ(M) bounds from the stratum) or "global"
+        bounds: Explicit (lo, hi) log10 mass bounds, overrides `norm`
+
+    Returns:
+        DataFrame abs_seg, abs_gr, abs_sr, abs_grsr (NaN where undefined)
+    """
+    sub = residuals if mask is None else residuals[np.asarray(mask, dtype=bool)]
+    if bounds is None:
+        bounds = log_bounds(sub if norm == "stratum" else residuals)
+    z_obs = sub["z_obs"].to_numpy()
+    with np.errstate(invalid="ignore"):
+        return pd.DataFrame({
+            "abs_seg": np.abs(z_obs - seg_prediction(sub, *bounds)),
+            "abs_gr": np.abs(z_obs - sub["z_gr"].to_numpy()),
+            "abs_sr": np.abs(z_obs - sub["z_sr"].to_numpy()),
+            "abs_grsr": sub["abs_grsr"].to_numpy(),
+        }, index=sub.index)
+
+
+def paired_stats(residuals: pd.DataFrame, mask=None, norm: str = "stratum",
+                 bounds: Optional[tuple] = None, n_boot: int = 0, seed: int = 137) -> Dict[str, float]:
+    """
+    Seg vs GR×SR sign test on one stratum
+
+    Args:
+        residuals: Output of compute_residuals()
+        mask: Boolean row mask (None = all rows)
+        norm: "stratum" (Δ(M) bounds from the stratum) or "global"
+        bounds: Explicit (lo, hi) log10 mass bounds, overrides `norm`
+        n_boot: Bootstrap resamples for CIs (0 = off)
+        seed: Bootstrap seed
+
+    Returns:
+        dict with the keys of redshift_paired_stats.json (N_pairs,
+        N_Seg_better, share_Seg_better, binom_two_sided_p) plus
+        N_rows, median_gain and CI fields when n_boot > 0
+    """
+    res = abs_residuals(residuals, mask, norm=norm, bounds=bounds)
+    abs_seg = res["abs_seg"].to_numpy()
+    abs_grsr = res["abs_grsr"].to_numpy()
+    ok = np.isfinite(abs_seg) & np.isfinite(abs_grsr)
+    gain = abs_grsr[ok] - abs_seg[ok]
+    n = int(gain.size)
+    k = int((gain > 0).sum())
+    out = {
+        "N_rows": int(len(res)),
+        "N_pairs": n,
+        "N_Seg_better": k,
+        "share_Seg_better": (k / n) if n > 0 else float("nan"),
+        "binom_two_sided_p": sign_test_two_sided(k, n) if n > 0 else float("nan"),
+        "median_gain": float(np.median(gain)) if n > 0 else float("nan"),
+    }
+    if n_boot > 0:
+        out.update(bootstrap_paired_ci(gain, n_boot=n_boot, seed=seed))
+    return out
+
+
+def evaluate_strata(residuals: pd.DataFrame, strata: Mapping[str, Iterable], norm: str = "stratum",
+                    n_boot: int = 0, seed: int = 137, dimension: Optional[str] = None) -> pd.DataFrame:
+    """
+    Paired test for any number of strata in one process
+
+    Args:
+        residuals: Output of compute_residuals()
+        strata: {label: boolean mask aligned with residuals}
+        norm: Δ(M) normalization ("stratum" or "global")
+        n_boot: Bootstrap resamples per stratum (0 = off)
+        seed: Base seed; each stratum gets a label-derived stream, so CIs
+            do not depend on the order of strata
+        dimension: Optional name stored in a "dimension" column
+
+    Returns:
+        DataFrame with one row per stratum (label first)
+    """
+    rows = []
+    global_bounds = log_bounds(residuals) if norm == "global" else None
+    for label, mask in strata.items():
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(residuals),):
+            raise ValueError(f"mask for {label!r} has shape {mask.shape}, expected ({len(residuals)},)")
+        stream = seed ^ zlib.crc32(str(label).encode("utf-8"))
+        row = {"label": label}
+        if dimension is not None:
+            row["dimension"] = dimension
+        row.update(paired_stats(residuals, mask, norm=norm, bounds=global_bounds,
+                                n_boot=n_boot, seed=stream))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def masks_from_bins(values, edges: Sequence[float], labels: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Half-open bin masks [e_i, e_i+1) for a numeric column
+
+    Use ±np.inf as outer edges for open-ended bins.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(labels) != len(edges) - 1:
+        raise ValueError("need exactly len(edges) - 1 labels")
+    idx = np.searchsorted(np.asarray(edges, dtype=np.float64), values, side="right") - 1
+    valid = np.isfinite(values)
+    return {label: valid & (idx == i) for i, label in enumerate(labels)}
+
+
+def masks_from_groups(values, prefix: str = "") -> Dict[str, np.ndarray]:
+    """One mask per distinct value of a categorical column (group-by)"""
+    codes, uniques = pd.factorize(pd.Series(values), sort=True)
+    return {f"{prefix}{u}": codes == i for i, u in enumerate(uniques)}
+
+
+def stratify(df: pd.DataFrame, dimensions: Mapping[str, Mapping[str, Iterable]],
+             mode: str = "hybrid", prefer_z: bool = False, norm: str = "stratum",
+             n_boot: int = 0, seed: int = 137, **dm) -> pd.DataFrame:
+    """
+    Full multi-dimensional stratification with a single model evaluation
+
+    Args:
+        df: Observation table
+        dimensions: {dimension name: {label: mask}}
+        mode, prefer_z, dm: Passed to compute_residuals()
+        norm, n_boot, seed: Passed to evaluate_strata()
+
+    Returns:
+        DataFrame with one row per (dimension, stratum)
+    """
+    residuals = compute_residuals(df, mode=mode, prefer_z=prefer_z, **dm)
+    frames: List[pd.DataFrame] = [
+        evaluate_strata(residuals, strata, norm=norm, n_boot=n_boot, seed=seed, dimension=name)
+        for name, strata in dimensions.items()
+    ]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()